@@ -6,11 +6,11 @@ from services.google_search import GoogleSearchService
 from services.apollo_api import ApolloAPIService
 from services.email_generator import EmailGenerator
 from services.email_sender import EmailSender
-from services.sheets_logger import SheetsLogger
-from services.scheduler import CampaignScheduler
+from services.sheets_logger import get_sheets_appender
+from services.scheduler import get_campaign_scheduler, start_campaign_scheduler
+from services.request_metrics import init_request_metrics
 from services.job_parser import JobParserService
-from services.ai_lead_scorer import AILeadScorer
-from utils.email_utils import text_to_html_email, replace_email_variables
+from utils.email_utils import replace_email_variables, get_compiled_template
 from datetime import datetime
 from urllib.parse import urlparse
 import os
@@ -65,8 +65,9 @@ db.init_app(app)
 
 # Initialize services (will be configured from settings)
 email_generator = EmailGenerator()
-campaign_scheduler = CampaignScheduler()
-ai_lead_scorer = AILeadScorer()
+with app.app_context():
+    # Route latency, DB and vendor time -> Server-Timing headers and /api/metrics
+    request_metrics = init_request_metrics(app, db.engine)
 
 def get_setting(key, default=None):
     """Get a setting from database or return default"""
@@ -290,6 +291,35 @@ def test_google_config():
     except Exception as e:
         return jsonify({'valid': False, 'message': str(e)})
 
+@app.route('/api/search/cache-stats', methods=['GET'])
+def get_search_cache_stats():
+    """Google Custom Search cache size and quota saved"""
+    try:
+        from services.google_cse import get_cse_cache
+        return jsonify({'success': True, 'stats': get_cse_cache().get_stats()})
+    except Exception as e:
+        return jsonify({'success': False, 'message': str(e)})
+
+@app.route('/api/gemini/stats', methods=['GET'])
+def get_gemini_stats():
+    """Gemini key health, call counters and response cache size"""
+    try:
+        from services.gemini_client import get_gemini_client
+        return jsonify({'success': True, 'stats': get_gemini_client().get_stats()})
+    except Exception as e:
+        return jsonify({'success': False, 'message': str(e)})
+
+@app.route('/api/search/cache', methods=['DELETE'])
+def clear_search_cache():
+    """Drop all cached Google Custom Search responses"""
+    try:
+        from services.google_cse import get_cse_cache
+        get_cse_cache().clear()
+        log_activity(None, 'search_cache_cleared', 'Google search cache cleared', 'success')
+        return jsonify({'success': True, 'message': 'Search cache cleared'})
+    except Exception as e:
+        return jsonify({'success': False, 'message': str(e)})
+
 # Session Manager API
 @app.route('/api/sessions', methods=['GET'])
 def get_sessions():
@@ -507,13 +537,13 @@ def update_campaign(campaign_id):
 
         # Update scheduler if needed
         if campaign.schedule_enabled:
-            campaign_scheduler.schedule_campaign(
+            get_campaign_scheduler(db.engine).schedule_campaign(
                 campaign.id,
                 campaign.schedule_frequency,
-                run_campaign_job
+                'app:run_campaign_job'
             )
         else:
-            campaign_scheduler.remove_campaign(campaign.id)
+            get_campaign_scheduler(db.engine).remove_campaign(campaign.id)
 
         log_activity(campaign.id, 'campaign_updated', f'Campaign "{campaign.name}" updated', 'success')
 
@@ -646,11 +676,10 @@ def execute_campaign(campaign):
                             db.session.commit()
                             emails_sent += 1
 
-                            # Log to Google Sheets
+                            # Log to Google Sheets (queued - flushed in batches by a background thread)
                             spreadsheet_id = get_setting('google_spreadsheet_id')
                             if spreadsheet_id:
-                                sheets_logger = SheetsLogger()
-                                sheets_logger.log_job_lead(spreadsheet_id, {
+                                get_sheets_appender().enqueue(spreadsheet_id, {
                                     'campaign_name': campaign.name,
                                     'job_title': lead.job_title,
                                     'company_name': lead.company_name,
@@ -689,6 +718,16 @@ def execute_campaign(campaign):
         log_activity(campaign.id, 'campaign_failed', str(e), 'error')
         return {'success': False, 'message': str(e)}
 
+def start_scheduler():
+    """
+    Start the campaign scheduler for this process (in the background, off the request path)
+    Jobs live in the app database; only the process holding the leader lease runs them.
+    Called after gunicorn forks each worker (gunicorn.conf.py) and by the dev server,
+    so apscheduler never loads while app is imported
+    """
+    with app.app_context():
+        start_campaign_scheduler(db.engine)
+
 def run_campaign_job(campaign_id):
     """Background job to run campaign (called by scheduler)"""
     with app.app_context():
@@ -696,6 +735,49 @@ def run_campaign_job(campaign_id):
         if campaign:
             execute_campaign(campaign)
 
+@app.route('/api/metrics', methods=['GET'])
+def get_metrics():
+    """Prometheus metrics merged across all gunicorn workers"""
+    return Response(request_metrics.render_prometheus(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/api/telemetry/vendors', methods=['GET'])
+def get_vendor_telemetry_summary():
+    """Vendor calls, latency, errors and estimated credit spend (all workers)"""
+    try:
+        from services.vendor_telemetry import get_vendor_telemetry
+        telemetry = get_vendor_telemetry()
+        hours = request.args.get('hours', 24, type=float)
+        return jsonify({
+            'success': True,
+            'summary': telemetry.summary(hours=hours),
+            'recent': telemetry.recent_calls(request.args.get('recent', 0, type=int),
+                                             vendor=request.args.get('vendor'))
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'message': str(e)}), 500
+
+@app.route('/api/sessions/<int:session_id>/telemetry', methods=['GET'])
+def get_session_vendor_telemetry(session_id):
+    """Vendor time and credits a lead session spent, per pipeline stage"""
+    try:
+        from services.vendor_telemetry import get_vendor_telemetry
+        telemetry = get_vendor_telemetry()
+        return jsonify({
+            'success': True,
+            'summary': telemetry.summary(session_id=session_id),
+            'recent': telemetry.recent_calls(request.args.get('recent', 0, type=int), session_id=session_id)
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'message': str(e)}), 500
+
+@app.route('/api/scheduler/status', methods=['GET'])
+def get_scheduler_status():
+    """Scheduler leader lease and scheduled campaign jobs"""
+    try:
+        return jsonify({'success': True, 'status': get_campaign_scheduler(db.engine).get_status()})
+    except Exception as e:
+        return jsonify({'success': False, 'message': str(e)}), 500
+
 # Email Templates API
 @app.route('/api/templates', methods=['GET'])
 def get_templates():
@@ -1416,7 +1498,8 @@ def ai_score_lead():
         lead_data = data.get('lead', {})
         query = data.get('query', '')
 
-        scoring = ai_lead_scorer.score_lead(lead_data, query)
+        from services.ai_lead_scorer import get_ai_lead_scorer
+        scoring = get_ai_lead_scorer().score_lead(lead_data, query)
 
         return jsonify({
             'success': True,
@@ -1432,13 +1515,23 @@ def ai_score_leads_batch():
         data = request.json
         leads = data.get('leads', [])
         query = data.get('query', '')
+        top_k = data.get('top_k')  # Optional: only return the best N leads
+        if top_k is not None:
+            try:
+                top_k = int(top_k)
+            except (TypeError, ValueError):
+                top_k = 0
+            if top_k < 1:
+                return jsonify({'success': False, 'message': 'top_k must be a positive integer'}), 400
 
-        scored_leads = ai_lead_scorer.batch_score_leads(leads, query)
+        from services.ai_lead_scorer import get_ai_lead_scorer
+        result = get_ai_lead_scorer().score_leads_columnar(leads, query, top_k)
 
         return jsonify({
             'success': True,
-            'leads': scored_leads,
-            'distribution': ai_lead_scorer.get_lead_priority_distribution(scored_leads)
+            'leads': result['leads'],
+            'total_scored': len(leads),
+            'distribution': result['distribution']
         })
     except Exception as e:
         return jsonify({'success': False, 'message': str(e)})
@@ -1588,6 +1681,10 @@ def update_ai_agent_config():
         # Save configuration
         config.save_config()
 
+        # Shared orchestrators pick up the new settings on next use
+        from services.ai_agent_system import reset_orchestrators
+        reset_orchestrators()
+
         log_activity(None, 'ai_agent_config_updated', 'AI agent configuration updated', 'success')
 
         return jsonify({
@@ -1609,6 +1706,8 @@ def apply_ai_agent_preset(preset_name):
 
         if success:
             config.save_config()
+            from services.ai_agent_system import reset_orchestrators
+            reset_orchestrators()
             log_activity(None, 'ai_agent_preset_applied', f'Applied preset: {preset_name}', 'success')
             return jsonify({
                 'success': True,
@@ -1647,6 +1746,9 @@ def reset_ai_agent_config():
         config.reset_to_defaults()
         config.save_config()
 
+        from services.ai_agent_system import reset_orchestrators
+        reset_orchestrators()
+
         log_activity(None, 'ai_agent_config_reset', 'AI agent configuration reset to defaults', 'success')
 
         return jsonify({
@@ -1662,6 +1764,8 @@ def get_ai_agent_stats():
     """Get AI agent statistics and status"""
     try:
         from services.ai_agent_config import get_config
+        from services.ai_agent_system import get_ollama_metrics, get_orchestrator_stats
+        from services.agent_decision_cache import get_decision_cache
         config = get_config()
 
         # Try to check Ollama status
@@ -1684,12 +1788,26 @@ def get_ai_agent_stats():
                 'config_summary': config.get_config_summary(),
                 'ollama_status': ollama_status,
                 'available_models': available_models,
-                'current_model': config.get_model()
+                'current_model': config.get_model(),
+                'ollama_metrics': get_ollama_metrics().snapshot(),
+                'decision_cache': get_decision_cache().get_stats(),
+                'orchestrators': get_orchestrator_stats()
             }
         })
     except Exception as e:
         return jsonify({'success': False, 'message': str(e)})
 
+@app.route('/api/ai-agents/decision-cache', methods=['DELETE'])
+def clear_ai_agent_decision_cache():
+    """Drop all cached AI agent verdicts"""
+    try:
+        from services.agent_decision_cache import get_decision_cache
+        get_decision_cache().clear()
+        log_activity(None, 'ai_agent_cache_cleared', 'AI agent decision cache cleared', 'success')
+        return jsonify({'success': True, 'message': 'Decision cache cleared'})
+    except Exception as e:
+        return jsonify({'success': False, 'message': str(e)})
+
 # ==================== LEAD ENGINE API ====================
 
 @app.route('/api/lead-engine/generate', methods=['POST'])
@@ -1781,7 +1899,8 @@ def lead_engine_generate():
                 keywords=keywords,
                 company_sizes=company_sizes,
                 poc_roles=poc_roles,
-                session_title=session_title
+                session_title=session_title,
+                session_id=lead_session.id
             ):
                 # Save lead to session when we get a new lead
                 if update.get('type') == 'lead':
@@ -1863,14 +1982,14 @@ def lead_engine_generate():
 def generate_email_sequence():
     """AI-powered email sequence generator - generates multiple options per day"""
     try:
-        import os
-        import google.generativeai as genai
         from collections import Counter
+        from services.gemini_client import get_gemini_client, GeminiError, GeminiQuotaExceeded
 
         data = request.json
         leads = data.get('leads', [])
         sender_name = data.get('sender_name', 'Your Team')
         template_pref = data.get('template_preference', 'auto')
+        regenerate = bool(data.get('regenerate', False))  # Skip cached options for the same audience
 
         if not leads:
             return jsonify({'success': False, 'message': 'No leads provided'}), 400
@@ -1936,12 +2055,9 @@ Campaign Profile:
                 'message': 'Reference templates not found in database'
             }), 400
 
-        # Generate custom sequence using Gemini (with fallback key)
-        gemini_keys = [k for k in [
-            os.getenv('GEMINI_API_KEY'),
-            os.getenv('GEMINI_API_KEY_FALLBACK')
-        ] if k]
-        if not gemini_keys:
+        # Generate custom sequence using the shared Gemini client (key pool + response cache)
+        gemini = get_gemini_client()
+        if not gemini.keys:
             return jsonify({'success': False, 'message': 'Gemini API key not configured'}), 500
 
         prompt = f"""You are an expert email copywriter. Generate MULTIPLE email options for a 4-step recruiting/staffing outreach sequence.
@@ -2027,69 +2143,66 @@ DAY_11_OPTION_B_BODY: [body]
 
 Generate the options now:"""
 
-        generated_text = None
-        last_error = None
-        for api_key in gemini_keys:
-            try:
-                genai.configure(api_key=api_key)
-                model = genai.GenerativeModel('gemini-2.5-flash')
-                response = model.generate_content(prompt)
-                generated_text = response.text.strip()
-                break  # Success, stop trying keys
-            except Exception as api_error:
-                last_error = api_error
-                error_msg = str(api_error)
-                print(f"Gemini API error with key ...{api_key[-6:]}: {error_msg}")
-                if '429' in error_msg or 'quota' in error_msg.lower() or 'resource' in error_msg.lower():
-                    continue  # Try next key
-                else:
-                    return jsonify({
-                        'success': False,
-                        'message': f'Gemini API error: {error_msg}',
-                        'error_type': 'api_error'
-                    }), 500
+        def parse_sequence(generated_text):
+            """Parse the generated sequence with multiple options"""
+            emails = []
+            email_blocks = generated_text.split('---')
+
+            for block in email_blocks:
+                lines = block.strip().split('\n')
+                subject = ''
+                body_lines = []
+                day = None
+                option = None
+
+                for line in lines:
+                    # Parse DAY_X_OPTION_Y_SUBJECT format
+                    if '_SUBJECT:' in line:
+                        parts = line.split('_')
+                        if len(parts) >= 4 and parts[1].isdigit():
+                            day = int(parts[1])
+                            option = parts[3]
+                            subject = line.split(':', 1)[1].strip()
+                    # Parse DAY_X_OPTION_Y_BODY format
+                    elif '_BODY:' in line:
+                        body_lines.append(line.split(':', 1)[1].strip())
+                    elif subject and line.strip():
+                        body_lines.append(line.strip())
+
+                body = '\n\n'.join([line for line in body_lines if line])
+
+                if subject and body and day and option:
+                    emails.append({
+                        'day': day,
+                        'option': option,
+                        'subject': subject,
+                        'body': body
+                    })
+            return emails
 
-        if not generated_text:
+        try:
+            # Identical audience + references -> cached options (only complete sequences are cached)
+            generated_text = gemini.generate(
+                prompt,
+                use_cache=not regenerate,
+                validate=lambda text: len(parse_sequence(text)) >= 8
+            )
+        except GeminiQuotaExceeded as quota_error:
+            print(f"[GEMINI] {quota_error}")
             return jsonify({
                 'success': False,
                 'message': f'Gemini API quota exceeded on all keys. Please try again later.',
-                'error_type': 'quota_exceeded'
+                'error_type': 'quota_exceeded',
+                'retry_after': round(quota_error.retry_after)
             }), 429
+        except GeminiError as api_error:
+            return jsonify({
+                'success': False,
+                'message': f'Gemini API error: {api_error}',
+                'error_type': 'api_error'
+            }), 500
 
-        # Parse the generated sequence with multiple options
-        emails = []
-        email_blocks = generated_text.split('---')
-
-        for block in email_blocks:
-            lines = block.strip().split('\n')
-            subject = ''
-            body_lines = []
-            day = None
-            option = None
-
-            for line in lines:
-                # Parse DAY_X_OPTION_Y_SUBJECT format
-                if '_SUBJECT:' in line:
-                    parts = line.split('_')
-                    if len(parts) >= 4:
-                        day = int(parts[1])
-                        option = parts[3]
-                        subject = line.split(':', 1)[1].strip()
-                # Parse DAY_X_OPTION_Y_BODY format
-                elif '_BODY:' in line:
-                    body_lines.append(line.split(':', 1)[1].strip())
-                elif subject and line.strip():
-                    body_lines.append(line.strip())
-
-            body = '\n\n'.join([line for line in body_lines if line])
-
-            if subject and body and day and option:
-                emails.append({
-                    'day': day,
-                    'option': option,
-                    'subject': subject,
-                    'body': body
-                })
+        emails = parse_sequence(generated_text)
 
         if len(emails) < 8:  # At least 8 options expected (3+3+2+2 minimum)
             return jsonify({
@@ -2167,59 +2280,34 @@ def send_test_email():
         else:
             return jsonify({'success': False, 'error': 'Template data is required'}), 400
 
-        # Replace variables with test data
-        replacements = {
-            '{{FirstName}}': test_lead_name,
-            '{{CompanyName}}': test_company,
-            '{{SenderName}}': sender.email.split('@')[0].title(),
-            '{{Title}}': 'Test Title',
-            '{{Industry}}': 'Technology',
-            '{{Email}}': recipient_email
+        # Replace variables with test data and build the HTML body in one pass
+        variables = {
+            'FirstName': test_lead_name,
+            'CompanyName': test_company,
+            'SenderName': sender.email.split('@')[0].title(),
+            'Title': 'Test Title',
+            'Industry': 'Technology',
+            'Email': recipient_email
         }
+        compiled = get_compiled_template(subject, body, template_id if template_id and template_id > 0 else None)
+        rendered = compiled.render(variables)
+        subject, body, html_body = rendered['subject'], rendered['body'], rendered['html']
+        if rendered['unknown_variables']:
+            print(f"[TEST EMAIL] Unfilled template variables: {', '.join(rendered['unknown_variables'])}")
 
-        for key, value in replacements.items():
-            subject = subject.replace(key, value)
-            body = body.replace(key, value)
-
-        # Convert body to professional HTML format
-        html_body = text_to_html_email(body)
-
-        # Send email using Gmail API
+        # Send email using the sender's cached Gmail API client
         try:
-            from google.oauth2.credentials import Credentials
-            from googleapiclient.discovery import build
-            from email.mime.text import MIMEText
-            import base64
-
-            # Refresh token if needed
-            if sender.token_expiry and sender.token_expiry < datetime.utcnow():
-                # Token refresh logic would go here
-                pass
-
-            # Build credentials
-            creds = Credentials(
-                token=sender.access_token,
-                refresh_token=sender.refresh_token,
-                token_uri='https://oauth2.googleapis.com/token',
-                client_id=os.getenv('GOOGLE_OAUTH_CLIENT_ID'),
-                client_secret=os.getenv('GOOGLE_OAUTH_CLIENT_SECRET')
-            )
+            from services.gmail_sender import GmailAuthError
 
-            # Create Gmail API service
-            service = build('gmail', 'v1', credentials=creds)
-
-            # Create HTML message
-            message = MIMEText(html_body, 'html')
-            message['to'] = recipient_email
-            message['from'] = sender.email
-            message['subject'] = f"[TEST] {subject}"
-
-            # Encode message
-            raw = base64.urlsafe_b64encode(message.as_bytes()).decode()
-            send_message = {'raw': raw}
-
-            # Send via Gmail API
-            result = service.users().messages().send(userId='me', body=send_message).execute()
+            try:
+                client = get_sender_gmail_client(sender)
+                result = client.send(recipient_email, f"[TEST] {subject}", html_body)
+            except GmailAuthError as auth_error:
+                sender.status = 'expired'
+                db.session.commit()
+                return jsonify({'success': False, 'error': f'{auth_error}. Please reconnect.'}), 401
+            finally:
+                save_sender_tokens(sender)
 
             return jsonify({
                 'success': True,
@@ -2259,16 +2347,10 @@ def personalize_email():
         if not leads or len(leads) == 0:
             return jsonify({'success': False, 'error': 'At least one lead is required for personalization'}), 400
 
-        try:
-            import google.generativeai as genai
-        except ImportError:
-            return jsonify({'success': False, 'error': 'Google Generative AI package not installed'}), 500
-
-        gemini_keys = [k for k in [
-            os.getenv('GEMINI_API_KEY'),
-            os.getenv('GEMINI_API_KEY_FALLBACK')
-        ] if k]
-        if not gemini_keys:
+        from services.gemini_client import get_gemini_client, GeminiError, GeminiQuotaExceeded
+
+        gemini = get_gemini_client()
+        if not gemini.keys:
             return jsonify({'success': False, 'error': 'Gemini API key not configured. Add GEMINI_API_KEY to .env'}), 500
 
         # Analyze lead characteristics
@@ -2324,57 +2406,52 @@ RESPOND IN THIS EXACT JSON FORMAT (no markdown, no code blocks):
 }}"""
 
         import json as json_module
-        last_error = None
-        for api_key in gemini_keys:
+
+        def parse_personalization(response_text):
+            # Clean up response - remove markdown code blocks if present
+            response_text = response_text.strip()
+            if response_text.startswith('```'):
+                response_text = response_text.split('\n', 1)[1] if '\n' in response_text else response_text[3:]
+            if response_text.endswith('```'):
+                response_text = response_text[:-3]
+            if response_text.startswith('json'):
+                response_text = response_text[4:]
+            return json_module.loads(response_text.strip())
+
+        def is_valid_personalization(response_text):
             try:
-                genai.configure(api_key=api_key)
-                model = genai.GenerativeModel('gemini-2.5-flash')
-                response = model.generate_content(prompt)
-                response_text = response.text.strip()
-
-                # Clean up response - remove markdown code blocks if present
-                if response_text.startswith('```'):
-                    response_text = response_text.split('\n', 1)[1] if '\n' in response_text else response_text[3:]
-                if response_text.endswith('```'):
-                    response_text = response_text[:-3]
-                if response_text.startswith('json'):
-                    response_text = response_text[4:]
-                response_text = response_text.strip()
-
-                result = json_module.loads(response_text)
-
-                return jsonify({
-                    'success': True,
-                    'original': {
-                        'subject': template_subject,
-                        'body': template_body
-                    },
-                    'personalized': {
-                        'subject': result.get('personalized_subject', template_subject),
-                        'body': result.get('personalized_body', template_body)
-                    },
-                    'changes_made': result.get('changes_made', []),
-                    'analysis': result.get('analysis', {})
-                })
-
-            except Exception as ai_error:
-                last_error = ai_error
-                error_str = str(ai_error)
-                print(f"Gemini API error with key ...{api_key[-6:]}: {error_str}")
-                if '429' in error_str or 'quota' in error_str.lower() or 'resource' in error_str.lower():
-                    print("Quota hit, trying next key...")
-                    continue
-                # Non-quota error, don't retry with next key
-                return jsonify({
-                    'success': False,
-                    'error': f'AI personalization failed: {str(ai_error)}'
-                }), 500
+                return isinstance(parse_personalization(response_text), dict)
+            except ValueError:
+                return False
+
+        try:
+            result = parse_personalization(gemini.generate(prompt, validate=is_valid_personalization))
+        except GeminiQuotaExceeded as quota_error:
+            return jsonify({
+                'success': False,
+                'error': f'AI quota exceeded on all API keys. Please try again later. Last error: {str(quota_error)}',
+                'retry_after': round(quota_error.retry_after)
+            }), 429
+        except (GeminiError, ValueError) as ai_error:
+            print(f"Gemini personalization error: {ai_error}")
+            return jsonify({
+                'success': False,
+                'error': f'AI personalization failed: {str(ai_error)}'
+            }), 500
 
-        # All keys exhausted
         return jsonify({
-            'success': False,
-            'error': f'AI quota exceeded on all API keys. Please try again later. Last error: {str(last_error)}'
-        }), 429
+            'success': True,
+            'original': {
+                'subject': template_subject,
+                'body': template_body
+            },
+            'personalized': {
+                'subject': result.get('personalized_subject', template_subject),
+                'body': result.get('personalized_body', template_body)
+            },
+            'changes_made': result.get('changes_made', []),
+            'analysis': result.get('analysis', {})
+        })
 
     except Exception as e:
         print(f"Error in personalize_email: {e}")
@@ -2383,8 +2460,113 @@ RESPOND IN THIS EXACT JSON FORMAT (no markdown, no code blocks):
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
+@app.route('/api/campaigns/personalize-leads', methods=['POST'])
+def personalize_leads():
+    """
+    Per-lead AI personalization job
+    Streams NDJSON results as (company, title) groups complete and stores
+    each lead's variant for the campaign sequence step when campaign_id is given
+    """
+    from models import LeadPersonalizedEmail
+    from services.email_personalizer import EmailPersonalizer, DEFAULT_MAX_CONCURRENT
+    from services.gemini_client import get_gemini_client
+
+    data = request.json or {}
+    template_subject = data.get('subject', '')
+    template_body = data.get('body', '')
+    leads = data.get('leads', [])
+    campaign_id = data.get('campaign_id')
+    step_number = int(data.get('step_number', 1))
+    max_concurrent = data.get('max_concurrent', DEFAULT_MAX_CONCURRENT)
+
+    if not template_subject or not template_body:
+        return jsonify({'success': False, 'error': 'Template subject and body are required'}), 400
+    if not leads:
+        return jsonify({'success': False, 'error': 'At least one lead is required for personalization'}), 400
+    if campaign_id and not Campaign.query.get(campaign_id):
+        return jsonify({'success': False, 'error': 'Campaign not found'}), 404
+    if not get_gemini_client().keys:
+        return jsonify({'success': False, 'error': 'Gemini API key not configured. Add GEMINI_API_KEY to .env'}), 500
+
+    def store_variant(update):
+        lead = update['lead']
+        lead_email = lead.get('email')
+        if not campaign_id or not lead_email:
+            return
+        variant = LeadPersonalizedEmail.query.filter_by(
+            campaign_id=campaign_id, step_number=step_number, lead_email=lead_email
+        ).first()
+        if not variant:
+            variant = LeadPersonalizedEmail(campaign_id=campaign_id, step_number=step_number, lead_email=lead_email)
+            db.session.add(variant)
+        variant.lead_name = lead.get('name')
+        variant.lead_company = lead.get('company')
+        variant.lead_title = lead.get('title')
+        variant.subject = update['subject']
+        variant.body = update['body']
+        variant.changes_made = json.dumps(update.get('changes_made', []))
+
+    def generate():
+        personalizer = EmailPersonalizer(max_concurrent=max_concurrent)
+        try:
+            for update in personalizer.personalize(template_subject, template_body, leads):
+                if update['type'] == 'lead':
+                    try:
+                        store_variant(update)
+                        db.session.commit()
+                    except Exception as db_err:
+                        print(f"    [DB Error] LeadPersonalizedEmail: {db_err}")
+                        db.session.rollback()
+                yield json.dumps(update) + '\n'
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+            yield json.dumps({'type': 'error', 'message': str(e)}) + '\n'
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+
+@app.route('/api/campaigns/<int:campaign_id>/personalized-emails', methods=['GET'])
+def get_personalized_emails(campaign_id):
+    """Stored per-lead variants for a campaign (optionally one step)"""
+    from models import LeadPersonalizedEmail
+
+    query = LeadPersonalizedEmail.query.filter_by(campaign_id=campaign_id)
+    step_number = request.args.get('step_number', type=int)
+    if step_number:
+        query = query.filter_by(step_number=step_number)
+    variants = query.order_by(LeadPersonalizedEmail.step_number, LeadPersonalizedEmail.lead_email).all()
+    return jsonify({'success': True, 'emails': [v.to_dict() for v in variants]})
+
+
 # ==================== SENDER ACCOUNT ROUTES ====================
 
+def get_sender_gmail_client(sender):
+    """Cached Gmail client for a sender, with a fresh token stored back on the account"""
+    from services.gmail_sender import get_gmail_client
+
+    client = get_gmail_client(sender)
+    if client.ensure_fresh():
+        save_sender_tokens(sender)
+    return client
+
+
+def save_sender_tokens(sender):
+    """Write a refreshed Gmail access token back to the SenderAccount"""
+    from services.gmail_sender import get_gmail_client
+
+    creds = get_gmail_client(sender).credentials
+    if creds.token and creds.token != sender.access_token:
+        sender.access_token = creds.token
+        sender.token_expiry = creds.expiry
+        sender.status = 'connected'
+        try:
+            db.session.commit()
+        except Exception as db_err:
+            print(f"    [DB Error] SenderAccount token: {db_err}")
+            db.session.rollback()
+
+
 @app.route('/api/senders', methods=['GET'])
 def get_senders():
     """Get all sender accounts"""
@@ -2398,11 +2580,132 @@ def delete_sender(sender_id):
     sender = SenderAccount.query.get(sender_id)
     if not sender:
         return jsonify({'error': 'Sender not found'}), 404
+    from services.gmail_sender import drop_gmail_client
+    drop_gmail_client(sender.id)
     db.session.delete(sender)
     db.session.commit()
     return jsonify({'success': True})
 
 
+@app.route('/api/senders/<int:sender_id>/send-batch', methods=['POST'])
+def send_batch(sender_id):
+    """
+    Send a template to many leads from one Gmail sender
+    Uses stored per-lead AI variants for the campaign step when available,
+    and Gmail batch requests paced to the account's sending limits. The send
+    runs as a background job; poll /api/senders/send-jobs/<job_id> for progress
+    """
+    from models import LeadPersonalizedEmail
+    from services.gmail_sender import GmailAuthError, start_send_job
+
+    data = request.json or {}
+    template_subject = data.get('subject', '')
+    template_body = data.get('body', '')
+    leads = [l for l in data.get('leads', []) if l.get('email')]
+    campaign_id = data.get('campaign_id')
+    step_number = int(data.get('step_number', 1))
+
+    sender = SenderAccount.query.get(sender_id)
+    if not sender:
+        return jsonify({'success': False, 'error': 'Sender account not found'}), 404
+    if sender.provider != 'gmail' or sender.status != 'connected':
+        return jsonify({'success': False, 'error': 'Sender account is not a connected Gmail account'}), 400
+    if not template_subject or not template_body:
+        return jsonify({'success': False, 'error': 'Template subject and body are required'}), 400
+    if not leads:
+        return jsonify({'success': False, 'error': 'At least one lead with an email is required'}), 400
+
+    variants = {}
+    if campaign_id:
+        variants = {
+            v.lead_email: v for v in LeadPersonalizedEmail.query.filter_by(
+                campaign_id=campaign_id, step_number=step_number
+            ).filter(LeadPersonalizedEmail.lead_email.in_([l['email'] for l in leads])).all()
+        }
+
+    sender_name = sender.label or sender.email.split('@')[0].title()
+    messages = []
+    unknown = set()
+    for lead in leads:
+        variant = variants.get(lead['email'])
+        subject = variant.subject if variant else template_subject
+        body = variant.body if variant else template_body
+        compiled = get_compiled_template(subject, body, None if variant else data.get('template_id'))
+        rendered = compiled.render({
+            'FirstName': (lead.get('name') or '').split(' ')[0] or None,
+            'CompanyName': lead.get('company'),
+            'Title': lead.get('title'),
+            'Industry': lead.get('industry'),
+            'Email': lead['email'],
+            'SenderName': sender_name
+        })
+        unknown.update(rendered['unknown_variables'])
+        messages.append({'id': lead['email'], 'to': lead['email'],
+                         'subject': rendered['subject'], 'html': rendered['html']})
+
+    try:
+        # Fail fast on a revoked token instead of queueing a job that cannot send
+        client = get_sender_gmail_client(sender)
+    except GmailAuthError as auth_error:
+        sender.status = 'expired'
+        db.session.commit()
+        return jsonify({'success': False, 'error': f'{auth_error}. Please reconnect.'}), 401
+    finally:
+        save_sender_tokens(sender)
+
+    job_id = start_send_job(sender.email, len(messages),
+                            lambda job: run_send_batch_job(job, sender_id, messages, campaign_id, step_number))
+
+    return jsonify({
+        'success': True,
+        'job_id': job_id,
+        'queued': len(messages),
+        'remaining_today': client.remaining_today(),
+        'unknown_variables': sorted(unknown)
+    }), 202
+
+
+def run_send_batch_job(job_id, sender_id, messages, campaign_id, step_number):
+    """Background Gmail batch send (started by send_batch); every outcome is in the send log"""
+    from services.gmail_sender import GmailAuthError
+
+    with app.app_context():
+        sender = SenderAccount.query.get(sender_id)
+        if not sender:
+            raise RuntimeError(f'Sender account {sender_id} not found')
+        try:
+            results = get_sender_gmail_client(sender).send_batch(messages, job_id=job_id)
+        except GmailAuthError:
+            sender.status = 'expired'
+            db.session.commit()
+            raise
+        finally:
+            save_sender_tokens(sender)
+
+        if any(r.get('reconnect') for r in results):
+            sender.status = 'expired'
+        sent = sum(1 for r in results if r['success'])
+        log = ActivityLog(
+            campaign_id=campaign_id,
+            action='batch_send',
+            details=f"Sent {sent}/{len(results)} emails from {sender.email} (step {step_number}, job {job_id})",
+            status='success' if sent == len(results) else 'warning'
+        )
+        db.session.add(log)
+        db.session.commit()
+
+
+@app.route('/api/senders/send-jobs/<job_id>', methods=['GET'])
+def get_send_job(job_id):
+    """Progress and per-message outcomes of a batch send job"""
+    from services.gmail_sender import get_send_log
+
+    job = get_send_log().get_job(job_id, include_results=request.args.get('results', '1') != '0')
+    if job is None:
+        return jsonify({'success': False, 'error': 'Send job not found'}), 404
+    return jsonify({'success': True, 'job': job})
+
+
 @app.route('/api/senders/<int:sender_id>/default', methods=['PUT'])
 def set_default_sender(sender_id):
     """Set a sender as default"""
@@ -2577,6 +2880,7 @@ if __name__ == '__main__':
     # Initialize Apollo API key from environment (SECURITY)
     with app.app_context():
         init_apollo_api_key()
+    start_scheduler()
 
     # Load AI model in background
     print("Loading AI model...")
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+AI Agent Batching Benchmark
+Runs ContactFilterAgent against a local stub Ollama server and compares
+one-prompt-per-contact with micro-batched prompts: LLM calls, fallbacks and
+wall time per 100 contacts, plus agreement with the per-contact verdicts.
+A second pass runs repeating titles through the decision cache, cold then
+warm.
+
+The stub serves one request at a time (like Ollama on a CPU-only box) and
+charges a fixed prompt-processing overhead per call plus a generation cost
+per item. It can drop or garble items in batched responses to exercise the
+per-item fallback.
+
+Usage:
+    python benchmarks/bench_ai_agent_batching.py
+    python benchmarks/bench_ai_agent_batching.py --contacts 200 --batch-sizes 1 10 20 --drop-rate 0.1
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aiohttp import web
+
+from services.agent_decision_cache import AgentDecisionCache
+from services.ai_agent_system import OllamaClient, ContactFilterAgent
+
+TITLES = ['COO', 'VP Operations', 'Plant Manager', 'HR Business Partner', 'Talent Acquisition Lead',
+          'Recruiter', 'Software Engineer', 'Sales Associate', 'Director of Manufacturing',
+          'Chief People Officer', 'Marketing Intern', 'Operations Analyst']
+RELEVANT = re.compile(r'COO|VP|Plant|Director|Chief|HR|Talent|Recruit', re.I)
+ITEM_RE = re.compile(r'Item (\d+):\n- Title: ([^\n]*)')
+SINGLE_RE = re.compile(r'- Title: ([^\n]*)')
+
+
+class StubOllama:
+    """Single-worker /api/generate stub answering ContactFilterAgent prompts"""
+
+    def __init__(self, overhead: float, per_item: float, drop_rate: float, garble_rate: float, seed: int = 3):
+        self.overhead = overhead
+        self.per_item = per_item
+        self.drop_rate = drop_rate
+        self.garble_rate = garble_rate
+        self.rng = random.Random(seed)
+        self.lock = asyncio.Lock()
+        self.requests = 0
+
+    @staticmethod
+    def verdict(title: str) -> dict:
+        relevant = bool(RELEVANT.search(title))
+        return {'relevant': relevant, 'confidence': 0.9 if relevant else 0.8,
+                'reason': 'stub', 'category': 'decision_maker' if relevant else 'irrelevant'}
+
+    async def handle(self, request):
+        body = await request.json()
+        prompt = body['prompt']
+        items = ITEM_RE.findall(prompt)
+
+        async with self.lock:
+            self.requests += 1
+            await asyncio.sleep(self.overhead + self.per_item * max(1, len(items)))
+
+        if not items:
+            title = SINGLE_RE.search(prompt).group(1)
+            return web.json_response({'response': json.dumps(self.verdict(title))})
+
+        objects = []
+        for index, title in items:
+            if self.rng.random() < self.drop_rate:
+                continue
+            verdict = dict(self.verdict(title), index=int(index))
+            if self.rng.random() < self.garble_rate:
+                verdict['relevant'] = 'maybe'
+            objects.append(verdict)
+        return web.json_response({'response': json.dumps(objects)})
+
+
+def make_contacts(count: int, seed: int = 11, distinct: bool = True) -> list:
+    """Contacts with distinct titles (measures batching) or repeating ones (measures reuse)"""
+    rng = random.Random(seed)
+    return [{'title': f"{rng.choice(TITLES)}{f' - Site {i}' if distinct else ''}",
+             'organization_name': f'Company {i}', 'seniority': 'senior'}
+            for i in range(count)]
+
+
+async def run_case(base_url: str, stub: StubOllama, contacts: list, batch_size: int, max_concurrent: int,
+                   cache: AgentDecisionCache = None):
+    client = OllamaClient(base_url=base_url, max_concurrent=max_concurrent)
+    agent = ContactFilterAgent(client, batch_size)
+    if cache:
+        agent.use_cache(cache, 'bench')
+    stub.requests = 0
+
+    start = time.perf_counter()
+    passed = await agent.filter_contacts_batch([dict(c) for c in contacts])
+    elapsed = time.perf_counter() - start
+    await client.close()
+
+    return {
+        'elapsed': elapsed,
+        'requests': stub.requests,
+        'stats': agent.get_stats(),
+        'passed': {c['organization_name'] for c in passed},
+    }
+
+
+async def main_async(args):
+    stub = StubOllama(args.overhead, args.per_item, args.drop_rate, args.garble_rate)
+    app = web.Application()
+    app.router.add_post('/api/generate', stub.handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', args.port)
+    await site.start()
+    base_url = f'http://127.0.0.1:{args.port}'
+
+    contacts = make_contacts(args.contacts)
+    per_100 = 100 / len(contacts)
+
+    print('=' * 60)
+    print(f"AI AGENT BATCHING BENCHMARK - {len(contacts)} contacts")
+    print(f"Stub: {args.overhead * 1000:.0f}ms/call + {args.per_item * 1000:.0f}ms/item, "
+          f"drop {args.drop_rate:.0%}, garble {args.garble_rate:.0%}")
+    print('=' * 60)
+    print(f"{'batch':>6} {'calls/100':>10} {'fallbacks':>10} {'wall/100':>10} {'speedup':>8}  verdicts")
+
+    baseline = None
+    try:
+        for batch_size in args.batch_sizes:
+            with contextlib.redirect_stdout(io.StringIO()):
+                result = await run_case(base_url, stub, contacts, batch_size, args.max_concurrent)
+            if baseline is None:
+                baseline = result
+            match = 'OK' if result['passed'] == baseline['passed'] else 'MISMATCH'
+            print(f"{batch_size:>6} {result['requests'] * per_100:>10.1f} {result['stats']['fallbacks']:>10} "
+                  f"{result['elapsed'] * per_100:>9.2f}s {baseline['elapsed'] / result['elapsed']:>7.1f}x  {match}")
+
+        # Decision cache: realistic (repeating) titles, cold then warm session
+        contacts = make_contacts(args.contacts, seed=12, distinct=False)
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = AgentDecisionCache(os.path.join(tmp, 'agent_decisions.db'))
+            print(f"\nDecision cache - {len(contacts)} contacts, {len(TITLES)} distinct titles, "
+                  f"batch {args.batch_sizes[-1]}")
+            print(f"{'run':>6} {'calls/100':>10} {'wall/100':>10} {'hit rate':>9}")
+            for run in ('cold', 'warm'):
+                with contextlib.redirect_stdout(io.StringIO()):
+                    result = await run_case(base_url, stub, contacts, args.batch_sizes[-1],
+                                            args.max_concurrent, cache)
+                stats = result['stats']
+                print(f"{run:>6} {result['requests'] * per_100:>10.1f} {result['elapsed'] * per_100:>9.2f}s "
+                      f"{stats['cache_hits'] / stats['items']:>8.0%}")
+    finally:
+        await runner.cleanup()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark micro-batched AI agent prompts')
+    parser.add_argument('--contacts', type=int, default=100)
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 5, 10, 20])
+    parser.add_argument('--overhead', type=float, default=0.15, help='Stub prompt-processing seconds per call')
+    parser.add_argument('--per-item', type=float, default=0.01, help='Stub generation seconds per item')
+    parser.add_argument('--drop-rate', type=float, default=0.05, help='Share of batched items the stub omits')
+    parser.add_argument('--garble-rate', type=float, default=0.02, help='Share of batched items with invalid fields')
+    parser.add_argument('--max-concurrent', type=int, default=10)
+    parser.add_argument('--port', type=int, default=11535)
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Email Template Rendering Benchmark
+Renders a multi-step sequence (subject, body and HTML body) for many leads,
+comparing replace_email_variables + text_to_html_email with the compiled
+renderer, and checks both produce identical output.
+
+Usage:
+    python benchmarks/bench_email_templates.py
+    python benchmarks/bench_email_templates.py --leads 10000 --steps 4
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.email_utils import replace_email_variables, text_to_html_email, get_compiled_template
+
+STEP_TEMPLATES = [
+    ('Quick question about {{CompanyName}} hiring',
+     "Hi {{FirstName}},\n\nI noticed {{CompanyName}} is growing its {{Industry}} team and hiring for "
+     "several roles.\nWe place pre-vetted engineers in 2-3 weeks.\n\nWorth a quick chat, {{FirstName}}?\n\n"
+     "Best,\n{{SenderName}}"),
+    ('Re: {{CompanyName}} hiring',
+     "Hi {{FirstName}},\n\nFollowing up - as {{Title}} you probably feel the hiring backlog first.\n\n"
+     "We recently helped a {{Industry}} company close 6 roles in a month.\n\n{{SenderName}}"),
+    ('Candidates for {{CompanyName}}',
+     "{{FirstName}},\n\nI have three candidates who match what {{CompanyName}} is looking for.\n"
+     "Happy to send profiles over to {{Email}}.\n\nThanks,\n{{SenderName}}\n{SenderTitle}"),
+    ('Closing the loop',
+     "Hi {{FirstName}},\n\nI will stop reaching out after this one.\n\nIf hiring at {{CompanyName}} picks up, "
+     "just reply and I'll send a shortlist.\n\nAll the best,\n{{SenderName}}"),
+]
+
+FIRST_NAMES = ['Ana', 'Ben', "O'Neil", 'Priya', 'Chen', 'Zoë', 'Marcus', 'Fatima']
+COMPANIES = ['Acme Corp', 'Globex & Sons', 'Initech', 'Umbrella <Labs>', 'Stark Industries', 'Wayne Enterprises']
+TITLES = ['VP Operations', 'HR Director', 'Head of Talent', 'COO', 'Plant Manager']
+INDUSTRIES = ['Manufacturing', 'Healthcare', 'Technology', 'Logistics']
+
+
+def make_leads(count, seed=7):
+    rng = random.Random(seed)
+    return [{
+        'FirstName': rng.choice(FIRST_NAMES),
+        'CompanyName': f"{rng.choice(COMPANIES)} {i}",
+        'Title': rng.choice(TITLES),
+        'Industry': rng.choice(INDUSTRIES),
+        'Email': f"lead{i}@example.com",
+        'SenderName': 'Jordan',
+        'SenderTitle': 'Account Manager',
+    } for i in range(count)]
+
+
+def render_current(steps, leads):
+    out = []
+    for subject, body in steps:
+        for variables in leads:
+            rendered_body = replace_email_variables(body, variables)
+            out.append((replace_email_variables(subject, variables), rendered_body,
+                        text_to_html_email(rendered_body)))
+    return out
+
+
+def render_compiled(steps, leads):
+    out = []
+    for step, (subject, body) in enumerate(steps):
+        compiled = get_compiled_template(subject, body, template_id=step)
+        for variables in leads:
+            rendered = compiled.render(variables)
+            out.append((rendered['subject'], rendered['body'], rendered['html']))
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark compiled email template rendering')
+    parser.add_argument('--leads', type=int, default=10000)
+    parser.add_argument('--steps', type=int, default=4, help=f'Sequence steps (max {len(STEP_TEMPLATES)})')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    steps = STEP_TEMPLATES[:args.steps]
+    leads = make_leads(args.leads)
+    emails = len(steps) * len(leads)
+
+    print('=' * 60)
+    print(f"EMAIL TEMPLATE BENCHMARK - {len(steps)} steps x {len(leads)} leads = {emails} emails")
+    print('=' * 60)
+
+    results = {}
+    for name, render in (('current', render_current), ('compiled', render_compiled)):
+        best = None
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            output = render(steps, leads)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        results[name] = (best, output)
+        print(f"{name:>9}: {best:.3f}s  ({emails / best:,.0f} emails/s)")
+
+    speedup = results['current'][0] / results['compiled'][0]
+    identical = results['current'][1] == results['compiled'][1]
+    print(f"  speedup: {speedup:.1f}x")
+    print(f"   output: {'identical' if identical else 'MISMATCH'}")
+
+    unknown = get_compiled_template(*steps[-1], template_id=len(steps) - 1).unknown_variables({'FirstName': 'x'})
+    print(f"  unknown variables reported for a partial lead: {', '.join(unknown)}")
+    if not identical:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
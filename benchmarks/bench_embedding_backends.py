@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Embedding Backend Throughput Benchmark
+Encodes the CSE fixture texts with each embedding backend (torch fp32,
+int8 ONNX) and reports load time and texts/s at several batch sizes. Batch
+size 1 matches VectorSearchService.encode_text / RAG per-item scoring;
+larger batches match encode_batch. A final pass runs the same texts through
+the embedding store (services/embedding_store.py) in a temporary directory:
+cold (encode + append) and warm (memory-mapped lookups only).
+
+The ONNX model must have been exported first
+(benchmarks/check_embedding_parity.py --export).
+
+Usage:
+    python benchmarks/bench_embedding_backends.py
+    python benchmarks/bench_embedding_backends.py --backends onnx --batch-sizes 1 16 64 --texts 2000
+    python benchmarks/bench_embedding_backends.py --threads 4
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# The store pass must not touch instance/ (set before the services are imported)
+STORE_DIR = tempfile.mkdtemp(prefix='embedding-store-')
+os.environ['LOCAL_STORE_DIR'] = STORE_DIR
+
+from check_embedding_parity import DEFAULT_CORPUS, load_texts
+from services.embedding_backend import DEFAULT_MODEL, OnnxEmbeddingBackend, TorchEmbeddingBackend
+from services.embedding_store import CachedEmbeddingBackend, EmbeddingStore
+
+
+def build(backend: str, model: str, threads: int):
+    if backend == 'onnx':
+        return OnnxEmbeddingBackend(model, num_threads=threads or None)
+    return TorchEmbeddingBackend(model, num_threads=threads or None)
+
+
+def main():
+    try:
+        parse_and_run()
+    finally:
+        shutil.rmtree(STORE_DIR, ignore_errors=True)
+
+
+def parse_and_run():
+    parser = argparse.ArgumentParser(description='Compare embedding backend throughput on CPU')
+    parser.add_argument('--model', default=DEFAULT_MODEL)
+    parser.add_argument('--backends', nargs='+', choices=('torch', 'onnx'), default=['torch', 'onnx'])
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 32, 128])
+    parser.add_argument('--texts', type=int, default=1000, help='Fixture texts per run')
+    parser.add_argument('--threads', type=int, default=0, help='Intra-op threads (0 = per-worker default)')
+    parser.add_argument('--corpus', default=DEFAULT_CORPUS)
+    args = parser.parse_args()
+
+    texts = load_texts(args.corpus, args.texts)
+
+    print('=' * 60)
+    print(f"EMBEDDING BACKENDS - {args.model}, {len(texts)} texts, threads {args.threads or 'per-worker default'}")
+    print('=' * 60)
+
+    run(args, texts)
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def run(args, texts):
+    results = {}
+    store_rates = {}
+    for name in args.backends:
+        start = time.perf_counter()
+        backend = build(name, args.model, args.threads)
+        load_seconds = time.perf_counter() - start
+        backend.encode(texts[:8])  # warm-up
+
+        print(f"\n{name} (loaded in {load_seconds:.1f}s):")
+        print(f"  {'batch':>6} {'texts/s':>9} {'ms/text':>8}")
+        for batch_size in args.batch_sizes:
+            start = time.perf_counter()
+            backend.encode(texts, batch_size=batch_size)
+            elapsed = time.perf_counter() - start
+            results[(name, batch_size)] = len(texts) / elapsed
+            print(f"  {batch_size:>6} {len(texts) / elapsed:>9.1f} {elapsed / len(texts) * 1000:>8.2f}")
+
+        cached = CachedEmbeddingBackend(backend, EmbeddingStore(f'bench-{name}',
+                                                                backend.get_sentence_embedding_dimension()))
+        batch_size = max(args.batch_sizes)
+        cold = timed(lambda: cached.encode(texts, batch_size=batch_size))
+        warm = timed(lambda: cached.encode(texts, batch_size=batch_size))
+        single = timed(lambda: [cached.encode(text) for text in texts])
+        store_rates[name] = (len(texts) / cold, len(texts) / warm, len(texts) / single)
+
+    print(f"\nEmbedding store (texts/s): {'cold':>9} {'warm':>11} {'warm x1':>10}")
+    for name, (cold, warm, single) in store_rates.items():
+        print(f"  {name:<24} {cold:>9.1f} {warm:>11.1f} {single:>10.1f}")
+
+    if 'torch' in args.backends and 'onnx' in args.backends:
+        print("\nonnx / torch speedup: " + ', '.join(
+            f"batch {b} {results[('onnx', b)] / results[('torch', b)]:.2f}x" for b in args.batch_sizes))
+
+
+if __name__ == '__main__':
+    main()
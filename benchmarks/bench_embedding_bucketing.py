@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Length-Bucketed Encoding Benchmark
+Encodes realistic title / snippet mixes from the CSE fixture corpus and
+compares the old path (texts in caller order, fixed batches of 32) with
+length-bucketed batches at several padded-token budgets. Reports texts/s,
+padding efficiency (real tokens / padded tokens) and speedup per mix. For
+torch it also times a plain SentenceTransformer.encode call, which sorts by
+character length inside each call but always uses batches of 32.
+
+With --workers N it also starts N processes encoding at once, like N
+gunicorn workers on one box, and compares the per-worker thread budget
+(cores // N each) against every worker using all cores.
+
+Usage:
+    python benchmarks/bench_embedding_bucketing.py
+    python benchmarks/bench_embedding_bucketing.py --backend onnx --budgets 2048 4096 8192 --max-batch 64 128
+    python benchmarks/bench_embedding_bucketing.py --workers 4 --texts 2000
+"""
+
+import argparse
+import gzip
+import json
+import multiprocessing
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from services.embedding_backend import (DEFAULT_MODEL, OnnxEmbeddingBackend, TorchEmbeddingBackend,
+                                        padding_efficiency, plan_batches)
+
+DEFAULT_CORPUS = os.path.join(ROOT, 'benchmarks', 'fixtures', 'cse_job_items.jsonl.gz')
+OLD_BATCH = 32  # sentence-transformers' default batch size
+
+# Share of long texts (title + snippet) in each mix; the rest are bare job titles
+MIXES = {
+    'titles': 0.0,
+    'mostly-titles': 0.2,
+    'half-half': 0.5,
+    'snippets': 1.0,
+}
+
+
+def load_mixes(path: str, count: int, seed: int = 9) -> dict:
+    """Texts per mix, shuffled the way callers hand them over (no length order)"""
+    titles, snippets = [], []
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        for line in f:
+            item = json.loads(line)['item']
+            titles.append(item.get('title', ''))
+            snippets.append(f"{item.get('title', '')} {item.get('snippet', '')}")
+    rng = random.Random(seed)
+    mixes = {}
+    for name, long_share in MIXES.items():
+        texts = [rng.choice(snippets) if rng.random() < long_share else rng.choice(titles) for _ in range(count)]
+        mixes[name] = texts
+    return mixes
+
+
+def build(backend: str, model: str, threads: int = None):
+    if backend == 'onnx':
+        return OnnxEmbeddingBackend(model, num_threads=threads)
+    return TorchEmbeddingBackend(model, num_threads=threads)
+
+
+def encode_seconds(backend, texts, max_batch: int, budget: int, bucketing: bool) -> float:
+    """Wall time to encode texts with one batch plan (tokenizing for the plan included)"""
+    start = time.perf_counter()
+    if bucketing:
+        batches = plan_batches(backend.token_lengths(texts), max_batch, budget)
+    else:
+        batches = plan_batches([0] * len(texts), OLD_BATCH, sort=False)
+    for batch in batches:
+        backend._encode([texts[i] for i in batch], len(batch), bucketing=False)
+    return time.perf_counter() - start
+
+
+def run_single(args, mixes):
+    backend = build(args.backend, args.model, args.threads or None)
+    backend.encode(mixes['titles'][:8])  # warm-up
+
+    for name, texts in mixes.items():
+        lengths = backend.token_lengths(texts)
+        old = encode_seconds(backend, texts, OLD_BATCH, 0, bucketing=False)
+        old_eff = padding_efficiency(lengths, plan_batches(lengths, OLD_BATCH, sort=False))
+        print(f"\n{name} ({len(texts)} texts, mean {lengths.mean():.0f} / max {lengths.max()} tokens):")
+        print(f"  {'plan':<22} {'texts/s':>9} {'padding eff':>12} {'speedup':>8}")
+        print(f"  {'caller order x32':<22} {len(texts) / old:>9.1f} {old_eff:>12.2f} {'1.00x':>8}")
+        if args.backend == 'torch':
+            start = time.perf_counter()
+            backend.model.encode(texts, show_progress_bar=False)
+            seconds = time.perf_counter() - start
+            print(f"  {'sentence-transformers':<22} {len(texts) / seconds:>9.1f} {'-':>12} {old / seconds:>7.2f}x")
+        for max_batch in args.max_batch:
+            for budget in args.budgets:
+                seconds = encode_seconds(backend, texts, max_batch, budget, bucketing=True)
+                eff = padding_efficiency(lengths, plan_batches(lengths, max_batch, budget))
+                label = f"bucketed {max_batch}/{budget}"
+                print(f"  {label:<22} {len(texts) / seconds:>9.1f} {eff:>12.2f} {old / seconds:>7.2f}x")
+
+
+def worker(backend_name, model, threads, texts, max_batch, budget, barrier, results):
+    backend = build(backend_name, model, threads)
+    backend.encode(texts[:8])
+    barrier.wait()
+    start = time.perf_counter()
+    encode_seconds(backend, texts, max_batch, budget, bucketing=True)
+    results.put((start, time.perf_counter()))
+
+
+def run_workers(args, texts):
+    """N concurrent processes: per-worker thread budget vs every worker using all cores"""
+    cores = os.cpu_count() or 1
+    ctx = multiprocessing.get_context('spawn')
+    print(f"\n{args.workers} concurrent workers on {cores} cores (half-half mix, bucketed "
+          f"{args.max_batch[0]}/{args.budgets[0]}):")
+    print(f"  {'threads/worker':<16} {'texts/s total':>14}")
+    for threads in sorted({max(1, cores // args.workers), cores}):
+        barrier, results = ctx.Barrier(args.workers), ctx.Queue()
+        procs = [ctx.Process(target=worker, args=(args.backend, args.model, threads, texts, args.max_batch[0],
+                                                  args.budgets[0], barrier, results))
+                 for _ in range(args.workers)]
+        for p in procs:
+            p.start()
+        spans = [results.get() for _ in procs]
+        for p in procs:
+            p.join()
+        wall = max(end for _, end in spans) - min(start for start, _ in spans)
+        label = f"{threads}" + (' (per-worker)' if threads == max(1, cores // args.workers) else ' (all cores)')
+        print(f"  {label:<16} {len(texts) * args.workers / wall:>14.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark length-bucketed embedding batches')
+    parser.add_argument('--backend', choices=('torch', 'onnx'), default='torch')
+    parser.add_argument('--model', default=DEFAULT_MODEL)
+    parser.add_argument('--texts', type=int, default=1000, help='Texts per mix')
+    parser.add_argument('--max-batch', type=int, nargs='+', default=[64, 128])
+    parser.add_argument('--budgets', type=int, nargs='+', default=[2048, 4096, 8192],
+                        help='Padded tokens per batch (EMBEDDING_BATCH_TOKENS)')
+    parser.add_argument('--threads', type=int, default=0, help='Intra-op threads (0 = per-worker default)')
+    parser.add_argument('--workers', type=int, default=1, help='Also run N concurrent worker processes')
+    parser.add_argument('--corpus', default=DEFAULT_CORPUS)
+    args = parser.parse_args()
+
+    mixes = load_mixes(args.corpus, args.texts)
+
+    print('=' * 60)
+    print(f"LENGTH-BUCKETED ENCODING - {args.model} ({args.backend}), threads {args.threads or 'per-worker'}")
+    print('=' * 60)
+
+    run_single(args, mixes)
+    if args.workers > 1:
+        run_workers(args, mixes['half-half'])
+
+
+if __name__ == '__main__':
+    main()
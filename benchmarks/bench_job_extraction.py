@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Job Result Extraction Benchmark
+Measures throughput and accuracy of company / job title extraction over a
+fixture corpus of CSE job results, for both GoogleJobsSearchService (job
+board search) and JobParserService (pipeline search).
+
+Usage:
+    python benchmarks/bench_job_extraction.py                 # run on the fixture corpus
+    python benchmarks/bench_job_extraction.py --repeat 20     # longer timing run
+    python benchmarks/bench_job_extraction.py --regenerate    # rebuild the fixture corpus
+    python benchmarks/bench_job_extraction.py --export-cache out.jsonl.gz
+                                                              # dump cached CSE items (unlabelled)
+"""
+
+import argparse
+import contextlib
+import gzip
+import io
+import json
+import os
+import random
+import re
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+DEFAULT_CORPUS = os.path.join(ROOT, 'benchmarks', 'fixtures', 'cse_job_items.jsonl.gz')
+
+LEGAL_WORDS = {'inc', 'ltd', 'pvt', 'llc', 'corp', 'co', 'limited', 'private', 'corporation'}
+
+
+# ============================================================
+# Fixture corpus
+# ============================================================
+
+COMPANIES = [
+    'Capgemini', 'Infosys Limited', 'Wipro Technologies', 'Tata Consultancy Services', 'Accenture',
+    'Deloitte', 'Google', 'Microsoft', 'Amazon Web Services', 'Stripe', 'Red Hat', 'Salesforce',
+    'ServiceNow', 'Freshworks Inc.', 'Zoho Corporation', 'Razorpay', 'HCL Tech', 'Mphasis',
+    'JPMorgan Chase & Co.', 'Goldman Sachs', 'Adobe', 'Atlassian', 'Shopify', 'Datadog',
+    'Snowflake Inc.', 'Cognizant', 'Tech Mahindra', 'Persistent Systems', 'LTIMindtree',
+    'Zensar Technologies', 'Nagarro', 'EPAM Systems', 'Thoughtworks', 'Globant', 'Publicis Sapient',
+    'Fractal Analytics', 'Mu Sigma', 'Quantiphi', 'Tiger Analytics', 'Synechron', 'Virtusa',
+    'Hexaware Technologies', 'Coforge', 'Birlasoft', 'Sonata Software', 'Mindtree Solutions',
+    'Acme Labs', 'Bright Horizons', 'Blue Yonder', 'Zeta Global', 'Kforce Inc.', 'Insight Global',
+    'Robert Half', 'Teksystems', 'Apex Systems', 'Randstad', 'Northwind Consulting', 'Contoso Software',
+]
+
+JOB_TITLES = [
+    'Senior Data Engineer', 'Java Developer', 'Product Manager', 'DevOps Engineer', 'Python Developer',
+    'Machine Learning Engineer', 'QA Analyst', 'Full Stack Developer', 'Cloud Architect',
+    'Salesforce Developer', 'Business Analyst', 'Site Reliability Engineer', 'Data Scientist',
+    'Frontend Engineer', 'Engineering Manager', 'Technical Recruiter', 'Scrum Master',
+    'Network Engineer', 'Security Analyst', 'iOS Developer',
+]
+
+LOCATIONS = [
+    ('Austin', 'TX'), ('Seattle', 'WA'), ('Boston', 'MA'), ('Chicago', 'IL'), ('Denver', 'CO'),
+    ('Atlanta', 'GA'), ('Dallas', 'TX'), ('Phoenix', 'AZ'), ('Bangalore', ''), ('Hyderabad', ''),
+    ('Pune', ''), ('Chennai', ''), ('London', ''), ('Remote', ''),
+]
+
+BOARD_LINKS = {
+    'LinkedIn': 'www.linkedin.com',
+    'Indeed': 'www.indeed.com',
+    'Glassdoor': 'www.glassdoor.com',
+    'Naukri': 'www.naukri.com',
+}
+
+
+def _slug(text: str) -> str:
+    return re.sub(r'[^a-z0-9]+', '-', text.lower()).strip('-')
+
+
+def _place(city: str, state: str) -> str:
+    return f'{city}, {state}' if state else city
+
+
+def _make_item(rng: random.Random) -> dict:
+    """One labelled CSE item in the shape each job board really returns"""
+    board = rng.choice(list(BOARD_LINKS))
+    company = rng.choice(COMPANIES)
+    job = rng.choice(JOB_TITLES)
+    city, state = rng.choice(LOCATIONS)
+    place = _place(city, state)
+    job_id = rng.randint(3_000_000_000, 3_999_999_999)
+    days = rng.randint(1, 30)
+    style = rng.randint(0, 2)
+
+    if board == 'LinkedIn':
+        if style == 0:
+            title = f'{company} hiring {job} in {place} | LinkedIn'
+            link = f'https://www.linkedin.com/jobs/view/{_slug(job)}-at-{_slug(company)}-{job_id}'
+        elif style == 1:
+            title = f'{job} - {company} - {place} | LinkedIn'
+            link = f'https://www.linkedin.com/jobs/view/{job_id}'
+        else:
+            title = f'{job} at {company} | LinkedIn'
+            link = f'https://www.linkedin.com/jobs/view/{_slug(job)}-at-{_slug(company)}-{job_id}'
+        snippet = f'Posted {days} days ago. {company} is looking for a {job} to join our team in {place}.'
+    elif board == 'Indeed':
+        if style == 0:
+            title = f'{job} - {company} - {place} - Indeed.com'
+        elif style == 1:
+            title = f'{job} - {company}, {place}'
+        else:
+            title = f'{job} - {company} - Indeed'
+        link = f'https://www.indeed.com/viewjob?jk={job_id:x}'
+        snippet = f'{company}. {place}. Full-time. Apply now - posted {days} days ago.'
+    elif board == 'Glassdoor':
+        if style == 0:
+            title = f'{company} hiring {job} Job in {place} | Glassdoor'
+        elif style == 1:
+            title = f'{job} at {company} | Glassdoor'
+        else:
+            title = f'{job} Job in {place} at {company} | Glassdoor'
+        link = f'https://www.glassdoor.com/job-listing/{_slug(job)}-{_slug(company)}-JV_{job_id}.htm'
+        snippet = f'{company} {job} job in {place}. {days}d. Easy Apply.'
+    else:
+        if style == 0:
+            title = f'{job} Job in {company} at {city} - Naukri.com'
+        elif style == 1:
+            title = f'{job} - {company} - {rng.randint(2, 12)} Years - Naukri.com'
+        else:
+            title = f'{job} Jobs in {city} - {company}'
+        link = f'https://www.naukri.com/job-listings-{_slug(job)}-{_slug(company)}-{job_id}'
+        snippet = f'Job description for {job} in {company} in {city}. {rng.randint(2, 12)} years experience.'
+
+    return {
+        'source': board,
+        'item': {'title': title, 'link': link, 'snippet': snippet, 'displayLink': BOARD_LINKS[board]},
+        'expected': {'company': company, 'job_title': job},
+    }
+
+
+def generate_corpus(path: str, count: int = 3000, seed: int = 42):
+    rng = random.Random(seed)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # mtime=0 keeps the fixture byte-identical across regenerations
+    with open(path, 'wb') as raw, gzip.GzipFile(fileobj=raw, mode='wb', mtime=0) as gz:
+        with io.TextIOWrapper(gz, encoding='utf-8') as f:
+            for _ in range(count):
+                f.write(json.dumps(_make_item(rng)) + '\n')
+    print(f"Wrote {count} items to {path}")
+
+
+def export_cache(path: str):
+    """Dump job-board items from the CSE response cache into an (unlabelled) corpus"""
+    from services.google_cse import get_cse_cache
+    import zlib
+
+    conn = get_cse_cache()._conn()
+    rows = conn.execute('SELECT payload FROM cse_responses').fetchall()
+    count = 0
+    with gzip.open(path, 'wt', encoding='utf-8') as f:
+        for (payload,) in rows:
+            for item in json.loads(zlib.decompress(payload).decode('utf-8')):
+                host = item.get('displayLink', '') or item.get('link', '')
+                source = next((name for name, domain in BOARD_LINKS.items()
+                               if domain.replace('www.', '') in host), None)
+                if source:
+                    f.write(json.dumps({'source': source, 'item': item}) + '\n')
+                    count += 1
+    print(f"Exported {count} cached job-board items to {path}")
+
+
+def load_corpus(path: str) -> list:
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+# ============================================================
+# Benchmark
+# ============================================================
+
+def normalize_company(name: str) -> str:
+    words = re.sub(r'[^a-z0-9]+', ' ', (name or '').lower()).split()
+    return ' '.join(w for w in words if w not in LEGAL_WORDS)
+
+
+def normalize_title(title: str) -> str:
+    return ' '.join(re.sub(r'[^a-z0-9]+', ' ', (title or '').lower()).split())
+
+
+def run_profile(name: str, parse, records: list, repeat: int) -> dict:
+    """Time `parse` over the corpus and score it against the labels"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        outputs = [parse(r) for r in records]
+
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for r in records:
+                parse(r)
+        elapsed = time.perf_counter() - start
+
+    labelled = [(r, out) for r, out in zip(records, outputs) if 'expected' in r]
+    extracted = sum(1 for out in outputs if out and out[0])
+    company_ok = sum(1 for r, out in labelled
+                     if out and normalize_company(out[0]) == normalize_company(r['expected']['company']))
+    title_ok = sum(1 for r, out in labelled
+                   if out and normalize_title(out[1]) == normalize_title(r['expected']['job_title']))
+
+    return {
+        'profile': name,
+        'items_per_sec': (len(records) * repeat) / elapsed if elapsed else 0.0,
+        'us_per_item': elapsed / (len(records) * repeat) * 1e6,
+        'coverage': extracted / len(records) if records else 0.0,
+        'company_accuracy': company_ok / len(labelled) if labelled else None,
+        'title_accuracy': title_ok / len(labelled) if labelled else None,
+        'labelled': len(labelled),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark job result extraction')
+    parser.add_argument('--corpus', default=DEFAULT_CORPUS, help='Corpus (.jsonl.gz) to benchmark')
+    parser.add_argument('--repeat', type=int, default=5, help='Timing passes over the corpus')
+    parser.add_argument('--regenerate', action='store_true', help='Rebuild the fixture corpus and exit')
+    parser.add_argument('--export-cache', metavar='PATH', help='Export cached CSE items to PATH and exit')
+    args = parser.parse_args()
+
+    if args.regenerate:
+        generate_corpus(args.corpus)
+        return
+    if args.export_cache:
+        export_cache(args.export_cache)
+        return
+
+    from services.google_jobs_search import GoogleJobsSearchService
+    from services.job_parser import JobParserService
+
+    records = load_corpus(args.corpus)
+    jobs_service = GoogleJobsSearchService()
+    job_parser = JobParserService()
+
+    def parse_job_board(record):
+        parsed = jobs_service._parse_result(record['item'], record['source'])
+        return (parsed['company_name'], parsed['job_title']) if parsed else None
+
+    def parse_pipeline(record):
+        parsed = job_parser.parse_job_data(dict(record['item'], platform=record['source']))
+        if parsed['company_name'] == 'Unknown Company':
+            return None
+        return parsed['company_name'], parsed['job_title']
+
+    print('=' * 60)
+    print(f"JOB EXTRACTION BENCHMARK - {len(records)} items x {args.repeat} passes")
+    print(f"Corpus: {os.path.relpath(args.corpus, ROOT)}")
+    print('=' * 60)
+
+    for name, parse in (('job_board (GoogleJobsSearchService)', parse_job_board),
+                        ('pipeline (JobParserService)', parse_pipeline)):
+        result = run_profile(name, parse, records, args.repeat)
+        print(f"\n{result['profile']}")
+        print(f"  Throughput:       {result['items_per_sec']:,.0f} items/s ({result['us_per_item']:.1f} us/item)")
+        print(f"  Coverage:         {result['coverage']:.1%} of items yielded a company")
+        if result['labelled']:
+            print(f"  Company accuracy: {result['company_accuracy']:.1%} ({result['labelled']} labelled)")
+            print(f"  Title accuracy:   {result['title_accuracy']:.1%}")
+        else:
+            print("  Accuracy:         n/a (corpus has no labels)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Lead Pipeline Benchmark (offline)
+Runs LeadEngineService.generate_leads and JobOpeningSearchService (search +
+contact enrichment) end to end against the local vendor stubs in
+stub_servers.py, so no credits are spent. Reports leads/min, vendor calls per
+lead and per-stage call latency (p50 / p95) from vendor telemetry.
+
+The CSE cache and telemetry store live in a temporary directory, so every run
+starts cold.
+
+Usage:
+    python benchmarks/bench_lead_engine.py
+    python benchmarks/bench_lead_engine.py --leads 50 --time-scale 0.2
+    python benchmarks/bench_lead_engine.py --rate-limit apollo=0.05 --error-rate 0.01
+    python benchmarks/bench_lead_engine.py --mode replay --cassette benchmarks/fixtures/vendor_cassette.jsonl.gz
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from stub_servers import add_stub_arguments, stub_from_args, endpoint_group
+
+ICP_PROFILE = {
+    'industries': ['Information Technology', 'Computer Software', 'Staffing & Recruiting'],
+    'sizeMin': 50,
+    'sizeMax': 10000,
+    't1Titles': ['Head of Talent Acquisition', 'VP Engineering'],
+    't2Titles': ['HR Manager', 'Engineering Manager'],
+    't3Titles': ['Senior Recruiter'],
+}
+
+
+@contextlib.contextmanager
+def quiet():
+    """Silence the services' progress logging (and tracebacks from injected faults)"""
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        yield
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))]
+
+
+def calls_between(telemetry, start: float, end: float):
+    """Vendor calls this process made in [start, end] (oldest first)"""
+    return [c for c in reversed(telemetry.recent_calls(limit=len(telemetry.recent)))
+            if start <= c['ts'] <= end]
+
+
+def report(title: str, leads: int, elapsed: float, calls):
+    per_lead = max(leads, 1)
+    print(f"\n{title}: {leads} leads in {elapsed:.1f}s ({leads / elapsed * 60:.1f} leads/min)")
+
+    by_group = defaultdict(int)
+    for call in calls:
+        by_group[endpoint_group(call['endpoint']) or call['vendor']] += 1
+    print("  calls/lead: " + ', '.join(f"{group} {count / per_lead:.2f}" for group, count in sorted(by_group.items()))
+          + f"  (total {len(calls) / per_lead:.2f})")
+
+    stages = defaultdict(list)
+    for call in calls:
+        stages[call['stage'] or 'unattributed'].append(call)
+    print(f"  {'stage':<16} {'calls':>6} {'errors':>7} {'p50 ms':>8} {'p95 ms':>8} {'s/lead':>7}")
+    for stage, stage_calls in sorted(stages.items(), key=lambda item: -sum(c['seconds'] for c in item[1])):
+        durations = [c['seconds'] for c in stage_calls]
+        errors = sum(1 for c in stage_calls if c['error_class'] != 'ok')
+        print(f"  {stage:<16} {len(stage_calls):>6} {errors:>7} {percentile(durations, 50) * 1000:>8.0f} "
+              f"{percentile(durations, 95) * 1000:>8.0f} {sum(durations) / per_lead:>7.2f}")
+
+
+def run_lead_engine(args, telemetry):
+    from services.lead_engine import LeadEngineService
+
+    engine = LeadEngineService()
+    leads = 0
+    stopped = None
+    start = time.time()
+    with quiet():
+        for update in engine.generate_leads(job_titles=args.job_titles, num_jobs=args.leads,
+                                            locations=args.locations, session_id='bench-lead-engine'):
+            if update.get('type') == 'lead':
+                leads += 1
+            elif update.get('type') in ('error', 'quota_exceeded'):
+                stopped = update.get('message')
+    end = time.time()
+    if stopped:
+        print(f"\n[BENCH] Lead engine stopped early: {stopped}")
+    report('LEAD ENGINE', leads, end - start, calls_between(telemetry, start, end))
+
+
+def run_job_openings(args, telemetry):
+    from services.api_keys import APOLLO_API_KEY, GOOGLE_API_KEY, GOOGLE_SEARCH_ENGINE_ID
+    from services.async_runtime import run_sync
+    from services.job_opening_search import JobOpeningSearchService
+
+    service = JobOpeningSearchService(APOLLO_API_KEY, GOOGLE_API_KEY, GOOGLE_SEARCH_ENGINE_ID)
+    start = time.time()
+    with quiet():
+        companies = run_sync(service.search_job_openings(args.job_titles[0], args.locations, ICP_PROFILE,
+                                                         max_results=args.leads))
+        searched = time.time()
+        leads = run_sync(service.enrich_companies_with_contacts(companies, ICP_PROFILE))
+    end = time.time()
+
+    # Enrichment runs on executor threads, so attribute calls by phase window instead of scope
+    calls = [dict(c, stage=c['stage'] or 'search') for c in calls_between(telemetry, start, searched)]
+    calls += [dict(c, stage=c['stage'] or 'enrich') for c in calls_between(telemetry, searched, end)]
+    report(f'JOB OPENING SEARCH ({len(companies)} companies)', len(leads), end - start, calls)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the lead pipeline against local vendor stubs')
+    parser.add_argument('--leads', type=int, default=20, help='Target leads (companies) per run')
+    parser.add_argument('--job-titles', nargs='+', default=['Data Engineer', 'Java Developer'])
+    parser.add_argument('--locations', nargs='+', default=['United States'])
+    parser.add_argument('--scenarios', nargs='+', choices=('lead_engine', 'job_openings'),
+                        default=['lead_engine', 'job_openings'])
+    add_stub_arguments(parser)
+    args = parser.parse_args()
+
+    stub = stub_from_args(args).start()
+    store = tempfile.TemporaryDirectory()
+    # Must be set before the services are imported (module-level configuration)
+    os.environ.update(stub.env())
+    os.environ['LOCAL_STORE_DIR'] = store.name
+    os.environ['TELEMETRY_BUFFER_SIZE'] = '1000000'
+
+    from services.vendor_telemetry import get_vendor_telemetry, instrument_requests
+    instrument_requests()
+    telemetry = get_vendor_telemetry()
+
+    print('=' * 60)
+    print(f"LEAD PIPELINE BENCHMARK - {args.mode} stubs at {stub.base_url}")
+    print(f"Latency: {', '.join(f'{g}={l.spec}' for g, l in sorted(stub.config.latency.items()))} "
+          f"x{args.time_scale:g}")
+    faults = {g: r for g, r in stub.config.rate_limit_rate.items() if r}
+    errors = {g: r for g, r in stub.config.error_rate.items() if r}
+    print(f"Faults: 429 {faults or 'none'}, 500 {errors or 'none'}")
+    print('=' * 60)
+
+    try:
+        if 'lead_engine' in args.scenarios:
+            run_lead_engine(args, telemetry)
+        if 'job_openings' in args.scenarios:
+            run_job_openings(args, telemetry)
+
+        print('\nStub requests:')
+        for endpoint, counts in stub.summary().items():
+            print(f"  {endpoint}: {', '.join(f'{k} {v}' for k, v in counts.items())}")
+    finally:
+        stub.stop()
+        telemetry.shutdown()
+        store.cleanup()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Lead Scoring Benchmark
+Compares the per-lead AILeadScorer.score_lead loop with the columnar batch
+path (full ranking and top-k) and checks that both produce the same scores.
+
+Usage:
+    python benchmarks/bench_lead_scoring.py
+    python benchmarks/bench_lead_scoring.py --sizes 1000 10000 50000 --top-k 50
+"""
+
+import argparse
+import copy
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.ai_lead_scorer import AILeadScorer
+
+
+def make_leads(count: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    techs = ['React', 'Python', 'AWS', 'Docker', 'Kubernetes', 'Node.js', 'Salesforce', 'Java',
+             'TensorFlow', 'Cloud Functions', 'Microservices', 'PHP', 'jQuery', 'Snowflake']
+    return [{
+        'company_name': f'Company {i}',
+        'company_size': rng.choice(['12', '75', '180', '350', '900', '2,500', '12,000', '']),
+        'annual_revenue': rng.choice(['$4M', '$25M', '$150M', '$2.1B', '', 'Unknown']),
+        'total_funding': rng.choice(['$2M', '$40M', '$1.2B', 'none', '']),
+        'publicly_traded': rng.random() < 0.2,
+        'job_title': rng.choice(['Senior Data Engineer', 'Java Developer', 'Lead Architect', 'Product Manager',
+                                 'QA Analyst', 'HR Generalist', 'Principal Scientist']),
+        'contact_title': rng.choice(['CEO', 'CTO', 'VP Engineering', 'Director of Talent', 'Head of HR',
+                                     'Hiring Manager', 'Recruiter', '']),
+        'contact_email': rng.choice(['jane@example.com', 'john@corp.io', '', '']),
+        'email_status': rng.choice(['verified', 'guessed', 'unavailable', '']),
+        'industry': rng.choice(['Information Technology', 'Financial Services', 'Retail', 'Healthcare',
+                                'Digital Media', 'Manufacturing']),
+        'subindustry': rng.choice(['SaaS', 'Consulting', '', 'Logistics']),
+        'technologies': rng.sample(techs, rng.randint(0, 12)),
+        'latest_funding_date': rng.choice([None, '2025-03-01']),
+    } for i in range(count)]
+
+
+def per_lead(scorer: AILeadScorer, leads: list, query: str) -> list:
+    """The previous batch implementation: score_lead per lead + full sort"""
+    for lead in leads:
+        lead['ai_score'] = scorer.score_lead(lead, query)
+    return sorted(leads, key=lambda x: x['ai_score']['total_score'], reverse=True)
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark AILeadScorer batch scoring')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 50000])
+    parser.add_argument('--top-k', type=int, default=100)
+    parser.add_argument('--query', default='senior data engineer')
+    args = parser.parse_args()
+
+    scorer = AILeadScorer()
+
+    print('=' * 60)
+    print('LEAD SCORING BENCHMARK')
+    print('=' * 60)
+    print(f"{'leads':>8} {'per-lead':>12} {'columnar':>12} {'top-' + str(args.top_k):>12} {'speedup':>9}  match")
+
+    for size in args.sizes:
+        leads = make_leads(size)
+
+        baseline, t_loop = timed(per_lead, scorer, copy.deepcopy(leads), args.query)
+        columnar, t_cols = timed(scorer.score_leads_columnar, copy.deepcopy(leads), args.query)
+        top, t_top = timed(scorer.score_leads_columnar, copy.deepcopy(leads), args.query, args.top_k)
+
+        expected = [(l['company_name'], l['ai_score']['total_score'], l['ai_score']['breakdown'])
+                    for l in baseline]
+        actual = [(l['company_name'], l['ai_score']['total_score'], l['ai_score']['breakdown'])
+                  for l in columnar['leads']]
+        top_actual = [(l['company_name'], l['ai_score']['total_score']) for l in top['leads']]
+        match = (expected == actual and
+                 top_actual == [e[:2] for e in expected[:args.top_k]] and
+                 columnar['distribution'] == scorer.get_lead_priority_distribution(baseline))
+
+        print(f"{size:>8} {t_loop * 1000:>10.1f}ms {t_cols * 1000:>10.1f}ms {t_top * 1000:>10.1f}ms "
+              f"{t_loop / t_top:>8.1f}x  {'OK' if match else 'MISMATCH'}")
+
+
+if __name__ == '__main__':
+    main()
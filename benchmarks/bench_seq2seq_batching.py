@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Seq2Seq Batching Benchmark
+Drives the local email model (services/seq2seq_inference.py) the way
+concurrent /api/pipeline/generate-email requests do: N client threads each
+submit EmailGenerator prompts through the dynamic-batching queue. For every
+max batch size (1 = the old one-email-at-a-time path) it reports emails/s,
+the batch size actually formed, and per-request latency (p50 / p95).
+
+Pass several --threads values to pick the intra-op thread count for this
+box (set it in production with SEQ2SEQ_THREADS).
+
+Needs torch and transformers; the model is downloaded on first run.
+
+Usage:
+    python benchmarks/bench_seq2seq_batching.py
+    python benchmarks/bench_seq2seq_batching.py --batch-sizes 1 8 32 --requests 64
+    python benchmarks/bench_seq2seq_batching.py --threads 2 4 8 --max-wait-ms 5
+    python benchmarks/bench_seq2seq_batching.py --num-beams 1 --max-length 200
+"""
+
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.email_generator import EmailGenerator
+from services.seq2seq_inference import MODEL_NAME, Seq2SeqBatcher, default_num_threads
+
+NAMES = ['Sarah Chen', 'Michael Brown', 'Priya Patel', 'James Wilson', 'Ana Garcia', 'David Kim']
+TITLES = ['VP Engineering', 'Head of Talent Acquisition', 'HR Manager', 'CTO', 'Director of Operations']
+COMPANIES = ['Acme Analytics', 'Northwind Logistics', 'Globex Software', 'Initech', 'Umbrella Health']
+JOBS = ['Senior Data Engineer', 'Java Developer', 'DevOps Engineer', 'Product Manager', 'QA Analyst']
+
+
+def make_prompts(count: int, seed: int = 11):
+    rng = random.Random(seed)
+    return [EmailGenerator._build_prompt(rng.choice(NAMES), rng.choice(TITLES), rng.choice(JOBS),
+                                         rng.choice(COMPANIES)) for _ in range(count)]
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))]
+
+
+def run(batcher: Seq2SeqBatcher, prompts, batch_size: int) -> dict:
+    """batch_size clients submit all prompts through the queue; returns throughput and latency"""
+    batcher.max_batch = batch_size
+    before = dict(batcher.stats)
+    latencies = []
+    lock = threading.Lock()
+    chunks = [prompts[i::batch_size] for i in range(batch_size)]
+
+    def client(chunk):
+        for prompt in chunk:
+            start = time.perf_counter()
+            batcher.generate(prompt)
+            with lock:
+                latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=client, args=(chunk,)) for chunk in chunks if chunk]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    batches = batcher.stats['batches'] - before['batches']
+    return {
+        'elapsed': elapsed,
+        'throughput': len(prompts) / elapsed,
+        'avg_batch': (batcher.stats['requests'] - before['requests']) / max(batches, 1),
+        'p50': percentile(latencies, 50),
+        'p95': percentile(latencies, 95),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark dynamic batching for the local email model')
+    parser.add_argument('--model', default=MODEL_NAME)
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 8, 32])
+    parser.add_argument('--requests', type=int, default=64, help='Emails generated per batch size')
+    parser.add_argument('--threads', type=int, nargs='+', default=[default_num_threads()],
+                        help='torch intra-op thread counts to compare')
+    parser.add_argument('--max-wait-ms', type=float, default=10)
+    parser.add_argument('--num-beams', type=int, default=None, help='Override the production decoding settings')
+    parser.add_argument('--max-length', type=int, default=None)
+    parser.add_argument('--device', default='cpu')
+    args = parser.parse_args()
+
+    generate_kwargs = {}
+    if args.num_beams is not None:
+        generate_kwargs['num_beams'] = args.num_beams
+    if args.max_length is not None:
+        generate_kwargs['max_length'] = args.max_length
+
+    batcher = Seq2SeqBatcher(model_name=args.model, max_wait_ms=args.max_wait_ms, num_threads=args.threads[0],
+                             generate_kwargs=generate_kwargs, device=args.device)
+
+    print('=' * 60)
+    print(f"SEQ2SEQ BATCHING BENCHMARK - {args.model} on {args.device}")
+    print(f"{args.requests} emails per run, max wait {args.max_wait_ms:g} ms, decoding {batcher.generate_kwargs}")
+    print('=' * 60)
+
+    if not batcher.load():
+        print("\n✗ Model could not be loaded (needs torch and transformers)")
+        sys.exit(1)
+
+    prompts = make_prompts(args.requests)
+    # Warm-up: first generate() call pays for lazy kernel / allocator setup
+    batcher.generate_batch(prompts[:2])
+
+    for num_threads in args.threads:
+        batcher.set_num_threads(num_threads)
+        print(f"\n{num_threads} threads:")
+        print(f"  {'max batch':>9} {'emails/s':>9} {'speedup':>8} {'avg batch':>10} {'p50 s':>7} {'p95 s':>7}")
+        baseline = None
+        for batch_size in args.batch_sizes:
+            result = run(batcher, prompts, batch_size)
+            baseline = baseline or result['throughput']
+            print(f"  {batch_size:>9} {result['throughput']:>9.2f} {result['throughput'] / baseline:>7.1f}x "
+                  f"{result['avg_batch']:>10.1f} {result['p50']:>7.2f} {result['p95']:>7.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Embedding Backend Parity Check
+Embeds a fixture set (job titles and snippets from the CSE corpus) with the
+full-precision torch model and the int8 ONNX export, and checks they agree
+closely enough for the thresholds VectorSearchService uses:
+
+- cosine between the two embeddings of each text (min and mean)
+- pairwise similarity drift (p99 / max |sim_onnx - sim_torch|)
+- agreement of the 0.85 dedup decision across all pairs
+- overlap of each text's top-10 neighbours
+
+A passing run is recorded as parity.json next to the exported model, which is
+what lets EMBEDDING_BACKEND=auto switch to ONNX. Exits 1 on failure.
+
+Usage:
+    python benchmarks/check_embedding_parity.py --export
+    python benchmarks/check_embedding_parity.py --texts 2000
+    python benchmarks/check_embedding_parity.py --min-cosine 0.97 --no-record
+"""
+
+import argparse
+import gzip
+import json
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+
+from services.embedding_backend import (DEFAULT_MODEL, OnnxEmbeddingBackend, TorchEmbeddingBackend,
+                                        export_onnx_int8, onnx_model_dir, write_parity_report)
+
+DEFAULT_CORPUS = os.path.join(ROOT, 'benchmarks', 'fixtures', 'cse_job_items.jsonl.gz')
+DEDUP_THRESHOLD = 0.85  # VectorSearchService.SIMILARITY_THRESHOLD
+TOP_K = 10
+
+
+def load_texts(path: str, count: int, seed: int = 5):
+    """Distinct titles, snippets and title+snippet strings from the CSE fixture corpus"""
+    texts = set()
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        for line in f:
+            item = json.loads(line)['item']
+            title, snippet = item.get('title', ''), item.get('snippet', '')
+            texts.update(t for t in (title, snippet, f"{title} {snippet}") if t)
+    texts = sorted(texts)
+    random.Random(seed).shuffle(texts)
+    return texts[:count]
+
+
+def compare(reference: np.ndarray, candidate: np.ndarray) -> dict:
+    """Agreement metrics between two (n x dim) unit-norm embedding matrices"""
+    cosines = np.sum(reference * candidate, axis=1) / (
+        np.linalg.norm(reference, axis=1) * np.linalg.norm(candidate, axis=1))
+    sim_ref = reference @ reference.T
+    sim_cand = candidate @ candidate.T
+    upper = np.triu_indices(len(reference), k=1)
+    drift = np.abs(sim_ref[upper] - sim_cand[upper])
+    dedup_agreement = np.mean((sim_ref[upper] >= DEDUP_THRESHOLD) == (sim_cand[upper] >= DEDUP_THRESHOLD))
+
+    np.fill_diagonal(sim_ref, -np.inf)
+    np.fill_diagonal(sim_cand, -np.inf)
+    k = min(TOP_K, len(reference) - 1)
+    top_ref = np.argsort(-sim_ref, axis=1)[:, :k]
+    top_cand = np.argsort(-sim_cand, axis=1)[:, :k]
+    overlap = np.mean([len(set(a) & set(b)) / k for a, b in zip(top_ref, top_cand)]) if k else 1.0
+
+    return {
+        'min_cosine': float(cosines.min()),
+        'mean_cosine': float(cosines.mean()),
+        'p99_sim_drift': float(np.percentile(drift, 99)) if len(drift) else 0.0,
+        'max_sim_drift': float(drift.max()) if len(drift) else 0.0,
+        'dedup_agreement': float(dedup_agreement) if len(drift) else 1.0,
+        'top10_overlap': float(overlap),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check int8 ONNX embeddings against the torch model')
+    parser.add_argument('--model', default=DEFAULT_MODEL)
+    parser.add_argument('--export', action='store_true', help='Export and quantize the model first (needs torch)')
+    parser.add_argument('--corpus', default=DEFAULT_CORPUS)
+    parser.add_argument('--texts', type=int, default=1000, help='Fixture texts to embed')
+    parser.add_argument('--min-cosine', type=float, default=0.97, help='Lowest allowed per-text cosine')
+    parser.add_argument('--mean-cosine', type=float, default=0.99)
+    parser.add_argument('--max-p99-drift', type=float, default=0.03, help='p99 pairwise similarity drift')
+    parser.add_argument('--min-dedup-agreement', type=float, default=0.999)
+    parser.add_argument('--min-top10-overlap', type=float, default=0.85)
+    parser.add_argument('--no-record', action='store_true', help="Don't write parity.json")
+    args = parser.parse_args()
+
+    print('=' * 60)
+    print(f"EMBEDDING PARITY - {args.model}: torch vs int8 ONNX")
+    print('=' * 60)
+
+    if args.export:
+        export_onnx_int8(args.model)
+
+    texts = load_texts(args.corpus, args.texts)
+    print(f"Fixture set: {len(texts)} texts from {os.path.relpath(args.corpus, ROOT)}")
+
+    start = time.time()
+    reference = TorchEmbeddingBackend(args.model).encode(texts)
+    print(f"  torch: {time.time() - start:.1f}s")
+    start = time.time()
+    candidate = OnnxEmbeddingBackend(args.model).encode(texts)
+    print(f"  onnx:  {time.time() - start:.1f}s")
+
+    metrics = compare(reference, candidate)
+    checks = [
+        ('min_cosine', metrics['min_cosine'] >= args.min_cosine, f">= {args.min_cosine}"),
+        ('mean_cosine', metrics['mean_cosine'] >= args.mean_cosine, f">= {args.mean_cosine}"),
+        ('p99_sim_drift', metrics['p99_sim_drift'] <= args.max_p99_drift, f"<= {args.max_p99_drift}"),
+        ('dedup_agreement', metrics['dedup_agreement'] >= args.min_dedup_agreement,
+         f">= {args.min_dedup_agreement}"),
+        ('top10_overlap', metrics['top10_overlap'] >= args.min_top10_overlap, f">= {args.min_top10_overlap}"),
+    ]
+    print()
+    for name, ok, bound in checks:
+        print(f"  {'✓' if ok else '✗'} {name:<16} {metrics[name]:.4f}  ({bound})")
+    print(f"    max_sim_drift    {metrics['max_sim_drift']:.4f}")
+
+    passed = all(ok for _, ok, _ in checks)
+    if not args.no_record:
+        write_parity_report({'passed': passed, 'texts': len(texts), 'metrics': metrics,
+                             'checked_at': time.strftime('%Y-%m-%dT%H:%M:%S')}, args.model)
+        print(f"\nRecorded in {os.path.join(onnx_model_dir(args.model), 'parity.json')}")
+
+    if not passed:
+        print("\n✗ int8 ONNX embeddings do not match torch closely enough - keep EMBEDDING_BACKEND=torch")
+        sys.exit(1)
+    print("\n✓ Parity passed - EMBEDDING_BACKEND=auto (or onnx) will use the int8 model")
+
+
+if __name__ == '__main__':
+    main()
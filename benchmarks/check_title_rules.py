@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Contact Title Rule Check
+Runs the title cascade (services/title_taxonomy.py) over a fixture list of
+real titles and checks each one's class and per-tier verdict: true / false
+when the rules decide it, null when it must go to the LLM. Run it after
+touching TITLE_CLASSES, CLASS_EXCLUSIONS or TIER_RULES. Exits 1 on any
+mismatch.
+
+Usage:
+    python benchmarks/check_title_rules.py
+    python benchmarks/check_title_rules.py --fixtures my_titles.json
+"""
+
+import argparse
+import json
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from services.title_taxonomy import classify_title, decide_contact
+
+DEFAULT_FIXTURES = os.path.join(ROOT, 'benchmarks', 'fixtures', 'title_rules.json')
+TIERS = ('T1', 'T2', 'T3')
+
+
+def check(case: dict) -> list:
+    """Mismatches for one fixture title (empty when it passes)"""
+    problems = []
+    title_class = classify_title(case['title'])
+    if title_class != case['class']:
+        problems.append(f"class {title_class}, expected {case['class']}")
+    for tier in TIERS:
+        verdict = decide_contact({'title': case['title']}, tier)
+        relevant = None if verdict is None else verdict['relevant']
+        if relevant != case[tier]:
+            problems.append(f"{tier} {relevant}, expected {case[tier]}")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check the contact title rules against a fixture list')
+    parser.add_argument('--fixtures', default=DEFAULT_FIXTURES)
+    args = parser.parse_args()
+
+    with open(args.fixtures) as f:
+        cases = json.load(f)
+
+    print('=' * 60)
+    print(f"TITLE RULES - {len(cases)} titles from {os.path.relpath(args.fixtures, ROOT)}")
+    print('=' * 60)
+
+    failures = 0
+    for case in cases:
+        problems = check(case)
+        if problems:
+            failures += 1
+            print(f"  ✗ {case['title']!r}: {'; '.join(problems)}")
+
+    if failures:
+        print(f"\n✗ {failures}/{len(cases)} titles classified differently")
+        sys.exit(1)
+    print(f"✓ All {len(cases)} titles match")
+
+
+if __name__ == '__main__':
+    main()
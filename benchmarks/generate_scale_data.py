@@ -0,0 +1,667 @@
+#!/usr/bin/env python3
+"""
+Synthetic Data Generator
+Bulk-loads realistic volumes of every model in models.py - sender accounts,
+settings, templates, campaigns with email sequences, lead sessions with POC
+JSON, job leads, per-campaign lead email states with their send logs and
+personalized variants, and activity logs - for scale testing the dashboards
+and the sequence tables.
+
+Rows are streamed in chunks with pre-assigned ids and written through the
+fastest path the database offers:
+
+    PostgreSQL  COPY ... FROM STDIN (psycopg2 copy_expert / psycopg 3 copy)
+    SQLite      one transaction of DBAPI executemany with synchronous=OFF
+    other       SQLAlchemy Core executemany
+
+Every table has its own random stream derived from --seed, so the same
+arguments always produce the same rows (pass --anchor to pin the timestamps
+too) and resizing one table does not reshuffle the others.
+
+Usage:
+    python benchmarks/generate_scale_data.py --database-url sqlite:////tmp/scale.db
+    python benchmarks/generate_scale_data.py --database-url sqlite:////tmp/scale.db --preset small
+    python benchmarks/generate_scale_data.py --database-url postgresql://localhost/scale --reset
+    python benchmarks/generate_scale_data.py --database-url sqlite:////tmp/scale.db --rows job_leads=3000000 --anchor 2026-01-31
+"""
+
+import argparse
+import io
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from operator import itemgetter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Row counts per preset. Send logs follow from the lead email states (one per
+# step already sent) and personalized variants from personalized_rate.
+PRESETS = {
+    'small': {
+        'sender_accounts': 3, 'templates': 13, 'campaigns': 20, 'steps_per_sequence': 4,
+        'lead_sessions': 200, 'session_leads': 4000, 'large_session_leads': 0, 'pocs_per_lead': 3,
+        'job_leads': 10000, 'lead_email_states': 4000, 'personalized_rate': 0.1, 'activity_logs': 1000,
+    },
+    'medium': {
+        'sender_accounts': 5, 'templates': 40, 'campaigns': 100, 'steps_per_sequence': 4,
+        'lead_sessions': 2000, 'session_leads': 20000, 'large_session_leads': 0, 'pocs_per_lead': 3,
+        'job_leads': 200000, 'lead_email_states': 50000, 'personalized_rate': 0.1, 'activity_logs': 10000,
+    },
+    'production': {
+        'sender_accounts': 10, 'templates': 100, 'campaigns': 500, 'steps_per_sequence': 5,
+        'lead_sessions': 20000, 'session_leads': 100000, 'large_session_leads': 0, 'pocs_per_lead': 3,
+        'job_leads': 1000000, 'lead_email_states': 400000, 'personalized_rate': 0.1, 'activity_logs': 100000,
+    },
+}
+
+CHUNK_SIZE = 20000
+
+COMPANY_WORDS = ['Apex', 'Blue', 'Cedar', 'Delta', 'Ember', 'Forge', 'Granite', 'Harbor', 'Ion', 'Juniper',
+                 'Keystone', 'Lumen', 'Meridian', 'North', 'Orbit', 'Pinnacle', 'Quarry', 'Ridge', 'Summit', 'Vertex']
+COMPANY_SUFFIXES = ['Systems', 'Labs', 'Manufacturing', 'Health', 'Analytics', 'Logistics', 'Software', 'Group']
+INDUSTRIES = ['Information Technology', 'Computer Software', 'Manufacturing', 'Hospital & Health Care',
+              'Financial Services', 'Logistics & Supply Chain', 'Staffing & Recruiting']
+JOB_TITLES = ['Data Engineer', 'Java Developer', 'DevOps Engineer', 'Registered Nurse', 'Mechanical Engineer',
+              'Product Manager', 'QA Analyst', 'Sales Development Representative']
+POC_TITLES = ['Head of Talent Acquisition', 'VP Engineering', 'HR Manager', 'Engineering Manager',
+              'Senior Recruiter', 'Director of Operations']
+FIRST_NAMES = ['Alex', 'Jordan', 'Sam', 'Taylor', 'Morgan', 'Casey', 'Riley', 'Jamie', 'Avery', 'Quinn']
+LAST_NAMES = ['Patel', 'Nguyen', 'Garcia', 'Smith', 'Kim', 'Okafor', 'Rossi', 'Cohen', 'Silva', 'Murphy']
+LOCATIONS = ['Austin, TX', 'Chicago, IL', 'Denver, CO', 'Boston, MA', 'Seattle, WA', 'Atlanta, GA']
+SOURCES = ['LinkedIn', 'Indeed', 'Glassdoor', 'ZipRecruiter']
+LEAD_STATUSES = ['new', 'new', 'new', 'contacted', 'replied', 'skipped', 'failed']
+SESSION_STATUSES = ['ready', 'ready', 'sent', 'processing', 'archived']
+CAMPAIGN_STATUSES = ['draft', 'active', 'active', 'paused', 'completed']
+ACTIVITY_ACTIONS = [('campaign_started', 'success'), ('campaign_updated', 'success'), ('pipeline_search', 'success'),
+                    ('no_jobs_found', 'warning'), ('campaign_failed', 'error'), ('settings_updated', 'success')]
+SETTINGS = {'email_signature': 'Best,\nRecruitment Team', 'daily_send_limit': '200', 'timezone': 'America/Chicago',
+            'default_sender': 'outreach1@example.com', 'tracking_enabled': 'true'}
+
+
+class LeadFactory:
+    """Deterministic synthetic rows for every model (one factory per table keeps streams independent)"""
+
+    def __init__(self, seed=7, days: int = 30, anchor: datetime = None):
+        self.rng = random.Random(seed)
+        # Default anchor is the start of tomorrow, so reruns on the same day match exactly
+        self.now = anchor or datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+        self.days = days
+        self._random = self.rng.random
+
+    # random.choice / randrange go through _randbelow; scaling random() is several times faster
+    def choice(self, seq):
+        return seq[int(self._random() * len(seq))]
+
+    def timestamp(self) -> datetime:
+        return self.now - timedelta(seconds=int(self._random() * self.days * 86400))
+
+    def company(self) -> dict:
+        name = f"{self.choice(COMPANY_WORDS)} {self.choice(COMPANY_WORDS)} {self.choice(COMPANY_SUFFIXES)}"
+        domain = name.lower().replace(' ', '') + '.com'
+        return {
+            'name': name,
+            'domain': domain,
+            'industry': self.choice(INDUSTRIES),
+            'size': self.choice([60, 120, 250, 600, 1500, 4000]),
+            'location': self.choice(LOCATIONS),
+            'linkedin_url': f"https://www.linkedin.com/company/{domain.split('.')[0]}",
+            'website': f"https://{domain}",
+        }
+
+    def poc(self, domain: str) -> dict:
+        rng = self.rng
+        first, last = self.choice(FIRST_NAMES), self.choice(LAST_NAMES)
+        return {
+            'name': f"{first} {last}",
+            'title': self.choice(POC_TITLES),
+            'email': f"{first.lower()}.{last.lower()}@{domain}" if rng.random() < 0.8 else None,
+            'linkedin_url': f"https://www.linkedin.com/in/{first.lower()}-{last.lower()}-{rng.randrange(10 ** 6)}",
+            'priority': self.choice(['high', 'medium', 'low']),
+        }
+
+    def sender_account(self, index: int) -> dict:
+        provider = 'gmail' if index % 3 else 'outlook'
+        return {
+            'email': f"outreach{index + 1}@example.com",
+            'label': f"Outreach {index + 1}",
+            'provider': provider,
+            'status': 'connected' if self.rng.random() < 0.9 else 'expired',
+            'is_default': index == 0,
+            'access_token': None,
+            'refresh_token': None,
+            'token_expiry': None,
+            'created_at': self.timestamp(),
+            'updated_at': self.now,
+        }
+
+    def setting(self, key: str, value: str) -> dict:
+        return {'key': key, 'value': value, 'updated_at': self.timestamp()}
+
+    def template(self, base: dict, variant: int) -> dict:
+        name = base['name'] if not variant else f"{base['name']} (variant {variant + 1})"
+        return {
+            'name': name,
+            'subject_template': base['subject_template'],
+            'body_template': base['body_template'],
+            'is_default': bool(base.get('is_default')) and not variant,
+            'created_at': self.timestamp(),
+        }
+
+    def campaign(self, index: int, template_ids) -> dict:
+        rng = self.rng
+        return {
+            'name': f"{self.choice(INDUSTRIES)} outreach #{index + 1}",
+            'search_keywords': ', '.join(rng.sample(JOB_TITLES, 2)),
+            'company_size_min': 50,
+            'company_size_max': self.choice([200, 500, 1000]),
+            'jobs_per_run': self.choice([10, 25, 50]),
+            'email_template_id': self.choice(template_ids) if template_ids else None,
+            'status': self.choice(CAMPAIGN_STATUSES),
+            'schedule_enabled': False,
+            'schedule_frequency': None,
+            'created_at': self.timestamp(),
+            'updated_at': self.now,
+        }
+
+    def sequence(self, campaign_id: int) -> dict:
+        return {
+            'campaign_id': campaign_id,
+            'sequence_name': f"Sequence for campaign {campaign_id}",
+            'ai_personalization_enabled': self.rng.random() < 0.7,
+            'created_at': self.timestamp(),
+        }
+
+    def step(self, sequence_id: int, step_number: int, template_id: int) -> dict:
+        return {
+            'sequence_id': sequence_id,
+            'step_number': step_number,
+            'email_template_id': template_id,
+            'days_after_previous': 0 if step_number == 1 else self.choice([2, 3, 4, 7]),
+            'created_at': self.timestamp(),
+        }
+
+    def session(self, index: int, leads: int, pocs: int) -> dict:
+        rng = self.rng
+        titles = rng.sample(JOB_TITLES, 2)
+        return {
+            'name': f"{titles[0]} search #{index + 1}",
+            'job_titles': json.dumps(titles),
+            'locations': json.dumps(['United States']),
+            'industries': json.dumps(rng.sample(INDUSTRIES, 2)),
+            'keywords': '[]',
+            'company_sizes': json.dumps(['51-200', '201-500']),
+            'total_leads': leads,
+            'total_pocs': leads * pocs,
+            'total_emails': int(leads * pocs * 0.8),
+            'status': self.choice(SESSION_STATUSES),
+            'created_at': self.timestamp(),
+            'updated_at': self.now,
+        }
+
+    def session_lead(self, session_id: int, pocs: int) -> dict:
+        rng = self.rng
+        company = self.company()
+        return {
+            'session_id': session_id,
+            'company_name': company['name'],
+            'company_domain': company['domain'],
+            'company_industry': company['industry'],
+            'company_size': company['size'],
+            'company_location': company['location'],
+            'company_linkedin': company['linkedin_url'],
+            'company_website': company['website'],
+            'job_title': self.choice(JOB_TITLES),
+            'job_source': self.choice(SOURCES),
+            'job_url': f"https://jobs.example.com/{company['domain']}/{rng.randrange(10 ** 8)}",
+            'pocs': json.dumps([self.poc(company['domain']) for _ in range(pocs)]),
+            'status': self.choice(LEAD_STATUSES[:4]),
+            'notes': None,
+            'created_at': self.timestamp(),
+        }
+
+    def job_lead(self, campaign_id) -> dict:
+        rng = self.rng
+        company = self.company()
+        poc = self.poc(company['domain'])
+        sent = rng.random() < 0.4
+        created_at = self.timestamp()
+        job_title = self.choice(JOB_TITLES)
+        return {
+            'campaign_id': campaign_id,
+            'job_title': job_title,
+            'company_name': company['name'],
+            'company_size': str(company['size']),
+            'job_url': f"https://jobs.example.com/{company['domain']}/{rng.randrange(10 ** 8)}",
+            'contact_name': poc['name'],
+            'contact_title': poc['title'],
+            'contact_email': poc['email'],
+            'email_sent': sent,
+            'email_sent_at': created_at + timedelta(hours=rng.randrange(1, 48)) if sent else None,
+            'email_subject': f"Quick question about {company['name']}'s hiring" if sent else None,
+            'email_body': f"Hi {poc['name'].split()[0]},\n\nWe place {job_title} candidates..." if sent else None,
+            'status': 'contacted' if sent else self.choice(LEAD_STATUSES),
+            'notes': None,
+            'created_at': created_at,
+            'updated_at': created_at,
+        }
+
+    def lead_email_state(self, campaign_id: int, index: int, steps: int) -> dict:
+        """A lead's progress through a sequence; index keeps the email unique per campaign"""
+        rng = self.rng
+        company = self.company()
+        first, last = self.choice(FIRST_NAMES), self.choice(LAST_NAMES)
+        current_step = rng.randint(0, steps)
+        created_at = self.timestamp()
+        status, stopped_reason, last_sent, next_at = 'pending', None, None, None
+        if current_step:
+            last_sent = min(created_at + timedelta(days=rng.randint(0, 3 * current_step), hours=rng.randrange(24)),
+                            self.now)
+            roll = rng.random()
+            if current_step == steps:
+                status = 'completed'
+            elif roll < 0.06:
+                status, stopped_reason = 'replied', 'replied'
+            elif roll < 0.09:
+                status, stopped_reason = 'stopped', self.choice(['bounced', 'unsubscribed'])
+            else:
+                status = 'active'
+                next_at = last_sent + timedelta(days=self.choice([2, 3, 4, 7]))
+        else:
+            next_at = created_at + timedelta(hours=rng.randrange(72))
+        return {
+            'campaign_id': campaign_id,
+            'lead_email': f"{first.lower()}.{last.lower()}.{index}@{company['domain']}",
+            'lead_name': f"{first} {last}",
+            'lead_company': company['name'],
+            'lead_title': self.choice(POC_TITLES),
+            'current_step': current_step,
+            'status': status,
+            'stopped_reason': stopped_reason,
+            'last_email_sent_at': last_sent,
+            'next_email_scheduled_at': next_at,
+            'created_at': created_at,
+            'updated_at': last_sent or created_at,
+        }
+
+    def send_log(self, state_id: int, state: dict, step_number: int, template: tuple, sent_at: datetime) -> dict:
+        rng = self.rng
+        subject, body = render(template, state)
+        failed = rng.random() < 0.02
+        opened = None if failed or rng.random() < 0.55 else sent_at + timedelta(minutes=rng.randrange(1, 2880))
+        clicked = opened + timedelta(minutes=rng.randrange(1, 60)) if opened and rng.random() < 0.15 else None
+        replied = None
+        if state['stopped_reason'] == 'replied' and step_number == state['current_step']:
+            replied = sent_at + timedelta(hours=rng.randrange(1, 72))
+        return {
+            'lead_email_state_id': state_id,
+            'step_number': step_number,
+            'email_template_id': template[0],
+            'subject': subject,
+            'body': body,
+            'sent_at': sent_at,
+            'status': 'failed' if failed else 'sent',
+            'opened_at': opened,
+            'clicked_at': clicked,
+            'replied_at': replied,
+            'error_message': 'Rate limit exceeded' if failed else None,
+        }
+
+    def personalized_email(self, state: dict, step_number: int, template: tuple) -> dict:
+        subject, body = render(template, state)
+        return {
+            'campaign_id': state['campaign_id'],
+            'step_number': step_number,
+            'lead_email': state['lead_email'],
+            'lead_name': state['lead_name'],
+            'lead_company': state['lead_company'],
+            'lead_title': state['lead_title'],
+            'subject': subject,
+            'body': body.replace('\n\n', f"\n\nI saw {state['lead_company']} is growing quickly.\n\n", 1),
+            'changes_made': json.dumps(['Added company-specific opener']),
+            'created_at': state['created_at'],
+            'updated_at': state['updated_at'],
+        }
+
+    def activity_log(self, campaign_id) -> dict:
+        action, status = self.choice(ACTIVITY_ACTIONS)
+        return {
+            'campaign_id': campaign_id,
+            'action': action,
+            'details': f"{action.replace('_', ' ').capitalize()} (synthetic)",
+            'status': status,
+            'created_at': self.timestamp(),
+        }
+
+
+def render(template: tuple, state: dict):
+    """Fill a (id, subject, body) template for a lead email state"""
+    first = state['lead_name'].split(' ', 1)[0]
+    values = (('{{FirstName}}', first), ('{{CompanyName}}', state['lead_company']),
+              ('{{JobTitle}}', state['lead_title']), ('{{SenderName}}', 'Recruitment Team'))
+    _, subject, body = template
+    for key, value in values:
+        subject = subject.replace(key, value)
+        body = body.replace(key, value)
+    return subject, body
+
+
+_COPY_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
+
+
+def _copy_text(value) -> str:
+    if value is None:
+        return '\\N'
+    if value is True or value is False:
+        return 't' if value else 'f'
+    return str(value).translate(_COPY_ESCAPES)
+
+
+class BulkWriter:
+    """Streams (table, row) pairs into the database in chunks, parents before children"""
+
+    def __init__(self, engine, chunk_size: int = CHUNK_SIZE):
+        self.engine = engine
+        self.dialect = engine.dialect.name
+        self.chunk_size = chunk_size
+        self.counts = {}
+
+    @property
+    def method(self) -> str:
+        if self.dialect == 'postgresql':
+            return 'COPY'
+        if self.dialect == 'sqlite':
+            return 'executemany'
+        return 'SQLAlchemy executemany'
+
+    def write(self, rows, progress=None) -> dict:
+        """
+        Load a stream of rows
+
+        Args:
+            rows: Iterable of (sqlalchemy Table, row dict) - every row of a table has the same keys,
+                  and a parent row is always yielded before the rows that reference it
+            progress: Optional callable(counts) after each chunk
+
+        Returns:
+            Rows written per table name
+        """
+        buffers = {}
+        buffered = 0
+        raw = self.engine.raw_connection()
+        try:
+            if self.dialect == 'sqlite':
+                raw.cursor().execute('PRAGMA synchronous = OFF')
+            for table, row in rows:
+                buffer = buffers.get(table)
+                if buffer is None:
+                    buffer = buffers[table] = (list(row), [])
+                buffer[1].append(row)
+                buffered += 1
+                if buffered >= self.chunk_size:
+                    self._flush(raw, buffers)
+                    buffered = 0
+                    if progress:
+                        progress(self.counts)
+            self._flush(raw, buffers)
+            if self.dialect == 'postgresql':
+                self._reset_sequences(raw, buffers)
+            raw.commit()
+        except Exception:
+            raw.rollback()
+            raise
+        finally:
+            raw.close()
+        return self.counts
+
+    def _flush(self, raw, buffers):
+        # Insertion order of the dict is first-appearance order, so parents are written first
+        for table, (columns, rows) in buffers.items():
+            if not rows:
+                continue
+            values = list(map(itemgetter(*columns), rows)) if len(columns) > 1 else [(r[columns[0]],) for r in rows]
+            if self.dialect == 'postgresql':
+                self._copy(raw, table, columns, values)
+            elif self.dialect == 'sqlite':
+                values = self._sqlite_values(table, columns, values)
+                sql = f"INSERT INTO {table.name} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+                raw.cursor().executemany(sql, values)
+            else:
+                with self.engine.begin() as conn:
+                    conn.execute(table.insert(), [dict(zip(columns, v)) for v in values])
+            self.counts[table.name] = self.counts.get(table.name, 0) + len(rows)
+            rows.clear()
+
+    @staticmethod
+    def _sqlite_values(table, columns, values):
+        """SQLite stores DateTime as text in SQLAlchemy's format; convert those columns only"""
+        from sqlalchemy import DateTime
+
+        indexes = [i for i, c in enumerate(columns) if isinstance(table.c[c].type, DateTime)]
+        if not indexes:
+            return values
+        converted = []
+        for value in values:
+            value = list(value)
+            for i in indexes:
+                if value[i] is not None:
+                    value[i] = value[i].isoformat(' ', 'microseconds')
+            converted.append(value)
+        return converted
+
+    @staticmethod
+    def _copy(raw, table, columns, values):
+        # COPY text format: tab separated, \N for NULL, backslash escapes
+        buffer = io.StringIO()
+        for value in values:
+            buffer.write('\t'.join(_copy_text(v) for v in value))
+            buffer.write('\n')
+        buffer.seek(0)
+        sql = f"COPY {table.name} ({', '.join(columns)}) FROM STDIN"
+        cursor = raw.cursor()
+        if hasattr(cursor, 'copy_expert'):  # psycopg2
+            cursor.copy_expert(sql, buffer)
+        else:  # psycopg 3
+            with cursor.copy(sql) as copy:
+                copy.write(buffer.getvalue())
+
+    @staticmethod
+    def _reset_sequences(raw, buffers):
+        """Ids were assigned here, so move each serial sequence past them"""
+        cursor = raw.cursor()
+        for table in buffers:
+            cursor.execute(f"SELECT setval(pg_get_serial_sequence('{table.name}', 'id'), "
+                           f"(SELECT MAX(id) FROM {table.name}))")
+
+
+def _rows(scale: dict, seed: int, days: int, anchor: datetime):
+    """Yield (table, row) for every model in foreign-key order, with ids assigned here"""
+    from models import (ActivityLog, Campaign, CampaignEmailSequence, CampaignEmailStep, EmailSendLog,
+                        EmailTemplate, JobLead, LeadEmailState, LeadPersonalizedEmail, LeadSession, SenderAccount,
+                        SessionLead, Settings)
+    from seed_templates import TEMPLATES
+
+    def factory(name):
+        return LeadFactory(f"{seed}:{name}", days, anchor)
+
+    def with_id(model, row_id, row):
+        row['id'] = row_id
+        return model.__table__, row
+
+    f = factory('sender_account')
+    for i in range(scale['sender_accounts']):
+        yield with_id(SenderAccount, i + 1, f.sender_account(i))
+
+    f = factory('settings')
+    for i, (key, value) in enumerate(SETTINGS.items()):
+        yield with_id(Settings, i + 1, f.setting(key, value))
+
+    # Templates: the real ones from seed_templates.py, then variants of them up to the requested count
+    f = factory('email_template')
+    templates = []
+    for i in range(max(scale['templates'], len(TEMPLATES))):
+        row = f.template(TEMPLATES[i % len(TEMPLATES)], i // len(TEMPLATES))
+        templates.append((i + 1, row['subject_template'], row['body_template']))
+        yield with_id(EmailTemplate, i + 1, row)
+
+    template_ids = [t[0] for t in templates]
+    f = factory('campaign')
+    campaigns = scale['campaigns']
+    for i in range(campaigns):
+        yield with_id(Campaign, i + 1, f.campaign(i, template_ids))
+
+    # One sequence per campaign; each step uses a consecutive template
+    steps = scale['steps_per_sequence']
+    f = factory('sequence')
+    sequence_templates = {}
+    step_id = 0
+    for campaign_id in range(1, campaigns + 1):
+        yield with_id(CampaignEmailSequence, campaign_id, f.sequence(campaign_id))
+        start = f.rng.randrange(len(templates))
+        sequence_templates[campaign_id] = [templates[(start + n) % len(templates)] for n in range(steps)]
+        for step_number in range(1, steps + 1):
+            step_id += 1
+            template_id = sequence_templates[campaign_id][step_number - 1][0]
+            yield with_id(CampaignEmailStep, step_id, f.step(campaign_id, step_number, template_id))
+
+    # Sessions with leads spread around the mean, plus an optional oversized session
+    f = factory('lead_session')
+    sessions = scale['lead_sessions']
+    total_leads = scale['session_leads']
+    sizes = []
+    for i in range(sessions):
+        remaining = total_leads - sum(sizes)
+        mean = remaining / (sessions - i)
+        sizes.append(remaining if i == sessions - 1 else min(remaining, int(f.rng.uniform(0.5, 1.5) * mean)))
+    if scale['large_session_leads']:
+        sizes.append(scale['large_session_leads'])
+    pocs = scale['pocs_per_lead']
+    for i, size in enumerate(sizes):
+        yield with_id(LeadSession, i + 1, f.session(i, size, pocs))
+    f = factory('session_lead')
+    lead_id = 0
+    for session_id, size in enumerate(sizes, 1):
+        for _ in range(size):
+            lead_id += 1
+            yield with_id(SessionLead, lead_id, f.session_lead(session_id, pocs))
+
+    f = factory('job_lead')
+    for i in range(scale['job_leads']):
+        campaign_id = f.rng.randint(1, campaigns) if campaigns and f.rng.random() < 0.8 else None
+        yield with_id(JobLead, i + 1, f.job_lead(campaign_id))
+
+    # Lead states with the logs of every step already sent and some personalized variants
+    if campaigns:
+        f = factory('lead_email_state')
+        logs = factory('email_send_log')
+        variants = factory('lead_personalized_email')
+        log_id = variant_id = 0
+        for i in range(scale['lead_email_states']):
+            campaign_id = f.rng.randint(1, campaigns)
+            state = f.lead_email_state(campaign_id, i + 1, steps)
+            yield with_id(LeadEmailState, i + 1, state)
+            sequence = sequence_templates[campaign_id]
+            current = state['current_step']
+            for step_number in range(1, current + 1):
+                # Spread the sends evenly up to the state's last send
+                log_id += 1
+                sent_at = state['created_at'] + (state['last_email_sent_at'] - state['created_at']) * step_number / current
+                yield with_id(EmailSendLog, log_id,
+                              logs.send_log(i + 1, state, step_number, sequence[step_number - 1], sent_at))
+            if variants.rng.random() < scale['personalized_rate']:
+                for step_number in range(1, steps + 1):
+                    variant_id += 1
+                    yield with_id(LeadPersonalizedEmail, variant_id,
+                                  variants.personalized_email(state, step_number, sequence[step_number - 1]))
+
+    f = factory('activity_log')
+    for i in range(scale['activity_logs']):
+        campaign_id = f.rng.randint(1, campaigns) if campaigns and f.rng.random() < 0.7 else None
+        yield with_id(ActivityLog, i + 1, f.activity_log(campaign_id))
+
+
+def generate(database_url: str, scale: dict = None, seed: int = 7, days: int = 30, anchor: datetime = None,
+             reset: bool = False, progress=None) -> dict:
+    """
+    Fill an empty database with synthetic rows for every model
+
+    Args:
+        database_url: SQLAlchemy URL of the target database
+        scale: Row counts (keys of PRESETS['production']); missing keys use the 'small' preset
+        seed: Random seed - the same seed and scale produce the same rows
+        days: Spread of created_at timestamps before the anchor
+        anchor: Latest timestamp (default: the start of tomorrow, UTC)
+        reset: Drop and recreate all tables first
+        progress: Optional callable(counts) after each written chunk
+
+    Returns:
+        Dict with 'counts' (rows per table), 'method' (load path) and 'seconds'
+    """
+    from sqlalchemy import create_engine, func, select
+    from models import db
+
+    scale = {**PRESETS['small'], **(scale or {})}
+    engine = create_engine(database_url)
+    try:
+        if reset:
+            db.metadata.drop_all(engine)
+        db.metadata.create_all(engine)
+        with engine.connect() as conn:
+            for table in db.metadata.sorted_tables:
+                if conn.execute(select(func.count()).select_from(table)).scalar():
+                    raise RuntimeError(f"{database_url} already has rows in {table.name} - "
+                                       f"pass reset=True (--reset) to regenerate")
+
+        writer = BulkWriter(engine)
+        start = time.time()
+        counts = writer.write(_rows(scale, seed, days, anchor), progress=progress)
+        return {'counts': counts, 'method': writer.method, 'seconds': time.time() - start}
+    finally:
+        engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Bulk-load synthetic rows for every model')
+    parser.add_argument('--database-url', required=True, help='SQLAlchemy URL, e.g. sqlite:////tmp/scale.db')
+    parser.add_argument('--preset', choices=sorted(PRESETS), default='production')
+    parser.add_argument('--rows', action='append', default=[], metavar='KEY=N',
+                        help=f"Override a preset count ({', '.join(PRESETS['production'])})")
+    parser.add_argument('--seed', type=int, default=7, help='Random seed for reproducible data')
+    parser.add_argument('--days', type=int, default=90, help='Spread of created_at timestamps (days)')
+    parser.add_argument('--anchor', help='Latest timestamp as YYYY-MM-DD (default: tomorrow, UTC)')
+    parser.add_argument('--reset', action='store_true', help='Drop and recreate all tables first')
+    args = parser.parse_args()
+
+    scale = dict(PRESETS[args.preset])
+    for item in args.rows:
+        key, _, value = item.partition('=')
+        if key not in scale:
+            parser.error(f"Unknown count: {key}")
+        scale[key] = float(value) if key == 'personalized_rate' else int(value)
+    anchor = datetime.strptime(args.anchor, '%Y-%m-%d') if args.anchor else None
+
+    print('=' * 60)
+    print(f"SYNTHETIC DATA - {args.preset} preset into {args.database_url} (seed {args.seed})")
+    print('=' * 60)
+
+    start = time.time()
+
+    def progress(counts):
+        total = sum(counts.values())
+        print(f"\r  {total:>12,} rows  {total / (time.time() - start):>9,.0f} rows/s", end='', flush=True)
+
+    result = generate(args.database_url, scale, seed=args.seed, days=args.days, anchor=anchor,
+                      reset=args.reset, progress=progress)
+    print()
+    for table, count in result['counts'].items():
+        print(f"  {table:<24} {count:>11,}")
+    total = sum(result['counts'].values())
+    print(f"\n✓ {total:,} rows via {result['method']} in {result['seconds']:.1f}s "
+          f"({total / max(result['seconds'], 1e-9):,.0f} rows/s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+App Import-Time Profile and Budget
+Imports app.py in fresh interpreters under `python -X importtime` and
+summarizes where cold start goes: slowest modules (cumulative), time per
+top-level package, and the median wall time of `import app`.
+
+Doubles as the startup budget check: exits 1 when the median import
+exceeds --budget seconds, or when `import app` pulls in a module that should
+only load on first use (--forbid: torch, sentence_transformers, numpy, the
+Google / Microsoft client libraries, ...).
+
+Each run gets its own temporary SQLite database, local store and metrics
+directory, so nothing in the working tree is touched.
+
+Usage:
+    python benchmarks/import_profile.py
+    python benchmarks/import_profile.py --runs 10 --top 40
+    python benchmarks/import_profile.py --budget 1.0
+    python benchmarks/import_profile.py --forbid torch faiss --allow numpy
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from collections import defaultdict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Heavy dependencies that must load on first use, never while importing app
+DEFAULT_FORBID = (
+    'torch', 'sentence_transformers', 'transformers', 'faiss', 'sklearn', 'chromadb', 'numpy',
+    'msal', 'googleapiclient', 'google_auth_oauthlib', 'google.oauth2', 'apscheduler',
+)
+
+# Runs in the child: time the import, then report which watched modules it loaded
+CHILD = """
+import json, sys, time
+start = time.perf_counter()
+import app
+elapsed = time.perf_counter() - start
+watched = {watched!r}
+print('IMPORT_RESULT ' + json.dumps({{'seconds': elapsed,
+                                     'loaded': sorted(m for m in watched if m in sys.modules)}}))
+"""
+
+
+def parse_importtime(stderr: str):
+    """(self_us, cumulative_us, depth, module) for each `-X importtime` line"""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+        except ValueError:
+            continue
+        depth = (len(name) - len(name.lstrip(' '))) // 2
+        # app itself is timed by the wall clock: its line is unreliable once the
+        # scheduler thread starts importing concurrently (importtime nesting is per process)
+        if name.strip() != 'app':
+            entries.append((int(self_us), int(cumulative_us), depth, name.strip()))
+    return entries
+
+
+def run_once(watched) -> dict:
+    """Import app in a fresh interpreter; returns wall time, loaded modules and the importtime entries"""
+    with tempfile.TemporaryDirectory() as workdir:
+        env = dict(os.environ,
+                   PYTHONPATH=os.pathsep.join(filter(None, [ROOT, os.environ.get('PYTHONPATH')])),
+                   DATABASE_URL=f"sqlite:///{os.path.join(workdir, 'import.db')}",
+                   LOCAL_STORE_DIR=workdir,
+                   METRICS_DIR=os.path.join(workdir, 'metrics'))
+        proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', CHILD.format(watched=list(watched))],
+                              cwd=workdir, env=env, capture_output=True, text=True, timeout=600)
+    result = next((json.loads(line.split(' ', 1)[1]) for line in proc.stdout.splitlines()
+                   if line.startswith('IMPORT_RESULT ')), None)
+    if proc.returncode != 0 or result is None:
+        errors = [line for line in proc.stderr.splitlines() if not line.startswith('import time:')]
+        raise RuntimeError(f"import app failed (exit {proc.returncode}):\n" + '\n'.join(errors[-20:]))
+    result['entries'] = parse_importtime(proc.stderr)
+    return result
+
+
+def report(entries, top: int):
+    """Slowest modules by cumulative time and self time per top-level package"""
+    print("\nSlowest imports (cumulative, one run):")
+    print(f"  {'module':<52} {'cumul ms':>9} {'self ms':>8}")
+    for self_us, cumulative_us, depth, name in sorted(entries, key=lambda e: -e[1])[:top]:
+        print(f"  {('  ' * min(depth, 4) + name)[:52]:<52} {cumulative_us / 1000:>9.1f} {self_us / 1000:>8.1f}")
+
+    packages = defaultdict(int)
+    for self_us, _, _, name in entries:
+        packages[name.split('.')[0]] += max(self_us, 0)
+    total = sum(packages.values()) or 1
+    print("\nSelf time by package:")
+    for package, self_us in sorted(packages.items(), key=lambda item: -item[1])[:top // 2 or 1]:
+        print(f"  {package:<32} {self_us / 1000:>8.1f} ms  {self_us / total:>6.1%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Profile cold `import app` and enforce a startup budget')
+    parser.add_argument('--runs', type=int, default=5, help='Fresh interpreters to time (median is reported)')
+    parser.add_argument('--top', type=int, default=25, help='Modules to list')
+    parser.add_argument('--budget', type=float, default=1.5, help='Max median seconds for `import app`')
+    parser.add_argument('--forbid', nargs='*', default=list(DEFAULT_FORBID),
+                        help='Modules that must not be loaded by `import app`')
+    parser.add_argument('--allow', nargs='*', default=[], help='Remove modules from the forbidden list')
+    args = parser.parse_args()
+
+    forbid = [m for m in args.forbid if m not in args.allow]
+
+    print('=' * 60)
+    print(f"APP IMPORT PROFILE - {args.runs} cold runs, budget {args.budget:.2f}s")
+    print('=' * 60)
+
+    # The first run also writes bytecode caches; keep it out of the timings
+    run_once(forbid)
+    runs = [run_once(forbid) for _ in range(args.runs)]
+    seconds = [r['seconds'] for r in runs]
+    median = statistics.median(seconds)
+
+    report(runs[-1]['entries'], args.top)
+    print(f"\nimport app: median {median:.3f}s (min {min(seconds):.3f}s, max {max(seconds):.3f}s)")
+
+    loaded = sorted({m for r in runs for m in r['loaded']})
+    failures = []
+    if median > args.budget:
+        failures.append(f"median import {median:.3f}s exceeds the {args.budget:.2f}s budget")
+    if loaded:
+        failures.append(f"heavy modules loaded at import: {', '.join(loaded)}")
+
+    if failures:
+        print('\n✗ ' + '\n✗ '.join(failures))
+        sys.exit(1)
+    print(f"✓ Within budget; none of {len(forbid)} deferred modules loaded at import")
+
+
+if __name__ == '__main__':
+    main()
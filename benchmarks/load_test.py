@@ -0,0 +1,406 @@
+#!/usr/bin/env python3
+"""
+API Load Test
+Seeds a database (seed_load_data.py), starts the vendor stubs
+(stub_servers.py) and the app under gunicorn, then drives the API with
+concurrent users for a fixed duration:
+
+    GET  /api/sessions, /api/sessions/<id> (regular and one large session),
+         /api/leads, /api/analytics/dashboard, /api/campaigns
+    POST /api/lead-engine/generate   (--streams concurrent NDJSON streams)
+
+Reports throughput and client-side p50 / p95 / p99 per route, plus the
+server's own app / db time from the Server-Timing header, so queueing in
+front of the workers can be told apart from slow handlers. Stream rows report
+time to first event and full stream time.
+
+Save a run with --json and compare later runs against it with --baseline;
+the script exits 1 when a route's p95 regresses by more than
+--max-regression.
+
+Usage:
+    python benchmarks/load_test.py
+    python benchmarks/load_test.py --users 32 --duration 60 --workers 4 --threads 4
+    python benchmarks/load_test.py --streams 4 --stream-jobs 10 --time-scale 0.2
+    python benchmarks/load_test.py --json benchmarks/load_baseline.json
+    python benchmarks/load_test.py --baseline benchmarks/load_baseline.json --max-regression 0.2
+    python benchmarks/load_test.py --target http://localhost:5000 --skip-seed
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import requests
+
+from seed_load_data import add_scale_arguments, scale_from_args, seed_database
+from stub_servers import add_stub_arguments, stub_from_args
+
+# Route mix: name -> relative weight (read-heavy, like the dashboard pages)
+DEFAULT_MIX = {
+    'GET /api/sessions': 25,
+    'GET /api/sessions/<id>': 25,
+    'GET /api/sessions/<id> (large)': 5,
+    'GET /api/leads': 10,
+    'GET /api/analytics/dashboard': 15,
+    'GET /api/campaigns': 20,
+}
+
+STREAM_ROUTE = 'POST /api/lead-engine/generate'
+
+# p95 regressions smaller than this are treated as noise
+REGRESSION_FLOOR_MS = 5.0
+
+_SERVER_TIMING = re.compile(r'(\w[\w-]*);dur=([\d.]+)')
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+class Results:
+    """Latency samples per route (thread-safe)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples = defaultdict(list)
+        self.server = defaultdict(list)
+        self.db = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.first_event = []
+        self.stream_leads = 0
+
+    def add(self, route: str, seconds: float, ok: bool, server_timing: str = None):
+        timings = dict(_SERVER_TIMING.findall(server_timing or ''))
+        with self._lock:
+            self.samples[route].append(seconds)
+            if not ok:
+                self.errors[route] += 1
+            if 'app' in timings:
+                self.server[route].append(float(timings['app']) / 1000)
+            if 'db' in timings:
+                self.db[route].append(float(timings['db']) / 1000)
+
+    def add_stream(self, seconds: float, first_event: float, leads: int, ok: bool):
+        with self._lock:
+            self.samples[STREAM_ROUTE].append(seconds)
+            if first_event is not None:
+                self.first_event.append(first_event)
+            self.stream_leads += leads
+            if not ok:
+                self.errors[STREAM_ROUTE] += 1
+
+    def summary(self, elapsed: float) -> dict:
+        routes = {}
+        for route, durations in sorted(self.samples.items()):
+            ms = [d * 1000 for d in durations]
+            routes[route] = {
+                'count': len(ms),
+                'errors': self.errors[route],
+                'rps': round(len(ms) / elapsed, 2),
+                'p50_ms': round(percentile(ms, 50), 1),
+                'p95_ms': round(percentile(ms, 95), 1),
+                'p99_ms': round(percentile(ms, 99), 1),
+                'server_p95_ms': round(percentile(self.server[route], 95) * 1000, 1),
+                'db_avg_ms': round(sum(self.db[route]) / len(self.db[route]) * 1000, 1) if self.db[route] else 0.0,
+            }
+        if STREAM_ROUTE in routes:
+            routes[STREAM_ROUTE]['first_event_p95_ms'] = round(percentile(self.first_event, 95) * 1000, 1)
+            routes[STREAM_ROUTE]['leads'] = self.stream_leads
+        total = sum(r['count'] for r in routes.values())
+        return {'elapsed': round(elapsed, 2), 'requests': total, 'rps': round(total / elapsed, 2), 'routes': routes}
+
+
+class LoadDriver:
+    """Closed-loop virtual users against a running server"""
+
+    def __init__(self, base_url: str, seeded: dict, mix: dict, think_time: float = 0.0, seed: int = 7):
+        self.base_url = base_url.rstrip('/')
+        self.session_ids = [i for i in seeded['session_ids'] if i != seeded.get('large_session_id')] or [1]
+        self.large_session_id = seeded.get('large_session_id')
+        self.mix = {route: weight for route, weight in mix.items()
+                    if weight > 0 and (self.large_session_id or '(large)' not in route)}
+        self.think_time = think_time
+        self.seed = seed
+
+    def path_for(self, route: str, rng: random.Random) -> str:
+        if route == 'GET /api/sessions/<id> (large)':
+            return f"/api/sessions/{self.large_session_id}"
+        if route == 'GET /api/sessions/<id>':
+            return f"/api/sessions/{rng.choice(self.session_ids)}"
+        return route.split(' ', 1)[1]
+
+    def user(self, index: int, deadline: float, results: Results):
+        rng = random.Random(self.seed * 1000 + index)
+        http = requests.Session()
+        routes, weights = list(self.mix), list(self.mix.values())
+        while time.time() < deadline:
+            route = rng.choices(routes, weights)[0]
+            start = time.perf_counter()
+            try:
+                response = http.get(self.base_url + self.path_for(route, rng), timeout=120)
+                response.content
+                ok = response.status_code < 400
+                server_timing = response.headers.get('Server-Timing')
+            except requests.RequestException:
+                ok, server_timing = False, None
+            if results is not None:
+                results.add(route, time.perf_counter() - start, ok, server_timing)
+            if self.think_time:
+                time.sleep(rng.uniform(0, 2 * self.think_time))
+
+    def stream_user(self, index: int, deadline: float, results: Results, payload: dict):
+        """Start lead-engine streams back to back until the deadline (the last one runs to completion)"""
+        http = requests.Session()
+        while time.time() < deadline:
+            body = dict(payload, session_title=f"Load test stream {index}")
+            start = time.perf_counter()
+            first_event, leads, ok = None, 0, True
+            try:
+                with http.post(self.base_url + '/api/lead-engine/generate', json=body, stream=True,
+                               timeout=600) as response:
+                    ok = response.status_code < 400
+                    for line in response.iter_lines():
+                        if not line:
+                            continue
+                        if first_event is None:
+                            first_event = time.perf_counter() - start
+                        event = json.loads(line)
+                        if event.get('type') == 'lead':
+                            leads += 1
+                        elif event.get('type') in ('error', 'quota_exceeded'):
+                            ok = False
+            except (requests.RequestException, ValueError):
+                ok = False
+            results.add_stream(time.perf_counter() - start, first_event, leads, ok)
+
+    def run(self, users: int, duration: float, streams: int = 0, stream_payload: dict = None,
+            warmup: float = 0.0) -> dict:
+        if warmup:
+            self._run_users(users, time.time() + warmup, None)
+
+        results = Results()
+        deadline = time.time() + duration
+        threads = [threading.Thread(target=self.stream_user, args=(i, deadline, results, stream_payload),
+                                    daemon=True) for i in range(streams)]
+        start = time.time()
+        for thread in threads:
+            thread.start()
+        self._run_users(users, deadline, results)
+        for thread in threads:
+            thread.join()
+        return results.summary(time.time() - start)
+
+    def _run_users(self, users: int, deadline: float, results):
+        threads = [threading.Thread(target=self.user, args=(i, deadline, results), daemon=True)
+                   for i in range(users)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+
+class GunicornServer:
+    """The app under gunicorn in a subprocess, as deployed (Dockerfile CMD)"""
+
+    def __init__(self, env: dict, workdir: str, workers: int = 4, threads: int = 4, port: int = None):
+        self.port = port or free_port()
+        self.workdir = workdir
+        self.log_path = os.path.join(workdir, 'gunicorn.log')
+        self.command = [sys.executable, '-m', 'gunicorn', '--bind', f'127.0.0.1:{self.port}',
+                        '--workers', str(workers), '--threads', str(threads), '--timeout', '120',
+                        '--config', os.path.join(ROOT, 'gunicorn.conf.py'),
+                        '--chdir', workdir, '--pythonpath', ROOT, 'app:app']
+        self.env = {**os.environ, **env}
+        self.process = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def start(self, boot_timeout: float = 180) -> 'GunicornServer':
+        self._log = open(self.log_path, 'w')
+        self.process = subprocess.Popen(self.command, cwd=self.workdir, env=self.env,
+                                        stdout=self._log, stderr=subprocess.STDOUT)
+        deadline = time.time() + boot_timeout
+        while time.time() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"gunicorn exited with code {self.process.returncode}:\n{self.log_tail()}")
+            try:
+                if requests.get(self.base_url + '/api/sessions', timeout=5).status_code == 200:
+                    return self
+            except requests.RequestException:
+                pass
+            time.sleep(0.5)
+        self.stop()
+        raise RuntimeError(f"gunicorn did not answer within {boot_timeout:.0f}s:\n{self.log_tail()}")
+
+    def log_tail(self, lines: int = 30) -> str:
+        try:
+            with open(self.log_path) as f:
+                return ''.join(f.readlines()[-lines:])
+        except OSError:
+            return ''
+
+    def stop(self):
+        if self.process and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+        if self.process:
+            self._log.close()
+
+
+def discover_sessions(base_url: str) -> dict:
+    """Session ids of an existing database (--skip-seed); the one with most leads is the large session"""
+    sessions = requests.get(base_url.rstrip('/') + '/api/sessions', timeout=60).json().get('sessions', [])
+    sessions.sort(key=lambda s: s.get('total_leads') or 0)
+    return {'session_ids': [s['id'] for s in sessions],
+            'large_session_id': sessions[-1]['id'] if len(sessions) > 1 else None}
+
+
+def report(summary: dict):
+    print(f"\n{summary['requests']} requests in {summary['elapsed']:.1f}s ({summary['rps']:.1f} req/s)\n")
+    print(f"  {'route':<36} {'count':>6} {'err':>5} {'req/s':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}"
+          f" {'srv p95':>8} {'db avg':>7}")
+    for route, stats in summary['routes'].items():
+        print(f"  {route:<36} {stats['count']:>6} {stats['errors']:>5} {stats['rps']:>7.2f} {stats['p50_ms']:>8.0f}"
+              f" {stats['p95_ms']:>8.0f} {stats['p99_ms']:>8.0f} {stats['server_p95_ms']:>8.0f}"
+              f" {stats['db_avg_ms']:>7.1f}")
+    stream = summary['routes'].get(STREAM_ROUTE)
+    if stream:
+        print(f"\n  Streams: {stream['leads']} leads, first event p95 {stream['first_event_p95_ms']:.0f} ms")
+
+
+def compare(summary: dict, baseline: dict, max_regression: float) -> list:
+    """Routes whose p95 regressed beyond the allowed ratio"""
+    regressions = []
+    for route, stats in summary['routes'].items():
+        before = baseline.get('routes', {}).get(route)
+        if not before:
+            continue
+        limit = max(before['p95_ms'] * (1 + max_regression), before['p95_ms'] + REGRESSION_FLOOR_MS)
+        if stats['p95_ms'] > limit:
+            regressions.append((route, before['p95_ms'], stats['p95_ms']))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test the API under gunicorn against local vendor stubs')
+    parser.add_argument('--users', type=int, default=16, help='Concurrent virtual users on the read routes')
+    parser.add_argument('--duration', type=float, default=30, help='Measured seconds')
+    parser.add_argument('--warmup', type=float, default=3, help='Unmeasured seconds before the run')
+    parser.add_argument('--think-time', type=float, default=0.0, help='Mean pause between a user\'s requests')
+    parser.add_argument('--mix', action='append', default=[], metavar='ROUTE=WEIGHT',
+                        help=f"Override route weights, e.g. 'GET /api/leads=0' (routes: {', '.join(DEFAULT_MIX)})")
+    parser.add_argument('--streams', type=int, default=2, help='Concurrent /api/lead-engine/generate streams')
+    parser.add_argument('--stream-jobs', type=int, default=5, help='num_jobs per stream')
+    parser.add_argument('--workers', type=int, default=4, help='gunicorn workers')
+    parser.add_argument('--threads', type=int, default=4, help='gunicorn threads per worker (gthread)')
+    parser.add_argument('--database-url', help='Database to seed and serve (default: temporary SQLite file)')
+    parser.add_argument('--skip-seed', action='store_true', help='Use the database as it is')
+    parser.add_argument('--target', help='Load test an already running server instead of starting gunicorn')
+    parser.add_argument('--json', help='Write the results to this file')
+    parser.add_argument('--baseline', help='Results file from an earlier run to compare p95 against')
+    parser.add_argument('--max-regression', type=float, default=0.2, help='Allowed p95 increase (0.2 = +20%%)')
+    add_scale_arguments(parser)
+    add_stub_arguments(parser)
+    args = parser.parse_args()
+
+    mix = dict(DEFAULT_MIX)
+    for item in args.mix:
+        route, _, weight = item.rpartition('=')
+        if route not in mix:
+            parser.error(f"Unknown route in --mix: {route}")
+        mix[route] = float(weight)
+
+    workdir = tempfile.TemporaryDirectory()
+    database_url = args.database_url or f"sqlite:///{os.path.join(workdir.name, 'load.db')}"
+    stub = stub_from_args(args).start()
+    server = None
+
+    print('=' * 60)
+    print(f"API LOAD TEST - {args.users} users + {args.streams} streams for {args.duration:g}s")
+    print(f"Server: {args.target or f'gunicorn {args.workers} workers x {args.threads} threads'}, "
+          f"stubs at {stub.base_url} (x{args.time_scale:g} latency)")
+    print('=' * 60)
+
+    try:
+        if not args.skip_seed:
+            start = time.time()
+            seeded = seed_database(database_url, scale_from_args(args), seed=args.seed, days=args.days,
+                                   reset=bool(args.database_url))
+            counts = ', '.join(f"{table} {count:,}" for table, count in seeded['counts'].items())
+            print(f"\n[LOAD] Seeded {database_url} in {time.time() - start:.1f}s: {counts}")
+
+        if args.target:
+            base_url = args.target
+        else:
+            env = dict(stub.env(), DATABASE_URL=database_url, LOCAL_STORE_DIR=workdir.name,
+                       METRICS_DIR=os.path.join(workdir.name, 'metrics'))
+            server = GunicornServer(env, workdir.name, workers=args.workers, threads=args.threads).start()
+            base_url = server.base_url
+            print(f"[LOAD] gunicorn ready at {base_url}")
+        if args.skip_seed:
+            seeded = discover_sessions(base_url)
+
+        driver = LoadDriver(base_url, seeded, mix, think_time=args.think_time, seed=args.seed)
+        payload = {'job_titles': ['Data Engineer', 'Java Developer'], 'num_jobs': args.stream_jobs,
+                   'locations': ['United States']}
+        summary = driver.run(args.users, args.duration, streams=args.streams, stream_payload=payload,
+                             warmup=args.warmup)
+        summary['config'] = {key: getattr(args, key) for key in
+                             ('users', 'duration', 'streams', 'stream_jobs', 'workers', 'threads', 'seed',
+                              'time_scale', 'sessions', 'leads_per_session', 'large_session_leads',
+                              'pocs_per_lead', 'job_leads', 'campaigns')}
+        report(summary)
+    finally:
+        if server:
+            server.stop()
+        stub.stop()
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(summary, f, indent=2)
+        print(f"\n[LOAD] Results written to {args.json}")
+
+    workdir.cleanup()
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(summary, baseline, args.max_regression)
+        if regressions:
+            print(f"\n✗ p95 regressions (> {args.max_regression:.0%}):")
+            for route, before, after in regressions:
+                print(f"  {route}: {before:.0f} ms -> {after:.0f} ms")
+            sys.exit(1)
+        print(f"\n✓ No p95 regressions beyond {args.max_regression:.0%} of {args.baseline}")
+
+
+if __name__ == '__main__':
+    main()
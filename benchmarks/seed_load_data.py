@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Load-Test Data Seeder
+Fills a database with synthetic lead sessions, session leads (with POCs),
+job leads, campaigns and the email templates from seed_templates.py, at a
+configurable scale. The rows come from generate_scale_data.py (bulk COPY /
+executemany, no app.py import), sized for load_test.py: regular sessions
+plus one oversized session for the /api/sessions/<id> worst case.
+
+Rows are generated from --seed, so the same arguments always produce the same
+data (timestamps are spread over the --days before the run).
+
+Usage:
+    python benchmarks/seed_load_data.py --database-url sqlite:////tmp/load.db
+    python benchmarks/seed_load_data.py --database-url sqlite:////tmp/load.db --sessions 200 --large-session-leads 5000
+    python benchmarks/seed_load_data.py --database-url postgresql://localhost/loadtest --job-leads 100000 --reset
+"""
+
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from generate_scale_data import generate
+
+# Default scale: a busy account after a few months of use
+DEFAULT_SCALE = {
+    'sessions': 50,
+    'leads_per_session': 40,
+    'large_session_leads': 2000,
+    'pocs_per_lead': 3,
+    'job_leads': 20000,
+    'campaigns': 25,
+}
+
+
+def seed_database(database_url: str, scale: dict = None, seed: int = 7, days: int = 30,
+                  reset: bool = False) -> dict:
+    """
+    Seed a database for load testing
+
+    Args:
+        database_url: SQLAlchemy URL of the database to fill
+        scale: Row counts (keys of DEFAULT_SCALE); missing keys use the defaults
+        seed: Random seed - the same seed produces the same rows
+        days: Spread of created_at timestamps before today
+        reset: Drop and recreate all tables first
+
+    Returns:
+        Dict with the created ids ('large_session_id', 'session_ids', 'campaign_ids') and row counts
+    """
+    scale = {**DEFAULT_SCALE, **(scale or {})}
+    result = generate(database_url, {
+        'sender_accounts': 1,
+        'templates': 0,
+        'campaigns': scale['campaigns'],
+        'lead_sessions': scale['sessions'],
+        'session_leads': scale['sessions'] * scale['leads_per_session'],
+        'large_session_leads': scale['large_session_leads'],
+        'pocs_per_lead': scale['pocs_per_lead'],
+        'job_leads': scale['job_leads'],
+        'lead_email_states': 0,
+        'activity_logs': 0,
+    }, seed=seed, days=days, reset=reset)
+
+    # Ids are assigned sequentially by the generator; the large session comes last
+    session_ids = list(range(1, result['counts'].get('lead_session', 0) + 1))
+    return {
+        'large_session_id': session_ids[-1] if scale['large_session_leads'] and session_ids else None,
+        'session_ids': session_ids,
+        'campaign_ids': list(range(1, scale['campaigns'] + 1)),
+        'counts': result['counts'],
+    }
+
+
+def add_scale_arguments(parser):
+    """Row-count options shared with load_test.py (which takes --seed from the stub options)"""
+    parser.add_argument('--sessions', type=int, default=DEFAULT_SCALE['sessions'], help='Regular lead sessions')
+    parser.add_argument('--leads-per-session', type=int, default=DEFAULT_SCALE['leads_per_session'])
+    parser.add_argument('--large-session-leads', type=int, default=DEFAULT_SCALE['large_session_leads'],
+                        help='Leads in one extra oversized session (0 to skip)')
+    parser.add_argument('--pocs-per-lead', type=int, default=DEFAULT_SCALE['pocs_per_lead'])
+    parser.add_argument('--job-leads', type=int, default=DEFAULT_SCALE['job_leads'])
+    parser.add_argument('--campaigns', type=int, default=DEFAULT_SCALE['campaigns'])
+    parser.add_argument('--days', type=int, default=30, help='Spread of created_at timestamps (days)')
+
+
+def scale_from_args(args) -> dict:
+    return {key: getattr(args, key) for key in DEFAULT_SCALE}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Seed a database with synthetic data for load testing')
+    parser.add_argument('--database-url', required=True, help='SQLAlchemy URL, e.g. sqlite:////tmp/load.db')
+    parser.add_argument('--reset', action='store_true', help='Drop and recreate all tables first')
+    parser.add_argument('--seed', type=int, default=7, help='Random seed for reproducible data')
+    add_scale_arguments(parser)
+    args = parser.parse_args()
+
+    print('=' * 60)
+    print(f"SEEDING LOAD-TEST DATA - {args.database_url} (seed {args.seed})")
+    print('=' * 60)
+    start = time.time()
+    result = seed_database(args.database_url, scale_from_args(args), seed=args.seed, days=args.days,
+                           reset=args.reset)
+    elapsed = time.time() - start
+
+    for table, count in result['counts'].items():
+        print(f"  {table:<16} {count:>9,}")
+    total = sum(result['counts'].values())
+    print(f"\n✓ Seeded {total:,} rows in {elapsed:.1f}s ({total / max(elapsed, 1e-9):,.0f} rows/s)")
+    if result['large_session_id']:
+        print(f"  Large session id: {result['large_session_id']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,623 @@
+#!/usr/bin/env python3
+"""
+Offline Vendor Stub Servers
+One local aiohttp server emulating the vendor endpoints the lead pipeline
+calls, so throughput can be measured without spending credits:
+
+    Apollo   POST /api/v1/mixed_companies/search, GET /api/v1/organizations/enrich,
+             POST /api/v1/people/search, /api/v1/people/match, /api/v1/people/bulk_match
+    Google   GET  /customsearch/v1   (job board pages from the fixture corpus,
+                                      LinkedIn profile results for people queries)
+    Ollama   POST /api/generate
+    Graph    POST /v1.0/users/{user}/sendMail
+
+Each vendor group gets a latency distribution, an error rate (HTTP 500) and
+a rate-limit rate (HTTP 429). Responses are deterministic per request.
+
+Modes:
+    synthetic  Generate every response (default)
+    record     Proxy to the real vendors and save responses to a cassette
+               (credentials are forwarded, never stored)
+    replay     Serve cassette responses with the configured latencies; requests
+               missing from the cassette fall back to synthetic responses
+
+Point the app at it with APOLLO_BASE_URL, GOOGLE_CSE_URL (.../customsearch/v1),
+OLLAMA_BASE_URL and GRAPH_BASE_URL.
+
+Usage:
+    python benchmarks/stub_servers.py --port 8765
+    python benchmarks/stub_servers.py --latency apollo=lognormal:0.4:1.5 --rate-limit apollo=0.05
+    python benchmarks/stub_servers.py --mode record --cassette benchmarks/fixtures/vendor_cassette.jsonl.gz
+    python benchmarks/stub_servers.py --mode replay --cassette benchmarks/fixtures/vendor_cassette.jsonl.gz
+"""
+
+import argparse
+import asyncio
+import gzip
+import hashlib
+import json
+import math
+import os
+import random
+import re
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+from aiohttp import web, ClientSession, ClientTimeout
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CSE_CORPUS = os.path.join(ROOT, 'benchmarks', 'fixtures', 'cse_job_items.jsonl.gz')
+
+GROUPS = ('apollo', 'google_cse', 'ollama', 'graph')
+
+# Where record mode forwards each group
+UPSTREAMS = {
+    'apollo': 'https://api.apollo.io',
+    'google_cse': 'https://www.googleapis.com',
+    'ollama': 'http://localhost:11434',
+    'graph': 'https://graph.microsoft.com',
+}
+
+# Typical latencies of the real services (median, p95 seconds)
+DEFAULT_LATENCY = {
+    'apollo': 'lognormal:0.35:1.2',
+    'google_cse': 'lognormal:0.3:0.9',
+    'ollama': 'lognormal:1.5:4',
+    'graph': 'lognormal:0.25:0.8',
+}
+
+# Request fields that carry credentials - forwarded upstream, left out of cassette keys
+SECRET_FIELDS = {'api_key', 'key', 'x-api-key', 'access_token'}
+
+BOARD_SITES = {
+    'linkedin.com/jobs': 'LinkedIn',
+    'indeed.com': 'Indeed',
+    'glassdoor.com': 'Glassdoor',
+    'naukri.com': 'Naukri',
+}
+
+INDUSTRIES = ['Information Technology', 'Computer Software', 'Financial Services', 'Staffing & Recruiting',
+              'Hospital & Health Care', 'Manufacturing', 'Management Consulting', 'Internet']
+CITIES = [('Austin', 'Texas', 'United States'), ('Chicago', 'Illinois', 'United States'),
+          ('Pune', 'Maharashtra', 'India'), ('Bengaluru', 'Karnataka', 'India'),
+          ('London', 'England', 'United Kingdom'), ('Toronto', 'Ontario', 'Canada')]
+FIRST_NAMES = ['Ana', 'Ben', 'Priya', 'Chen', 'Marcus', 'Fatima', 'Rahul', 'Sofia', 'James', 'Aisha',
+               'Daniel', 'Meera', 'Lucas', 'Olivia', 'Arjun', 'Grace']
+LAST_NAMES = ['Sharma', 'Nguyen', 'Patel', 'Garcia', 'Smith', 'Khan', 'Müller', 'Rossi', 'Okafor',
+              'Iyer', 'Johnson', 'Kim', 'Silva', 'Cohen']
+SENIOR_TITLES = ['Head of Talent Acquisition', 'HR Manager', 'Engineering Manager', 'VP Engineering',
+                 'CTO', 'Senior Recruiter', 'Director of Operations', 'COO', 'VP Sales', 'Talent Partner']
+EMAIL_STATUSES = ['verified'] * 6 + ['guessed'] * 2 + ['unavailable']
+
+
+# ============================================================
+# Latency and fault injection
+# ============================================================
+
+class Latency:
+    """
+    Latency distribution parsed from a spec string
+
+    fixed:S, uniform:LOW:HIGH or lognormal:MEDIAN:P95 (seconds)
+    """
+
+    def __init__(self, spec: str):
+        self.spec = spec
+        kind, *values = spec.split(':')
+        values = [float(v) for v in values]
+        if kind == 'fixed' and len(values) == 1:
+            self.sample = lambda rng: values[0]
+        elif kind == 'uniform' and len(values) == 2:
+            self.sample = lambda rng: rng.uniform(*values)
+        elif kind == 'lognormal' and len(values) == 2:
+            median, p95 = values
+            sigma = math.log(max(p95, median * 1.0001) / median) / 1.645 if median > 0 else 0.0
+            self.sample = lambda rng: rng.lognormvariate(math.log(median), sigma) if median > 0 else 0.0
+        else:
+            raise ValueError(f"Bad latency spec '{spec}' (fixed:S, uniform:LOW:HIGH or lognormal:MEDIAN:P95)")
+
+
+class StubConfig:
+    """Per-group latency, error and 429 rates"""
+
+    def __init__(self, latency: Dict[str, str] = None, error_rate: Dict[str, float] = None,
+                 rate_limit_rate: Dict[str, float] = None, people_empty_rate: float = 0.2,
+                 time_scale: float = 1.0, seed: int = 7):
+        """
+        Args:
+            latency: group -> latency spec (defaults to DEFAULT_LATENCY)
+            error_rate: group -> share of requests answered with HTTP 500
+            rate_limit_rate: group -> share of requests answered with HTTP 429
+            people_empty_rate: Share of companies whose Apollo people search is empty
+                (exercises the Google senior-name + people/match fallback)
+            time_scale: Multiplier on every sampled latency (0 = no delay)
+            seed: Seed for latency and fault sampling
+        """
+        specs = dict(DEFAULT_LATENCY, **(latency or {}))
+        self.latency = {group: Latency(spec) for group, spec in specs.items()}
+        self.error_rate = defaultdict(float, error_rate or {})
+        self.rate_limit_rate = defaultdict(float, rate_limit_rate or {})
+        self.people_empty_rate = people_empty_rate
+        self.time_scale = time_scale
+        self.rng = random.Random(seed)
+
+
+def parse_group_values(values: List[str], cast=float) -> Dict:
+    """['0.01', 'apollo=0.05'] -> {'apollo': 0.05, <every other group>: 0.01}"""
+    result = {}
+    for value in values or []:
+        if '=' in value:
+            group, value = value.split('=', 1)
+            if group not in GROUPS:
+                raise ValueError(f"Unknown group '{group}' (one of {', '.join(GROUPS)})")
+            result[group] = cast(value)
+        else:
+            for group in GROUPS:
+                result.setdefault(group, cast(value))
+    return result
+
+
+def _seeded(*parts) -> random.Random:
+    """RNG seeded from request content, so the same request gets the same answer"""
+    digest = hashlib.sha1('|'.join(str(p) for p in parts).encode()).hexdigest()
+    return random.Random(int(digest[:12], 16))
+
+
+def _slug(name: str) -> str:
+    return re.sub(r'[^a-z0-9]+', '', name.lower().replace('&', 'and'))[:30] or 'company'
+
+
+# ============================================================
+# Synthetic responses
+# ============================================================
+
+def synth_organization(name: str, domain: str = None) -> Dict:
+    domain = domain or f"{_slug(name)}.com"
+    rng = _seeded('org', domain)
+    city, state, country = rng.choice(CITIES)
+    return {
+        'id': hashlib.md5(domain.encode()).hexdigest()[:24],
+        'name': name or domain.split('.')[0].title(),
+        'primary_domain': domain,
+        'website_url': f'https://www.{domain}',
+        'linkedin_url': f'https://www.linkedin.com/company/{domain.split(".")[0]}',
+        'estimated_num_employees': rng.choice([12, 40, 85, 150, 320, 750, 1800, 5200, 24000]),
+        'industry': rng.choice(INDUSTRIES),
+        'founded_year': rng.randint(1970, 2020),
+        'city': city, 'state': state, 'country': country,
+        'keywords': ['staffing', 'software'],
+        'annual_revenue': rng.randint(1, 900) * 1_000_000,
+        'annual_revenue_printed': f"{rng.randint(1, 900)}M",
+    }
+
+
+def synth_person(domain: str, index: int, with_email: bool, rng: random.Random) -> Dict:
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    status = rng.choice(EMAIL_STATUSES)
+    person = {
+        'id': hashlib.md5(f"{domain}:{index}:{first}{last}".encode()).hexdigest()[:24],
+        'first_name': first, 'last_name': last, 'name': f"{first} {last}",
+        'title': rng.choice(SENIOR_TITLES),
+        'linkedin_url': f"https://www.linkedin.com/in/{first.lower()}-{last.lower()}-{index}",
+        'email_status': status,
+        'organization': {'name': domain.split('.')[0].title(), 'primary_domain': domain},
+        'organization_name': domain.split('.')[0].title(),
+        'seniority': 'director', 'departments': ['master_human_resources'],
+        'phone_numbers': [],
+    }
+    if not with_email:
+        person['email'] = None  # Searches don't reveal emails
+    elif status != 'unavailable':
+        person['email'] = f"{first.lower()}.{last.lower()}@{domain}"
+    else:
+        person['email'] = ''
+    return person
+
+
+class SyntheticVendors:
+    """Deterministic responses shaped like the real vendor APIs"""
+
+    def __init__(self, config: StubConfig, corpus_path: str = CSE_CORPUS):
+        self.config = config
+        self.board_items: Dict[str, List[Dict]] = defaultdict(list)
+        if os.path.exists(corpus_path):
+            with gzip.open(corpus_path, 'rt', encoding='utf-8') as f:
+                for line in f:
+                    row = json.loads(line)
+                    self.board_items[row['source']].append(row['item'])
+
+    def apollo(self, path: str, params: Dict, body: Dict) -> Dict:
+        if path.endswith('/mixed_companies/search'):
+            name = body.get('q_organization_name', '')
+            rng = _seeded('companies', name.lower())
+            count = min(body.get('per_page', 10), rng.choice([0, 1, 2, 3, 3, 3]))
+            orgs = [synth_organization(name if i == 0 else f"{name} {suffix}")
+                    for i, suffix in zip(range(count), ('', 'Group', 'Holdings'))]
+            return {'organizations': orgs, 'pagination': {'page': 1, 'total_entries': len(orgs)}}
+
+        if path.endswith('/organizations/enrich'):
+            domain = params.get('domain', '')
+            name = domain.split('.')[0].title()
+            return {'organization': synth_organization(name, domain)}
+
+        if path.endswith('/people/search'):
+            domains = body.get('organization_domains') or []
+            domain = domains[0] if domains else None
+            if domain is None:
+                # Title search across companies (JobOpeningSearchService fallback)
+                rng = _seeded('people', json.dumps(body, sort_keys=True))
+                people = []
+                for i in range(min(body.get('per_page', 25), 25)):
+                    org = synth_organization(f"{rng.choice(LAST_NAMES)} {rng.choice(['Labs', 'Systems', 'Group'])}")
+                    person = synth_person(org['primary_domain'], i, False, rng)
+                    person['organization'] = org
+                    people.append(person)
+                return {'people': people}
+            rng = _seeded('people', domain)
+            if rng.random() < self.config.people_empty_rate:
+                return {'people': []}
+            count = min(body.get('per_page', 10), rng.randint(2, 8))
+            return {'people': [synth_person(domain, i, False, rng) for i in range(count)]}
+
+        if path.endswith('/people/bulk_match'):
+            matches = []
+            for detail in body.get('details', []):
+                domain = detail.get('domain') or 'example.com'
+                rng = _seeded('match', detail.get('id') or detail.get('name'), domain)
+                person = synth_person(domain, 0, True, rng)
+                for field in ('id', 'name', 'first_name', 'last_name'):
+                    if detail.get(field):
+                        person[field] = detail[field]
+                if person['email'] and detail.get('first_name') and detail.get('last_name'):
+                    person['email'] = f"{detail['first_name'].lower()}.{detail['last_name'].lower()}@{domain}"
+                matches.append(person)
+            return {'matches': matches, 'credits_consumed': len(matches)}
+
+        if path.endswith('/people/match'):
+            domain = body.get('domain') or 'example.com'
+            rng = _seeded('match', body.get('id'), body.get('first_name'), body.get('last_name'), domain)
+            if rng.random() < 0.15:
+                return {'person': None}
+            person = synth_person(domain, 0, True, rng)
+            if body.get('first_name') and body.get('last_name'):
+                person.update(first_name=body['first_name'], last_name=body['last_name'],
+                              name=f"{body['first_name']} {body['last_name']}")
+                if person['email']:
+                    person['email'] = f"{body['first_name'].lower()}.{body['last_name'].lower()}@{domain}"
+            return {'person': person}
+
+        return None
+
+    def google_cse(self, params: Dict) -> Dict:
+        query = params.get('q', '')
+        start = int(params.get('start', 1))
+        num = min(int(params.get('num', 10)), 10)
+        site = re.search(r'site:(\S+)', query)
+        source = BOARD_SITES.get(site.group(1)) if site else None
+
+        if source and self.board_items.get(source):
+            # Job board page: a query-specific window over the board's corpus, 100 results max
+            items = self.board_items[source]
+            if start > 91:
+                return {'items': []}
+            offset = _seeded('cse', query).randrange(len(items))
+            page = [items[(offset + start - 1 + i) % len(items)] for i in range(num)]
+            return {'items': page, 'searchInformation': {'totalResults': '100'}}
+
+        # People query ('"Company" "VP" ... site:linkedin.com'): LinkedIn profile results
+        company = re.search(r'"([^"]+)"', query)
+        company = company.group(1) if company else 'Company'
+        rng = _seeded('profiles', query, start)
+        items = []
+        for i in range(rng.randint(0, num)):
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            items.append({
+                'title': f"{first} {last} - {rng.choice(SENIOR_TITLES)} - {company} | LinkedIn",
+                'link': f"https://www.linkedin.com/in/{first.lower()}-{last.lower()}-{rng.randint(100, 999)}",
+                'snippet': f"{first} {last}. {rng.choice(SENIOR_TITLES)} at {company}.",
+                'displayLink': 'www.linkedin.com',
+            })
+        return {'items': items} if items else {'searchInformation': {'totalResults': '0'}}
+
+    def ollama(self, body: Dict) -> Dict:
+        prompt = body.get('prompt', '')
+        items = re.findall(r'Item (\d+):', prompt)
+        verdict = {'relevant': True, 'confidence': 0.8, 'reason': 'stub', 'category': 'decision_maker'}
+        if items:
+            text = json.dumps([dict(verdict, index=int(i)) for i in items])
+        else:
+            text = json.dumps(verdict)
+        return {'model': body.get('model', 'stub'), 'response': text, 'done': True}
+
+
+# ============================================================
+# Cassettes (record / replay)
+# ============================================================
+
+def _strip_secrets(value):
+    if isinstance(value, dict):
+        return {k: _strip_secrets(v) for k, v in value.items() if k.lower() not in SECRET_FIELDS}
+    if isinstance(value, list):
+        return [_strip_secrets(v) for v in value]
+    return value
+
+
+def request_key(method: str, path: str, params: Dict, body) -> str:
+    canonical = json.dumps([method, path, _strip_secrets(params), _strip_secrets(body)], sort_keys=True)
+    return hashlib.sha1(canonical.encode()).hexdigest()
+
+
+class Cassette:
+    """Recorded responses keyed by request_key (gzipped JSON lines)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.responses: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                for line in f:
+                    entry = json.loads(line)
+                    self.responses[entry['key']] = entry
+
+    def get(self, key: str) -> Optional[Dict]:
+        return self.responses.get(key)
+
+    def add(self, key: str, group: str, method: str, path: str, status: int, body):
+        entry = {'key': key, 'group': group, 'method': method, 'path': path, 'status': status, 'body': body}
+        with self._lock:
+            self.responses[key] = entry
+            with gzip.open(self.path, 'at', encoding='utf-8') as f:
+                f.write(json.dumps(entry) + '\n')
+
+
+# ============================================================
+# Server
+# ============================================================
+
+def endpoint_group(path: str) -> Optional[str]:
+    """Vendor group served at a path"""
+    if path.startswith(('/api/v1/', '/v1/organizations')):
+        return 'apollo'
+    if path.startswith('/customsearch/'):
+        return 'google_cse'
+    if path == '/api/generate':
+        return 'ollama'
+    if path.startswith('/v1.0/'):
+        return 'graph'
+    return None
+
+
+class VendorStubServer:
+    """All vendor stubs on one port, served from a background thread"""
+
+    def __init__(self, config: StubConfig = None, mode: str = 'synthetic', cassette: str = None,
+                 host: str = '127.0.0.1', port: int = 0):
+        """
+        Args:
+            config: Latency / fault settings
+            mode: 'synthetic', 'record' or 'replay'
+            cassette: Cassette path (required for record and replay)
+            host: Bind address
+            port: Port (0 = any free port)
+        """
+        if mode not in ('synthetic', 'record', 'replay'):
+            raise ValueError(f"Unknown mode '{mode}'")
+        if mode != 'synthetic' and not cassette:
+            raise ValueError(f"--cassette is required in {mode} mode")
+        self.config = config or StubConfig()
+        self.mode = mode
+        self.cassette = Cassette(cassette) if cassette else None
+        self.synthetic = SyntheticVendors(self.config)
+        self.host = host
+        self.port = port
+        self.stats = defaultdict(lambda: defaultdict(int))
+        self._loop = None
+        self._runner = None
+        self._thread = None
+        self._upstream = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def env(self) -> Dict[str, str]:
+        """Environment variables that point the app's clients at this server"""
+        return {
+            'APOLLO_BASE_URL': self.base_url,
+            'GOOGLE_CSE_URL': f"{self.base_url}/customsearch/v1",
+            'OLLAMA_BASE_URL': self.base_url,
+            'GRAPH_BASE_URL': self.base_url,
+        }
+
+    def reset_stats(self):
+        self.stats.clear()
+
+    # ==================== LIFECYCLE ====================
+
+    def start(self) -> 'VendorStubServer':
+        ready = threading.Event()
+        errors = []
+
+        def run():
+            self._loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(self._loop)
+            try:
+                self._loop.run_until_complete(self._start_site())
+            except Exception as e:
+                errors.append(e)
+                ready.set()
+                return
+            ready.set()
+            self._loop.run_forever()
+
+        self._thread = threading.Thread(target=run, name='vendor-stubs', daemon=True)
+        self._thread.start()
+        ready.wait()
+        if errors:
+            raise errors[0]
+        return self
+
+    async def _start_site(self):
+        app = web.Application(client_max_size=16 * 1024 * 1024)
+        app.router.add_route('*', '/{path:.*}', self.handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        self.port = self._runner.addresses[0][1]
+
+    def stop(self):
+        if self._loop is None:
+            return
+
+        async def cleanup():
+            if self._upstream is not None:
+                await self._upstream.close()
+            await self._runner.cleanup()
+
+        asyncio.run_coroutine_threadsafe(cleanup(), self._loop).result(10)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(10)
+        self._loop = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # ==================== REQUESTS ====================
+
+    async def handle(self, request: web.Request) -> web.Response:
+        path = request.path
+        group = endpoint_group(path)
+        if group is None:
+            return web.json_response({'error': f'No stub for {path}'}, status=404)
+
+        params = dict(request.query)
+        raw = await request.read()
+        try:
+            body = json.loads(raw) if raw else {}
+        except ValueError:
+            body = {}
+
+        stats = self.stats[f"{request.method} {path if group != 'graph' else '/v1.0/users/:id/sendMail'}"]
+        stats['calls'] += 1
+        config = self.config
+        await asyncio.sleep(config.latency[group].sample(config.rng) * config.time_scale)
+
+        # Faults are injected before record/replay so every mode exercises the retry paths
+        roll = config.rng.random()
+        if roll < config.rate_limit_rate[group]:
+            stats['429'] += 1
+            return web.json_response({'error': {'code': 429, 'message': 'Rate limit exceeded (stub)',
+                                                'errors': [{'reason': 'rateLimitExceeded'}]}},
+                                     status=429, headers={'Retry-After': '1'})
+        if roll < config.rate_limit_rate[group] + config.error_rate[group]:
+            stats['500'] += 1
+            return web.json_response({'error': 'Internal error (stub)'}, status=500)
+
+        key = request_key(request.method, path, params, body)
+        if self.mode == 'record':
+            status, payload = await self._forward(group, request, raw)
+            if status < 500 and status != 429:
+                self.cassette.add(key, group, request.method, path, status, payload)
+            stats['recorded'] += 1
+            return web.json_response(payload, status=status)
+
+        if self.mode == 'replay':
+            entry = self.cassette.get(key)
+            if entry is not None:
+                stats['replayed'] += 1
+                return web.json_response(entry['body'], status=entry['status'])
+            stats['replay_miss'] += 1
+
+        return self._synthesize(group, request.method, path, params, body)
+
+    def _synthesize(self, group: str, method: str, path: str, params: Dict, body: Dict) -> web.Response:
+        if group == 'apollo':
+            payload = self.synthetic.apollo(path, params, body)
+            if payload is None:
+                return web.json_response({'error': f'No stub for {path}'}, status=404)
+            return web.json_response(payload)
+        if group == 'google_cse':
+            return web.json_response(self.synthetic.google_cse(params))
+        if group == 'ollama':
+            return web.json_response(self.synthetic.ollama(body))
+        # Graph sendMail answers 202 with no body
+        return web.Response(status=202)
+
+    async def _forward(self, group: str, request: web.Request, raw: bytes):
+        if self._upstream is None:
+            self._upstream = ClientSession(timeout=ClientTimeout(total=120))
+        headers = {k: v for k, v in request.headers.items()
+                   if k.lower() in ('content-type', 'x-api-key', 'authorization', 'cache-control')}
+        url = f"{UPSTREAMS[group]}{request.path}"
+        async with self._upstream.request(request.method, url, params=request.query, data=raw or None,
+                                          headers=headers) as response:
+            text = await response.text()
+            try:
+                payload = json.loads(text) if text else {}
+            except ValueError:
+                payload = {'raw': text}
+            return response.status, payload
+
+    def summary(self) -> Dict[str, Dict[str, int]]:
+        return {endpoint: dict(counts) for endpoint, counts in sorted(self.stats.items())}
+
+
+def add_stub_arguments(parser: argparse.ArgumentParser):
+    """Stub options shared by this script and the benchmarks that start a stub"""
+    parser.add_argument('--latency', action='append', default=[], metavar='GROUP=SPEC',
+                        help='Latency per group: fixed:S, uniform:LOW:HIGH or lognormal:MEDIAN:P95')
+    parser.add_argument('--error-rate', action='append', default=[], metavar='[GROUP=]RATE',
+                        help='Share of requests answered with HTTP 500')
+    parser.add_argument('--rate-limit', action='append', default=[], metavar='[GROUP=]RATE',
+                        help='Share of requests answered with HTTP 429')
+    parser.add_argument('--people-empty-rate', type=float, default=0.2,
+                        help='Share of companies with no Apollo people search results')
+    parser.add_argument('--time-scale', type=float, default=1.0, help='Multiplier on all stub latencies')
+    parser.add_argument('--mode', choices=('synthetic', 'record', 'replay'), default='synthetic')
+    parser.add_argument('--cassette', help='Cassette file for record / replay (.jsonl.gz)')
+    parser.add_argument('--seed', type=int, default=7)
+
+
+def stub_from_args(args, port: int = 0) -> VendorStubServer:
+    config = StubConfig(
+        latency=parse_group_values(args.latency, str),
+        error_rate=parse_group_values(args.error_rate),
+        rate_limit_rate=parse_group_values(args.rate_limit),
+        people_empty_rate=args.people_empty_rate,
+        time_scale=args.time_scale,
+        seed=args.seed,
+    )
+    return VendorStubServer(config, mode=args.mode, cassette=args.cassette, port=port)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run local Apollo / Google CSE / Ollama / Graph stubs')
+    parser.add_argument('--port', type=int, default=8765)
+    add_stub_arguments(parser)
+    args = parser.parse_args()
+
+    server = stub_from_args(args, port=args.port).start()
+    print('=' * 60)
+    print(f"VENDOR STUBS ({args.mode}) listening on {server.base_url}")
+    for name, value in server.env().items():
+        print(f"  export {name}={value}")
+    print('=' * 60)
+    try:
+        while True:
+            time.sleep(30)
+            for endpoint, counts in server.summary().items():
+                print(f"  {endpoint}: {counts}")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
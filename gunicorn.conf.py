@@ -0,0 +1,35 @@
+"""
+Gunicorn Settings and Server Hooks
+Picked up automatically when gunicorn starts in the project root (Dockerfile
+CMD, startup.sh); elsewhere pass it with --config. Command-line flags still
+override the settings here.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# Threaded workers: concurrent requests in a worker share its model batchers
+# (seq2seq_inference, embeddings), so their prompts can meet in one batch.
+# Sync workers serve one request at a time and every batch would have size 1.
+worker_class = 'gthread'
+threads = int(os.getenv('GUNICORN_THREADS', '4'))
+
+
+def on_starting(server):
+    """Drop metrics snapshots left by earlier runs - their workers are gone"""
+    from services.request_metrics import clear_snapshots
+    clear_snapshots()
+
+
+def child_exit(server, worker):
+    """Keep an exited worker's counters in /api/metrics (folded into the dead-workers snapshot)"""
+    from services.request_metrics import retire_snapshot
+    retire_snapshot(worker.pid)
+
+
+def post_worker_init(worker):
+    """Start the campaign scheduler once the worker has forked and loaded the app"""
+    from app import start_scheduler
+    start_scheduler()
@@ -102,6 +102,40 @@ class LeadEmailState(db.Model):
     __table_args__ = (db.UniqueConstraint('campaign_id', 'lead_email', name='unique_campaign_lead_email'),)
 
 
+class LeadPersonalizedEmail(db.Model):
+    """AI-personalized variant of a sequence step for one lead"""
+    __tablename__ = 'lead_personalized_email'
+    id = db.Column(db.Integer, primary_key=True)
+    campaign_id = db.Column(db.Integer, db.ForeignKey('campaign.id'), nullable=False)
+    step_number = db.Column(db.Integer, nullable=False, default=1)
+    lead_email = db.Column(db.String(200), nullable=False)
+    lead_name = db.Column(db.String(200))
+    lead_company = db.Column(db.String(200))
+    lead_title = db.Column(db.String(200))
+    subject = db.Column(db.Text)
+    body = db.Column(db.Text)
+    changes_made = db.Column(db.Text)  # JSON array
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    __table_args__ = (db.UniqueConstraint('campaign_id', 'step_number', 'lead_email', name='unique_step_lead_variant'),)
+
+    def to_dict(self):
+        import json
+        return {
+            'id': self.id,
+            'campaign_id': self.campaign_id,
+            'step_number': self.step_number,
+            'lead_email': self.lead_email,
+            'lead_name': self.lead_name,
+            'lead_company': self.lead_company,
+            'lead_title': self.lead_title,
+            'subject': self.subject,
+            'body': self.body,
+            'changes_made': json.loads(self.changes_made) if self.changes_made else [],
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }
+
+
 class EmailSendLog(db.Model):
     """Log of all emails sent"""
     __tablename__ = 'email_send_log'
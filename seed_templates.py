@@ -1,23 +1,12 @@
 """Seed email templates for AI Client Discovery"""
-from app import app, db
-from models import EmailTemplate
+from models import db, EmailTemplate
 
-def seed_templates():
-    """Seed the database with pre-built email templates"""
-    with app.app_context():
-        # Check if templates already exist
-        if EmailTemplate.query.count() > 1:
-            print(f"✓ Templates already exist ({EmailTemplate.query.count()} templates)")
-            return
-
-        print("Seeding email templates...")
-
-        templates = [
-            # ============ Manufacturing A - Direct Decision Maker (4 emails) ============
-            {
-                'name': 'Manufacturing A - Day 1 (Opener)',
-                'subject_template': 'Quick question about {{CompanyName}}\'s hiring',
-                'body_template': '''Hi {{FirstName}},
+TEMPLATES = [
+    # ============ Manufacturing A - Direct Decision Maker (4 emails) ============
+    {
+        'name': 'Manufacturing A - Day 1 (Opener)',
+        'subject_template': 'Quick question about {{CompanyName}}\'s hiring',
+        'body_template': '''Hi {{FirstName}},
 
 I noticed {{CompanyName}} and wanted to reach out quickly.
 
@@ -27,12 +16,12 @@ Would it make sense to connect for 10 minutes this week?
 
 Best,
 {{SenderName}}''',
-                'is_default': False
-            },
-            {
-                'name': 'Manufacturing A - Day 3 (Follow-up)',
-                'subject_template': 'Re: {{CompanyName}} hiring',
-                'body_template': '''Hi {{FirstName}},
+        'is_default': False
+    },
+    {
+        'name': 'Manufacturing A - Day 3 (Follow-up)',
+        'subject_template': 'Re: {{CompanyName}} hiring',
+        'body_template': '''Hi {{FirstName}},
 
 Following up from Monday. I know hiring {{JobTitle}} roles in manufacturing can be time-consuming.
 
@@ -41,12 +30,12 @@ We currently have 3 candidates who match your industry - all with 5+ years exper
 Would Thursday or Friday work for a brief call?
 
 {{SenderName}}''',
-                'is_default': False
-            },
-            {
-                'name': 'Manufacturing A - Day 7 (Value)',
-                'subject_template': 'Top {{JobTitle}} candidates available',
-                'body_template': '''{{FirstName}},
+        'is_default': False
+    },
+    {
+        'name': 'Manufacturing A - Day 7 (Value)',
+        'subject_template': 'Top {{JobTitle}} candidates available',
+        'body_template': '''{{FirstName}},
 
 Quick update: We just placed two {{JobTitle}} professionals at companies similar to {{CompanyName}}.
 
@@ -56,12 +45,12 @@ If you're hiring or planning to soon, let's connect. I can share profiles that m
 
 Thanks,
 {{SenderName}}''',
-                'is_default': False
-            },
-            {
-                'name': 'Manufacturing A - Day 11 (Breakup)',
-                'subject_template': 'Should I close your file?',
-                'body_template': '''Hi {{FirstName}},
+        'is_default': False
+    },
+    {
+        'name': 'Manufacturing A - Day 11 (Breakup)',
+        'subject_template': 'Should I close your file?',
+        'body_template': '''Hi {{FirstName}},
 
 Haven't heard back, so I'll assume the timing isn't right.
 
@@ -70,14 +59,14 @@ If things change and you need {{JobTitle}} candidates down the road, feel free t
 Best of luck with your hiring!
 
 {{SenderName}}''',
-                'is_default': False
-            },
+        'is_default': False
+    },
 
-            # ============ Manufacturing B - Multi-Touch (4 emails) ============
-            {
-                'name': 'Manufacturing B - Day 1 (Opener)',
-                'subject_template': '{{CompanyName}} - Manufacturing talent',
-                'body_template': '''Hi {{FirstName}},
+    # ============ Manufacturing B - Multi-Touch (4 emails) ============
+    {
+        'name': 'Manufacturing B - Day 1 (Opener)',
+        'subject_template': '{{CompanyName}} - Manufacturing talent',
+        'body_template': '''Hi {{FirstName}},
 
 I work with manufacturing companies on {{JobTitle}} placements.
 
@@ -86,12 +75,12 @@ We have candidates with experience in {{CompanyName}}'s industry who are looking
 Would you be open to a quick intro call this week?
 
 {{SenderName}}''',
-                'is_default': False
-            },
-            {
-                'name': 'Manufacturing B - Day 3 (Follow-up)',
-                'subject_template': 'Re: Manufacturing talent',
-                'body_template': '''{{FirstName}},
+        'is_default': False
+    },
+    {
+        'name': 'Manufacturing B - Day 3 (Follow-up)',
+        'subject_template': 'Re: Manufacturing talent',
+        'body_template': '''{{FirstName}},
 
 Wanted to follow up on my note from Monday.
 
@@ -100,12 +89,12 @@ We specialize in manufacturing roles and have a few {{JobTitle}} candidates avai
 Any interest in connecting?
 
 {{SenderName}}''',
-                'is_default': False
-            },
-            {
-                'name': 'Manufacturing B - Day 7 (Value)',
-                'subject_template': 'Manufacturing hiring taking too long?',
-                'body_template': '''Hi {{FirstName}},
+        'is_default': False
+    },
+    {
+        'name': 'Manufacturing B - Day 7 (Value)',
+        'subject_template': 'Manufacturing hiring taking too long?',
+        'body_template': '''Hi {{FirstName}},
 
 Finding quality {{JobTitle}} candidates in manufacturing shouldn't take months.
 
@@ -114,12 +103,12 @@ Our average placement happens in under 3 weeks because we focus on active candid
 Let me know if you'd like to see some profiles.
 
 {{SenderName}}''',
-                'is_default': False
-            },
-            {
-                'name': 'Manufacturing B - Day 11 (Breakup)',
-                'subject_template': 'Moving on',
-                'body_template': '''{{FirstName}},
+        'is_default': False
+    },
+    {
+        'name': 'Manufacturing B - Day 11 (Breakup)',
+        'subject_template': 'Moving on',
+        'body_template': '''{{FirstName}},
 
 I'll take your silence as a "not now" and close your file.
 
@@ -128,14 +117,14 @@ If you ever need {{JobTitle}} candidates, you know where to find me.
 Good luck!
 
 {{SenderName}}''',
-                'is_default': False
-            },
+        'is_default': False
+    },
 
-            # ============ SaaS/Product (5 emails - extra variety) ============
-            {
-                'name': 'SaaS/Product - Day 1 (Opener A)',
-                'subject_template': '{{CompanyName}} hiring for {{JobTitle}}?',
-                'body_template': '''Hi {{FirstName}},
+    # ============ SaaS/Product (5 emails - extra variety) ============
+    {
+        'name': 'SaaS/Product - Day 1 (Opener A)',
+        'subject_template': '{{CompanyName}} hiring for {{JobTitle}}?',
+        'body_template': '''Hi {{FirstName}},
 
 Saw {{CompanyName}} is growing and thought I'd reach out.
 
@@ -144,12 +133,12 @@ We place {{JobTitle}} professionals in tech and SaaS companies. Our candidates a
 Open to a quick call this week?
 
 {{SenderName}}''',
-                'is_default': False
-            },
-            {
-                'name': 'SaaS/Product - Day 1 (Opener B)',
-                'subject_template': 'Quick question, {{FirstName}}',
-                'body_template': '''Hi {{FirstName}},
+        'is_default': False
+    },
+    {
+        'name': 'SaaS/Product - Day 1 (Opener B)',
+        'subject_template': 'Quick question, {{FirstName}}',
+        'body_template': '''Hi {{FirstName}},
 
 I specialize in {{JobTitle}} placements for SaaS companies like {{CompanyName}}.
 
@@ -158,12 +147,12 @@ We have candidates with experience at similar-stage companies who are looking fo
 Would it make sense to connect?
 
 {{SenderName}}''',
-                'is_default': True  # Default for SaaS
-            },
-            {
-                'name': 'SaaS/Product - Day 3 (Follow-up)',
-                'subject_template': 'Re: {{JobTitle}} candidates',
-                'body_template': '''{{FirstName}},
+        'is_default': True  # Default for SaaS
+    },
+    {
+        'name': 'SaaS/Product - Day 3 (Follow-up)',
+        'subject_template': 'Re: {{JobTitle}} candidates',
+        'body_template': '''{{FirstName}},
 
 Following up on my note about {{JobTitle}} candidates.
 
@@ -172,12 +161,12 @@ We've successfully placed professionals at companies in your space. Most of our
 Any interest in seeing a few profiles?
 
 {{SenderName}}''',
-                'is_default': False
-            },
-            {
-                'name': 'SaaS/Product - Day 7 (Value)',
-                'subject_template': 'Tech hiring moving slow?',
-                'body_template': '''Hi {{FirstName}},
+        'is_default': False
+    },
+    {
+        'name': 'SaaS/Product - Day 7 (Value)',
+        'subject_template': 'Tech hiring moving slow?',
+        'body_template': '''Hi {{FirstName}},
 
 Finding good {{JobTitle}} talent in tech can be a grind.
 
@@ -186,12 +175,12 @@ We focus on pre-vetted candidates who are already interviewing. Our average time
 If you're hiring now or soon, let's connect. I can share relevant profiles.
 
 {{SenderName}}''',
-                'is_default': False
-            },
-            {
-                'name': 'SaaS/Product - Day 11 (Breakup)',
-                'subject_template': 'Last note',
-                'body_template': '''{{FirstName}},
+        'is_default': False
+    },
+    {
+        'name': 'SaaS/Product - Day 11 (Breakup)',
+        'subject_template': 'Last note',
+        'body_template': '''{{FirstName}},
 
 I'll assume the timing isn't right and close your file.
 
@@ -199,17 +188,31 @@ If you need {{JobTitle}} candidates in the future, feel free to reach out.
 
 Best,
 {{SenderName}}''',
-                'is_default': False
-            }
-        ]
+        'is_default': False
+    }
+]
+
+
+
+def seed_templates():
+    """Seed the database with pre-built email templates"""
+    from app import app
+
+    with app.app_context():
+        # Check if templates already exist
+        if EmailTemplate.query.count() > 1:
+            print(f"✓ Templates already exist ({EmailTemplate.query.count()} templates)")
+            return
+
+        print("Seeding email templates...")
 
         # Add all templates
-        for tmpl_data in templates:
+        for tmpl_data in TEMPLATES:
             template = EmailTemplate(**tmpl_data)
             db.session.add(template)
 
         db.session.commit()
-        print(f"✓ Seeded {len(templates)} email templates successfully!")
+        print(f"✓ Seeded {len(TEMPLATES)} email templates successfully!")
 
         # Print summary
         print("\nTemplate Summary:")
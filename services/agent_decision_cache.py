@@ -0,0 +1,245 @@
+"""
+Persistent AI Agent Decision Cache
+Stores agent verdicts keyed by (agent, model, prompt version, config
+fingerprint, normalized input features) so recurring titles and companies
+skip the LLM across sessions and workers.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from typing import List, Dict
+
+from services import local_store
+
+CACHE_FILE = 'agent_decisions.db'
+CACHE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS agent_decisions (
+    cache_key TEXT PRIMARY KEY,
+    agent TEXT NOT NULL,
+    model TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    verdict TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_agent_decisions_fingerprint ON agent_decisions (fingerprint);
+"""
+
+DEFAULT_TTL = 30 * 24 * 60 * 60    # Re-ask the model about a title once a month
+# Another config's verdicts are only dropped once nothing has been written under it for this long
+# (orchestrators with different configs can share the cache - the fingerprint is part of the key)
+RETIRED_FINGERPRINT_AGE = 7 * 24 * 60 * 60
+
+# Company size buckets used in cache features (exact headcounts rarely repeat)
+SIZE_BUCKETS = ((50, '<50'), (200, '50-199'), (1000, '200-999'), (5000, '1000-4999'))
+
+
+def normalize(value) -> str:
+    """Lowercase and collapse whitespace so trivially different inputs share a key"""
+    return ' '.join(str(value or '').lower().split())
+
+
+def size_bucket(size) -> str:
+    try:
+        size = int(size or 0)
+    except (TypeError, ValueError):
+        return 'unknown'
+    if size <= 0:
+        return 'unknown'
+    for limit, label in SIZE_BUCKETS:
+        if size < limit:
+            return label
+    return '5000+'
+
+
+def config_fingerprint(config) -> str:
+    """
+    Hash of the config settings that affect agent verdicts
+
+    Args:
+        config: AIAgentConfig instance
+
+    Returns:
+        Short hex digest (changes when model, temperature or thresholds change)
+    """
+    summary = config.get_config_summary()
+    relevant = {
+        'model': summary.get('model'),
+        'temperature': summary.get('temperature'),
+        'thresholds': summary.get('thresholds'),
+        'aggressive': config.is_aggressive_mode(),
+        'strict_manufacturing': config.is_strict_manufacturing_only(),
+    }
+    return hashlib.sha1(json.dumps(relevant, sort_keys=True).encode('utf-8')).hexdigest()[:12]
+
+
+class AgentDecisionCache:
+    """Persistent verdict cache shared by all AI agents"""
+
+    def __init__(self, filename: str = CACHE_FILE, ttl: int = DEFAULT_TTL):
+        self.filename = filename
+        self.ttl = ttl
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.enabled = True
+
+        # Process-local counters per agent
+        self.counters: Dict[str, Dict[str, int]] = {}
+
+        try:
+            conn = self._conn()
+            conn.execute('DELETE FROM agent_decisions WHERE created_at < ?', (time.time() - self.ttl,))
+            conn.commit()
+        except sqlite3.Error as e:
+            print(f"[DECISION CACHE] Disabled - could not open cache: {e}")
+            self.enabled = False
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = local_store.connect(self.filename, CACHE_SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def make_key(agent: str, model: str, prompt_version: str, fingerprint: str, features: Dict) -> str:
+        raw = json.dumps([agent, model, prompt_version, fingerprint, features], sort_keys=True)
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+    def _count(self, agent: str, hits: int, misses: int):
+        with self._lock:
+            counter = self.counters.setdefault(agent, {'hits': 0, 'misses': 0})
+            counter['hits'] += hits
+            counter['misses'] += misses
+
+    def get_many(self, agent: str, keys: List[str]) -> Dict[str, Dict]:
+        """
+        Look up verdicts for a set of keys
+
+        Args:
+            agent: Agent name (for hit-rate reporting)
+            keys: Cache keys (duplicates are looked up once)
+
+        Returns:
+            Dict of key -> verdict for the keys that hit
+        """
+        unique = list(dict.fromkeys(keys))
+        if not self.enabled or not unique:
+            return {}
+
+        found = {}
+        try:
+            conn = self._conn()
+            cutoff = time.time() - self.ttl
+            # Stay well under SQLite's bound-parameter limit
+            for i in range(0, len(unique), 500):
+                chunk = unique[i:i + 500]
+                rows = conn.execute(
+                    f"SELECT cache_key, verdict FROM agent_decisions "
+                    f"WHERE created_at >= ? AND cache_key IN ({', '.join('?' for _ in chunk)})",
+                    [cutoff] + chunk
+                ).fetchall()
+                found.update((key, json.loads(verdict)) for key, verdict in rows)
+            if found:
+                conn.executemany('UPDATE agent_decisions SET hits = hits + 1 WHERE cache_key = ?',
+                                 [(key,) for key in found])
+                conn.commit()
+        except (sqlite3.Error, ValueError) as e:
+            print(f"[DECISION CACHE] Read failed: {e}")
+            found = {}
+
+        self._count(agent, len(found), len(unique) - len(found))
+        return found
+
+    def set_many(self, agent: str, model: str, fingerprint: str, verdicts: Dict[str, Dict]):
+        """Store verdicts by cache key"""
+        if not self.enabled or not verdicts:
+            return
+        try:
+            now = time.time()
+            conn = self._conn()
+            conn.executemany(
+                'INSERT OR REPLACE INTO agent_decisions '
+                '(cache_key, agent, model, fingerprint, verdict, created_at, hits) VALUES (?, ?, ?, ?, ?, ?, 0)',
+                [(key, agent, model, fingerprint, json.dumps(verdict), now) for key, verdict in verdicts.items()]
+            )
+            conn.commit()
+        except sqlite3.Error as e:
+            print(f"[DECISION CACHE] Write failed: {e}")
+
+    def invalidate_stale(self, fingerprint: str, max_age: int = RETIRED_FINGERPRINT_AGE) -> int:
+        """
+        Drop verdicts of retired configs
+
+        Args:
+            fingerprint: The caller's current config fingerprint (never dropped)
+            max_age: Seconds since another fingerprint's newest verdict before it counts as retired
+
+        Returns:
+            Number of verdicts deleted
+        """
+        if not self.enabled:
+            return 0
+        try:
+            conn = self._conn()
+            deleted = conn.execute(
+                'DELETE FROM agent_decisions WHERE fingerprint IN ('
+                '  SELECT fingerprint FROM agent_decisions WHERE fingerprint != ?'
+                '  GROUP BY fingerprint HAVING MAX(created_at) < ?)',
+                (fingerprint, time.time() - max_age)
+            ).rowcount
+            conn.commit()
+            if deleted:
+                print(f"[DECISION CACHE] Dropped {deleted} cached verdicts from retired configs")
+            return deleted
+        except sqlite3.Error as e:
+            print(f"[DECISION CACHE] Invalidate failed: {e}")
+            return 0
+
+    def get_stats(self) -> Dict:
+        """Entries and hit rates per agent"""
+        with self._lock:
+            counters = {agent: dict(c) for agent, c in self.counters.items()}
+        stats = {'enabled': self.enabled, 'agents': {}}
+        for agent, c in counters.items():
+            lookups = c['hits'] + c['misses']
+            stats['agents'][agent] = dict(c, hit_rate=round(c['hits'] / lookups, 3) if lookups else 0.0)
+        if not self.enabled:
+            return stats
+        try:
+            rows = self._conn().execute(
+                'SELECT agent, COUNT(*), COALESCE(SUM(hits), 0) FROM agent_decisions GROUP BY agent'
+            ).fetchall()
+            for agent, entries, total_hits in rows:
+                stats['agents'].setdefault(agent, {'hits': 0, 'misses': 0, 'hit_rate': 0.0})
+                stats['agents'][agent].update(entries=entries, total_hits=total_hits)
+            stats['entries'] = sum(row[1] for row in rows)
+        except sqlite3.Error as e:
+            stats['error'] = str(e)
+        return stats
+
+    def clear(self):
+        """Drop every cached verdict"""
+        if not self.enabled:
+            return
+        conn = self._conn()
+        conn.execute('DELETE FROM agent_decisions')
+        conn.commit()
+        with self._lock:
+            self.counters.clear()
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_decision_cache() -> AgentDecisionCache:
+    """Get the process-wide decision cache"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = AgentDecisionCache()
+        return _cache
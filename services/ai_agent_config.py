@@ -93,6 +93,10 @@ class AIAgentConfig:
         """Get minimum confidence for contact filter"""
         return self.config.get('ai_agents', {}).get('contact_filter', {}).get('min_confidence', 0.6)
 
+    def is_rule_cascade_enabled(self) -> bool:
+        """Check if title rules settle clear-cut contacts before the LLM filter"""
+        return self.config.get('ai_agents', {}).get('contact_filter', {}).get('rule_cascade', True)
+
     def is_aggressive_mode(self) -> bool:
         """Check if aggressive filtering is enabled"""
         return self.config.get('ai_agents', {}).get('contact_filter', {}).get('aggressive_mode', False)
@@ -145,6 +149,14 @@ class AIAgentConfig:
         """Get batch size for processing"""
         return self.config.get('ai_agents', {}).get('performance', {}).get('batch_size', 20)
 
+    def is_decision_cache_enabled(self) -> bool:
+        """Check if agent verdicts are cached across sessions"""
+        return self.config.get('ai_agents', {}).get('performance', {}).get('decision_cache', True)
+
+    def get_keep_alive(self) -> str:
+        """Get how long Ollama keeps the model loaded between requests"""
+        return self.config.get('ai_agents', {}).get('performance', {}).get('keep_alive', '30m')
+
     # Logging
     def is_verbose_logging(self) -> bool:
         """Check if verbose logging is enabled"""
@@ -257,6 +269,7 @@ class AIAgentConfig:
             'temperature': self.get_temperature(),
             'filters': {
                 'contact_filter': self.is_contact_filter_enabled(),
+                'rule_cascade': self.is_rule_cascade_enabled(),
                 'quality_assessment': self.is_quality_assessment_enabled(),
                 'company_categorization': self.is_company_categorization_enabled(),
                 'priority_scoring': self.is_priority_scoring_enabled()
@@ -270,7 +283,9 @@ class AIAgentConfig:
             'performance': {
                 'parallel_processing': self.is_parallel_processing_enabled(),
                 'max_concurrent': self.get_max_concurrent_requests(),
-                'batch_size': self.get_batch_size()
+                'batch_size': self.get_batch_size(),
+                'keep_alive': self.get_keep_alive(),
+                'decision_cache': self.is_decision_cache_enabled()
             }
         }
 
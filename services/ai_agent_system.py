@@ -5,27 +5,147 @@ Uses Ollama to filter, categorize, and process leads 10-20x faster
 
 import asyncio
 import aiohttp
+import hashlib
 import json
-from typing import List, Dict, Optional, Tuple
+import os
+import threading
+import time
+from collections import Counter, deque
+from typing import List, Dict, Optional, Tuple, Callable, Awaitable
 from datetime import datetime
 
+from services.agent_decision_cache import normalize, size_bucket
+from services.async_runtime import get_runtime, run_sync
+from services.title_taxonomy import decide_contact
+from services.vendor_telemetry import get_vendor_telemetry, error_class_for_exception
+
+
+class OllamaMetrics:
+    """Latency and queue depth counters for Ollama calls (shared by all clients in the process)"""
+
+    LATENCY_WINDOW = 500  # Recent calls kept for percentiles
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.calls = 0
+            self.errors = 0
+            self.timeouts = 0
+            self.in_flight = 0
+            self.queued = 0
+            self.max_queued = 0
+            self.total_latency = 0.0
+            self.total_wait = 0.0
+            self.latencies = deque(maxlen=self.LATENCY_WINDOW)
+
+    def enqueue(self):
+        with self._lock:
+            self.queued += 1
+            self.max_queued = max(self.max_queued, self.queued)
+
+    def start(self, waited: float):
+        with self._lock:
+            self.queued -= 1
+            self.in_flight += 1
+            self.total_wait += waited
+
+    def cancel(self):
+        """Call was cancelled while still waiting for a slot"""
+        with self._lock:
+            self.queued -= 1
+
+    def finish(self, latency: float, error: bool = False, timeout: bool = False):
+        with self._lock:
+            self.in_flight -= 1
+            self.calls += 1
+            self.errors += int(error)
+            self.timeouts += int(timeout)
+            self.total_latency += latency
+            self.latencies.append(latency)
+
+    def snapshot(self) -> Dict:
+        """Current counters plus latency percentiles (seconds)"""
+        with self._lock:
+            recent = sorted(self.latencies)
+            calls = self.calls
+
+            def pct(p):
+                return round(recent[min(len(recent) - 1, int(p * len(recent)))], 3) if recent else 0.0
+
+            return {
+                'calls': calls,
+                'errors': self.errors,
+                'timeouts': self.timeouts,
+                'in_flight': self.in_flight,
+                'queue_depth': self.queued,
+                'max_queue_depth': self.max_queued,
+                'avg_latency': round(self.total_latency / calls, 3) if calls else 0.0,
+                'avg_queue_wait': round(self.total_wait / calls, 3) if calls else 0.0,
+                'p50_latency': pct(0.50),
+                'p95_latency': pct(0.95),
+            }
+
+
+_metrics = OllamaMetrics()
+
+
+def get_ollama_metrics() -> OllamaMetrics:
+    """Get process-wide Ollama call metrics"""
+    return _metrics
+
 
 class OllamaClient:
     """Client for interacting with local Ollama LLM"""
 
-    def __init__(self, base_url: str = "http://localhost:11434", model: str = "llama3.2:3b"):
+    def __init__(self, base_url: str = None, model: str = "llama3.2:3b",
+                 max_concurrent: int = 10, timeout: int = 30, keep_alive: str = "30m"):
         """
         Initialize Ollama client
 
         Args:
-            base_url: Ollama API base URL
+            base_url: Ollama API base URL (default: OLLAMA_BASE_URL or http://localhost:11434)
             model: Model to use (llama3.2:3b or gemma3:1b)
+            max_concurrent: Max requests in flight to Ollama (others wait their turn)
+            timeout: Per-request timeout in seconds (queue wait not included)
+            keep_alive: How long Ollama keeps the model loaded after a request
         """
-        self.base_url = base_url
+        self.base_url = base_url or os.getenv('OLLAMA_BASE_URL', 'http://localhost:11434')
         self.model = model
-        print(f"[OLLAMA] Initialized with model: {model}")
-
-    async def generate(self, prompt: str, system: str = None, temperature: float = 0.3) -> str:
+        self.max_concurrent = max(1, int(max_concurrent))
+        self.timeout = timeout
+        self.keep_alive = keep_alive
+        self.metrics = get_ollama_metrics()
+
+        # One session + semaphore per event loop (aiohttp objects are bound to their loop)
+        self._session = None
+        self._semaphore = None
+        self._loop = None
+        print(f"[OLLAMA] Initialized with model: {model} (max {self.max_concurrent} concurrent)")
+
+    def _ensure_session(self) -> aiohttp.ClientSession:
+        """Return the client session for the running loop, creating it if needed"""
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            # A session from a previous (now closed) loop can't be reused or closed cleanly
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_concurrent, keepalive_timeout=60),
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+        return self._session
+
+    async def close(self):
+        """Close the underlying HTTP session"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def generate(self, prompt: str, system: str = None, temperature: float = 0.3,
+                       num_predict: int = 500) -> str:
         """
         Generate text using Ollama
 
@@ -33,6 +153,7 @@ class OllamaClient:
             prompt: User prompt
             system: System prompt
             temperature: Sampling temperature (0-1)
+            num_predict: Max tokens to generate (timeout scales with it above 500)
 
         Returns:
             Generated text
@@ -43,27 +164,60 @@ class OllamaClient:
             "model": self.model,
             "prompt": prompt,
             "stream": False,
+            "keep_alive": self.keep_alive,
             "options": {
                 "temperature": temperature,
-                "num_predict": 500  # Max tokens
+                "num_predict": num_predict  # Max tokens
             }
         }
 
         if system:
             payload["system"] = system
 
+        session = self._ensure_session()
+        queued_at = time.perf_counter()
+        self.metrics.enqueue()
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, json=payload, timeout=aiohttp.ClientTimeout(total=30)) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return data.get('response', '').strip()
-                    else:
-                        print(f"[OLLAMA] Error: {response.status}")
-                        return ""
+            await self._semaphore.acquire()
+        except BaseException:
+            self.metrics.cancel()
+            raise
+
+        started = time.perf_counter()
+        self.metrics.start(started - queued_at)
+        error = timed_out = False
+        status = error_class = None
+        bytes_in = 0
+        try:
+            timeout = aiohttp.ClientTimeout(total=self.timeout * max(1.0, num_predict / 500))
+            async with session.post(url, json=payload, timeout=timeout) as response:
+                status = response.status
+                if response.status == 200:
+                    raw = await response.read()
+                    bytes_in = len(raw)
+                    data = json.loads(raw)
+                    return data.get('response', '').strip()
+                else:
+                    error = True
+                    print(f"[OLLAMA] Error: {response.status}")
+                    return ""
+        except asyncio.TimeoutError:
+            error = timed_out = True
+            error_class = 'timeout'
+            print(f"[OLLAMA] Timeout after {timeout.total:.0f}s")
+            return ""
         except Exception as e:
+            error = True
+            error_class = error_class_for_exception(e)
             print(f"[OLLAMA] Exception: {e}")
             return ""
+        finally:
+            self._semaphore.release()
+            elapsed = time.perf_counter() - started
+            self.metrics.finish(elapsed, error=error, timeout=timed_out)
+            get_vendor_telemetry().record('ollama', '/api/generate', 'POST', status=status,
+                                          error_class=error_class, seconds=elapsed, bytes_in=bytes_in,
+                                          bytes_out=len(prompt) + len(system or ''))
 
     async def generate_json(self, prompt: str, system: str = None) -> Dict:
         """
@@ -93,22 +247,285 @@ class OllamaClient:
             print(f"[OLLAMA] Failed to parse JSON: {response[:100]}")
             return {}
 
+    async def generate_json_array(self, prompt: str, system: str = None, num_predict: int = 500) -> List[Dict]:
+        """
+        Generate a JSON array of objects (batched prompts)
 
-class ContactFilterAgent:
-    """Agent for filtering and validating contacts before enrichment"""
+        Args:
+            prompt: User prompt
+            system: System prompt
+            num_predict: Max tokens to generate
+
+        Returns:
+            Parsed objects (whatever could be salvaged from a garbled response)
+        """
+        response = await self.generate(prompt, system, temperature=0.1, num_predict=num_predict)
+        objects = parse_json_objects(response)
+        if response and not objects:
+            print(f"[OLLAMA] Failed to parse JSON array: {response[:100]}")
+        return objects
+
+
+def parse_json_objects(text: str) -> List[Dict]:
+    """
+    Parse a JSON array of objects from model output
+
+    Accepts a bare array, an object wrapping the array ({"items": [...]}) or an
+    object keyed by index ({"1": {...}}). When the array itself doesn't parse
+    (truncated or malformed output), each well-formed {...} in it is kept.
+    """
+    if not text:
+        return []
+
+    start = text.find('[')
+    end = text.rfind(']') + 1
+    if start != -1 and end > start:
+        try:
+            parsed = json.loads(text[start:end])
+            if isinstance(parsed, list):
+                return [obj for obj in parsed if isinstance(obj, dict)]
+        except ValueError:
+            pass
+
+    try:
+        parsed = json.loads(text[text.find('{'):text.rfind('}') + 1])
+        if isinstance(parsed, dict):
+            for value in parsed.values():
+                if isinstance(value, list):
+                    return [obj for obj in value if isinstance(obj, dict)]
+            if parsed and all(isinstance(v, dict) for v in parsed.values()):
+                return [dict(v, index=v.get('index', k)) for k, v in parsed.items()]
+            return [parsed]
+    except ValueError:
+        pass
+
+    # Salvage individual objects
+    decoder = json.JSONDecoder()
+    objects = []
+    pos = text.find('{')
+    while pos != -1:
+        try:
+            obj, end = decoder.raw_decode(text, pos)
+            if isinstance(obj, dict):
+                objects.append(obj)
+            pos = text.find('{', end)
+        except ValueError:
+            pos = text.find('{', pos + 1)
+    return objects
+
+
+NUMBER = (int, float)
+
+
+class BatchedAgent:
+    """
+    Base for agents that can pack several items into one prompt
+
+    Subclasses define the role prompt, the response schema and the fields each
+    verdict must carry; the batched prompt asks for a JSON array with one object
+    per numbered item. Items the model drops or garbles are retried one by one.
+    """
+
+    ROLE_PROMPT = ""
+    RESPONSE_SCHEMA = ""
+    PROMPT_VERSION = 1           # Bump when prompt wording changes meaning (cached verdicts are dropped)
+    REQUIRED_FIELDS: Dict[str, tuple] = {}
+    TOKENS_PER_ITEM = 100
+    LOG_TAG = "AGENT"
 
-    def __init__(self, ollama_client: OllamaClient):
+    def __init__(self, ollama_client: OllamaClient, batch_size: int = 1):
         self.ollama = ollama_client
-        self.system_prompt = """You are an expert recruiter analyzing contact relevance.
-Your task is to determine if a contact is relevant for a manufacturing staffing/recruiting outreach.
+        self.batch_size = max(1, int(batch_size))
+        self.system_prompt = f"{self.ROLE_PROMPT}\n\nRespond ONLY with a JSON object:\n{self.RESPONSE_SCHEMA}"
+        self.batch_system_prompt = (
+            f"{self.ROLE_PROMPT}\n\n"
+            f"You will be given several numbered items. Respond ONLY with a JSON array containing "
+            f"one object per item, in the same order. Each object must include the item's \"index\" "
+            f"and these fields:\n{self.RESPONSE_SCHEMA}"
+        )
+        self.prompt_version = f"{self.PROMPT_VERSION}-" + hashlib.sha1(
+            (self.system_prompt + self.batch_system_prompt).encode('utf-8')).hexdigest()[:8]
+        self.stats = {'items': 0, 'batch_calls': 0, 'single_calls': 0, 'fallbacks': 0,
+                      'cache_hits': 0, 'duplicates': 0}
+
+        # Set by the orchestrator (see use_cache)
+        self.decision_cache = None
+        self.fingerprint = None
+
+    def use_cache(self, cache, fingerprint: str):
+        """
+        Serve repeat inputs from the persistent decision cache
+
+        Args:
+            cache: AgentDecisionCache (None disables caching)
+            fingerprint: Config fingerprint the verdicts are valid for
+        """
+        self.decision_cache = cache
+        self.fingerprint = fingerprint
+
+    def is_valid(self, result: Dict) -> bool:
+        """True when a verdict has every required field with the right type"""
+        for field, types in self.REQUIRED_FIELDS.items():
+            value = result.get(field)
+            if not isinstance(value, types) or (isinstance(value, bool) and bool not in types):
+                return False
+        return True
+
+    async def run_batched(self, descriptions: List[str], header: str, question: str,
+                          single: Callable[[int], Awaitable[Dict]], features: List[Dict] = None,
+                          usage: Dict = None) -> List[Dict]:
+        """
+        Get one verdict per item, batch_size items per prompt
 
-Respond ONLY with a JSON object:
-{
+        Args:
+            descriptions: Rendered details for each item
+            header: Prompt line introducing the items
+            question: Prompt line asked after the items
+            single: Per-item call (by position) used when batching is off or an item is missing
+            features: Normalized inputs per item; items with equal features share one verdict
+                      and are served from the decision cache when enabled
+            usage: Per-run counters; its 'llm_calls' is increased by the calls this run makes
+
+        Returns:
+            Verdict dicts aligned with descriptions
+        """
+        self.stats['items'] += len(descriptions)
+        if features is None:
+            results = await self._ask_model(descriptions, header, question, single, usage)
+            return [dict(result, decided_by='llm') for result in results]
+
+        model = self.ollama.model
+        keys = [self.decision_cache.make_key(self.LOG_TAG.lower(), model, self.prompt_version,
+                                             self.fingerprint, f) if self.decision_cache else
+                json.dumps(f, sort_keys=True) for f in features]
+        cached = self.decision_cache.get_many(self.LOG_TAG.lower(), keys) if self.decision_cache else {}
+
+        # One model call per distinct uncached input
+        representative = {}
+        for i, key in enumerate(keys):
+            if key not in cached:
+                representative.setdefault(key, i)
+        todo = list(representative.values())
+        hits = sum(1 for key in keys if key in cached)
+        self.stats['cache_hits'] += hits
+        self.stats['duplicates'] += len(keys) - len(todo) - hits
+
+        answers = {}
+        if todo:
+            verdicts = await self._ask_model([descriptions[i] for i in todo], header, question,
+                                             lambda n: single(todo[n]), usage)
+            answers = {keys[i]: verdict for i, verdict in zip(todo, verdicts)}
+            if self.decision_cache:
+                self.decision_cache.set_many(
+                    self.LOG_TAG.lower(), model, self.fingerprint,
+                    {key: verdict for key, verdict in answers.items() if self.is_valid(verdict)}
+                )
+
+        if len(todo) < len(keys):
+            print(f"[{self.LOG_TAG}] {len(keys) - len(todo)}/{len(keys)} verdicts reused "
+                  f"({hits} cached, {len(keys) - len(todo) - hits} duplicates)")
+        answers.update(cached)
+
+        results = []
+        for i, key in enumerate(keys):
+            stage = 'cache' if key in cached else 'llm' if representative[key] == i else 'duplicate'
+            results.append(dict(answers[key], decided_by=stage))
+        return results
+
+    async def _ask_model(self, descriptions: List[str], header: str, question: str,
+                         single: Callable[[int], Awaitable[Dict]], usage: Dict = None) -> List[Dict]:
+        """Verdicts straight from the model (batched, with per-item fallback)"""
+        if not descriptions:
+            return []
+        if usage is None:
+            usage = {}
+        usage.setdefault('llm_calls', 0)
+        if self.batch_size <= 1:
+            self.stats['single_calls'] += len(descriptions)
+            usage['llm_calls'] += len(descriptions)
+            return list(await asyncio.gather(*(single(i) for i in range(len(descriptions)))))
+
+        chunks = [range(i, min(i + self.batch_size, len(descriptions)))
+                  for i in range(0, len(descriptions), self.batch_size)]
+        usage['llm_calls'] += sum(1 for chunk in chunks if len(chunk) > 1)
+        chunk_results = await asyncio.gather(*(
+            self._run_chunk([descriptions[i] for i in chunk], header, question) for chunk in chunks
+        ))
+
+        results: List[Optional[Dict]] = []
+        for chunk_result in chunk_results:
+            results.extend(chunk_result)
+
+        missing = [i for i, result in enumerate(results) if result is None]
+        if missing:
+            self.stats['fallbacks'] += len(missing)
+            self.stats['single_calls'] += len(missing)
+            usage['llm_calls'] += len(missing)
+            print(f"[{self.LOG_TAG}] {len(missing)}/{len(results)} items missing from batch responses - retrying individually")
+            retried = await asyncio.gather(*(single(i) for i in missing))
+            for i, result in zip(missing, retried):
+                results[i] = result
+
+        return results
+
+    async def _run_chunk(self, descriptions: List[str], header: str, question: str) -> List[Optional[Dict]]:
+        """One batched call; returns a verdict per item, or None where the model failed it"""
+        if len(descriptions) == 1:
+            return [None]
+
+        items = "\n\n".join(f"Item {n}:\n{text}" for n, text in enumerate(descriptions, 1))
+        prompt = (f"{header}\n\n{items}\n\n{question}\n"
+                  f"Return a JSON array of {len(descriptions)} objects with \"index\" 1 to {len(descriptions)}.")
+
+        self.stats['batch_calls'] += 1
+        objects = await self.ollama.generate_json_array(
+            prompt, self.batch_system_prompt,
+            num_predict=max(500, self.TOKENS_PER_ITEM * len(descriptions))
+        )
+
+        results: List[Optional[Dict]] = [None] * len(descriptions)
+        for position, obj in enumerate(objects):
+            index = obj.pop('index', None)
+            try:
+                slot = int(index) - 1
+            except (TypeError, ValueError):
+                # No usable index - trust the order only if the array is complete
+                slot = position if len(objects) == len(descriptions) else -1
+            if 0 <= slot < len(results) and results[slot] is None and self.is_valid(obj):
+                results[slot] = obj
+        return results
+
+    def get_stats(self) -> Dict:
+        """Items processed and LLM calls made by this agent"""
+        calls = self.stats['batch_calls'] + self.stats['single_calls']
+        return dict(self.stats, batch_size=self.batch_size, llm_calls=calls,
+                    items_per_call=round(self.stats['items'] / calls, 2) if calls else 0.0)
+
+
+class ContactFilterAgent(BatchedAgent):
+    """Agent for filtering and validating contacts before enrichment"""
+
+    ROLE_PROMPT = """You are an expert recruiter analyzing contact relevance.
+Your task is to determine if a contact is relevant for a manufacturing staffing/recruiting outreach."""
+    RESPONSE_SCHEMA = """{
   "relevant": true/false,
   "confidence": 0.0-1.0,
   "reason": "brief explanation",
   "category": "decision_maker/hr_leader/hr_practitioner/irrelevant"
 }"""
+    REQUIRED_FIELDS = {'relevant': (bool,), 'confidence': NUMBER}
+    TOKENS_PER_ITEM = 80
+    LOG_TAG = "FILTER"
+
+    @staticmethod
+    def _target(tier: str) -> str:
+        return "COO/VP Operations decision makers" if tier == "T1" else "HR/TA leaders" if tier == "T2" else "HR practitioners/recruiters"
+
+    @staticmethod
+    def _describe(contact: Dict) -> str:
+        return (f"- Title: {contact.get('title', '')}\n"
+                f"- Company: {contact.get('organization_name', '')}\n"
+                f"- Seniority: {contact.get('seniority', '')}")
 
     async def filter_contact(self, contact: Dict, tier: str = "T1") -> Tuple[bool, Dict]:
         """
@@ -121,18 +538,12 @@ Respond ONLY with a JSON object:
         Returns:
             (is_relevant, analysis_dict)
         """
-        title = contact.get('title', '')
-        company = contact.get('organization_name', '')
-        seniority = contact.get('seniority', '')
-
         prompt = f"""Analyze this contact for {tier} manufacturing staffing outreach:
 
 Contact Details:
-- Title: {title}
-- Company: {company}
-- Seniority: {seniority}
+{self._describe(contact)}
 
-Target: {tier} = {"COO/VP Operations decision makers" if tier == "T1" else "HR/TA leaders" if tier == "T2" else "HR practitioners/recruiters"}
+Target: {tier} = {self._target(tier)}
 
 Is this contact relevant?"""
 
@@ -142,42 +553,53 @@ Is this contact relevant?"""
 
         return is_relevant, result
 
-    async def filter_contacts_batch(self, contacts: List[Dict], tier: str = "T1") -> List[Dict]:
+    async def filter_contacts_batch(self, contacts: List[Dict], tier: str = "T1",
+                                    usage: Dict = None) -> List[Dict]:
         """
-        Filter multiple contacts in parallel
+        Filter multiple contacts, batch_size contacts per prompt
 
         Args:
             contacts: List of contacts
             tier: Target tier
+            usage: Per-run counters (see BatchedAgent.run_batched)
 
         Returns:
             Filtered list with relevance scores
         """
         print(f"[FILTER] Filtering {len(contacts)} contacts for {tier}...")
-
-        tasks = [self.filter_contact(contact, tier) for contact in contacts]
-        results = await asyncio.gather(*tasks)
+        if not contacts:
+            return []
+
+        async def single(i):
+            return (await self.filter_contact(contacts[i], tier))[1]
+
+        results = await self.run_batched(
+            [self._describe(contact) for contact in contacts],
+            f"Analyze these contacts for {tier} manufacturing staffing outreach.\n"
+            f"Target: {tier} = {self._target(tier)}",
+            "Is each contact relevant?",
+            single,
+            features=[{'title': normalize(c.get('title')), 'seniority': normalize(c.get('seniority')), 'tier': tier}
+                      for c in contacts],
+            usage=usage
+        )
 
         filtered = []
-        for contact, (is_relevant, analysis) in zip(contacts, results):
-            if is_relevant:
-                contact['ai_filter'] = analysis
+        for contact, analysis in zip(contacts, results):
+            contact['ai_filter'] = analysis
+            if analysis.get('relevant', False):
                 filtered.append(contact)
 
         print(f"[FILTER] {len(filtered)}/{len(contacts)} contacts passed filter ({len(filtered)/len(contacts)*100:.1f}%)")
         return filtered
 
 
-class CompanyCategoryAgent:
+class CompanyCategoryAgent(BatchedAgent):
     """Agent for categorizing and validating companies"""
 
-    def __init__(self, ollama_client: OllamaClient):
-        self.ollama = ollama_client
-        self.system_prompt = """You are an expert at analyzing manufacturing companies.
-Your task is to categorize companies and assess their fit for staffing/recruiting services.
-
-Respond ONLY with a JSON object:
-{
+    ROLE_PROMPT = """You are an expert at analyzing manufacturing companies.
+Your task is to categorize companies and assess their fit for staffing/recruiting services."""
+    RESPONSE_SCHEMA = """{
   "is_manufacturing": true/false,
   "category": "automotive/electronics/industrial/pharma/fmcg/other",
   "size_category": "small/medium/large/enterprise",
@@ -185,6 +607,16 @@ Respond ONLY with a JSON object:
   "likely_needs_staffing": true/false,
   "reason": "brief explanation"
 }"""
+    REQUIRED_FIELDS = {'is_manufacturing': (bool,), 'fit_score': NUMBER}
+    TOKENS_PER_ITEM = 120
+    LOG_TAG = "CATEGORY"
+
+    @staticmethod
+    def _describe(company_data: Dict) -> str:
+        return (f"Company: {company_data.get('name', '')}\n"
+                f"Industry: {company_data.get('industry', '')}\n"
+                f"Size: {company_data.get('estimated_num_employees', 0)} employees\n"
+                f"Description: {(company_data.get('short_description') or '')[:200]}")
 
     async def categorize_company(self, company_data: Dict) -> Dict:
         """
@@ -196,17 +628,9 @@ Respond ONLY with a JSON object:
         Returns:
             Categorization analysis
         """
-        name = company_data.get('name', '')
-        industry = company_data.get('industry', '')
-        size = company_data.get('estimated_num_employees', 0)
-        description = company_data.get('short_description', '')[:200]
-
         prompt = f"""Analyze this company for manufacturing staffing:
 
-Company: {name}
-Industry: {industry}
-Size: {size} employees
-Description: {description}
+{self._describe(company_data)}
 
 Categorize this company and assess staffing needs."""
 
@@ -215,7 +639,7 @@ Categorize this company and assess staffing needs."""
 
     async def categorize_companies_batch(self, companies: List[Dict]) -> List[Dict]:
         """
-        Categorize multiple companies in parallel
+        Categorize multiple companies, batch_size companies per prompt
 
         Args:
             companies: List of company data
@@ -224,9 +648,20 @@ Categorize this company and assess staffing needs."""
             Companies with categorization data
         """
         print(f"[CATEGORY] Categorizing {len(companies)} companies...")
+        if not companies:
+            return []
+
+        async def single(i):
+            return await self.categorize_company(companies[i])
 
-        tasks = [self.categorize_company(company) for company in companies]
-        results = await asyncio.gather(*tasks)
+        results = await self.run_batched(
+            [self._describe(company) for company in companies],
+            "Analyze these companies for manufacturing staffing:",
+            "Categorize each company and assess staffing needs.",
+            single,
+            features=[{'name': normalize(c.get('name')), 'industry': normalize(c.get('industry')),
+                       'size': size_bucket(c.get('estimated_num_employees'))} for c in companies]
+        )
 
         categorized = []
         for company, analysis in zip(companies, results):
@@ -239,22 +674,29 @@ Categorize this company and assess staffing needs."""
         return categorized
 
 
-class ContactQualityAgent:
+class ContactQualityAgent(BatchedAgent):
     """Agent for assessing contact quality and email likelihood"""
 
-    def __init__(self, ollama_client: OllamaClient):
-        self.ollama = ollama_client
-        self.system_prompt = """You are an expert at assessing contact data quality.
-Your task is to determine if a contact is worth enriching (costs money).
-
-Respond ONLY with a JSON object:
-{
+    ROLE_PROMPT = """You are an expert at assessing contact data quality.
+Your task is to determine if a contact is worth enriching (costs money)."""
+    RESPONSE_SCHEMA = """{
   "quality_score": 0.0-1.0,
   "email_likely": true/false,
   "decision_maker": true/false,
   "worth_enriching": true/false,
   "reason": "brief explanation"
 }"""
+    REQUIRED_FIELDS = {'quality_score': NUMBER, 'worth_enriching': (bool,)}
+    TOKENS_PER_ITEM = 90
+    LOG_TAG = "QUALITY"
+
+    @staticmethod
+    def _describe(contact: Dict, company_data: Dict = None) -> str:
+        company_size = company_data.get('estimated_num_employees', 0) if company_data else 0
+        return (f"Title: {contact.get('title', '')}\n"
+                f"Seniority: {contact.get('seniority', '')}\n"
+                f"Has LinkedIn: {bool(contact.get('linkedin_url'))}\n"
+                f"Company: {contact.get('organization_name', '')} ({company_size} employees)")
 
     async def assess_quality(self, contact: Dict, company_data: Dict = None) -> Dict:
         """
@@ -267,18 +709,9 @@ Respond ONLY with a JSON object:
         Returns:
             Quality assessment
         """
-        title = contact.get('title', '')
-        seniority = contact.get('seniority', '')
-        has_linkedin = bool(contact.get('linkedin_url'))
-        company_name = contact.get('organization_name', '')
-        company_size = company_data.get('estimated_num_employees', 0) if company_data else 0
-
         prompt = f"""Assess this contact's quality for recruiting outreach:
 
-Title: {title}
-Seniority: {seniority}
-Has LinkedIn: {has_linkedin}
-Company: {company_name} ({company_size} employees)
+{self._describe(contact, company_data)}
 
 Is this contact worth enriching (costs API credits)?"""
 
@@ -287,7 +720,7 @@ Is this contact worth enriching (costs API credits)?"""
 
     async def assess_batch(self, contacts: List[Dict], companies: Dict[str, Dict] = None) -> List[Dict]:
         """
-        Assess multiple contacts in parallel
+        Assess multiple contacts, batch_size contacts per prompt
 
         Args:
             contacts: List of contacts
@@ -297,15 +730,25 @@ Is this contact worth enriching (costs API credits)?"""
             Contacts worth enriching
         """
         print(f"[QUALITY] Assessing {len(contacts)} contact quality...")
+        if not contacts:
+            return []
 
         companies = companies or {}
-        tasks = []
-        for contact in contacts:
-            company_name = contact.get('organization_name', '')
-            company_data = companies.get(company_name, {})
-            tasks.append(self.assess_quality(contact, company_data))
-
-        results = await asyncio.gather(*tasks)
+        company_data = [companies.get(contact.get('organization_name', ''), {}) for contact in contacts]
+
+        async def single(i):
+            return await self.assess_quality(contacts[i], company_data[i])
+
+        results = await self.run_batched(
+            [self._describe(contact, data) for contact, data in zip(contacts, company_data)],
+            "Assess these contacts' quality for recruiting outreach:",
+            "Is each contact worth enriching (costs API credits)?",
+            single,
+            features=[{'title': normalize(c.get('title')), 'seniority': normalize(c.get('seniority')),
+                       'linkedin': bool(c.get('linkedin_url')),
+                       'size': size_bucket(data.get('estimated_num_employees'))}
+                      for c, data in zip(contacts, company_data)]
+        )
 
         high_quality = []
         for contact, assessment in zip(contacts, results):
@@ -317,22 +760,36 @@ Is this contact worth enriching (costs API credits)?"""
         return high_quality
 
 
-class PriorityScoringAgent:
+class PriorityScoringAgent(BatchedAgent):
     """Agent for final lead prioritization"""
 
-    def __init__(self, ollama_client: OllamaClient):
-        self.ollama = ollama_client
-        self.system_prompt = """You are an expert at prioritizing sales leads.
-Your task is to score leads based on multiple factors.
-
-Respond ONLY with a JSON object:
-{
+    ROLE_PROMPT = """You are an expert at prioritizing sales leads.
+Your task is to score leads based on multiple factors."""
+    RESPONSE_SCHEMA = """{
   "priority_score": 0.0-10.0,
   "urgency": "high/medium/low",
   "key_factors": ["factor1", "factor2"],
   "outreach_angle": "brief suggestion",
   "estimated_conversion": 0.0-1.0
 }"""
+    REQUIRED_FIELDS = {'priority_score': NUMBER, 'urgency': (str,)}
+    TOKENS_PER_ITEM = 140
+    LOG_TAG = "PRIORITY"
+
+    @staticmethod
+    def _describe(lead_data: Dict) -> str:
+        company = lead_data.get('company', {})
+        contact = lead_data.get('contact', {})
+        validation = lead_data.get('validation', {})
+        return f"""Company: {company.get('name')} ({company.get('size')} employees)
+Industry: {company.get('industry')}
+Revenue: {company.get('revenue', 'N/A')}
+
+Contact: {contact.get('name')}
+Title: {contact.get('title')}
+Email: {'Yes' if contact.get('email') else 'No'}
+
+Validation Score: {validation.get('score', 0)}/6"""
 
     async def score_lead(self, lead_data: Dict) -> Dict:
         """
@@ -344,21 +801,9 @@ Respond ONLY with a JSON object:
         Returns:
             Priority scoring
         """
-        company = lead_data.get('company', {})
-        contact = lead_data.get('contact', {})
-        validation = lead_data.get('validation', {})
-
         prompt = f"""Score this lead for manufacturing staffing outreach:
 
-Company: {company.get('name')} ({company.get('size')} employees)
-Industry: {company.get('industry')}
-Revenue: {company.get('revenue', 'N/A')}
-
-Contact: {contact.get('name')}
-Title: {contact.get('title')}
-Email: {'Yes' if contact.get('email') else 'No'}
-
-Validation Score: {validation.get('score', 0)}/6
+{self._describe(lead_data)}
 
 Provide priority score (0-10) and outreach strategy."""
 
@@ -367,7 +812,7 @@ Provide priority score (0-10) and outreach strategy."""
 
     async def score_leads_batch(self, leads: List[Dict]) -> List[Dict]:
         """
-        Score and prioritize multiple leads
+        Score and prioritize multiple leads, batch_size leads per prompt
 
         Args:
             leads: List of complete leads
@@ -376,9 +821,19 @@ Provide priority score (0-10) and outreach strategy."""
             Leads sorted by priority
         """
         print(f"[PRIORITY] Scoring {len(leads)} leads...")
+        if not leads:
+            return leads
+
+        async def single(i):
+            return await self.score_lead(leads[i])
 
-        tasks = [self.score_lead(lead) for lead in leads]
-        results = await asyncio.gather(*tasks)
+        results = await self.run_batched(
+            [self._describe(lead) for lead in leads],
+            "Score these leads for manufacturing staffing outreach:",
+            "Provide a priority score (0-10) and outreach strategy for each lead.",
+            single,
+            features=[{'lead': normalize(self._describe(lead))} for lead in leads]
+        )
 
         for lead, scoring in zip(leads, results):
             lead['ai_priority'] = scoring
@@ -405,7 +860,8 @@ class AIAgentOrchestrator:
         print(f"[AI AGENTS] Initializing AI Agent System")
         print(f"{'='*60}")
 
-        # Load configuration
+        # Load configuration (a shared config is re-read per run so edits/reloads apply)
+        self._own_config = config
         if config is None:
             from services.ai_agent_config import get_config
             self.config = get_config()
@@ -418,15 +874,30 @@ class AIAgentOrchestrator:
 
         print(f"[AI AGENTS] Using model: {model}")
         print(f"[AI AGENTS] Temperature: {self.config.get_temperature()}")
+        print(f"[AI AGENTS] Batch size: {self.config.get_batch_size()} items/prompt")
 
         # Initialize Ollama client
-        self.ollama = OllamaClient(model=model)
+        self.ollama = OllamaClient(
+            model=model,
+            max_concurrent=self.config.get_max_concurrent_requests(),
+            timeout=self.config.get_timeout(),
+            keep_alive=self.config.get_keep_alive()
+        )
 
         # Initialize specialized agents
-        self.filter_agent = ContactFilterAgent(self.ollama)
-        self.category_agent = CompanyCategoryAgent(self.ollama)
-        self.quality_agent = ContactQualityAgent(self.ollama)
-        self.priority_agent = PriorityScoringAgent(self.ollama)
+        batch_size = self.config.get_batch_size()
+        self.filter_agent = ContactFilterAgent(self.ollama, batch_size)
+        self.category_agent = CompanyCategoryAgent(self.ollama, batch_size)
+        self.quality_agent = ContactQualityAgent(self.ollama, batch_size)
+        self.priority_agent = PriorityScoringAgent(self.ollama, batch_size)
+        self.agents = [self.filter_agent, self.category_agent, self.quality_agent, self.priority_agent]
+
+        self.fingerprint = None
+        self._refresh_cache_scope()
+
+        # Which cascade stage decided each filtered contact (process lifetime / last run)
+        self.filter_stages = Counter()
+        self.last_filter_run = {}
 
         print(f"[AI AGENTS] Filters enabled:")
         print(f"  - Contact Filter: {self.config.is_contact_filter_enabled()}")
@@ -436,6 +907,31 @@ class AIAgentOrchestrator:
         print(f"[AI AGENTS] All agents initialized successfully")
         print(f"{'='*60}\n")
 
+    def _refresh_cache_scope(self):
+        """
+        Point the agents at the decision cache for the current config
+
+        Verdicts are keyed by a fingerprint of the model and thresholds, so a
+        config change starts from an empty cache (older verdicts are dropped).
+        """
+        if self._own_config is None:
+            from services.ai_agent_config import get_config
+            self.config = get_config()
+
+        if not self.config.is_decision_cache_enabled():
+            for agent in self.agents:
+                agent.use_cache(None, None)
+            return
+
+        from services.agent_decision_cache import get_decision_cache, config_fingerprint
+        cache = get_decision_cache()
+        fingerprint = config_fingerprint(self.config)
+        if fingerprint != self.fingerprint:
+            cache.invalidate_stale(fingerprint)
+            self.fingerprint = fingerprint
+        for agent in self.agents:
+            agent.use_cache(cache, fingerprint)
+
     async def intelligent_filter_pipeline(self, contacts: List[Dict], tier: str = "T1") -> List[Dict]:
         """
         Run contacts through intelligent filtering pipeline
@@ -450,10 +946,11 @@ class AIAgentOrchestrator:
             Filtered contacts worth enriching
         """
         print(f"\n[PIPELINE] Starting intelligent filtering for {len(contacts)} contacts")
+        self._refresh_cache_scope()
 
-        # Stage 1: Filter by relevance (if enabled)
+        # Stage 1: Filter by relevance (if enabled) - title rules first, LLM for the rest
         if self.config.is_contact_filter_enabled():
-            filtered = await self.filter_agent.filter_contacts_batch(contacts, tier)
+            filtered = await self._cascade_filter(contacts, tier)
 
             if not filtered:
                 print(f"[PIPELINE] No contacts passed relevance filter")
@@ -484,6 +981,49 @@ class AIAgentOrchestrator:
 
         return high_quality
 
+    async def _cascade_filter(self, contacts: List[Dict], tier: str) -> List[Dict]:
+        """
+        Relevance filter cascade: title rules -> decision cache -> LLM
+
+        Each contact's ai_filter records which stage decided it ('rules',
+        'cache', 'duplicate' or 'llm').
+
+        Args:
+            contacts: Raw contacts from Apollo search
+            tier: Target tier
+
+        Returns:
+            Relevant contacts
+        """
+        use_rules = self.config.is_rule_cascade_enabled()
+        ambiguous = []
+        for contact in contacts:
+            verdict = decide_contact(contact, tier) if use_rules else None
+            if verdict is None:
+                ambiguous.append(contact)
+            else:
+                contact['ai_filter'] = dict(verdict, decided_by='rules')
+
+        # Counted for this run only - other runs share the agent and its stats
+        usage = {'llm_calls': 0}
+        if ambiguous:
+            await self.filter_agent.filter_contacts_batch(ambiguous, tier, usage=usage)
+        llm_calls = usage['llm_calls']
+
+        stages = Counter(c.get('ai_filter', {}).get('decided_by', 'llm') for c in contacts)
+        self.filter_stages.update(stages)
+        self.last_filter_run = {
+            'contacts': len(contacts),
+            'tier': tier,
+            'decided_by': dict(stages),
+            'llm_calls': llm_calls,
+            'llm_share': round(stages['llm'] / len(contacts), 3) if contacts else 0.0,
+        }
+        print(f"[CASCADE] {len(contacts)} contacts: rules {stages['rules']}, cache {stages['cache']}, "
+              f"duplicates {stages['duplicate']}, LLM {stages['llm']} ({llm_calls} calls)")
+
+        return [c for c in contacts if c.get('ai_filter', {}).get('relevant', False)]
+
     async def intelligent_company_filter(self, companies: List[Dict]) -> List[Dict]:
         """
         Filter companies before enrichment
@@ -495,6 +1035,7 @@ class AIAgentOrchestrator:
             Filtered companies worth enriching
         """
         print(f"\n[PIPELINE] Filtering {len(companies)} companies")
+        self._refresh_cache_scope()
 
         categorized = await self.category_agent.categorize_companies_batch(companies)
 
@@ -512,6 +1053,7 @@ class AIAgentOrchestrator:
             Prioritized leads
         """
         print(f"\n[PIPELINE] Prioritizing {len(leads)} leads")
+        self._refresh_cache_scope()
 
         prioritized = await self.priority_agent.score_leads_batch(leads)
 
@@ -535,48 +1077,108 @@ class AIAgentOrchestrator:
                 'quality': 'ContactQualityAgent',
                 'priority': 'PriorityScoringAgent'
             },
+            'batching': {
+                'filter': self.filter_agent.get_stats(),
+                'category': self.category_agent.get_stats(),
+                'quality': self.quality_agent.get_stats(),
+                'priority': self.priority_agent.get_stats()
+            },
+            'decision_cache': self.filter_agent.decision_cache.get_stats() if self.filter_agent.decision_cache else {'enabled': False},
+            'filter_cascade': {
+                'decided_by': dict(self.filter_stages),
+                'last_run': self.last_filter_run
+            },
+            'max_concurrent': self.ollama.max_concurrent,
+            'keep_alive': self.ollama.keep_alive,
+            'ollama_metrics': self.ollama.metrics.snapshot(),
             'status': 'ready'
         }
 
+    async def close(self):
+        """Release the Ollama HTTP session"""
+        await self.ollama.close()
 
-# Synchronous wrapper functions for easy integration
-def run_async(coro):
-    """Run async function in sync context"""
-    try:
-        loop = asyncio.get_event_loop()
-    except RuntimeError:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
 
-    return loop.run_until_complete(coro)
+# Shared orchestrators, bound to the process-wide async runtime
+_orchestrators: Dict[str, AIAgentOrchestrator] = {}
+_orchestrators_lock = threading.Lock()
+
+
+def get_orchestrator(model: str = None) -> AIAgentOrchestrator:
+    """
+    Get the shared orchestrator for a model
+
+    Its Ollama session, semaphore and caches live on the async runtime loop,
+    so every caller in the process reuses them.
+
+    Args:
+        model: Ollama model (optional, uses config if not provided)
+
+    Returns:
+        AIAgentOrchestrator instance
+    """
+    if model is None:
+        from services.ai_agent_config import get_config
+        model = get_config().get_model()
+
+    with _orchestrators_lock:
+        orchestrator = _orchestrators.get(model)
+        if orchestrator is None:
+            orchestrator = AIAgentOrchestrator(model=model)
+            _orchestrators[model] = orchestrator
+        return orchestrator
+
+
+def get_orchestrator_stats() -> Dict[str, Dict]:
+    """Stats of the orchestrators created so far, by model"""
+    with _orchestrators_lock:
+        orchestrators = dict(_orchestrators)
+    return {model: orchestrator.get_stats() for model, orchestrator in orchestrators.items()}
+
+
+def reset_orchestrators():
+    """Drop the shared orchestrators (e.g. after concurrency/timeout settings change)"""
+    with _orchestrators_lock:
+        orchestrators = list(_orchestrators.values())
+        _orchestrators.clear()
+
+    runtime = get_runtime()
+    for orchestrator in orchestrators:
+        runtime.submit(orchestrator.close())
+
+
+# Synchronous wrapper functions for easy integration
+def run_async(coro, timeout: float = None):
+    """Run async function in sync context (on the process-wide runtime loop)"""
+    return run_sync(coro, timeout)
 
 
-def filter_contacts_sync(contacts: List[Dict], tier: str = "T1", model: str = "llama3.2:3b") -> List[Dict]:
+def filter_contacts_sync(contacts: List[Dict], tier: str = "T1", model: str = None) -> List[Dict]:
     """
     Synchronous wrapper for contact filtering
 
     Args:
         contacts: List of contacts
         tier: Target tier
-        model: Ollama model
+        model: Ollama model (optional, uses config if not provided)
 
     Returns:
         Filtered contacts
     """
-    orchestrator = AIAgentOrchestrator(model=model)
+    orchestrator = get_orchestrator(model)
     return run_async(orchestrator.intelligent_filter_pipeline(contacts, tier))
 
 
-def prioritize_leads_sync(leads: List[Dict], model: str = "llama3.2:3b") -> List[Dict]:
+def prioritize_leads_sync(leads: List[Dict], model: str = None) -> List[Dict]:
     """
     Synchronous wrapper for lead prioritization
 
     Args:
         leads: List of leads
-        model: Ollama model
+        model: Ollama model (optional, uses config if not provided)
 
     Returns:
         Prioritized leads
     """
-    orchestrator = AIAgentOrchestrator(model=model)
+    orchestrator = get_orchestrator(model)
     return run_async(orchestrator.prioritize_leads(leads))
@@ -5,8 +5,52 @@ Intelligent lead prioritization using multiple factors and machine learning
 
 from typing import Dict, List, Optional, Tuple
 import re
+import threading
 from datetime import datetime
 
+import numpy as np
+
+NUMBER_RE = re.compile(r'[\d,]+\.?\d*')
+
+# Keyword vocabularies (shared by the per-lead and batch scoring paths)
+SENIORITY_KEYWORDS = ('senior', 'lead', 'principal', 'architect', 'director', 'vp', 'head')
+SPECIALIZED_KEYWORDS = ('engineer', 'developer', 'scientist', 'analyst', 'architect', 'specialist')
+CONTACT_TIERS = (
+    (12, ('ceo', 'chief executive', 'president', 'owner', 'founder')),  # C-level/Founder
+    (10, ('cto', 'cfo', 'coo', 'cmo', 'vp', 'vice president')),         # C-suite/VP
+    (7, ('director', 'head of', 'lead')),                                # Director level
+    (4, ('manager', 'supervisor')),                                      # Manager level
+)
+RELATED_INDUSTRY_KEYWORDS = ('software', 'technology', 'digital', 'consulting', 'services')
+
+# Grade thresholds, highest first: (min score, grade, priority, color)
+GRADE_BANDS = (
+    (85, 'A+', 'Critical', '#10B981'),      # Green
+    (75, 'A', 'High', '#3B82F6'),           # Blue
+    (65, 'B+', 'Medium-High', '#8B5CF6'),   # Purple
+    (55, 'B', 'Medium', '#F59E0B'),         # Yellow
+    (45, 'C', 'Low-Medium', '#F97316'),     # Orange
+    (float('-inf'), 'D', 'Low', '#EF4444'),  # Red
+)
+
+
+class KeywordMatcher:
+    """Precompiled substring matcher for a keyword list (one regex pass instead of N `in` scans)"""
+
+    def __init__(self, keywords):
+        self.keywords = tuple(keywords)
+        self.pattern = re.compile('|'.join(re.escape(k) for k in self.keywords))
+
+    def any(self, text: str) -> bool:
+        """Same as any(k in text for k in keywords)"""
+        return self.pattern.search(text) is not None
+
+    def count_distinct(self, text: str) -> int:
+        """Number of keywords occurring in text (overlaps counted, unlike findall)"""
+        if not self.pattern.search(text):
+            return 0
+        return sum(1 for k in self.keywords if k in text)
+
 
 class AILeadScorer:
     """
@@ -42,6 +86,14 @@ class AILeadScorer:
             'tensorflow', 'machine learning', 'ai', 'cloud', 'microservices'
         ]
 
+        # Precompiled matchers for the batch scoring path
+        self._premium_industry_matcher = KeywordMatcher(self.premium_industries)
+        self._premium_tech_matcher = KeywordMatcher(self.premium_tech)
+        self._related_industry_matcher = KeywordMatcher(RELATED_INDUSTRY_KEYWORDS)
+        self._seniority_matcher = KeywordMatcher(SENIORITY_KEYWORDS)
+        self._specialized_matcher = KeywordMatcher(SPECIALIZED_KEYWORDS)
+        self._contact_tier_matchers = [(points, KeywordMatcher(keywords)) for points, keywords in CONTACT_TIERS]
+
     def score_lead(self, lead_data: Dict, job_query: Optional[str] = None) -> Dict:
         """
         Comprehensive lead scoring
@@ -164,13 +216,11 @@ class AILeadScorer:
             score += match_ratio * 10
 
         # Seniority indicators in job title (5 points)
-        seniority_keywords = ['senior', 'lead', 'principal', 'architect', 'director', 'vp', 'head']
-        if any(keyword in job_title for keyword in seniority_keywords):
+        if any(keyword in job_title for keyword in SENIORITY_KEYWORDS):
             score += 5
 
         # Technical/specialized roles (5 points)
-        specialized_keywords = ['engineer', 'developer', 'scientist', 'analyst', 'architect', 'specialist']
-        if any(keyword in job_title for keyword in specialized_keywords):
+        if any(keyword in job_title for keyword in SPECIALIZED_KEYWORDS):
             score += 5
 
         return min(score, max_score)
@@ -187,14 +237,10 @@ class AILeadScorer:
         contact_email = lead.get('contact_email', '')
 
         # Contact seniority (12 points)
-        if any(keyword in contact_title for keyword in ['ceo', 'chief executive', 'president', 'owner', 'founder']):
-            score += 12  # C-level/Founder
-        elif any(keyword in contact_title for keyword in ['cto', 'cfo', 'coo', 'cmo', 'vp', 'vice president']):
-            score += 10  # C-suite/VP
-        elif any(keyword in contact_title for keyword in ['director', 'head of', 'lead']):
-            score += 7  # Director level
-        elif any(keyword in contact_title for keyword in ['manager', 'supervisor']):
-            score += 4  # Manager level
+        for points, keywords in CONTACT_TIERS:
+            if any(keyword in contact_title for keyword in keywords):
+                score += points
+                break
 
         # Email quality (8 points)
         if contact_email:
@@ -232,8 +278,7 @@ class AILeadScorer:
 
         # Partial match for related industries
         if score == 0:
-            related_keywords = ['software', 'technology', 'digital', 'consulting', 'services']
-            if any(keyword in combined for keyword in related_keywords):
+            if any(keyword in combined for keyword in RELATED_INDUSTRY_KEYWORDS):
                 score += 8
 
         return min(score, max_score)
@@ -286,18 +331,9 @@ class AILeadScorer:
         """
         Calculate letter grade, priority level, and color code
         """
-        if score >= 85:
-            return ('A+', 'Critical', '#10B981')  # Green
-        elif score >= 75:
-            return ('A', 'High', '#3B82F6')  # Blue
-        elif score >= 65:
-            return ('B+', 'Medium-High', '#8B5CF6')  # Purple
-        elif score >= 55:
-            return ('B', 'Medium', '#F59E0B')  # Yellow
-        elif score >= 45:
-            return ('C', 'Low-Medium', '#F97316')  # Orange
-        else:
-            return ('D', 'Low', '#EF4444')  # Red
+        for threshold, grade, priority, color in GRADE_BANDS:
+            if score >= threshold:
+                return (grade, priority, color)
 
     def _generate_insights(self, scores: Dict, lead: Dict) -> List[str]:
         """Generate AI insights about the lead"""
@@ -354,31 +390,226 @@ class AILeadScorer:
     def _extract_number(self, text: str) -> float:
         """Extract numeric value from text"""
         try:
-            # Remove commas and extract numbers
-            numbers = re.findall(r'[\d,]+\.?\d*', str(text))
-            if numbers:
-                return float(numbers[0].replace(',', ''))
+            # Remove commas and extract the first number
+            match = NUMBER_RE.search(str(text))
+            if match:
+                return float(match.group(0).replace(',', ''))
         except:
             pass
         return 0
 
-    def batch_score_leads(self, leads: List[Dict], query: Optional[str] = None) -> List[Dict]:
+    def batch_score_leads(self, leads: List[Dict], query: Optional[str] = None,
+                          top_k: Optional[int] = None) -> List[Dict]:
         """
         Score multiple leads at once
 
-        Returns leads with scoring information added
+        Returns leads with scoring information added, highest score first
+        (only the best top_k when given)
         """
-        scored_leads = []
+        return self.score_leads_columnar(leads, query, top_k)['leads']
 
-        for lead in leads:
-            scoring = self.score_lead(lead, query)
-            lead['ai_score'] = scoring
+    def score_leads_columnar(self, leads: List[Dict], query: Optional[str] = None,
+                             top_k: Optional[int] = None) -> Dict:
+        """
+        Vectorized batch scoring - same scores as score_lead, computed column-wise
+
+        Features are extracted once per lead, component scores and totals are
+        computed with NumPy, and insights/recommendations are only generated
+        for the leads that are returned.
+
+        Args:
+            leads: Lead dictionaries (the returned ones get 'ai_score' added)
+            query: Original search query for relevance scoring
+            top_k: Return only the best top_k leads (partial selection, no full sort)
+
+        Returns:
+            Dictionary with 'leads' (sorted by score) and 'distribution' over all leads
+        """
+        n = len(leads)
+        if n == 0:
+            return {'leads': [], 'distribution': self.get_lead_priority_distribution([])}
+
+        features = self._extract_features(leads, query)
+        components = self._score_features(features)
+        totals = sum(components.values())
+
+        # Grade band index per lead (0 = A+ ... 5 = D)
+        bands = np.full(n, len(GRADE_BANDS) - 1)
+        for band_idx in range(len(GRADE_BANDS) - 2, -1, -1):
+            bands[totals >= GRADE_BANDS[band_idx][0]] = band_idx
+        counts = np.bincount(bands, minlength=len(GRADE_BANDS))
+        distribution = {band[2]: int(count) for band, count in zip(GRADE_BANDS, counts)}
+
+        # Order by rounded score like the per-lead path (stable: ties keep input order)
+        keys = np.round(totals, 1)
+        if top_k is not None and 0 <= top_k < n:
+            if top_k == 0:
+                order = np.array([], dtype=int)
+            else:
+                kth = np.partition(keys, n - top_k)[n - top_k]
+                above = np.flatnonzero(keys > kth)
+                ties = np.flatnonzero(keys == kth)[:top_k - len(above)]
+                selected = np.concatenate([above, ties])
+                order = selected[np.argsort(-keys[selected], kind='stable')]
+        else:
+            order = np.argsort(-keys, kind='stable')
+
+        scored_at = datetime.utcnow().isoformat()
+        names = list(components)
+        scored_leads = []
+        for i in order:
+            lead = leads[i]
+            scores = {name: float(components[name][i]) for name in names}
+            grade, priority, color = GRADE_BANDS[bands[i]][1:]
+            lead['ai_score'] = {
+                'total_score': round(float(totals[i]), 1),
+                'grade': grade,
+                'priority': priority,
+                'color': color,
+                'breakdown': {k: round(v, 1) for k, v in scores.items()},
+                'insights': self._generate_insights(scores, lead),
+                'recommendations': self._generate_recommendations(scores, lead),
+                'scored_at': scored_at
+            }
             scored_leads.append(lead)
 
-        # Sort by score (highest first)
-        scored_leads.sort(key=lambda x: x['ai_score']['total_score'], reverse=True)
+        return {'leads': scored_leads, 'distribution': distribution}
+
+    # Column order of the rows built by _extract_features
+    FEATURE_COLUMNS = (
+        'employees', 'revenue_billion', 'revenue_million', 'revenue_num',
+        'funding_billion', 'funding_million', 'public',
+        'has_title', 'title_match', 'senior_title', 'specialized_title',
+        'contact_points', 'valid_email', 'email_status_points',
+        'premium_industry', 'related_industry',
+        'tech_matches', 'funding_date', 'tech_count',
+    )
 
-        return scored_leads
+    def _extract_features(self, leads: List[Dict], query: Optional[str]) -> Dict[str, np.ndarray]:
+        """
+        Pull every raw scoring input out of the leads in a single pass
+
+        Text fields repeat heavily across a batch (sizes, titles, industries),
+        so each distinct value is parsed/matched once and memoized.
+        """
+        query_words = set(query.lower().split()) if query else set()
+        company_memo, title_memo, contact_memo, industry_memo = {}, {}, {}, {}
+
+        def company_features(size, revenue, funding):
+            employees = self._extract_number(size)
+            revenue_str = str(revenue).lower()
+            funding_str = str(funding).lower()
+            has_funding = bool(funding_str) and funding_str != 'none'
+            return (employees, 'b' in revenue_str, 'm' in revenue_str, self._extract_number(revenue_str),
+                    has_funding and 'b' in funding_str, has_funding and 'm' in funding_str)
+
+        def title_features(title):
+            job_title = str(title).lower()
+            match = len(query_words & set(job_title.split())) / len(query_words) if query_words else 0.0
+            return (bool(job_title), match,
+                    self._seniority_matcher.any(job_title), self._specialized_matcher.any(job_title))
+
+        def contact_points(title):
+            contact_title = str(title).lower()
+            return next((points for points, matcher in self._contact_tier_matchers
+                         if matcher.any(contact_title)), 0)
+
+        def industry_features(industry, subindustry):
+            combined = f"{str(industry).lower()} {str(subindustry).lower()}"
+            return (self._premium_industry_matcher.any(combined), self._related_industry_matcher.any(combined))
+
+        def memoized(memo, key, fn):
+            try:
+                value = memo.get(key)
+            except TypeError:  # Unhashable field value
+                return fn(*key)
+            if value is None:
+                value = memo[key] = fn(*key)
+            return value
+
+        rows = []
+        for lead in leads:
+            company = memoized(company_memo, (lead.get('company_size', '0'), lead.get('annual_revenue', ''),
+                                              lead.get('total_funding', '')), company_features)
+            title = memoized(title_memo, (lead.get('job_title', ''),), title_features)
+            contact = memoized(contact_memo, (lead.get('contact_title', ''),), contact_points)
+            industry = memoized(industry_memo, (lead.get('industry', ''), lead.get('subindustry', '')),
+                                industry_features)
+
+            contact_email = lead.get('contact_email', '')
+            email_status = (lead.get('email_status') or '').lower()
+            technologies = lead.get('technologies') or []
+            tech_matches = (self._premium_tech_matcher.count_distinct('\n'.join(str(t).lower() for t in technologies))
+                            if technologies else 0)
+
+            rows.append(company + (bool(lead.get('publicly_traded')),) + title + (
+                contact,
+                bool(contact_email) and '@' in contact_email and '.' in contact_email,
+                4 if email_status == 'verified' else 2 if email_status == 'guessed' else 1 if email_status else 0,
+            ) + industry + (
+                tech_matches,
+                bool(lead.get('latest_funding_date')),
+                len(technologies),
+            ))
+
+        return {name: np.asarray(column) for name, column in zip(self.FEATURE_COLUMNS, zip(*rows))}
+
+    def _score_features(self, f: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """Component scores for every lead (mirrors the _score_* methods)"""
+        w = self.weights
+
+        employees = f['employees']
+        employee_points = np.select(
+            [employees <= 0,
+             (employees >= 50) & (employees <= 200),
+             (employees > 200) & (employees <= 500),
+             (employees > 500) & (employees <= 1000),
+             employees > 1000],
+            [0, 10, 8, 6, 5],
+            default=3
+        )
+        revenue_points = np.select(
+            [f['revenue_billion'],
+             f['revenue_million'] & (f['revenue_num'] >= 100),
+             f['revenue_million'] & (f['revenue_num'] >= 10),
+             f['revenue_million']],
+            [8, 7, 5, 3],
+            default=0
+        )
+        funding_points = np.select([f['funding_billion'], f['funding_million']], [4, 3], default=0)
+        company = np.minimum(
+            0.0 + employee_points + revenue_points + funding_points + 3 * f['public'],
+            w['company_quality']
+        )
+
+        job = np.where(
+            f['has_title'],
+            np.minimum(f['title_match'] * 10 + 5 * f['senior_title'] + 5 * f['specialized_title'],
+                       w['job_relevance']),
+            0.0
+        )
+
+        email_points = np.where(f['valid_email'], 4 + f['email_status_points'], 0)
+        contact = np.minimum(0.0 + f['contact_points'] + email_points, w['contact_quality'])
+
+        industry = np.minimum(
+            np.where(f['premium_industry'], 15.0, np.where(f['related_industry'], 8.0, 0.0)),
+            w['industry_fit']
+        )
+
+        tech = np.minimum(f['tech_matches'] * 2.0, w['tech_stack_fit'])
+
+        engagement = np.minimum(5.0 + 3 * f['funding_date'] + 2 * (f['tech_count'] > 10),
+                                w['engagement_potential'])
+
+        return {
+            'company_quality': company,
+            'job_relevance': job,
+            'contact_quality': contact,
+            'industry_fit': industry,
+            'tech_stack_fit': tech,
+            'engagement_potential': engagement,
+        }
 
     def get_lead_priority_distribution(self, scored_leads: List[Dict]) -> Dict:
         """Get distribution of leads by priority"""
@@ -396,3 +627,16 @@ class AILeadScorer:
             distribution[priority] = distribution.get(priority, 0) + 1
 
         return distribution
+
+
+_scorer = None
+_scorer_lock = threading.Lock()
+
+
+def get_ai_lead_scorer() -> AILeadScorer:
+    """Get the shared lead scorer (numpy is only loaded once scoring is first used)"""
+    global _scorer
+    with _scorer_lock:
+        if _scorer is None:
+            _scorer = AILeadScorer()
+        return _scorer
@@ -4,9 +4,9 @@ Automated company research using AI and web data
 """
 
 from typing import Dict, List, Optional
-import requests
 from datetime import datetime
 import re
+from services.google_cse import get_cse_client, TTL_NEWS
 
 
 class AIResearchAgent:
@@ -203,20 +203,13 @@ class AIResearchAgent:
         try:
             # Search for recent news
             query = f'{company_name} news'
-            params = {
-                'key': self.google_api_key,
-                'cx': self.google_cx,
-                'q': query,
-                'num': 5,
-                'sort': 'date'  # Try to get recent articles
-            }
-
-            response = requests.get(self.google_search_url, params=params, timeout=10)
-            response.raise_for_status()
-            data = response.json()
-
-            if 'items' in data:
-                for item in data['items'][:5]:  # Top 5 results
+            items = get_cse_client(self.google_api_key, self.google_cx).search(
+                query, num=5, ttl=TTL_NEWS, timeout=10,
+                sort='date'  # Try to get recent articles
+            )
+
+            if items:
+                for item in items[:5]:  # Top 5 results
                     article = {
                         'title': item.get('title', ''),
                         'snippet': item.get('snippet', ''),
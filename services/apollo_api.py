@@ -1,11 +1,17 @@
+import os
 import requests
 from typing import Dict, List, Optional
 
+from services.title_taxonomy import categorize_role
+
+# Overridable so benchmarks can point the client at a local stub server
+APOLLO_BASE_URL = os.getenv('APOLLO_BASE_URL', 'https://api.apollo.io')
+
 class ApolloAPIService:
     def __init__(self, api_key: str):
         self.api_key = api_key
         # Apollo API base URL - note: some endpoints use /api/v1, others use /v1
-        self.base_url = "https://api.apollo.io"
+        self.base_url = APOLLO_BASE_URL
         self.headers = {
             'Content-Type': 'application/json',
             'Cache-Control': 'no-cache',
@@ -324,26 +330,7 @@ class ApolloAPIService:
     
     def _categorize_role(self, title: str) -> str:
         """Categorize a job title into a role type for easier filtering"""
-        title_lower = title.lower()
-        
-        if any(x in title_lower for x in ['ceo', 'chief executive', 'president', 'owner', 'founder', 'managing director']):
-            return 'Executive'
-        elif any(x in title_lower for x in ['cto', 'chief technology', 'vp engineering', 'head of engineering', 'director of engineering']):
-            return 'Tech Leadership'
-        elif any(x in title_lower for x in ['cfo', 'chief financial', 'vp finance', 'finance director']):
-            return 'Finance'
-        elif any(x in title_lower for x in ['coo', 'chief operating', 'operations director', 'vp operations']):
-            return 'Operations'
-        elif any(x in title_lower for x in ['cmo', 'chief marketing', 'vp marketing', 'marketing director', 'head of marketing']):
-            return 'Marketing'
-        elif any(x in title_lower for x in ['hr', 'human resources', 'people', 'talent', 'chro', 'recruiting']):
-            return 'HR/Recruiting'
-        elif any(x in title_lower for x in ['sales', 'revenue', 'business development', 'account executive']):
-            return 'Sales'
-        elif any(x in title_lower for x in ['partner', 'principal']):
-            return 'Partner'
-        else:
-            return 'Other'
+        return categorize_role(title)
     
     def search_people(self, person_titles: List[str] = None, person_locations: List[str] = None,
                      organization_num_employees_ranges: List[str] = None, 
@@ -0,0 +1,129 @@
+"""
+Process-wide Async Runtime
+One event loop on a dedicated daemon thread per process. Sync code (Flask
+request threads, scheduler jobs) hands coroutines to it with submit()/run(),
+so aiohttp sessions, semaphores and caches bound to the loop are shared
+across requests instead of being rebuilt per call.
+"""
+
+import asyncio
+import concurrent.futures
+import os
+import threading
+from typing import Any, Awaitable, Optional
+
+import aiohttp
+
+
+class AsyncRuntime:
+    """Background event loop with a thread-safe submit() bridge"""
+
+    def __init__(self, name: str = 'async-runtime'):
+        self.name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    def _ensure_started(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            # A loop thread inherited through fork() (gunicorn preload) is not running here
+            if self._loop is None or self._pid != os.getpid() or not self._thread.is_alive():
+                loop = asyncio.new_event_loop()
+                ready = threading.Event()
+
+                def run():
+                    asyncio.set_event_loop(loop)
+                    loop.call_soon(ready.set)
+                    loop.run_forever()
+
+                self._thread = threading.Thread(target=run, name=self.name, daemon=True)
+                self._thread.start()
+                ready.wait()
+                self._loop = loop
+                self._pid = os.getpid()
+                self._session = None
+                print(f"[ASYNC] Started background event loop ({self.name}, pid {self._pid})")
+            return self._loop
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        return self._ensure_started()
+
+    def in_loop_thread(self) -> bool:
+        """True when called from the runtime's own thread"""
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def submit(self, coro: Awaitable) -> concurrent.futures.Future:
+        """
+        Schedule a coroutine on the runtime loop
+
+        Args:
+            coro: Coroutine to run
+
+        Returns:
+            concurrent.futures.Future with the coroutine's result
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_started())
+
+    def run(self, coro: Awaitable, timeout: float = None) -> Any:
+        """
+        Run a coroutine on the runtime loop and wait for its result
+
+        Args:
+            coro: Coroutine to run
+            timeout: Seconds to wait (the coroutine is cancelled on timeout)
+
+        Returns:
+            The coroutine's result (its exception is re-raised)
+        """
+        if self.in_loop_thread():
+            coro.close()
+            raise RuntimeError("AsyncRuntime.run() called from the runtime loop - await the coroutine instead")
+
+        future = self.submit(coro)
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise
+
+    def http_session(self) -> aiohttp.ClientSession:
+        """Shared aiohttp session for code running on the runtime loop"""
+        if not self.in_loop_thread():
+            raise RuntimeError("http_session() must be used from coroutines running on the runtime loop")
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=50))
+        return self._session
+
+    def stop(self, timeout: float = 5):
+        """Close the shared session and stop the loop thread"""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            if loop is None or self._pid != os.getpid():
+                return
+            if self._session is not None and not self._session.closed:
+                asyncio.run_coroutine_threadsafe(self._session.close(), loop).result(timeout)
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout)
+            self._loop = None
+            self._session = None
+
+
+_runtime = None
+_runtime_lock = threading.Lock()
+
+
+def get_runtime() -> AsyncRuntime:
+    """Get the process-wide async runtime"""
+    global _runtime
+    with _runtime_lock:
+        if _runtime is None:
+            _runtime = AsyncRuntime()
+        return _runtime
+
+
+def run_sync(coro: Awaitable, timeout: float = None) -> Any:
+    """Run a coroutine on the process-wide runtime from sync code"""
+    return get_runtime().run(coro, timeout)
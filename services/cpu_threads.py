@@ -0,0 +1,45 @@
+"""
+Per-Worker CPU Thread Budget
+Local models (torch, ONNX Runtime) default to one thread per core in every
+process, so 4 gunicorn workers on a 4-core box run 16 busy threads. Each
+worker gets cpu_count // WEB_CONCURRENCY threads instead, unless a
+model-specific variable (EMBEDDING_THREADS, SEQ2SEQ_THREADS) sets it.
+"""
+
+import os
+import threading
+
+_torch_lock = threading.Lock()
+_interop_set = False
+
+
+def threads_per_worker(override_env: str = None) -> int:
+    """
+    Intra-op threads for a model in this process
+
+    Args:
+        override_env: Environment variable that sets the count explicitly
+
+    Returns:
+        The override if set, otherwise the cores split evenly across gunicorn workers (at least 1)
+    """
+    if override_env and os.getenv(override_env):
+        return max(1, int(os.getenv(override_env)))
+    workers = max(1, int(os.getenv('WEB_CONCURRENCY', '1')))
+    return max(1, (os.cpu_count() or 1) // workers)
+
+
+def configure_torch_threads(num_threads: int):
+    """Set torch's intra-op thread count (process-wide) and keep inter-op parallelism at one thread"""
+    global _interop_set
+    import torch
+
+    with _torch_lock:
+        torch.set_num_threads(max(1, num_threads))
+        if not _interop_set:
+            _interop_set = True
+            try:
+                # Only allowed before the first parallel op
+                torch.set_num_interop_threads(1)
+            except RuntimeError:
+                pass
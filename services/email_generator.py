@@ -1,33 +1,31 @@
+import os
 from typing import Dict
 
+# Seconds a request waits for the local model before falling back to the template
+AI_TIMEOUT = float(os.getenv('EMAIL_AI_TIMEOUT', '60'))
+
+
 class EmailGenerator:
     def __init__(self):
-        self.use_ai = False
+        # Local model generation is opt-in: EMAIL_AI_MODEL=1 tries it on first use
+        # (load_model() turns it on too); it turns itself off if transformers or
+        # the weights are unavailable
+        self.use_ai = os.getenv('EMAIL_AI_MODEL', '0') != '0'
         self.model = None
         self.tokenizer = None
 
     def load_model(self):
-        """Load the model - now optional, uses templates by default"""
-        try:
-            # Try to load transformers if available
-            from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
-            import torch
-            
-            self.model_name = "google/flan-t5-base"
-            self.device = "cuda" if torch.cuda.is_available() else "cpu"
-            
-            print("Loading email generation model...")
-            self.tokenizer = AutoTokenizer.from_pretrained(self.model_name)
-            self.model = AutoModelForSeq2SeqLM.from_pretrained(self.model_name)
-            self.model.to(self.device)
-            self.use_ai = True
-            print(f"Model loaded on {self.device}")
-        except ImportError:
-            print("Transformers not available - using template-based email generation")
-            self.use_ai = False
-        except Exception as e:
-            print(f"Could not load AI model: {e} - using templates")
-            self.use_ai = False
+        """Load the model now instead of on the first request - uses templates if it is unavailable"""
+        from services.seq2seq_inference import get_seq2seq_batcher
+
+        batcher = get_seq2seq_batcher()
+        print("Loading email generation model...")
+        self.use_ai = batcher.load()
+        self.model, self.tokenizer = batcher.model, batcher.tokenizer
+        if self.use_ai:
+            print(f"Model loaded on {batcher.device}")
+        else:
+            print("Email model not available - using template-based email generation")
 
     def generate_email(self, job_data: Dict, contact_data: Dict, template: str = None) -> Dict:
         """
@@ -60,7 +58,7 @@ class EmailGenerator:
             return {'subject': subject, 'body': body}
 
         # Try AI generation if available
-        if self.use_ai and self.model is not None:
+        if self.use_ai:
             try:
                 body = self._generate_with_ai(contact_name, contact_title, job_title, company_name)
                 if body and len(body) > 50:
@@ -78,10 +76,19 @@ class EmailGenerator:
 
     def _generate_with_ai(self, contact_name: str, contact_title: str,
                           job_title: str, company_name: str) -> str:
-        """Generate email using AI model"""
-        import torch
-        
-        prompt = f"""Write a professional recruitment email to {contact_name}, {contact_title} at {company_name}.
+        """Generate email using AI model (batched with concurrent requests)"""
+        from services.seq2seq_inference import get_seq2seq_batcher
+
+        batcher = get_seq2seq_batcher()
+        if batcher.available is False:
+            self.use_ai = False
+            return ''
+        return batcher.generate(self._build_prompt(contact_name, contact_title, job_title, company_name),
+                                timeout=AI_TIMEOUT)
+
+    @staticmethod
+    def _build_prompt(contact_name: str, contact_title: str, job_title: str, company_name: str) -> str:
+        return f"""Write a professional recruitment email to {contact_name}, {contact_title} at {company_name}.
 We are a recruitment agency and we noticed they have an opening for {job_title}.
 We want to offer our pre-vetted candidates. Keep it concise, professional, and compelling.
 The email should:
@@ -93,21 +100,6 @@ The email should:
 
 Email:"""
 
-        inputs = self.tokenizer(prompt, return_tensors="pt", max_length=512, truncation=True)
-        inputs = inputs.to(self.device)
-
-        with torch.no_grad():
-            outputs = self.model.generate(
-                **inputs,
-                max_length=300,
-                num_beams=4,
-                temperature=0.7,
-                do_sample=True,
-                top_p=0.9
-            )
-
-        return self.tokenizer.decode(outputs[0], skip_special_tokens=True)
-
     def _get_default_template(self, contact_name: str, contact_title: str,
                               job_title: str, company_name: str) -> str:
         """Fallback professional template"""
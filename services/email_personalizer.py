@@ -0,0 +1,162 @@
+"""
+Per-Lead Email Personalization
+Renders a personalized variant of a template for every lead in a campaign.
+Leads sharing the same (company, title) share one Gemini generation, groups
+run with bounded concurrency, and results are yielded as they complete so
+routes can stream them.
+"""
+
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterator, List, Tuple
+
+from services.gemini_client import get_gemini_client, GeminiError, GeminiQuotaExceeded
+
+DEFAULT_MAX_CONCURRENT = int(os.getenv('PERSONALIZE_MAX_CONCURRENT', '4'))
+MAX_CONCURRENT_LIMIT = 16
+
+PROMPT_TEMPLATE = """You are an expert cold email copywriter for tech recruiting/staffing.
+
+TASK: Personalize this email template for ONE specific recipient.
+
+ORIGINAL EMAIL:
+Subject: {subject}
+Body:
+{body}
+
+RECIPIENT:
+- Company: {company}
+- Job Title: {title}
+
+RULES:
+1. Keep the email 60-100 words MAX
+2. Keep the same template variables ({{{{FirstName}}}}, {{{{CompanyName}}}}, {{{{SenderName}}}}, etc.) - do NOT replace them
+3. Adjust the TONE and PAIN POINTS to this recipient's role and company
+4. Avoid spam triggers: "free", "guarantee", "100%", ALL CAPS, exclamation marks
+5. Keep subject line under 50 characters
+6. Use conversational tone, not corporate
+7. Short paragraphs (2-3 lines max)
+8. Do NOT add new variables - only use the ones already in the template
+
+RESPOND IN THIS EXACT JSON FORMAT (no markdown, no code blocks):
+{{
+  "personalized_subject": "the improved subject line",
+  "personalized_body": "the improved email body",
+  "changes_made": ["Brief description of change 1", "Brief description of change 2"]
+}}"""
+
+
+def parse_json_response(response_text: str) -> Dict:
+    """Parse a Gemini JSON answer, stripping markdown code fences"""
+    response_text = response_text.strip()
+    if response_text.startswith('```'):
+        response_text = response_text.split('\n', 1)[1] if '\n' in response_text else response_text[3:]
+    if response_text.endswith('```'):
+        response_text = response_text[:-3]
+    if response_text.startswith('json'):
+        response_text = response_text[4:]
+    return json.loads(response_text.strip())
+
+
+def _is_valid_variant(response_text: str) -> bool:
+    try:
+        result = parse_json_response(response_text)
+    except ValueError:
+        return False
+    return isinstance(result, dict) and bool(result.get('personalized_subject')) \
+        and bool(result.get('personalized_body'))
+
+
+def group_key(lead: Dict) -> Tuple[str, str]:
+    """Leads with the same normalized (company, title) get the same variant"""
+    company = ' '.join(str(lead.get('company') or '').lower().split())
+    title = ' '.join(str(lead.get('title') or '').lower().split())
+    return company, title
+
+
+class EmailPersonalizer:
+    """Bounded-concurrency per-lead personalization over the shared Gemini client"""
+
+    def __init__(self, max_concurrent: int = DEFAULT_MAX_CONCURRENT):
+        """
+        Initialize personalizer
+
+        Args:
+            max_concurrent: Maximum Gemini generations in flight
+        """
+        self.max_concurrent = max(1, min(int(max_concurrent or DEFAULT_MAX_CONCURRENT), MAX_CONCURRENT_LIMIT))
+        self.gemini = get_gemini_client()
+
+    def _generate_variant(self, subject: str, body: str, lead: Dict, quota_hit: threading.Event) -> Dict:
+        if quota_hit.is_set():
+            raise GeminiQuotaExceeded("Gemini API quota exceeded on all keys")
+        prompt = PROMPT_TEMPLATE.format(
+            subject=subject,
+            body=body,
+            company=lead.get('company') or 'Unknown',
+            title=lead.get('title') or 'Professional'
+        )
+        try:
+            result = parse_json_response(self.gemini.generate(prompt, validate=_is_valid_variant))
+        except GeminiQuotaExceeded:
+            # Queued groups would only fail the same way - stop calling the API
+            quota_hit.set()
+            raise
+        return {
+            'subject': result.get('personalized_subject') or subject,
+            'body': result.get('personalized_body') or body,
+            'changes_made': result.get('changes_made', []),
+        }
+
+    def personalize(self, subject: str, body: str, leads: List[Dict]) -> Iterator[Dict]:
+        """
+        Personalize a template for every lead, yielding results as groups complete
+
+        Args:
+            subject: Template subject
+            body: Template body
+            leads: Lead dicts (name, email, company, title)
+
+        Yields:
+            {'type': 'start', ...}, then one {'type': 'lead', ...} or
+            {'type': 'lead_error', ...} per lead, then {'type': 'done', ...}
+        """
+        groups: Dict[Tuple[str, str], List[Dict]] = {}
+        for lead in leads:
+            groups.setdefault(group_key(lead), []).append(lead)
+
+        print(f"[PERSONALIZE] {len(leads)} leads in {len(groups)} (company, title) groups, "
+              f"{self.max_concurrent} concurrent")
+        yield {'type': 'start', 'total_leads': len(leads), 'groups': len(groups),
+               'max_concurrent': self.max_concurrent}
+
+        quota_hit = threading.Event()
+        completed = failed = 0
+        executor = ThreadPoolExecutor(max_workers=self.max_concurrent, thread_name_prefix='personalize')
+        try:
+            futures = {
+                executor.submit(self._generate_variant, subject, body, members[0], quota_hit): members
+                for members in groups.values()
+            }
+            for future in as_completed(futures):
+                members = futures[future]
+                try:
+                    variant = future.result()
+                except (GeminiError, ValueError) as e:
+                    failed += len(members)
+                    error_type = 'quota_exceeded' if isinstance(e, GeminiQuotaExceeded) else 'api_error'
+                    for lead in members:
+                        yield {'type': 'lead_error', 'lead': lead, 'error': str(e), 'error_type': error_type}
+                    continue
+
+                completed += len(members)
+                for lead in members:
+                    yield {'type': 'lead', 'lead': lead, 'shared_with': len(members) - 1, **variant}
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        print(f"[PERSONALIZE] ✓ {completed} personalized, {failed} failed")
+        yield {'type': 'done', 'personalized': completed, 'failed': failed, 'groups': len(groups),
+               'generations_saved': len(leads) - len(groups)}
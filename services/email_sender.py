@@ -1,4 +1,3 @@
-import msal
 import requests
 from typing import Dict, Optional
 import sys
@@ -8,6 +7,8 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from utils.email_utils import text_to_html_email
 
+GRAPH_BASE_URL = os.getenv('GRAPH_BASE_URL', 'https://graph.microsoft.com')
+
 class EmailSender:
     def __init__(self, client_id: str, client_secret: str, tenant_id: str):
         self.client_id = client_id
@@ -21,6 +22,8 @@ class EmailSender:
         Authenticate using Microsoft Graph API with client credentials
         """
         try:
+            import msal  # Only needed once a token is requested
+
             authority = f"https://login.microsoftonline.com/{self.tenant_id}"
             app = msal.ConfidentialClientApplication(
                 self.client_id,
@@ -64,7 +67,7 @@ class EmailSender:
             if not from_email:
                 return {'success': False, 'message': 'Sender email is required'}
 
-            url = f"https://graph.microsoft.com/v1.0/users/{from_email}/sendMail"
+            url = f"{GRAPH_BASE_URL}/v1.0/users/{from_email}/sendMail"
 
             # Convert plain text to professional HTML format
             html_body = text_to_html_email(body)
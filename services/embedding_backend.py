@@ -0,0 +1,330 @@
+"""
+Pluggable Sentence-Embedding Backends
+VectorSearchService and RAGLeadIntelligence embed text through a backend
+chosen by EMBEDDING_BACKEND:
+
+- 'torch' (default): full-precision sentence-transformers model
+- 'onnx': the same model exported to ONNX with int8 dynamic quantization,
+  run by ONNX Runtime (no torch import at serve time)
+- 'auto': 'onnx' once benchmarks/check_embedding_parity.py has recorded a
+  passing parity report next to the exported model, otherwise 'torch'
+
+Both backends expose the subset of SentenceTransformer's API the services
+use (encode / get_sentence_embedding_dimension), and one backend per model
+is shared by every service in the process. Unless EMBEDDING_STORE=0 it is
+fronted by the on-disk embedding store (services/embedding_store.py), so
+texts any worker has already embedded are not encoded again.
+
+Texts are encoded in length buckets: sorted by token count and cut into
+batches of at most EMBEDDING_MAX_BATCH texts and EMBEDDING_BATCH_TOKENS
+padded tokens, so short job titles are not padded to the length of a
+snippet in the same batch. Results come back in the callers' order.
+"""
+
+import json
+import os
+import threading
+from typing import Dict, List, Union
+
+import numpy as np
+
+from services.cpu_threads import configure_torch_threads, threads_per_worker
+from services.local_store import PROJECT_ROOT
+
+DEFAULT_MODEL = 'all-MiniLM-L6-v2'
+BACKEND = os.getenv('EMBEDDING_BACKEND', 'torch').lower()
+ONNX_ROOT = os.getenv('EMBEDDING_ONNX_DIR', os.path.join(PROJECT_ROOT, 'instance', 'onnx'))
+MAX_SEQ_LENGTH = 256
+# Batch limits for length-bucketed encoding (tune with benchmarks/bench_embedding_bucketing.py)
+MAX_BATCH = int(os.getenv('EMBEDDING_MAX_BATCH', '64'))
+BATCH_TOKENS = int(os.getenv('EMBEDDING_BATCH_TOKENS', '4096'))
+BUCKETING = os.getenv('EMBEDDING_BUCKETING', '1') != '0'
+ONNX_FILE = 'model_int8.onnx'
+PARITY_FILE = 'parity.json'
+
+
+def onnx_model_dir(model_name: str = DEFAULT_MODEL) -> str:
+    """Directory holding the exported int8 model, tokenizer and parity report for model_name"""
+    return os.path.join(ONNX_ROOT, model_name.split('/')[-1] + '-int8')
+
+
+def hf_model_id(model_name: str) -> str:
+    """Hugging Face id for a sentence-transformers short name"""
+    return model_name if '/' in model_name else f'sentence-transformers/{model_name}'
+
+
+def plan_batches(lengths, max_batch: int = MAX_BATCH, max_tokens: int = BATCH_TOKENS,
+                 sort: bool = True) -> List[np.ndarray]:
+    """
+    Group texts into batches by token length
+
+    Args:
+        lengths: Token count of each text
+        max_batch: Most texts per batch
+        max_tokens: Most padded tokens per batch (texts x longest text); a single text may exceed it
+        sort: Bucket by length; False keeps the input order with fixed-size batches (the old behaviour)
+
+    Returns:
+        Index arrays into the input, one per batch
+    """
+    lengths = np.asarray(lengths)
+    if not sort:
+        return [np.arange(start, min(start + max_batch, len(lengths))) for start in range(0, len(lengths), max_batch)]
+    order = np.argsort(lengths, kind='stable')
+    batches, start = [], 0
+    for end in range(1, len(order) + 1):
+        # Ascending order: the text just added is the longest in its batch
+        if end == len(order) or end - start >= max_batch or (end - start + 1) * lengths[order[end]] > max_tokens:
+            batches.append(order[start:end])
+            start = end
+    return batches
+
+
+def padding_efficiency(lengths, batches) -> float:
+    """Real tokens / padded tokens for a batch plan (1.0 = no padding)"""
+    lengths = np.asarray(lengths)
+    padded = sum(len(batch) * lengths[batch].max() for batch in batches if len(batch))
+    return float(lengths.sum() / padded) if padded else 1.0
+
+
+class EmbeddingBackend:
+    """Interface: encode texts to float32 sentence embeddings"""
+
+    name = 'base'
+
+    def __init__(self, model_name: str):
+        self.model_name = model_name
+
+    def get_sentence_embedding_dimension(self) -> int:
+        raise NotImplementedError
+
+    def token_lengths(self, texts: List[str]) -> np.ndarray:
+        """Token count of each text after truncation (special tokens included)"""
+        raise NotImplementedError
+
+    def _encode(self, texts: List[str], batch_size: int) -> np.ndarray:
+        raise NotImplementedError
+
+    def encode(self, sentences: Union[str, List[str]], batch_size: int = None, **kwargs) -> np.ndarray:
+        """
+        Embed one text or a list of texts
+
+        Args:
+            sentences: Text or list of texts
+            batch_size: Most texts per forward pass (default: EMBEDDING_MAX_BATCH)
+            **kwargs: Accepted for SentenceTransformer compatibility (convert_to_numpy, show_progress_bar)
+
+        Returns:
+            1-D embedding for a single text, (n_texts x dim) array for a list
+        """
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        if not texts:
+            return np.zeros((0, self.get_sentence_embedding_dimension()), dtype=np.float32)
+        embeddings = self._encode(texts, batch_size or MAX_BATCH)
+        return embeddings[0] if single else embeddings
+
+
+class TorchEmbeddingBackend(EmbeddingBackend):
+    """Full-precision sentence-transformers model"""
+
+    name = 'torch'
+
+    def __init__(self, model_name: str = DEFAULT_MODEL, num_threads: int = None):
+        """
+        Load the model
+
+        Args:
+            model_name: sentence-transformers model
+            num_threads: torch intra-op threads (default: threads_per_worker('EMBEDDING_THREADS'))
+        """
+        super().__init__(model_name)
+        from sentence_transformers import SentenceTransformer
+
+        configure_torch_threads(num_threads or threads_per_worker('EMBEDDING_THREADS'))
+        self.model = SentenceTransformer(model_name)
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.model.get_sentence_embedding_dimension()
+
+    def token_lengths(self, texts: List[str]) -> np.ndarray:
+        encoded = self.model.tokenizer(texts, add_special_tokens=True, truncation=True,
+                                       max_length=self.model.max_seq_length)['input_ids']
+        return np.array([len(ids) for ids in encoded])
+
+    def _encode(self, texts: List[str], batch_size: int, bucketing: bool = BUCKETING) -> np.ndarray:
+        out = np.empty((len(texts), self.get_sentence_embedding_dimension()), dtype=np.float32)
+        for batch in plan_batches(self.token_lengths(texts), batch_size, sort=bucketing):
+            out[batch] = self.model.encode([texts[i] for i in batch], batch_size=len(batch),
+                                           convert_to_numpy=True, show_progress_bar=False)
+        return out
+
+
+class OnnxEmbeddingBackend(EmbeddingBackend):
+    """int8-quantized ONNX export of the same model: mean pooling + L2 normalization, as in the torch pipeline"""
+
+    name = 'onnx'
+
+    def __init__(self, model_name: str = DEFAULT_MODEL, model_dir: str = None, num_threads: int = None):
+        """
+        Load an exported model
+
+        Args:
+            model_name: sentence-transformers model the export was made from
+            model_dir: Directory from export_onnx_int8() (default: onnx_model_dir(model_name))
+            num_threads: ONNX Runtime intra-op threads (default: threads_per_worker('EMBEDDING_THREADS'))
+        """
+        super().__init__(model_name)
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        self.model_dir = model_dir or onnx_model_dir(model_name)
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = num_threads or threads_per_worker('EMBEDDING_THREADS')
+        options.inter_op_num_threads = 1
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(os.path.join(self.model_dir, ONNX_FILE), options,
+                                            providers=['CPUExecutionProvider'])
+        self.input_names = {i.name for i in self.session.get_inputs()}
+        self.dimension = self.session.get_outputs()[0].shape[-1]
+
+        self.tokenizer = Tokenizer.from_file(os.path.join(self.model_dir, 'tokenizer.json'))
+        self.tokenizer.enable_truncation(MAX_SEQ_LENGTH)
+        # Batches are padded per length bucket in _encode
+        self.tokenizer.no_padding()
+        self.pad_id = self.tokenizer.token_to_id('[PAD]') or 0
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.dimension
+
+    def token_lengths(self, texts: List[str]) -> np.ndarray:
+        return np.array([len(e.ids) for e in self.tokenizer.encode_batch(texts)])
+
+    def _encode(self, texts: List[str], batch_size: int, bucketing: bool = BUCKETING) -> np.ndarray:
+        ids = [e.ids for e in self.tokenizer.encode_batch(texts)]
+        out = np.empty((len(texts), self.dimension), dtype=np.float32)
+        for batch in plan_batches([len(i) for i in ids], batch_size, sort=bucketing):
+            longest = max(len(ids[i]) for i in batch)
+            input_ids = np.full((len(batch), longest), self.pad_id, dtype=np.int64)
+            attention_mask = np.zeros((len(batch), longest), dtype=np.int64)
+            for row, i in enumerate(batch):
+                input_ids[row, :len(ids[i])] = ids[i]
+                attention_mask[row, :len(ids[i])] = 1
+            feeds = {'input_ids': input_ids, 'attention_mask': attention_mask}
+            if 'token_type_ids' in self.input_names:
+                feeds['token_type_ids'] = np.zeros_like(input_ids)
+            token_embeddings = self.session.run(None, feeds)[0]
+
+            # Mean over real tokens, then unit length
+            mask = attention_mask[..., None].astype(np.float32)
+            pooled = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            pooled /= np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+            out[batch] = pooled
+        return out
+
+
+def export_onnx_int8(model_name: str = DEFAULT_MODEL, output_dir: str = None) -> str:
+    """
+    Export a sentence-transformers model to ONNX and quantize its weights to int8 (needs torch)
+
+    Args:
+        model_name: sentence-transformers model to export
+        output_dir: Destination (default: onnx_model_dir(model_name))
+
+    Returns:
+        The output directory (model_int8.onnx + tokenizer.json)
+    """
+    import torch
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    from transformers import AutoModel, AutoTokenizer
+
+    output_dir = output_dir or onnx_model_dir(model_name)
+    os.makedirs(output_dir, exist_ok=True)
+    tokenizer = AutoTokenizer.from_pretrained(hf_model_id(model_name))
+    model = AutoModel.from_pretrained(hf_model_id(model_name)).eval()
+
+    sample = tokenizer(['export sample text'], return_tensors='pt')
+    names = [n for n in ('input_ids', 'attention_mask', 'token_type_ids') if n in sample]
+    fp32_path = os.path.join(output_dir, 'model_fp32.onnx')
+    with torch.inference_mode():
+        torch.onnx.export(model, tuple(sample[n] for n in names), fp32_path,
+                          input_names=names, output_names=['token_embeddings'],
+                          dynamic_axes={**{n: {0: 'batch', 1: 'sequence'} for n in names},
+                                        'token_embeddings': {0: 'batch', 1: 'sequence'}},
+                          opset_version=14)
+    quantize_dynamic(fp32_path, os.path.join(output_dir, ONNX_FILE), weight_type=QuantType.QInt8)
+    os.remove(fp32_path)
+    tokenizer.save_pretrained(output_dir)
+    # A new export invalidates any earlier parity result
+    if os.path.exists(os.path.join(output_dir, PARITY_FILE)):
+        os.remove(os.path.join(output_dir, PARITY_FILE))
+    print(f"[EMBED] Exported {model_name} (int8 ONNX) to {output_dir}")
+    return output_dir
+
+
+def parity_report(model_name: str = DEFAULT_MODEL) -> Dict:
+    """The parity report recorded for the exported model ({} if none)"""
+    try:
+        with open(os.path.join(onnx_model_dir(model_name), PARITY_FILE)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def write_parity_report(report: Dict, model_name: str = DEFAULT_MODEL):
+    with open(os.path.join(onnx_model_dir(model_name), PARITY_FILE), 'w') as f:
+        json.dump(report, f, indent=2)
+
+
+def create_embedding_backend(model_name: str = DEFAULT_MODEL, backend: str = None) -> EmbeddingBackend:
+    """
+    Build a backend (not shared - use get_embedding_backend in services)
+
+    Args:
+        model_name: sentence-transformers model
+        backend: 'torch', 'onnx' or 'auto' (default: EMBEDDING_BACKEND)
+
+    Returns:
+        The requested backend; falls back to torch when the ONNX model cannot be loaded
+    """
+    backend = (backend or BACKEND).lower()
+    if backend == 'auto':
+        backend = 'onnx' if parity_report(model_name).get('passed') else 'torch'
+    if backend == 'onnx':
+        try:
+            return OnnxEmbeddingBackend(model_name)
+        except Exception as e:
+            print(f"[EMBED] ONNX backend unavailable for {model_name} ({e}) - using torch")
+    elif backend != 'torch':
+        print(f"[EMBED] Unknown EMBEDDING_BACKEND '{backend}' - using torch")
+    return TorchEmbeddingBackend(model_name)
+
+
+_backends: Dict[str, EmbeddingBackend] = {}
+_backends_lock = threading.Lock()
+
+
+def get_embedding_backend(model_name: str = DEFAULT_MODEL) -> EmbeddingBackend:
+    """Get the process-wide backend for model_name (loaded on first use)"""
+    with _backends_lock:
+        if model_name not in _backends:
+            backend = create_embedding_backend(model_name)
+            print(f"[EMBED] {model_name} served by the {backend.name} backend")
+            _backends[model_name] = with_embedding_store(backend)
+        return _backends[model_name]
+
+
+def with_embedding_store(backend: EmbeddingBackend) -> EmbeddingBackend:
+    """Front a backend with the shared embedding store (returned unchanged if the store is off or unusable)"""
+    from services.embedding_store import STORE_ENABLED, CachedEmbeddingBackend, get_embedding_store
+
+    if not STORE_ENABLED:
+        return backend
+    namespace = f"{backend.model_name.split('/')[-1]}-{backend.name}"
+    try:
+        store = get_embedding_store(namespace, backend.get_sentence_embedding_dimension())
+        store.get_stats()
+    except Exception as e:
+        print(f"[EMBED] Embedding store unavailable ({e}) - encoding every text")
+        return backend
+    return CachedEmbeddingBackend(backend, store)
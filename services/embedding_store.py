@@ -0,0 +1,258 @@
+"""
+Content-Addressed Embedding Store
+Persists sentence embeddings so gunicorn workers stop re-encoding the same
+job titles, company descriptions and ICP profiles.
+
+Layout (per model + backend namespace, under instance/):
+- embeddings-<namespace>.f16: append-only float16 rows, memory-mapped
+  read-only by every worker; row i starts at byte i * dim * 2
+- embeddings.db (local store): blake2b(text) -> row index plus the committed
+  row count
+
+Single-writer append protocol: a writer takes SQLite's write lock
+(BEGIN IMMEDIATE), truncates the data file to the committed row count
+(dropping any tail left by a crashed writer), appends and fsyncs its rows,
+then commits the index entries and the new row count in the same
+transaction. Readers only ever map committed rows, so they never see a
+partially written vector.
+"""
+
+import hashlib
+import os
+import threading
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+
+from services.embedding_backend import EmbeddingBackend
+from services.local_store import connect, instance_path
+
+STORE_ENABLED = os.getenv('EMBEDDING_STORE', '1') != '0'
+# 384-dim rows are 768 bytes: 1M rows ~ 730 MB
+MAX_ROWS = int(os.getenv('EMBEDDING_STORE_MAX_ROWS', '1000000'))
+LOOKUP_CHUNK = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS embedding_files (
+    namespace TEXT PRIMARY KEY,
+    dimension INTEGER NOT NULL,
+    rows INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS embedding_index (
+    namespace TEXT NOT NULL,
+    key BLOB NOT NULL,
+    row INTEGER NOT NULL,
+    PRIMARY KEY (namespace, key)
+);
+CREATE INDEX IF NOT EXISTS idx_embedding_index_row ON embedding_index (namespace, row);
+"""
+
+
+def text_key(text: str) -> bytes:
+    """Content address of a text (16-byte blake2b digest)"""
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+
+
+class EmbeddingStore:
+    """Append-only float16 vectors, memory-mapped read-only, indexed by text hash"""
+
+    def __init__(self, namespace: str, dimension: int, max_rows: int = MAX_ROWS):
+        """
+        Open (or create) a store
+
+        Args:
+            namespace: Model + backend the vectors come from, e.g. 'all-MiniLM-L6-v2-torch'
+            dimension: Embedding dimension (must match an existing store)
+            max_rows: Stop appending once the file holds this many rows
+        """
+        self.namespace = namespace
+        self.dimension = dimension
+        self.max_rows = max_rows
+        self.row_bytes = dimension * np.dtype(np.float16).itemsize
+        self.path = instance_path(f"embeddings-{namespace.replace('/', '_')}.f16")
+        self._lock = threading.RLock()
+        self._pid = None
+        self._conn = None
+        # key -> row for every committed row up to _synced_rows
+        self._index: Dict[bytes, int] = {}
+        self._synced_rows = 0
+        self._mmap: Optional[np.memmap] = None
+        self._full = False
+        self.stats = {'hits': 0, 'misses': 0, 'appended': 0}
+
+    def _ensure_open(self):
+        # SQLite connections must not cross fork() (gunicorn preload)
+        if self._conn is None or self._pid != os.getpid():
+            self._conn = connect('embeddings.db', SCHEMA)
+            self._conn.isolation_level = None
+            self._pid = os.getpid()
+            self._index, self._synced_rows, self._mmap = {}, 0, None
+            row = self._conn.execute('SELECT dimension FROM embedding_files WHERE namespace = ?',
+                                     (self.namespace,)).fetchone()
+            if row and row[0] != self.dimension:
+                raise ValueError(f"Embedding store {self.namespace} holds {row[0]}-dim vectors, not {self.dimension}")
+
+    def _sync(self):
+        """Pick up rows other workers committed since the last sync and remap the file"""
+        self._ensure_open()
+        committed = self._conn.execute('SELECT rows FROM embedding_files WHERE namespace = ?',
+                                       (self.namespace,)).fetchone()
+        committed = committed[0] if committed else 0
+        if committed <= self._synced_rows:
+            return
+        for key, row in self._conn.execute(
+                'SELECT key, row FROM embedding_index WHERE namespace = ? AND row >= ? AND row < ?',
+                (self.namespace, self._synced_rows, committed)):
+            self._index[bytes(key)] = row
+        # Views handed out earlier keep their own reference to the old map
+        self._mmap = np.memmap(self.path, dtype=np.float16, mode='r', shape=(committed, self.dimension))
+        self._synced_rows = committed
+
+    def lookup(self, keys: List[bytes]) -> List[Optional[int]]:
+        """Committed row for each key (None for misses)"""
+        with self._lock:
+            self._ensure_open()
+            if any(key not in self._index for key in keys):
+                self._sync()
+            rows = [self._index.get(key) for key in keys]
+        hits = sum(1 for row in rows if row is not None)
+        self.stats['hits'] += hits
+        self.stats['misses'] += len(rows) - hits
+        return rows
+
+    def vector(self, row: int) -> np.ndarray:
+        """Zero-copy read-only float16 view of one stored row"""
+        return self._mmap[row]
+
+    def vectors(self, rows: List[int]) -> np.ndarray:
+        """Stored rows gathered into one float32 array"""
+        return self._mmap[np.asarray(rows, dtype=np.int64)].astype(np.float32)
+
+    def append(self, keys: List[bytes], vectors: np.ndarray) -> int:
+        """
+        Store vectors for keys that are not stored yet (single writer across processes)
+
+        Args:
+            keys: Content keys (text_key)
+            vectors: (len(keys) x dimension) embeddings
+
+        Returns:
+            Number of rows appended
+        """
+        if self._full or not keys:
+            return 0
+        with self._lock:
+            self._ensure_open()
+            conn = self._conn
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                row = conn.execute('SELECT rows FROM embedding_files WHERE namespace = ?',
+                                   (self.namespace,)).fetchone()
+                committed = row[0] if row else 0
+
+                # Another worker may have stored some of these since our lookup
+                existing = set()
+                for start in range(0, len(keys), LOOKUP_CHUNK):
+                    chunk = keys[start:start + LOOKUP_CHUNK]
+                    existing.update(bytes(k) for (k,) in conn.execute(
+                        f"SELECT key FROM embedding_index WHERE namespace = ? AND key IN ({','.join('?' * len(chunk))})",
+                        (self.namespace, *chunk)))
+                new, seen = [], set()
+                for i, key in enumerate(keys):
+                    if key not in existing and key not in seen:
+                        seen.add(key)
+                        new.append(i)
+                new = new[:max(0, self.max_rows - committed)]
+                if not new:
+                    conn.execute('ROLLBACK')
+                    if committed >= self.max_rows and not self._full:
+                        self._full = True
+                        print(f"[EMBED] Store {self.namespace} is full ({committed:,} rows) - no longer appending")
+                    return 0
+
+                data = np.ascontiguousarray(vectors[new], dtype=np.float16)
+                with open(self.path, 'ab') as f:
+                    f.truncate(committed * self.row_bytes)
+                    f.write(data.tobytes())
+                    f.flush()
+                    os.fsync(f.fileno())
+
+                conn.executemany('INSERT INTO embedding_index (namespace, key, row) VALUES (?, ?, ?)',
+                                 [(self.namespace, keys[i], committed + n) for n, i in enumerate(new)])
+                conn.execute('INSERT INTO embedding_files (namespace, dimension, rows) VALUES (?, ?, ?) '
+                             'ON CONFLICT(namespace) DO UPDATE SET rows = excluded.rows',
+                             (self.namespace, self.dimension, committed + len(new)))
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+            self.stats['appended'] += len(new)
+            self._sync()
+            return len(new)
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            self._ensure_open()
+            self._sync()
+            return dict(self.stats, namespace=self.namespace, rows=self._synced_rows,
+                        bytes=self._synced_rows * self.row_bytes)
+
+
+class CachedEmbeddingBackend(EmbeddingBackend):
+    """Serves stored vectors and only runs the wrapped backend for texts the store has not seen"""
+
+    def __init__(self, backend: EmbeddingBackend, store: EmbeddingStore):
+        super().__init__(backend.model_name)
+        self.backend = backend
+        self.store = store
+        self.name = backend.name
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.backend.get_sentence_embedding_dimension()
+
+    def encode(self, sentences: Union[str, List[str]], batch_size: int = None, **kwargs) -> np.ndarray:
+        """Like EmbeddingBackend.encode - float32 whether stored or not (EmbeddingStore.vector is the zero-copy view)"""
+        if isinstance(sentences, str):
+            row = self.store.lookup([text_key(sentences)])[0]
+            if row is not None:
+                return self.store.vector(row).astype(np.float32)
+        return super().encode(sentences, batch_size, **kwargs)
+
+    def _encode(self, texts: List[str], batch_size: int) -> np.ndarray:
+        keys = [text_key(text) for text in texts]
+        rows = self.store.lookup(keys)
+        out = np.empty((len(texts), self.get_sentence_embedding_dimension()), dtype=np.float32)
+
+        hits = [i for i, row in enumerate(rows) if row is not None]
+        if hits:
+            out[hits] = self.store.vectors([rows[i] for i in hits])
+
+        misses = [i for i, row in enumerate(rows) if row is None]
+        if misses:
+            # Encode each distinct missing text once
+            first = {}
+            for i in misses:
+                first.setdefault(keys[i], i)
+            unique = list(first.values())
+            # Round to the stored precision so cold and warm lookups return the same vectors
+            computed = self.backend._encode([texts[i] for i in unique], batch_size).astype(np.float16)
+            by_key = {keys[i]: vector for i, vector in zip(unique, computed)}
+            for i in misses:
+                out[i] = by_key[keys[i]]
+            try:
+                self.store.append([keys[i] for i in unique], computed)
+            except Exception as e:
+                print(f"[EMBED] Could not store {len(unique)} embeddings: {e}")
+        return out
+
+
+_stores: Dict[str, EmbeddingStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_embedding_store(namespace: str, dimension: int) -> EmbeddingStore:
+    """Get the process-wide store for a model + backend namespace"""
+    with _stores_lock:
+        if namespace not in _stores:
+            _stores[namespace] = EmbeddingStore(namespace, dimension)
+        return _stores[namespace]
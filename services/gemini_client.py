@@ -0,0 +1,334 @@
+"""
+Shared Gemini Client
+One process-wide entry point for Gemini text generation: a pool of API keys
+(each with its own HTTP session), cooldowns for quota-exhausted keys, a
+per-request deadline and a persistent content-hash response cache.
+
+Talks to the Generative Language REST API directly, so keys never go through
+the SDK's process-global genai.configure().
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+import requests
+
+from services import local_store
+
+GEMINI_API_URL = "https://generativelanguage.googleapis.com/v1beta/models/{model}:generateContent"
+DEFAULT_MODEL = 'gemini-2.5-flash'
+DEFAULT_DEADLINE = float(os.getenv('GEMINI_DEADLINE_SECONDS', '90'))
+DEFAULT_CACHE_TTL = 7 * 24 * 60 * 60
+
+# Cooldowns for exhausted keys (seconds) when the API gives no retry delay
+QUOTA_COOLDOWN = 60
+DAILY_QUOTA_COOLDOWN = 60 * 60
+
+CACHE_FILE = 'gemini_cache.db'
+CACHE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS gemini_responses (
+    cache_key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    response TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+_RETRY_DELAY = re.compile(r'"retryDelay":\s*"(\d+(?:\.\d+)?)s"')
+
+
+class GeminiError(Exception):
+    """Gemini call failed for a reason other than quota"""
+    pass
+
+
+class GeminiNotConfigured(GeminiError):
+    """No Gemini API key is configured"""
+    pass
+
+
+class GeminiTimeout(GeminiError):
+    """The request deadline passed before Gemini answered"""
+    pass
+
+
+class GeminiQuotaExceeded(GeminiError):
+    """Every key is out of quota (retry_after: seconds until one cools down)"""
+
+    def __init__(self, message: str, retry_after: float = 0):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class GeminiKey:
+    """One API key with its own HTTP session and quota state"""
+
+    def __init__(self, api_key: str):
+        self.api_key = api_key
+        self.session = requests.Session()
+        self.session.headers.update({'x-goog-api-key': api_key, 'Content-Type': 'application/json'})
+        self.cooldown_until = 0.0
+        self.calls = 0
+        self.quota_errors = 0
+
+    @property
+    def label(self) -> str:
+        return f"...{self.api_key[-6:]}"
+
+    def available(self, now: float) -> bool:
+        return now >= self.cooldown_until
+
+
+class GeminiResponseCache:
+    """Persistent prompt-hash -> response text cache"""
+
+    def __init__(self, filename: str = CACHE_FILE):
+        self.filename = filename
+        self._local = threading.local()
+        self.enabled = True
+        try:
+            conn = self._conn()
+            conn.execute('DELETE FROM gemini_responses WHERE expires_at < ?', (time.time(),))
+            conn.commit()
+        except sqlite3.Error as e:
+            print(f"[GEMINI CACHE] Disabled - could not open cache: {e}")
+            self.enabled = False
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = local_store.connect(self.filename, CACHE_SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def make_key(model: str, prompt: str, generation_config: Dict = None) -> str:
+        raw = f"{model}\n{sorted((generation_config or {}).items())}\n{prompt}"
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        if not self.enabled:
+            return None
+        try:
+            conn = self._conn()
+            row = conn.execute('SELECT response, expires_at FROM gemini_responses WHERE cache_key = ?',
+                               (key,)).fetchone()
+            if not row or row[1] < time.time():
+                return None
+            conn.execute('UPDATE gemini_responses SET hits = hits + 1 WHERE cache_key = ?', (key,))
+            conn.commit()
+            return row[0]
+        except sqlite3.Error as e:
+            print(f"[GEMINI CACHE] Read failed: {e}")
+            return None
+
+    def set(self, key: str, model: str, response: str, ttl: int):
+        if not self.enabled or ttl <= 0:
+            return
+        try:
+            now = time.time()
+            conn = self._conn()
+            conn.execute(
+                'INSERT OR REPLACE INTO gemini_responses (cache_key, model, response, created_at, expires_at, hits) '
+                'VALUES (?, ?, ?, ?, ?, 0)',
+                (key, model, response, now, now + ttl)
+            )
+            conn.commit()
+        except sqlite3.Error as e:
+            print(f"[GEMINI CACHE] Write failed: {e}")
+
+    def get_stats(self) -> Dict:
+        if not self.enabled:
+            return {'enabled': False}
+        try:
+            entries, total_hits = self._conn().execute(
+                'SELECT COUNT(*), COALESCE(SUM(hits), 0) FROM gemini_responses WHERE expires_at >= ?',
+                (time.time(),)
+            ).fetchone()
+            return {'enabled': True, 'entries': entries, 'total_hits': total_hits}
+        except sqlite3.Error as e:
+            return {'enabled': True, 'error': str(e)}
+
+    def clear(self):
+        if not self.enabled:
+            return
+        conn = self._conn()
+        conn.execute('DELETE FROM gemini_responses')
+        conn.commit()
+
+
+class GeminiClient:
+    """Key-pool Gemini client shared by every route in the process"""
+
+    def __init__(self, api_keys: List[str], model: str = DEFAULT_MODEL, cache: GeminiResponseCache = None):
+        """
+        Initialize Gemini client
+
+        Args:
+            api_keys: API keys in preference order (primary first)
+            model: Default model name
+            cache: Response cache (optional, uses a local store cache if not provided)
+        """
+        self.keys = [GeminiKey(k) for k in dict.fromkeys(k for k in api_keys if k)]
+        self.model = model
+        self.cache = cache or GeminiResponseCache()
+        self._lock = threading.Lock()
+        self.stats = {'requests': 0, 'cache_hits': 0, 'api_calls': 0, 'quota_errors': 0,
+                      'timeouts': 0, 'errors': 0}
+
+    def _count(self, stat: str):
+        with self._lock:
+            self.stats[stat] += 1
+
+    def _cooldown(self, key: GeminiKey, body: str):
+        """Put an exhausted key aside until its quota is expected back"""
+        match = _RETRY_DELAY.search(body or '')
+        if match:
+            delay = float(match.group(1)) + 1
+        elif 'PerDay' in (body or ''):
+            delay = DAILY_QUOTA_COOLDOWN
+        else:
+            delay = QUOTA_COOLDOWN
+        with self._lock:
+            key.cooldown_until = time.time() + delay
+            key.quota_errors += 1
+        print(f"[GEMINI] Key {key.label} out of quota - cooling down for {delay:.0f}s")
+
+    @staticmethod
+    def _is_quota_error(status: int, body: str) -> bool:
+        return status == 429 or 'RESOURCE_EXHAUSTED' in (body or '')
+
+    @staticmethod
+    def _extract_text(data: Dict) -> str:
+        candidates = data.get('candidates') or []
+        if not candidates:
+            reason = (data.get('promptFeedback') or {}).get('blockReason', 'no candidates')
+            raise GeminiError(f"Gemini returned no content ({reason})")
+        parts = (candidates[0].get('content') or {}).get('parts') or []
+        text = ''.join(part.get('text', '') for part in parts if not part.get('thought'))
+        if not text.strip():
+            raise GeminiError(f"Gemini returned an empty response ({candidates[0].get('finishReason', 'unknown')})")
+        return text.strip()
+
+    def generate(self, prompt: str, model: str = None, deadline: float = DEFAULT_DEADLINE,
+                 use_cache: bool = True, cache_ttl: int = DEFAULT_CACHE_TTL,
+                 validate: Callable[[str], bool] = None, generation_config: Dict = None) -> str:
+        """
+        Generate text, trying healthy keys in order
+
+        Args:
+            prompt: Prompt text
+            model: Model name (optional, uses the client default)
+            deadline: Seconds allowed for the whole call, across keys
+            use_cache: Return a cached response for an identical prompt if there is one
+            cache_ttl: Seconds to keep the response (it is stored even when use_cache is False)
+            validate: Optional check; responses failing it are returned but not cached
+            generation_config: Optional Gemini generationConfig
+
+        Returns:
+            Response text
+
+        Raises:
+            GeminiNotConfigured, GeminiQuotaExceeded, GeminiTimeout, GeminiError
+        """
+        if not self.keys:
+            raise GeminiNotConfigured("Gemini API key not configured")
+
+        model = model or self.model
+        self._count('requests')
+        cache_key = self.cache.make_key(model, prompt, generation_config)
+        if use_cache:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                self._count('cache_hits')
+                print(f"[GEMINI] ✓ Cache hit ({len(prompt)} char prompt)")
+                return cached
+
+        payload = {'contents': [{'role': 'user', 'parts': [{'text': prompt}]}]}
+        if generation_config:
+            payload['generationConfig'] = generation_config
+
+        url = GEMINI_API_URL.format(model=model)
+        expires = time.time() + deadline
+        last_error = None
+
+        for key in self.keys:
+            now = time.time()
+            if not key.available(now):
+                continue
+            remaining = expires - now
+            if remaining <= 1:
+                self._count('timeouts')
+                raise GeminiTimeout(f"Gemini did not answer within {deadline:.0f}s")
+
+            self._count('api_calls')
+            key.calls += 1
+            try:
+                response = key.session.post(url, json=payload, timeout=(5, remaining))
+            except requests.Timeout:
+                self._count('timeouts')
+                raise GeminiTimeout(f"Gemini did not answer within {deadline:.0f}s")
+            except requests.RequestException as e:
+                self._count('errors')
+                raise GeminiError(f"Gemini request failed: {e}")
+
+            if response.status_code == 200:
+                text = self._extract_text(response.json())
+                if validate is None or validate(text):
+                    self.cache.set(cache_key, model, text, cache_ttl)
+                return text
+
+            body = response.text
+            if self._is_quota_error(response.status_code, body):
+                self._count('quota_errors')
+                self._cooldown(key, body)
+                last_error = body[:200]
+                continue
+
+            self._count('errors')
+            print(f"[GEMINI] Error {response.status_code} with key {key.label}: {body[:200]}")
+            raise GeminiError(f"{response.status_code} {body[:300]}")
+
+        retry_after = max(0.0, min(k.cooldown_until for k in self.keys) - time.time())
+        raise GeminiQuotaExceeded(
+            f"Gemini API quota exceeded on all keys (retry in {retry_after:.0f}s)"
+            + (f". Last error: {last_error}" if last_error else ''),
+            retry_after=retry_after
+        )
+
+    def get_stats(self) -> Dict:
+        """Call counters, key health and cache size"""
+        now = time.time()
+        with self._lock:
+            stats = dict(self.stats)
+        stats['keys'] = [{
+            'key': key.label,
+            'calls': key.calls,
+            'quota_errors': key.quota_errors,
+            'cooling_down_for': round(max(0.0, key.cooldown_until - now)),
+        } for key in self.keys]
+        stats['cache'] = self.cache.get_stats()
+        return stats
+
+
+_client = None
+_client_keys = None
+_client_lock = threading.Lock()
+
+
+def get_gemini_client() -> GeminiClient:
+    """Get the shared Gemini client (rebuilt if the configured keys change)"""
+    global _client, _client_keys
+    keys = tuple(k for k in (os.getenv('GEMINI_API_KEY'), os.getenv('GEMINI_API_KEY_FALLBACK')) if k)
+    with _client_lock:
+        if _client is None or keys != _client_keys:
+            _client = GeminiClient(list(keys), cache=_client.cache if _client else None)
+            _client_keys = keys
+        return _client
@@ -0,0 +1,480 @@
+"""
+Gmail API Sender
+Cached Gmail API clients per connected SenderAccount. Each client is built
+once from the bundled (static) discovery document, refreshes its OAuth token
+before it expires, and sends messages in Gmail batch HTTP requests paced to
+the per-user sending limits.
+
+Every message outcome is written to the send log (gmail_sends.db in the
+local store) as its batch completes. The daily cap is counted from that log,
+so it holds across workers and restarts. Large sends run as background jobs
+(start_send_job) whose progress any worker can read back from the log.
+"""
+
+import base64
+import json
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from email.mime.text import MIMEText
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional
+
+from google.auth.exceptions import RefreshError
+from google.auth.transport.requests import Request
+from google.oauth2.credentials import Credentials
+from googleapiclient.discovery import build_from_document
+from googleapiclient.discovery_cache import get_static_doc
+from googleapiclient.errors import HttpError
+
+from services.local_store import connect
+from services.vendor_telemetry import get_vendor_telemetry, GMAIL_SEND_UNITS
+
+TOKEN_URI = 'https://oauth2.googleapis.com/token'
+SCOPES = ['https://www.googleapis.com/auth/gmail.send']
+
+# Refresh tokens this long before they expire
+REFRESH_MARGIN = timedelta(minutes=5)
+
+# Gmail per-user limits: 250 quota units/s with messages.send costing 100,
+# and a daily sending cap (500 for consumer accounts, 2000 for Workspace)
+BATCH_SIZE = int(os.getenv('GMAIL_BATCH_SIZE', '10'))
+SENDS_PER_SECOND = float(os.getenv('GMAIL_SENDS_PER_SECOND', '2'))
+DAILY_SEND_LIMIT = int(os.getenv('GMAIL_DAILY_SEND_LIMIT', '500'))
+MAX_RETRIES = 3
+# Background send jobs run at once per worker
+SEND_JOB_WORKERS = int(os.getenv('GMAIL_SEND_JOB_WORKERS', '2'))
+DAY_SECONDS = 24 * 60 * 60
+
+RATE_LIMIT_REASONS = {'rateLimitExceeded', 'userRateLimitExceeded'}
+
+
+class GmailAuthError(Exception):
+    """Sender token could not be refreshed - the account must be reconnected"""
+    pass
+
+
+@lru_cache(maxsize=1)
+def _discovery_document() -> Dict:
+    """Gmail v1 discovery document bundled with google-api-python-client (parsed once)"""
+    return json.loads(get_static_doc('gmail', 'v1'))
+
+
+def build_message(to_email: str, from_email: str, subject: str, html_body: str) -> Dict:
+    """Gmail API message body for an HTML email"""
+    message = MIMEText(html_body, 'html')
+    message['to'] = to_email
+    message['from'] = from_email
+    message['subject'] = subject
+    return {'raw': base64.urlsafe_b64encode(message.as_bytes()).decode()}
+
+
+def _is_rate_limited(error: HttpError) -> bool:
+    if error.resp.status == 429:
+        return True
+    if error.resp.status != 403:
+        return False
+    try:
+        details = json.loads(error.content).get('error', {}).get('errors', [])
+    except (ValueError, AttributeError):
+        return False
+    return any(d.get('reason') in RATE_LIMIT_REASONS for d in details)
+
+
+SEND_LOG_SCHEMA = """
+CREATE TABLE IF NOT EXISTS gmail_sends (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    sender_email TEXT NOT NULL,
+    job_id TEXT,
+    recipient TEXT NOT NULL,
+    status TEXT NOT NULL,
+    message_id TEXT,
+    error TEXT,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_gmail_sends_sender ON gmail_sends (sender_email, status, created_at);
+CREATE INDEX IF NOT EXISTS idx_gmail_sends_job ON gmail_sends (job_id);
+CREATE TABLE IF NOT EXISTS gmail_send_jobs (
+    job_id TEXT PRIMARY KEY,
+    sender_email TEXT NOT NULL,
+    total INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    error TEXT,
+    created_at REAL NOT NULL,
+    finished_at REAL
+);
+"""
+
+
+class GmailSendLog:
+    """Per-message send outcomes ('sent', 'failed', 'deferred') and send jobs, shared by all workers"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pid = None
+        self._conn = None
+
+    def _connection(self):
+        # SQLite connections must not cross fork() (gunicorn preload)
+        if self._conn is None or self._pid != os.getpid():
+            self._conn = connect('gmail_sends.db', SEND_LOG_SCHEMA)
+            self._pid = os.getpid()
+        return self._conn
+
+    def record(self, sender_email: str, results: List[Dict], job_id: str = None):
+        """
+        Store the final outcome of each message
+
+        Args:
+            sender_email: Sending account
+            results: send_batch result dicts
+            job_id: Send job the messages belong to (None for direct sends)
+        """
+        if not results:
+            return
+        now = time.time()
+        rows = [(sender_email, job_id, r['to'],
+                 'sent' if r['success'] else 'deferred' if r.get('deferred') else 'failed',
+                 r.get('message_id'), r.get('error'), now) for r in results]
+        with self._lock:
+            conn = self._connection()
+            conn.executemany('INSERT INTO gmail_sends (sender_email, job_id, recipient, status, message_id, error, '
+                             'created_at) VALUES (?, ?, ?, ?, ?, ?, ?)', rows)
+            conn.commit()
+
+    def sent_since(self, sender_email: str, since: float) -> int:
+        """Messages the account has sent since a unix time (all workers)"""
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT COUNT(*) FROM gmail_sends WHERE sender_email = ? AND status = 'sent' AND created_at >= ?",
+                (sender_email, since)
+            ).fetchone()
+        return row[0]
+
+    def create_job(self, sender_email: str, total: int) -> str:
+        """Register a queued send job and return its id"""
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            conn = self._connection()
+            conn.execute("INSERT INTO gmail_send_jobs (job_id, sender_email, total, status, created_at) "
+                         "VALUES (?, ?, ?, 'queued', ?)", (job_id, sender_email, total, time.time()))
+            conn.commit()
+        return job_id
+
+    def set_job_status(self, job_id: str, status: str, error: str = None):
+        """Move a job to 'running', 'done' or 'failed'"""
+        finished = time.time() if status in ('done', 'failed') else None
+        with self._lock:
+            conn = self._connection()
+            conn.execute('UPDATE gmail_send_jobs SET status = ?, error = COALESCE(?, error), finished_at = ? '
+                         'WHERE job_id = ?', (status, error, finished, job_id))
+            conn.commit()
+
+    def get_job(self, job_id: str, include_results: bool = True) -> Optional[Dict]:
+        """
+        Progress of a send job
+
+        Args:
+            job_id: Id returned by create_job
+            include_results: Also return the per-message outcomes recorded so far
+
+        Returns:
+            Job dict with sent / failed / deferred counts, or None if unknown
+        """
+        with self._lock:
+            conn = self._connection()
+            job = conn.execute('SELECT sender_email, total, status, error, created_at, finished_at '
+                               'FROM gmail_send_jobs WHERE job_id = ?', (job_id,)).fetchone()
+            if job is None:
+                return None
+            rows = conn.execute('SELECT recipient, status, message_id, error FROM gmail_sends '
+                                'WHERE job_id = ? ORDER BY id', (job_id,)).fetchall()
+        counts = {'sent': 0, 'failed': 0, 'deferred': 0}
+        for _, status, _, _ in rows:
+            counts[status] = counts.get(status, 0) + 1
+        result = dict(counts, job_id=job_id, sender_email=job[0], total=job[1], status=job[2], error=job[3],
+                      pending=max(0, job[1] - len(rows)),
+                      created_at=datetime.utcfromtimestamp(job[4]).isoformat(),
+                      finished_at=datetime.utcfromtimestamp(job[5]).isoformat() if job[5] else None)
+        if include_results:
+            result['results'] = [{'to': to, 'status': status, 'message_id': message_id, 'error': error}
+                                 for to, status, message_id, error in rows]
+        return result
+
+
+_send_log = None
+_send_log_lock = threading.Lock()
+
+
+def get_send_log() -> GmailSendLog:
+    """Get the process-wide Gmail send log"""
+    global _send_log
+    with _send_log_lock:
+        if _send_log is None:
+            _send_log = GmailSendLog()
+        return _send_log
+
+
+class GmailClient:
+    """Gmail API client for one sender account"""
+
+    def __init__(self, sender_email: str, access_token: str, refresh_token: str,
+                 token_expiry: Optional[datetime] = None):
+        """
+        Initialize Gmail client
+
+        Args:
+            sender_email: Connected Gmail address
+            access_token: OAuth access token
+            refresh_token: OAuth refresh token
+            token_expiry: Access token expiry (naive UTC)
+        """
+        self.sender_email = sender_email
+        self.credentials = Credentials(
+            token=access_token,
+            refresh_token=refresh_token,
+            token_uri=TOKEN_URI,
+            client_id=os.getenv('GOOGLE_OAUTH_CLIENT_ID'),
+            client_secret=os.getenv('GOOGLE_OAUTH_CLIENT_SECRET'),
+            scopes=SCOPES
+        )
+        self.credentials.expiry = token_expiry
+        self.service = build_from_document(_discovery_document(), credentials=self.credentials)
+
+        # httplib2 (used by the service) is not thread-safe
+        self._lock = threading.RLock()
+        self._last_send = 0.0
+
+    def update_token(self, access_token: str, token_expiry: Optional[datetime]):
+        """Adopt a newer access token stored by another worker"""
+        with self._lock:
+            current = self.credentials.expiry
+            if access_token and access_token != self.credentials.token and \
+                    token_expiry and (current is None or token_expiry > current):
+                self.credentials.token = access_token
+                self.credentials.expiry = token_expiry
+
+    def ensure_fresh(self) -> bool:
+        """
+        Refresh the access token if it expires within REFRESH_MARGIN
+
+        Returns:
+            True if the token was refreshed (callers should store it)
+
+        Raises:
+            GmailAuthError if the refresh token was revoked or is missing
+        """
+        with self._lock:
+            expiry = self.credentials.expiry
+            if self.credentials.token and expiry and expiry - REFRESH_MARGIN > datetime.utcnow():
+                return False
+            if not self.credentials.refresh_token:
+                raise GmailAuthError(f"No refresh token for {self.sender_email}")
+            try:
+                self.credentials.refresh(Request())
+            except RefreshError as e:
+                raise GmailAuthError(f"Token refresh failed for {self.sender_email}: {e}")
+            print(f"[GMAIL] Refreshed token for {self.sender_email} (expires {self.credentials.expiry})")
+            return True
+
+    def remaining_today(self) -> int:
+        """Messages the account may still send in the last 24h window (counted across all workers)"""
+        return max(0, DAILY_SEND_LIMIT - get_send_log().sent_since(self.sender_email, time.time() - DAY_SECONDS))
+
+    def _pace(self, count: int):
+        """Keep the send rate under SENDS_PER_SECOND"""
+        wait = self._last_send + count / SENDS_PER_SECOND - time.time()
+        if wait > 0:
+            time.sleep(wait)
+        self._last_send = time.time()
+
+    def send(self, to_email: str, subject: str, html_body: str) -> Dict:
+        """
+        Send one HTML email
+
+        Returns:
+            Gmail API message resource (includes 'id')
+        """
+        with self._lock:
+            self.ensure_fresh()
+            self._pace(1)
+            body = build_message(to_email, self.sender_email, subject, html_body)
+            # httplib2 bypasses the requests hook - record the call here
+            with get_vendor_telemetry().track('gmail', '/gmail/v1/users/me/messages/send') as call:
+                call['bytes_out'] = len(body['raw'])
+                result = self.service.users().messages().send(userId='me', body=body).execute()
+                call['status'] = 200
+            get_send_log().record(self.sender_email, [{'to': to_email, 'success': True,
+                                                       'message_id': result.get('id')}])
+            return result
+
+    def send_batch(self, messages: List[Dict], job_id: str = None) -> List[Dict]:
+        """
+        Send many emails with Gmail batch requests
+
+        Each message's outcome is written to the send log as its batch completes.
+        A batch that fails outright marks its messages failed and the send moves on;
+        a failed token refresh defers everything not yet sent and flags it 'reconnect'.
+
+        Args:
+            messages: Dicts with 'to', 'subject' and 'html' (optional 'id' echoed back)
+            job_id: Send job the messages belong to (recorded with each outcome)
+
+        Returns:
+            One result per message, in order:
+            {'id', 'to', 'success', 'message_id' | 'error', 'deferred', 'reconnect'}
+        """
+        results = [{'id': m.get('id', i), 'to': m['to'], 'success': False} for i, m in enumerate(messages)]
+        log = get_send_log()
+
+        with self._lock:
+            allowed = self.remaining_today()
+            for result in results[allowed:]:
+                result.update(error='Daily Gmail sending limit reached', deferred=True)
+            log.record(self.sender_email, results[allowed:], job_id)
+
+            pending = list(range(min(allowed, len(messages))))
+            attempt = 0
+            while pending:
+                chunk, pending = pending[:BATCH_SIZE], pending[BATCH_SIZE:]
+                retry = []
+                try:
+                    # Long runs can outlive the token
+                    self.ensure_fresh()
+                except GmailAuthError as e:
+                    unsent = [results[i] for i in chunk + pending]
+                    for result in unsent:
+                        result.update(error=str(e), deferred=True, reconnect=True)
+                    log.record(self.sender_email, unsent, job_id)
+                    print(f"[GMAIL] {self.sender_email}: {e} - {len(unsent)} messages not sent")
+                    break
+
+                def callback(request_id, response, exception):
+                    index = int(request_id)
+                    if exception is None:
+                        results[index].update(success=True, message_id=response.get('id'))
+                        results[index].pop('error', None)
+                    elif isinstance(exception, HttpError) and _is_rate_limited(exception):
+                        results[index]['error'] = 'Gmail rate limit exceeded'
+                        retry.append(index)
+                    else:
+                        results[index]['error'] = str(exception)
+
+                batch = self.service.new_batch_http_request(callback=callback)
+                for index in chunk:
+                    m = messages[index]
+                    batch.add(
+                        self.service.users().messages().send(
+                            userId='me', body=build_message(m['to'], self.sender_email, m['subject'], m['html'])
+                        ),
+                        request_id=str(index)
+                    )
+
+                self._pace(len(chunk))
+                try:
+                    with get_vendor_telemetry().track('gmail', '/batch/gmail/v1', count=len(chunk)) as call:
+                        call['retries'] = attempt
+                        batch.execute()
+                        call['status'] = 200
+                        call['credits'] = GMAIL_SEND_UNITS * sum(1 for i in chunk if results[i]['success'])
+                        if retry:
+                            call['error_class'] = 'rate_limited'
+                except Exception as e:
+                    # Not retried: the batch may have been partly delivered before it failed
+                    print(f"[GMAIL] Batch of {len(chunk)} failed: {e}")
+                    for index in chunk:
+                        if not results[index]['success'] and 'error' not in results[index]:
+                            results[index]['error'] = str(e)
+                    retry = []
+
+                if retry:
+                    attempt += 1
+                    if attempt > MAX_RETRIES:
+                        for index in retry:
+                            results[index]['deferred'] = True
+                        retry = []
+                    else:
+                        backoff = 2 ** attempt
+                        print(f"[GMAIL] {len(retry)} messages rate limited - retrying in {backoff}s")
+                        time.sleep(backoff)
+                log.record(self.sender_email, [results[i] for i in chunk if i not in retry], job_id)
+                pending = retry + pending
+
+        sent = sum(1 for r in results if r['success'])
+        print(f"[GMAIL] {self.sender_email}: sent {sent}/{len(messages)} in batches of {BATCH_SIZE}")
+        return results
+
+
+_clients: Dict[int, GmailClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_gmail_client(sender) -> GmailClient:
+    """
+    Get the cached Gmail client for a sender account
+
+    Args:
+        sender: SenderAccount (id, email, access_token, refresh_token, token_expiry)
+
+    Returns:
+        GmailClient, kept up to date with the tokens stored on the account
+    """
+    with _clients_lock:
+        client = _clients.get(sender.id)
+        # A reconnect issues a new refresh token - start from the stored credentials
+        if client is None or client.sender_email != sender.email or \
+                client.credentials.refresh_token != sender.refresh_token:
+            client = GmailClient(sender.email, sender.access_token, sender.refresh_token, sender.token_expiry)
+            _clients[sender.id] = client
+            return client
+    client.update_token(sender.access_token, sender.token_expiry)
+    return client
+
+
+def drop_gmail_client(sender_id: int):
+    """Forget a sender's client (disconnected or deleted account)"""
+    with _clients_lock:
+        _clients.pop(sender_id, None)
+
+
+_executor = None
+_executor_pid = None
+_executor_lock = threading.Lock()
+
+
+def start_send_job(sender_email: str, total: int, run: Callable[[str], None]) -> str:
+    """
+    Run a send in the background and return its job id at once
+
+    Args:
+        sender_email: Sending account
+        total: Number of messages in the job
+        run: Called with the job id on a send-job thread; it sends with send_batch(..., job_id=...)
+
+    Returns:
+        Job id (see GmailSendLog.get_job)
+    """
+    global _executor, _executor_pid
+    log = get_send_log()
+    job_id = log.create_job(sender_email, total)
+
+    def execute():
+        log.set_job_status(job_id, 'running')
+        try:
+            run(job_id)
+        except Exception as e:
+            print(f"[GMAIL] Send job {job_id} failed: {e}")
+            log.set_job_status(job_id, 'failed', str(e))
+        else:
+            log.set_job_status(job_id, 'done')
+
+    with _executor_lock:
+        # Threads do not survive fork() (gunicorn preload) - start a pool in the child
+        if _executor is None or _executor_pid != os.getpid():
+            _executor = ThreadPoolExecutor(max_workers=SEND_JOB_WORKERS, thread_name_prefix='gmail-send')
+            _executor_pid = os.getpid()
+        _executor.submit(execute)
+    return job_id
@@ -0,0 +1,299 @@
+"""
+Shared Google Custom Search Client
+Every CSE query in the app goes through here so identical searches are
+served from a persistent cache instead of spending the daily quota.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from datetime import date
+from typing import List, Dict, Optional
+
+import requests
+
+from services import local_store
+
+GOOGLE_CSE_URL = os.getenv('GOOGLE_CSE_URL', "https://www.googleapis.com/customsearch/v1")
+
+# Cache lifetimes per caller (seconds)
+TTL_NEWS = 60 * 60                 # News goes stale quickly
+TTL_JOBS = 6 * 60 * 60             # Job postings churn during the day
+TTL_PEOPLE = 3 * 24 * 60 * 60      # Senior staff at a company rarely change
+TTL_DOMAIN = 30 * 24 * 60 * 60     # Company websites almost never change
+
+QUOTA_MESSAGE = "Google Search API quota exceeded. Please update your API key in Settings."
+QUOTA_ERROR_MARKERS = ('rateLimitExceeded', 'dailyLimitExceeded', 'quotaExceeded')
+
+CACHE_FILE = 'cse_cache.db'
+CACHE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cse_responses (
+    cache_key TEXT PRIMARY KEY,
+    payload BLOB NOT NULL,
+    created_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS cse_usage (
+    day TEXT PRIMARY KEY,
+    api_calls INTEGER NOT NULL DEFAULT 0,
+    cache_hits INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+
+class GoogleAPIQuotaExceeded(Exception):
+    """Raised when Google API quota is exceeded"""
+    pass
+
+
+class CSEResponseCache:
+    """Persistent (query, start, num) -> items cache with zlib-compressed payloads"""
+
+    def __init__(self, filename: str = CACHE_FILE):
+        self.filename = filename
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.enabled = True
+
+        # Process-local counters (the usage table holds the cross-worker totals)
+        self.hits = 0
+        self.misses = 0
+
+        try:
+            conn = self._conn()
+            conn.execute('DELETE FROM cse_responses WHERE expires_at < ?', (time.time(),))
+            conn.commit()
+        except sqlite3.Error as e:
+            print(f"[CSE CACHE] Disabled - could not open cache: {e}")
+            self.enabled = False
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = local_store.connect(self.filename, CACHE_SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def make_key(cx: str, query: str, start: int, num: int, extra: Dict = None) -> str:
+        """Build the cache key (API key is deliberately excluded - results don't depend on it)"""
+        parts = {'cx': cx, 'q': ' '.join(query.split()), 'start': start, 'num': num}
+        if extra:
+            parts.update({k: v for k, v in extra.items() if v is not None})
+        return json.dumps(parts, sort_keys=True)
+
+    def get(self, key: str) -> Optional[List[Dict]]:
+        """Return cached items, or None if missing/expired"""
+        if not self.enabled:
+            return None
+        try:
+            conn = self._conn()
+            row = conn.execute(
+                'SELECT payload, expires_at FROM cse_responses WHERE cache_key = ?', (key,)
+            ).fetchone()
+            if not row or row[1] < time.time():
+                with self._lock:
+                    self.misses += 1
+                return None
+
+            conn.execute('UPDATE cse_responses SET hits = hits + 1 WHERE cache_key = ?', (key,))
+            self._record_usage(conn, cache_hits=1)
+            conn.commit()
+            with self._lock:
+                self.hits += 1
+            return json.loads(zlib.decompress(row[0]).decode('utf-8'))
+        except (sqlite3.Error, zlib.error, ValueError) as e:
+            print(f"[CSE CACHE] Read failed: {e}")
+            return None
+
+    def set(self, key: str, items: List[Dict], ttl: int):
+        """Store items for ttl seconds"""
+        if not self.enabled or ttl <= 0:
+            return
+        try:
+            now = time.time()
+            payload = zlib.compress(json.dumps(items).encode('utf-8'))
+            conn = self._conn()
+            conn.execute(
+                'INSERT OR REPLACE INTO cse_responses (cache_key, payload, created_at, expires_at, hits) '
+                'VALUES (?, ?, ?, ?, 0)',
+                (key, payload, now, now + ttl)
+            )
+            conn.commit()
+        except sqlite3.Error as e:
+            print(f"[CSE CACHE] Write failed: {e}")
+
+    def record_api_call(self):
+        """Count a query that actually went to Google"""
+        if not self.enabled:
+            return
+        try:
+            conn = self._conn()
+            self._record_usage(conn, api_calls=1)
+            conn.commit()
+        except sqlite3.Error:
+            pass
+
+    @staticmethod
+    def _record_usage(conn: sqlite3.Connection, api_calls: int = 0, cache_hits: int = 0):
+        conn.execute(
+            'INSERT INTO cse_usage (day, api_calls, cache_hits) VALUES (?, ?, ?) '
+            'ON CONFLICT(day) DO UPDATE SET api_calls = api_calls + excluded.api_calls, '
+            'cache_hits = cache_hits + excluded.cache_hits',
+            (date.today().isoformat(), api_calls, cache_hits)
+        )
+
+    def get_stats(self) -> Dict:
+        """Cache size plus quota used/saved today and overall"""
+        stats = {
+            'enabled': self.enabled,
+            'process_hits': self.hits,
+            'process_misses': self.misses,
+        }
+        if not self.enabled:
+            return stats
+        try:
+            conn = self._conn()
+            entries, payload_bytes = conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(LENGTH(payload)), 0) FROM cse_responses WHERE expires_at >= ?',
+                (time.time(),)
+            ).fetchone()
+            today = conn.execute(
+                'SELECT api_calls, cache_hits FROM cse_usage WHERE day = ?', (date.today().isoformat(),)
+            ).fetchone() or (0, 0)
+            total = conn.execute(
+                'SELECT COALESCE(SUM(api_calls), 0), COALESCE(SUM(cache_hits), 0) FROM cse_usage'
+            ).fetchone()
+            stats.update({
+                'entries': entries,
+                'payload_bytes': payload_bytes,
+                'queries_today': today[0],
+                'quota_saved_today': today[1],
+                'queries_total': total[0],
+                'quota_saved_total': total[1],
+            })
+        except sqlite3.Error as e:
+            stats['error'] = str(e)
+        return stats
+
+    def clear(self):
+        """Drop every cached response (usage history is kept)"""
+        if not self.enabled:
+            return
+        conn = self._conn()
+        conn.execute('DELETE FROM cse_responses')
+        conn.commit()
+
+
+class GoogleCSEClient:
+    """Google Custom Search client bound to one API key / search engine"""
+
+    def __init__(self, api_key: str, cx: str, cache: CSEResponseCache = None):
+        self.api_key = api_key
+        self.cx = cx
+        self.base_url = GOOGLE_CSE_URL
+        self.cache = cache or get_cse_cache()
+
+    def cache_key(self, query: str, start: int = 1, num: int = 10, **extra) -> str:
+        return CSEResponseCache.make_key(self.cx, query, start, num, extra)
+
+    def lookup(self, query: str, start: int = 1, num: int = 10, **extra) -> Optional[List[Dict]]:
+        """Cached items for a query, or None (for callers doing their own HTTP, e.g. aiohttp)"""
+        return self.cache.get(self.cache_key(query, start, num, **extra))
+
+    def store(self, query: str, items: List[Dict], ttl: int, start: int = 1, num: int = 10, **extra):
+        """Cache items fetched by the caller"""
+        self.cache.set(self.cache_key(query, start, num, **extra), items, ttl)
+
+    def build_params(self, query: str, start: int = 1, num: int = 10, **extra) -> Dict:
+        params = {
+            'key': self.api_key,
+            'cx': self.cx,
+            'q': query,
+            'start': start,
+            'num': num
+        }
+        params.update({k: v for k, v in extra.items() if v is not None})
+        return params
+
+    def search(self, query: str, start: int = 1, num: int = 10,
+               ttl: int = TTL_JOBS, timeout: int = 30, **extra) -> List[Dict]:
+        """
+        Run a CSE query, serving it from cache when possible
+
+        Args:
+            query: Search query
+            start: 1-based index of the first result
+            num: Results per page (max 10)
+            ttl: How long to cache the response (seconds)
+            timeout: HTTP timeout
+            **extra: Additional CSE parameters (e.g. sort='date')
+
+        Returns:
+            Raw CSE items (empty list when Google has no more results)
+
+        Raises:
+            GoogleAPIQuotaExceeded: On 429 / quota 403
+            requests.exceptions.RequestException: On any other failure
+        """
+        cached = self.lookup(query, start, num, **extra)
+        if cached is not None:
+            return cached
+
+        response = requests.get(self.base_url, params=self.build_params(query, start, num, **extra),
+                                timeout=timeout)
+        self.cache.record_api_call()
+        self.check_quota(response.status_code, response.text)
+        response.raise_for_status()
+
+        items = response.json().get('items', [])
+        self.store(query, items, ttl, start, num, **extra)
+        return items
+
+    @staticmethod
+    def check_quota(status_code: int, body: str):
+        """Raise GoogleAPIQuotaExceeded if the response signals an exhausted quota"""
+        if status_code == 429:
+            print("[QUOTA EXCEEDED] Google API daily limit reached!")
+            raise GoogleAPIQuotaExceeded(QUOTA_MESSAGE)
+        if status_code == 403 and any(marker in (body or '') for marker in QUOTA_ERROR_MARKERS):
+            print("[QUOTA EXCEEDED] Google API daily limit reached!")
+            raise GoogleAPIQuotaExceeded(QUOTA_MESSAGE)
+
+
+# Singletons
+_cache_instance = None
+_client_instances: Dict = {}
+_singleton_lock = threading.RLock()
+
+
+def get_cse_cache() -> CSEResponseCache:
+    """Get the process-wide CSE response cache"""
+    global _cache_instance
+    if _cache_instance is None:
+        with _singleton_lock:
+            if _cache_instance is None:
+                _cache_instance = CSEResponseCache()
+    return _cache_instance
+
+
+def get_cse_client(api_key: str = None, cx: str = None) -> GoogleCSEClient:
+    """Get a shared CSE client (defaults to the keys in services.api_keys)"""
+    if api_key is None or cx is None:
+        from services.api_keys import GOOGLE_API_KEY, GOOGLE_SEARCH_ENGINE_ID
+        api_key = api_key or GOOGLE_API_KEY
+        cx = cx or GOOGLE_SEARCH_ENGINE_ID
+
+    key = (api_key, cx)
+    client = _client_instances.get(key)
+    if client is None:
+        with _singleton_lock:
+            client = _client_instances.get(key)
+            if client is None:
+                client = GoogleCSEClient(api_key, cx)
+                _client_instances[key] = client
+    return client
@@ -4,11 +4,11 @@ Searches multiple job portals simultaneously for active job postings
 """
 
 import requests
-import re
 from typing import List, Dict, Optional
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from services.api_keys import GOOGLE_API_KEY, GOOGLE_SEARCH_ENGINE_ID, GOOGLE_SEARCH_URL
-from services.google_search import GoogleAPIQuotaExceeded
+from services.google_cse import GoogleAPIQuotaExceeded, get_cse_client, TTL_JOBS
+from services import job_extraction
 
 
 class GoogleJobsSearchService:
@@ -22,18 +22,11 @@ class GoogleJobsSearchService:
         {'name': 'Naukri', 'site': 'naukri.com'},
     ]
 
-    # Words that are DEFINITELY not company names
-    INVALID_COMPANY_WORDS = {
-        'indeed', 'linkedin', 'glassdoor', 'naukri', 'monster', 'ziprecruiter',
-        'jobs', 'careers', 'hiring', 'apply', 'now',
-        'remote', 'hybrid', 'onsite',
-        'posted', 'ago', 'today', 'yesterday',
-    }
-
     def __init__(self):
         self.api_key = GOOGLE_API_KEY
         self.search_engine_id = GOOGLE_SEARCH_ENGINE_ID
         self.base_url = GOOGLE_SEARCH_URL
+        self.cse = get_cse_client(self.api_key, self.search_engine_id)
 
     def search_jobs(self,
                     job_titles: List[str],
@@ -113,55 +106,56 @@ class GoogleJobsSearchService:
         for page in range(pages_needed):
             start_index = page * results_per_page + 1
 
-            try:
-                params = {
-                    'key': self.api_key,
-                    'cx': self.search_engine_id,
-                    'q': query,
-                    'start': start_index,
-                    'num': results_per_page
-                }
-
-                response = requests.get(self.base_url, params=params, timeout=30)
-
-                if response.status_code == 429:
-                    print(f"    [QUOTA EXCEEDED] Google API daily limit reached!")
-                    raise GoogleAPIQuotaExceeded("Search credits are over. Please update your Google API key in Settings.")
-
-                if response.status_code == 403:
-                    error_data = response.json() if response.text else {}
-                    error_msg = error_data.get('error', {}).get('message', '')
-                    if 'rateLimitExceeded' in error_msg or 'dailyLimitExceeded' in error_msg or 'quotaExceeded' in error_msg:
-                        raise GoogleAPIQuotaExceeded("Search credits are over. Please update your Google API key in Settings.")
-
-                if response.status_code != 200:
-                    error_data = response.json() if response.text else {}
-                    error_msg = error_data.get('error', {}).get('message', response.text[:200])
-                    print(f"    [Error] API returned {response.status_code}: {error_msg}")
+            raw_count, page_results = self.fetch_board_page(board, query, start_index, results_per_page)
+            if not raw_count:
+                break
+
+            for parsed in page_results:
+                results.append(parsed)
+                if len(results) >= num_results:
                     break
 
-                data = response.json()
+            if len(results) >= num_results:
+                break
 
-                items = data.get('items', [])
-                if not items:
-                    break
+        return results
 
-                for item in items:
-                    parsed = self._parse_result(item, board['name'])
-                    if parsed:
-                        results.append(parsed)
+    def build_board_query(self,
+                          board: Dict,
+                          job_titles: List[str],
+                          locations: List[str] = None,
+                          industries: List[str] = None,
+                          keywords: List[str] = None) -> str:
+        """Build the search query for one job board"""
+        return self._build_query(job_titles, locations, industries, keywords, board['site'])
+
+    def fetch_board_page(self,
+                         board: Dict,
+                         query: str,
+                         start_index: int,
+                         results_per_page: int = 10) -> tuple:
+        """
+        Fetch and parse one page of results from a job board
 
-                        if len(results) >= num_results:
-                            break
+        Returns:
+            (raw result count, parsed job results) - (0, []) on errors
 
-                if len(results) >= num_results:
-                    break
+        Raises:
+            GoogleAPIQuotaExceeded: When the search quota is exhausted
+        """
+        try:
+            items = self.cse.search(query, start=start_index, num=results_per_page, ttl=TTL_JOBS)
+        except requests.exceptions.RequestException as e:
+            print(f"    [Error] Page {(start_index - 1) // results_per_page + 1}: {e}")
+            return 0, []
 
-            except requests.exceptions.RequestException as e:
-                print(f"    [Error] Page {page + 1}: {e}")
-                break
+        results = []
+        for item in items:
+            parsed = self._parse_result(item, board['name'])
+            if parsed:
+                results.append(parsed)
 
-        return results
+        return len(items), results
 
     def _build_query(self,
                      job_titles: List[str],
@@ -228,18 +222,18 @@ class GoogleJobsSearchService:
         link = item.get('link', '')
         snippet = item.get('snippet', '')
 
-        # Extract company name based on source
-        company = self._extract_company(title, snippet, link, source)
+        # Extract company name using the source's rule set
+        company = job_extraction.extract_company(title, snippet, link, source)
 
         if not company:
             return None
 
         # Validate company name
-        if not self._is_valid_company(company):
+        if not job_extraction.is_valid_company(company):
             return None
 
         # Extract job title
-        job_title = self._extract_job_title(title, source)
+        job_title = job_extraction.extract_job_title(title)
 
         return {
             'company_name': company,
@@ -250,136 +244,6 @@ class GoogleJobsSearchService:
             'raw_title': title
         }
 
-    def _extract_company(self, title: str, snippet: str, url: str, source: str) -> Optional[str]:
-        """Extract company name from search result"""
-
-        company = None
-
-        if source == 'LinkedIn':
-            # LinkedIn URL: linkedin.com/jobs/view/title-at-company-123456
-            match = re.search(r'/jobs/view/[^/]+-at-([a-z0-9-]+)-\d+', url.lower())
-            if match:
-                company = match.group(1).replace('-', ' ').title()
-            else:
-                # Title: "Job Title at Company | LinkedIn"
-                match = re.search(r'\bat\s+([^|]+?)\s*(?:\||$)', title, re.IGNORECASE)
-                if match:
-                    company = match.group(1).strip()
-
-        elif source == 'Indeed':
-            # Indeed title: "Job Title - Company - Location"
-            parts = title.split(' - ')
-            if len(parts) >= 2:
-                company = parts[1].strip()
-                # Remove trailing location
-                company = re.sub(r'\s*,.*$', '', company)
-
-        elif source == 'Glassdoor':
-            # "Job Title at Company" or "Company hiring Job Title"
-            match = re.search(r'\bat\s+([A-Z][A-Za-z0-9\s&.,\']+?)(?:\s*[-|]|\s*$)', title)
-            if match:
-                company = match.group(1).strip()
-            else:
-                match = re.search(r'^([A-Z][A-Za-z0-9\s&\']+?)\s+(?:hiring|is hiring)', title, re.IGNORECASE)
-                if match:
-                    company = match.group(1).strip()
-
-        elif source == 'Naukri':
-            # Naukri: "Job in Company at Location" or company suffix patterns
-            parts = title.split(' in ')
-            if len(parts) >= 2:
-                potential = parts[-1].strip()
-                if ' at ' in potential:
-                    potential = potential.split(' at ')[0].strip()
-                if potential and not self._is_tech_term(potential):
-                    company = potential
-
-            if not company:
-                # Look for company suffix patterns
-                match = re.search(
-                    r'([A-Z][A-Za-z0-9\s&]+(?:Pvt\.?\s*Ltd\.?|Limited|Inc\.?|Corp\.?|Technologies|Solutions|Services|Software|Tech|Labs|Consulting))',
-                    title + ' ' + snippet
-                )
-                if match:
-                    company = match.group(1).strip()
-
-        # Fallback: "at Company" pattern
-        if not company:
-            match = re.search(r'\bat\s+([A-Z][A-Za-z0-9\s&\']+?)(?:\s*[-|,]|\s+(?:in|for|is)\s|\s*$)', title + ' ' + snippet)
-            if match:
-                company = match.group(1).strip()
-
-        # Clean up
-        if company:
-            company = self._clean_company(company)
-
-        return company if company and len(company) >= 2 else None
-
-    def _is_tech_term(self, text: str) -> bool:
-        """Check if text is a technology term"""
-        tech = {'python', 'java', 'javascript', 'react', 'angular', 'node', 'sql',
-                'machine learning', 'data science', 'ai', 'ml', 'aws', 'azure', 'devops'}
-        return text.lower().strip() in tech
-
-    def _clean_company(self, company: str) -> str:
-        """Clean company name"""
-        # Remove legal suffixes
-        company = re.sub(r'\s*(Pvt\.?\s*Ltd\.?|Private\s+Limited|Limited|Inc\.?|LLC|Corp\.?|Co\.?)?\s*$', '', company, flags=re.IGNORECASE)
-        # Remove location suffixes
-        company = re.sub(r'\s*[-,]\s*(India|USA|UK|Remote|Hybrid|Delhi|Mumbai|Bangalore|Hyderabad|Chennai|Pune|New York|California|Texas|London).*$', '', company, flags=re.IGNORECASE)
-        # Remove time references
-        company = re.sub(r'\s*\d+\s*(days?|weeks?|months?|years?)\s*ago.*$', '', company, flags=re.IGNORECASE)
-        # Clean whitespace
-        company = re.sub(r'\s+', ' ', company).strip(' -|,.:;')
-        # Fix case
-        if company.isupper() or company.islower():
-            company = company.title()
-        return company
-
-    def _is_valid_company(self, company: str) -> bool:
-        """Validate company name"""
-        if not company or len(company) < 2 or len(company) > 80:
-            return False
-
-        words = company.lower().split()
-        valid_words = [w for w in words if w not in self.INVALID_COMPANY_WORDS]
-        if not valid_words:
-            return False
-
-        if not any(c.isupper() for c in company):
-            return False
-
-        # Too many digits
-        if sum(c.isdigit() for c in company) > len(company) * 0.3:
-            return False
-
-        # Garbage patterns
-        if re.search(r'^\d+\s+|\.\.\.', company):
-            return False
-
-        return True
-
-    def _extract_job_title(self, title: str, source: str) -> str:
-        """Extract job title from result"""
-        # "Job at Company | Site"
-        match = re.match(r'^([^|]+?)\s+at\s+', title)
-        if match:
-            return match.group(1).strip()[:60]
-
-        # "Job - Company"
-        match = re.match(r'^([^-]+?)\s*-\s*', title)
-        if match:
-            job = match.group(1).strip()
-            if 3 < len(job) < 60:
-                return job
-
-        # First part before separator
-        parts = re.split(r'[-|]', title)
-        if parts:
-            return parts[0].strip()[:60]
-
-        return title[:60]
-
 
 # Singleton
 _service_instance = None
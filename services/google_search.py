@@ -1,11 +1,5 @@
-import requests
 from typing import List, Dict, Optional
-from .vector_search import VectorSearchService
-
-
-class GoogleAPIQuotaExceeded(Exception):
-    """Raised when Google API quota is exceeded"""
-    pass
+from .google_cse import GoogleAPIQuotaExceeded, get_cse_client, TTL_JOBS
 
 
 class GoogleSearchService:
@@ -13,6 +7,7 @@ class GoogleSearchService:
         self.api_key = api_key
         self.cx_code = cx_code
         self.base_url = "https://www.googleapis.com/customsearch/v1"
+        self.cse = get_cse_client(api_key, cx_code)
 
         # Job platforms to search
         self.job_platforms = [
@@ -30,6 +25,8 @@ class GoogleSearchService:
         self.vector_search = None
         if use_vector_search:
             try:
+                # sentence-transformers / torch / faiss load here, not when the app imports this module
+                from .vector_search import VectorSearchService
                 print("[*] Initializing Vector Search Service...")
                 self.vector_search = VectorSearchService()
                 print("[+] Vector Search ready for enhanced job search\n")
@@ -57,37 +54,20 @@ class GoogleSearchService:
 
             # Google Custom Search returns max 10 results per request
             for start_index in range(1, fetch_count + 1, 10):
-                params = {
-                    'key': self.api_key,
-                    'cx': self.cx_code,
-                    'q': keywords,
-                    'num': min(10, fetch_count - len(results)),
-                    'start': start_index
-                }
-
-                response = requests.get(self.base_url, params=params)
-                
-                # Check for quota exceeded
-                if response.status_code == 429:
-                    raise GoogleAPIQuotaExceeded("Google Search API quota exceeded. Please update your API key in Settings.")
-                if response.status_code == 403:
-                    error_data = response.json()
-                    if 'error' in error_data and 'rateLimitExceeded' in str(error_data):
-                        raise GoogleAPIQuotaExceeded("Google Search API quota exceeded. Please update your API key in Settings.")
-                    if 'error' in error_data and 'dailyLimitExceeded' in str(error_data):
-                        raise GoogleAPIQuotaExceeded("Google Search API daily limit exceeded. Please update your API key in Settings.")
-                
-                response.raise_for_status()
-                data = response.json()
-
-                if 'items' in data:
-                    for item in data['items']:
-                        results.append({
-                            'title': item.get('title', ''),
-                            'link': item.get('link', ''),
-                            'snippet': item.get('snippet', ''),
-                            'displayLink': item.get('displayLink', '')
-                        })
+                items = self.cse.search(
+                    keywords,
+                    start=start_index,
+                    num=min(10, fetch_count - len(results)),
+                    ttl=TTL_JOBS
+                )
+
+                for item in items:
+                    results.append({
+                        'title': item.get('title', ''),
+                        'link': item.get('link', ''),
+                        'snippet': item.get('snippet', ''),
+                        'displayLink': item.get('displayLink', '')
+                    })
 
                 if len(results) >= fetch_count:
                     break
@@ -146,36 +126,26 @@ class GoogleSearchService:
                 break
 
             try:
-                params = {
-                    'key': self.api_key,
-                    'cx': self.cx_code,
-                    'q': query,
-                    'num': min(10, fetch_target - len(all_results))
-                }
-
-                response = requests.get(self.base_url, params=params)
-                response.raise_for_status()
-                data = response.json()
-
-                if 'items' in data:
-                    for item in data['items']:
-                        link = item.get('link', '')
-
-                        # Only include individual job view pages, exclude search pages
-                        if 'linkedin.com/jobs/view' in link and 'search' not in link.lower():
-                            if link not in seen_urls:
-                                seen_urls.add(link)
-                                all_results.append({
-                                    'title': item.get('title', ''),
-                                    'link': link,
-                                    'snippet': item.get('snippet', ''),
-                                    'displayLink': item.get('displayLink', ''),
-                                    'platform': 'LinkedIn'
-                                })
-
-                                print(f"[+] Found LinkedIn job: {item.get('title', '')[:50]}...")
-
-                print(f"Found {len(data.get('items', []))} results in this batch")
+                items = self.cse.search(query, num=min(10, fetch_target - len(all_results)), ttl=TTL_JOBS)
+
+                for item in items:
+                    link = item.get('link', '')
+
+                    # Only include individual job view pages, exclude search pages
+                    if 'linkedin.com/jobs/view' in link and 'search' not in link.lower():
+                        if link not in seen_urls:
+                            seen_urls.add(link)
+                            all_results.append({
+                                'title': item.get('title', ''),
+                                'link': link,
+                                'snippet': item.get('snippet', ''),
+                                'displayLink': item.get('displayLink', ''),
+                                'platform': 'LinkedIn'
+                            })
+
+                            print(f"[+] Found LinkedIn job: {item.get('title', '')[:50]}...")
+
+                print(f"Found {len(items)} results in this batch")
 
             except Exception as e:
                 print(f"Error searching LinkedIn: {str(e)}")
@@ -214,28 +184,18 @@ class GoogleSearchService:
                 # Create platform-specific search query
                 query = f'{keywords} site:{platform}'
 
-                params = {
-                    'key': self.api_key,
-                    'cx': self.cx_code,
-                    'q': query,
-                    'num': min(10, results_per_platform)
-                }
-
-                response = requests.get(self.base_url, params=params)
-                response.raise_for_status()
-                data = response.json()
-
-                if 'items' in data:
-                    for item in data['items']:
-                        all_results.append({
-                            'title': item.get('title', ''),
-                            'link': item.get('link', ''),
-                            'snippet': item.get('snippet', ''),
-                            'displayLink': item.get('displayLink', ''),
-                            'platform': self._get_platform_name(platform)
-                        })
-
-                print(f"Found {len(data.get('items', []))} jobs on {platform}")
+                items = self.cse.search(query, num=min(10, results_per_platform), ttl=TTL_JOBS)
+
+                for item in items:
+                    all_results.append({
+                        'title': item.get('title', ''),
+                        'link': item.get('link', ''),
+                        'snippet': item.get('snippet', ''),
+                        'displayLink': item.get('displayLink', ''),
+                        'platform': self._get_platform_name(platform)
+                    })
+
+                print(f"Found {len(items)} jobs on {platform}")
 
             except Exception as e:
                 print(f"Error searching {platform}: {str(e)}")
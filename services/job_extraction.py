@@ -0,0 +1,349 @@
+"""
+Job Result Extraction Rules
+Precompiled, table-driven extraction of company name, job title and location
+from Google CSE job results. Shared by GoogleJobsSearchService (job board
+search) and JobParserService (pipeline search).
+
+Each profile is an ordered table of (sources, rule) entries. A rule takes
+(title, snippet, url) and returns a value, or None to fall through to the
+next rule. sources=None means the rule applies to every source.
+"""
+
+import re
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple
+
+UNKNOWN_COMPANY = "Unknown Company"
+
+# Words that are DEFINITELY not company names
+INVALID_COMPANY_WORDS = frozenset({
+    'indeed', 'linkedin', 'glassdoor', 'naukri', 'monster', 'ziprecruiter',
+    'jobs', 'careers', 'hiring', 'apply', 'now',
+    'remote', 'hybrid', 'onsite',
+    'posted', 'ago', 'today', 'yesterday',
+})
+
+TECH_TERMS = frozenset({
+    'python', 'java', 'javascript', 'react', 'angular', 'node', 'sql',
+    'machine learning', 'data science', 'ai', 'ml', 'aws', 'azure', 'devops',
+})
+
+
+# ==================== Precompiled patterns ====================
+
+# Job board search (GoogleJobsSearchService)
+LINKEDIN_URL_RE = re.compile(r'/jobs/view/[^/]+-at-([a-z0-9-]+)-\d+')
+LINKEDIN_TITLE_AT_RE = re.compile(r'\bat\s+([^|]+?)\s*(?:\||$)', re.IGNORECASE)
+TRAILING_COMMA_RE = re.compile(r'\s*,.*$')
+GLASSDOOR_AT_RE = re.compile(r'\bat\s+([A-Z][A-Za-z0-9\s&.,\']+?)(?:\s*[-|]|\s*$)')
+GLASSDOOR_HIRING_RE = re.compile(r'^([A-Z][A-Za-z0-9\s&\']+?)\s+(?:hiring|is hiring)', re.IGNORECASE)
+COMPANY_SUFFIX_RE = re.compile(
+    r'([A-Z][A-Za-z0-9\s&]+(?:Pvt\.?\s*Ltd\.?|Limited|Inc\.?|Corp\.?|Technologies|Solutions|Services|Software|Tech|Labs|Consulting))'
+)
+FALLBACK_AT_RE = re.compile(r'\bat\s+([A-Z][A-Za-z0-9\s&\']+?)(?:\s*[-|,]|\s+(?:in|for|is)\s|\s*$)')
+
+LEGAL_SUFFIX_RE = re.compile(r'\s*(Pvt\.?\s*Ltd\.?|Private\s+Limited|Limited|Inc\.?|LLC|Corp\.?|Co\.?)?\s*$', re.IGNORECASE)
+LOCATION_SUFFIX_RE = re.compile(
+    r'\s*[-,]\s*(India|USA|UK|Remote|Hybrid|Delhi|Mumbai|Bangalore|Hyderabad|Chennai|Pune|New York|California|Texas|London).*$',
+    re.IGNORECASE
+)
+TIME_AGO_RE = re.compile(r'\s*\d+\s*(days?|weeks?|months?|years?)\s*ago.*$', re.IGNORECASE)
+WHITESPACE_RE = re.compile(r'\s+')
+GARBAGE_COMPANY_RE = re.compile(r'^\d+\s+|\.\.\.')
+
+JOB_AT_RE = re.compile(r'^([^|]+?)\s+at\s+')
+JOB_DASH_RE = re.compile(r'^([^-]+?)\s*-\s*')
+JOB_SEPARATOR_RE = re.compile(r'[-|]')
+
+# Pipeline search (JobParserService)
+HIRING_PREFIX_RE = re.compile(r'^([A-Z][A-Za-z0-9\s&.,\']+?)\s+hiring\s+', re.IGNORECASE)
+AGENCY_SUFFIX_RE = re.compile(r'\s+(recruiting|staffing|solutions|inc\.|ltd\.|llc)$', re.IGNORECASE)
+DASH_COMPANY_RE = re.compile(r'-\s*([^|-]+?)\s*(?:\||$)')
+DASH_LOCATION_RE = re.compile(r'\s*-\s*[A-Z][a-z]+(?:,\s*[A-Z]{2})?$')
+SNIPPET_AT_RE = re.compile(r'(?:at|for|with)\s+([A-Z][A-Za-z0-9\s&.,\']+?)(?:\s+(?:in|is|hiring|seeks|located)|\.|\,|$)')
+GENERIC_AT_RE = re.compile(r'(?:at|@)\s+([A-Z][A-Za-z0-9\s&.,\']+?)(?:\s*[-|]|$)')
+SNIPPET_HIRING_RE = re.compile(r'([A-Z][A-Za-z0-9\s&.,\']+?)\s+(?:is hiring|hiring|seeks|looking for)')
+SNIPPET_JOIN_RE = re.compile(r'Join\s+([A-Z][A-Za-z0-9\s&.,\']+?)(?:\s+(?:team|as|in)|\.|\,|$)')
+
+PLATFORM_SUFFIX_RE = re.compile(
+    r'\s*[\|\-]\s*(?:LinkedIn|Indeed|Glassdoor|Monster|ZipRecruiter|SimplyHired|CareerBuilder).*$',
+    re.IGNORECASE
+)
+TITLE_SEPARATOR_RE = re.compile(r'\s*[-|@]\s*')
+
+LOCATION_RE = re.compile(r'(?:Location:|in)\s*([A-Z][a-z]+(?:,\s*[A-Z]{2})?)')
+CITY_STATE_RE = re.compile(r'^([A-Z][a-z]+,\s*[A-Z]{2})')
+
+PARSER_PLATFORMS = ('linkedin', 'indeed', 'glassdoor')
+
+Rule = Callable[[str, str, str], Optional[str]]
+
+
+def _search_group(pattern: re.Pattern, text: str) -> Optional[str]:
+    match = pattern.search(text)
+    return match.group(1).strip() if match else None
+
+
+def _bounded(value: Optional[str], min_len: int, max_len: int = None) -> Optional[str]:
+    """Keep value only if min_len < len(value) (< max_len)"""
+    if value is None or len(value) <= min_len:
+        return None
+    if max_len is not None and len(value) >= max_len:
+        return None
+    return value
+
+
+# ==================== Job board rules ====================
+
+def _linkedin_url(title: str, snippet: str, url: str) -> Optional[str]:
+    # LinkedIn URL: linkedin.com/jobs/view/title-at-company-123456
+    match = LINKEDIN_URL_RE.search(url.lower())
+    return match.group(1).replace('-', ' ').title() if match else None
+
+
+def _linkedin_title(title: str, snippet: str, url: str) -> Optional[str]:
+    # Title: "Job Title at Company | LinkedIn" (reached only when the URL had no company)
+    return _search_group(LINKEDIN_TITLE_AT_RE, title) or None
+
+
+def _indeed_title(title: str, snippet: str, url: str) -> Optional[str]:
+    # Indeed title: "Job Title - Company - Location"
+    parts = title.split(' - ')
+    if len(parts) < 2:
+        return None
+    return TRAILING_COMMA_RE.sub('', parts[1].strip()) or None
+
+
+def _glassdoor_title(title: str, snippet: str, url: str) -> Optional[str]:
+    # "Job Title at Company" or "Company hiring Job Title"
+    return _search_group(GLASSDOOR_AT_RE, title) or _search_group(GLASSDOOR_HIRING_RE, title) or None
+
+
+def _naukri_title(title: str, snippet: str, url: str) -> Optional[str]:
+    # Naukri: "Job in Company at Location"
+    parts = title.split(' in ')
+    if len(parts) < 2:
+        return None
+    potential = parts[-1].strip()
+    if ' at ' in potential:
+        potential = potential.split(' at ')[0].strip()
+    if potential and not is_tech_term(potential):
+        return potential
+    return None
+
+
+def _naukri_suffix(title: str, snippet: str, url: str) -> Optional[str]:
+    # Company suffix patterns ("... Technologies", "... Pvt Ltd")
+    return _search_group(COMPANY_SUFFIX_RE, title + ' ' + snippet) or None
+
+
+def _fallback_at(title: str, snippet: str, url: str) -> Optional[str]:
+    return _search_group(FALLBACK_AT_RE, title + ' ' + snippet) or None
+
+
+JOB_BOARD_COMPANY_RULES: List[Tuple[Optional[frozenset], Rule]] = [
+    (frozenset({'LinkedIn'}), _linkedin_url),
+    (frozenset({'LinkedIn'}), _linkedin_title),
+    (frozenset({'Indeed'}), _indeed_title),
+    (frozenset({'Glassdoor'}), _glassdoor_title),
+    (frozenset({'Naukri'}), _naukri_title),
+    (frozenset({'Naukri'}), _naukri_suffix),
+    (None, _fallback_at),
+]
+
+
+# ==================== Pipeline search rules ====================
+
+def _hiring_prefix(title: str, snippet: str, url: str) -> Optional[str]:
+    # "Capgemini hiring Java Developer" (most specific, checked first)
+    company = _search_group(HIRING_PREFIX_RE, title)
+    if company is None:
+        return None
+    company = AGENCY_SUFFIX_RE.sub('', company)
+    return _bounded(company, 2, 100)
+
+
+def _linkedin_dash(title: str, snippet: str, url: str) -> Optional[str]:
+    # "Job Title - Company Name | LinkedIn" / "Job Title - Company Name - Location | LinkedIn"
+    company = _search_group(DASH_COMPANY_RE, title)
+    if company is None:
+        return None
+    company = DASH_LOCATION_RE.sub('', company)
+    return _bounded(company, 2)
+
+
+def _linkedin_snippet(title: str, snippet: str, url: str) -> Optional[str]:
+    return _bounded(_search_group(SNIPPET_AT_RE, snippet), 2, 50)
+
+
+def _indeed_second_part(title: str, snippet: str, url: str) -> Optional[str]:
+    # "Job Title - Company Name - Location"
+    parts = title.split(' - ')
+    return parts[1].strip() if len(parts) >= 2 else None
+
+
+def _glassdoor_leading_words(title: str, snippet: str, url: str) -> Optional[str]:
+    # Often starts with company name - take the first 2-3 words
+    words = title.split()
+    return ' '.join(words[:min(3, len(words))]) if words else None
+
+
+def _generic_at(title: str, snippet: str, url: str) -> Optional[str]:
+    return _bounded(_search_group(GENERIC_AT_RE, title + ' ' + snippet), 2)
+
+
+def _snippet_hiring(title: str, snippet: str, url: str) -> Optional[str]:
+    return _bounded(_search_group(SNIPPET_HIRING_RE, snippet), 2, 50)
+
+
+def _snippet_join(title: str, snippet: str, url: str) -> Optional[str]:
+    return _bounded(_search_group(SNIPPET_JOIN_RE, snippet), 2, 50)
+
+
+PARSER_COMPANY_RULES: List[Tuple[Optional[frozenset], Rule]] = [
+    (None, _hiring_prefix),
+    (frozenset({'linkedin'}), _linkedin_dash),
+    (frozenset({'linkedin'}), _linkedin_snippet),
+    (frozenset({'indeed'}), _indeed_second_part),
+    (frozenset({'glassdoor'}), _glassdoor_leading_words),
+    (None, _generic_at),
+    (None, _snippet_hiring),
+    (None, _snippet_join),
+]
+
+
+# ==================== Rule chains ====================
+
+@lru_cache(maxsize=64)
+def _job_board_chain(source: str) -> Tuple[Rule, ...]:
+    return tuple(rule for sources, rule in JOB_BOARD_COMPANY_RULES if sources is None or source in sources)
+
+
+@lru_cache(maxsize=64)
+def _parser_chain(platform: str) -> Tuple[Rule, ...]:
+    tags = {tag for tag in PARSER_PLATFORMS if tag in platform.lower()}
+    return tuple(rule for sources, rule in PARSER_COMPANY_RULES if sources is None or sources & tags)
+
+
+def _run_chain(chain: Tuple[Rule, ...], title: str, snippet: str, url: str) -> Tuple[Optional[str], Optional[str]]:
+    for rule in chain:
+        value = rule(title, snippet, url)
+        if value is not None:
+            return value, rule.__name__.lstrip('_')
+    return None, None
+
+
+# ==================== Job board profile ====================
+
+def extract_company(title: str, snippet: str, url: str, source: str) -> Optional[str]:
+    """Company name from a job board result (None if nothing usable)"""
+    company, _ = _run_chain(_job_board_chain(source), title, snippet, url)
+    if company:
+        company = clean_company(company)
+    return company if company and len(company) >= 2 else None
+
+
+def is_tech_term(text: str) -> bool:
+    """Check if text is a technology term"""
+    return text.lower().strip() in TECH_TERMS
+
+
+def clean_company(company: str) -> str:
+    """Strip legal/location/time suffixes and normalise case"""
+    company = LEGAL_SUFFIX_RE.sub('', company)
+    company = LOCATION_SUFFIX_RE.sub('', company)
+    company = TIME_AGO_RE.sub('', company)
+    company = WHITESPACE_RE.sub(' ', company).strip(' -|,.:;')
+    if company.isupper() or company.islower():
+        company = company.title()
+    return company
+
+
+def is_valid_company(company: str) -> bool:
+    """Validate company name"""
+    if not company or len(company) < 2 or len(company) > 80:
+        return False
+
+    words = company.lower().split()
+    if all(w in INVALID_COMPANY_WORDS for w in words):
+        return False
+
+    if not any(c.isupper() for c in company):
+        return False
+
+    # Too many digits
+    if sum(c.isdigit() for c in company) > len(company) * 0.3:
+        return False
+
+    # Garbage patterns
+    if GARBAGE_COMPANY_RE.search(company):
+        return False
+
+    return True
+
+
+def extract_job_title(title: str) -> str:
+    """Job title from a job board result title"""
+    # "Job at Company | Site"
+    match = JOB_AT_RE.match(title)
+    if match:
+        return match.group(1).strip()[:60]
+
+    # "Job - Company"
+    match = JOB_DASH_RE.match(title)
+    if match:
+        job = match.group(1).strip()
+        if 3 < len(job) < 60:
+            return job
+
+    # First part before separator
+    return JOB_SEPARATOR_RE.split(title)[0].strip()[:60]
+
+
+# ==================== Pipeline search profile ====================
+
+def parse_company_name(title: str, snippet: str, platform: str) -> Tuple[str, Optional[str]]:
+    """
+    Company name from a pipeline search result
+
+    Returns:
+        (company name or "Unknown Company", name of the rule that matched)
+    """
+    company, rule = _run_chain(_parser_chain(platform), title, snippet, '')
+    if company is None:
+        return UNKNOWN_COMPANY, None
+    return company, rule
+
+
+@lru_cache(maxsize=1024)
+def _company_hiring_re(company_name: str) -> re.Pattern:
+    return re.compile(f"^{re.escape(company_name)}\\s+hiring\\s+", re.IGNORECASE)
+
+
+def strip_job_title(title: str, company_name: str) -> str:
+    """Job title with platform name and company removed"""
+    job_title = PLATFORM_SUFFIX_RE.sub('', title)
+
+    if company_name and company_name != UNKNOWN_COMPANY:
+        # Remove "Company hiring" at the start, then any other mention
+        job_title = _company_hiring_re(company_name).sub('', job_title).strip()
+        job_title = job_title.replace(company_name, '').strip()
+        job_title = TITLE_SEPARATOR_RE.sub(' ', job_title).strip()
+
+    job_title = WHITESPACE_RE.sub(' ', job_title).strip(' -|')
+
+    return job_title if job_title else title
+
+
+def extract_location(snippet: str) -> Optional[str]:
+    """Location from a job snippet ("Location: City, ST" / "City, ST - ...")"""
+    match = LOCATION_RE.search(snippet) or CITY_STATE_RE.search(snippet)
+    return match.group(1).strip() if match else None
+
+
+def rule_names() -> Dict[str, List[str]]:
+    """Rule order per profile (for debugging / the extraction benchmark)"""
+    return {
+        'job_board': [rule.__name__.lstrip('_') for _, rule in JOB_BOARD_COMPANY_RULES],
+        'parser': [rule.__name__.lstrip('_') for _, rule in PARSER_COMPANY_RULES],
+    }
@@ -12,7 +12,9 @@ from datetime import datetime, timedelta
 from urllib.parse import urlparse, quote_plus
 from concurrent.futures import ThreadPoolExecutor
 from services.apollo_api import ApolloAPIService
-from services.google_search import GoogleAPIQuotaExceeded
+from services.async_runtime import get_runtime, run_sync
+from services.google_cse import GoogleAPIQuotaExceeded, GoogleCSEClient, get_cse_client, TTL_JOBS
+from services.vendor_telemetry import get_vendor_telemetry
 
 
 class JobOpeningSearchService:
@@ -103,8 +105,11 @@ class JobOpeningSearchService:
         # Build search queries
         queries = self._build_search_queries(job_title, location, icp_profile)
 
-        # Search in parallel
-        async with aiohttp.ClientSession() as session:
+        # Search in parallel (on the shared runtime session when running there)
+        runtime = get_runtime()
+        owns_session = not runtime.in_loop_thread()
+        session = aiohttp.ClientSession() if owns_session else runtime.http_session()
+        try:
             tasks = [
                 self._google_search(session, query)
                 for query in queries[:3]  # Limit to 3 queries per location
@@ -120,6 +125,9 @@ class JobOpeningSearchService:
 
                 extracted = self._extract_companies_from_results(results, icp_profile)
                 companies.extend(extracted)
+        finally:
+            if owns_session:
+                await session.close()
 
         # If no results from Google, use Apollo fallback
         if not companies:
@@ -168,42 +176,45 @@ class JobOpeningSearchService:
         results = []
 
         if self.google_api_key and self.google_cse_id:
-            # Use Google Custom Search API
-            url = "https://www.googleapis.com/customsearch/v1"
-            params = {
-                'key': self.google_api_key,
-                'cx': self.google_cse_id,
-                'q': query,
-                'num': 10
-            }
+            # Use Google Custom Search API (served from the shared cache when possible)
+            cse = get_cse_client(self.google_api_key, self.google_cse_id)
+            # The cache is SQLite - keep its blocking calls off the event loop
+            loop = asyncio.get_running_loop()
+            cached = await loop.run_in_executor(None, lambda: cse.lookup(query, num=10))
+            if cached is not None:
+                print(f"[GOOGLE] ✓ Cache hit: {query[:60]}...")
+                return [{
+                    'title': item.get('title', ''),
+                    'link': item.get('link', ''),
+                    'snippet': item.get('snippet', '')
+                } for item in cached]
 
             print(f"[GOOGLE] Searching: {query[:60]}...")
 
             try:
-                async with session.get(url, params=params, timeout=aiohttp.ClientTimeout(total=10)) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        items = data.get('items', [])
-
-                        for item in items:
-                            results.append({
-                                'title': item.get('title', ''),
-                                'link': item.get('link', ''),
-                                'snippet': item.get('snippet', '')
-                            })
-
-                        print(f"[GOOGLE] ✓ Found {len(results)} results")
-                    elif response.status == 429:
-                        print(f"[GOOGLE] ⚠ Rate limit exceeded")
-                        raise GoogleAPIQuotaExceeded("Google Search API quota exceeded. Please update your API key in Settings.")
-                    elif response.status == 403:
-                        error_text = await response.text()
-                        if 'rateLimitExceeded' in error_text or 'dailyLimitExceeded' in error_text:
-                            raise GoogleAPIQuotaExceeded("Google Search API quota exceeded. Please update your API key in Settings.")
-                        print(f"[GOOGLE] ✗ Error 403: {error_text[:100]}")
-                    else:
-                        error_text = await response.text()
-                        print(f"[GOOGLE] ✗ Error {response.status}: {error_text[:100]}")
+                # aiohttp bypasses the requests hook - record the call here
+                with get_vendor_telemetry().track('google_cse', '/customsearch/v1', 'GET') as call:
+                    async with session.get(cse.base_url, params=cse.build_params(query, num=10),
+                                           timeout=aiohttp.ClientTimeout(total=10)) as response:
+                        call['status'] = response.status
+                        await loop.run_in_executor(None, cse.cache.record_api_call)
+                        if response.status == 200:
+                            data = await response.json()
+                            items = data.get('items', [])
+                            await loop.run_in_executor(None, lambda: cse.store(query, items, TTL_JOBS, num=10))
+
+                            for item in items:
+                                results.append({
+                                    'title': item.get('title', ''),
+                                    'link': item.get('link', ''),
+                                    'snippet': item.get('snippet', '')
+                                })
+
+                            print(f"[GOOGLE] ✓ Found {len(results)} results")
+                        else:
+                            error_text = await response.text()
+                            GoogleCSEClient.check_quota(response.status, error_text)
+                            print(f"[GOOGLE] ✗ Error {response.status}: {error_text[:100]}")
             except asyncio.TimeoutError:
                 print(f"[GOOGLE] ✗ Request timeout")
             except GoogleAPIQuotaExceeded:
@@ -232,8 +243,9 @@ class JobOpeningSearchService:
         try:
             print(f"[APOLLO FALLBACK] Searching for '{job_title}' in {location}...")
 
-            # Search Apollo for people with this title
-            contacts = self.apollo.search_people(
+            # Search Apollo for people with this title (blocking client - keep it off the loop)
+            contacts = await asyncio.to_thread(
+                self.apollo.search_people,
                 person_titles=[job_title],
                 person_locations=[location],
                 organization_num_employees_ranges=[f"{icp_profile.get('sizeMin', 200)},{icp_profile.get('sizeMax', 10000)}"],
@@ -389,32 +401,34 @@ class JobOpeningSearchService:
         # Use ThreadPoolExecutor for parallel Apollo API calls
         all_leads = []
 
-        with ThreadPoolExecutor(max_workers=5) as executor:
+        loop = asyncio.get_running_loop()
+        executor = ThreadPoolExecutor(max_workers=5)
+        try:
             # Process companies in batches
             batch_size = 10
             for i in range(0, len(companies), batch_size):
                 batch = companies[i:i + batch_size]
 
-                # Submit enrichment tasks
+                # Submit enrichment tasks (awaited, so the event loop stays free)
                 futures = [
-                    executor.submit(
-                        self._enrich_single_company,
-                        company,
-                        icp_profile
+                    asyncio.wait_for(
+                        loop.run_in_executor(executor, self._enrich_single_company, company, icp_profile),
+                        timeout=30
                     )
                     for company in batch
                 ]
 
                 # Collect results
-                for future in futures:
-                    try:
-                        leads = future.result(timeout=30)
-                        if leads:
-                            all_leads.extend(leads)
-                    except Exception as e:
-                        print(f"[ENRICH] Error: {e}")
+                for leads in await asyncio.gather(*futures, return_exceptions=True):
+                    if isinstance(leads, Exception):
+                        print(f"[ENRICH] Error: {leads!r}")
+                    elif leads:
+                        all_leads.extend(leads)
 
                 print(f"[ENRICH] Processed {min(i + batch_size, len(companies))}/{len(companies)} companies, {len(all_leads)} leads so far")
+        finally:
+            # Don't block the loop on calls that already timed out
+            executor.shutdown(wait=False)
 
         # Balance tiers
         balanced_leads = self._balance_tiers(all_leads, t1_target, t2_target, t3_target)
@@ -577,21 +591,12 @@ def search_job_openings_sync(
 
     service = JobOpeningSearchService(apollo_api_key)
 
-    # Run async function in sync context
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-
-    try:
+    async def search_and_enrich():
         # Search for companies
-        companies = loop.run_until_complete(
-            service.search_job_openings(job_title, locations, icp_profile, max_results)
-        )
+        companies = await service.search_job_openings(job_title, locations, icp_profile, max_results)
 
         # Enrich with contacts
-        leads = loop.run_until_complete(
-            service.enrich_companies_with_contacts(companies, icp_profile)
-        )
+        return await service.enrich_companies_with_contacts(companies, icp_profile)
 
-        return leads
-    finally:
-        loop.close()
+    # Run on the process-wide loop (shared HTTP session, no per-request loop)
+    return run_sync(search_and_enrich())
@@ -3,12 +3,15 @@ Lead Engine Service
 Orchestrates the job search -> company enrichment -> POC extraction pipeline
 """
 
-import requests
+from collections import deque
 from typing import List, Dict, Optional, Generator
 from services.google_jobs_search import get_google_jobs_service
 from services.apollo_api import ApolloAPIService
 from services.api_keys import APOLLO_API_KEY, GOOGLE_API_KEY, GOOGLE_SEARCH_ENGINE_ID
-from services.google_search import GoogleAPIQuotaExceeded
+from services.google_cse import GoogleAPIQuotaExceeded, get_cse_client, TTL_PEOPLE
+from services.search_planner import SearchPlanner
+from services.title_taxonomy import TITLE_PRIORITY
+from services.vendor_telemetry import get_vendor_telemetry, telemetry_scope
 
 
 class LeadEngineService:
@@ -24,14 +27,7 @@ class LeadEngineService:
     }
 
     # Title priority for ranking POCs by hiring influence (lower = higher priority)
-    TITLE_PRIORITY = [
-        ['talent acquisition', 'head of talent'],
-        ['hr manager', 'hr business partner'],
-        ['engineering manager', 'hiring manager'],
-        ['vp engineering', 'vp it', 'vp of engineering', 'vp of it'],
-        ['cto', 'technical director', 'chief technology officer'],
-        ['senior recruiter'],
-    ]
+    TITLE_PRIORITY = TITLE_PRIORITY
     MAX_POCS_PER_LEAD = 5
 
     def __init__(self):
@@ -46,9 +42,13 @@ class LeadEngineService:
                        keywords: List[str] = None,
                        company_sizes: List[str] = None,
                        poc_roles: List[str] = None,
-                       session_title: str = None) -> Generator[Dict, None, None]:
+                       session_title: str = None,
+                       session_id=None) -> Generator[Dict, None, None]:
         """
         Generate leads from job openings
+
+        Vendor calls are attributed to session_id and the pipeline stage making them
+        (job_search, company_enrich, poc_search, senior_names, person_enrich, email_reveal).
         """
 
         print(f"\n{'='*60}")
@@ -60,7 +60,7 @@ class LeadEngineService:
         print(f"POC Role Filter: {poc_roles}")
         print(f"{'='*60}\n")
 
-        # PHASE 1: Search job openings
+        # PHASE 1: Plan the job search from the yield of past sessions
         yield {
             'type': 'status',
             'phase': 'search',
@@ -68,66 +68,115 @@ class LeadEngineService:
             'progress': 5
         }
 
-        # Get more results to account for filtering losses
-        # Each job board can return up to 100 results, so we can get many more
-        target_search_results = min(num_jobs * 3, 200)  # Get 3x more to account for filtering
-
-        try:
-            job_results = self.google_service.search_jobs(
-                job_titles=job_titles,
-                locations=locations,
-                industries=industries,
-                keywords=keywords,
-                num_results=target_search_results
-            )
-        except GoogleAPIQuotaExceeded as e:
-            yield {
-                'type': 'quota_exceeded',
-                'message': str(e)
-            }
-            return
-
-        if not job_results:
-            yield {
-                'type': 'error',
-                'message': 'No job openings found. Try different search terms.'
-            }
-            return
+        boards = {board['name']: board for board in self.google_service.JOB_BOARDS}
+        planner = SearchPlanner(self.google_service.JOB_BOARDS, num_jobs, company_sizes)
+        print(f"[PLANNER] Initial page plan: {planner.plan()}")
 
-        yield {
-            'type': 'status',
-            'phase': 'search_complete',
-            'message': f'Found {len(job_results)} companies with job openings',
-            'progress': 15
+        queries = {
+            name: self.google_service.build_board_query(board, job_titles, locations, industries, keywords)
+            for name, board in boards.items()
         }
 
+        # Companies found but not processed yet, fetched lazily page by page
+        pending = deque()
+        pending_counts = dict.fromkeys(boards, 0)
+        seen_companies = set()
+        search_announced = False
+
         # PHASE 2: Enrich companies and find POCs
         leads = []
+        processed = 0
         skipped_no_data = 0
         skipped_size = 0
         skipped_no_pocs = 0
 
-        total_to_process = len(job_results)
+        while len(leads) < num_jobs:
+            # Fetch another page only while the running yield says the target won't be met
+            while planner.should_fetch(len(leads), pending_counts):
+                board_name = planner.next_board()
+                if board_name is None:
+                    break
+
+                page = planner.pages_fetched[board_name] + 1
+                print(f"\n[{board_name}] Fetching page {page}...")
+                if search_announced:
+                    yield {
+                        'type': 'status',
+                        'phase': 'search',
+                        'message': f'Searching {board_name} for more job openings (page {page})...',
+                        'progress': 15 + int((len(leads) / num_jobs) * 75)
+                    }
+
+                try:
+                    with telemetry_scope(session_id, 'job_search'):
+                        raw_count, page_results = self.google_service.fetch_board_page(
+                            boards[board_name], queries[board_name], planner.next_start_index(board_name)
+                        )
+                except GoogleAPIQuotaExceeded as e:
+                    if not pending and not leads:
+                        yield {
+                            'type': 'quota_exceeded',
+                            'message': str(e)
+                        }
+                        return
+                    print(f"[PLANNER] Quota exceeded - finishing with companies already found")
+                    for name in boards:
+                        planner.mark_exhausted(name)
+                    break
+
+                new_companies = 0
+                for result in page_results:
+                    company_key = result['company_name'].lower().strip()
+                    if company_key in seen_companies:
+                        continue
+                    seen_companies.add(company_key)
+                    pending.append((board_name, result))
+                    pending_counts[board_name] += 1
+                    new_companies += 1
+                    print(f"    + {result['company_name']}")
+
+                planner.record_page(board_name, raw_count, new_companies)
+
+            if not search_announced:
+                if not pending:
+                    yield {
+                        'type': 'error',
+                        'message': 'No job openings found. Try different search terms.'
+                    }
+                    return
+
+                yield {
+                    'type': 'status',
+                    'phase': 'search_complete',
+                    'message': f'Found {len(pending)} companies with job openings',
+                    'progress': 15
+                }
+                search_announced = True
 
-        for idx, job_result in enumerate(job_results):
-            if len(leads) >= num_jobs:
+            if not pending:
                 break
 
+            board_name, job_result = pending.popleft()
+            pending_counts[board_name] -= 1
+            processed += 1
+            planner.record(board_name, 'processed')
+
             company_name = job_result['company_name']
-            progress = 15 + int((idx / total_to_process) * 75)
+            progress = 15 + int((len(leads) / num_jobs) * 75)
 
             yield {
                 'type': 'status',
                 'phase': 'enriching',
-                'message': f'Processing: {company_name} ({idx+1}/{total_to_process})',
+                'message': f'Processing: {company_name} ({processed}/{processed + len(pending)})',
                 'progress': progress,
-                'current': idx + 1,
-                'total': total_to_process
+                'current': processed,
+                'total': processed + len(pending)
             }
 
             try:
                 # Get company data from Apollo
-                company_data = self._enrich_company(company_name)
+                with telemetry_scope(session_id, 'company_enrich'):
+                    company_data = self._enrich_company(company_name)
 
                 if not company_data:
                     print(f"[Skip] {company_name} - No company data")
@@ -150,46 +199,51 @@ class LeadEngineService:
                         skipped_size += 1
                         continue
 
+                planner.record(board_name, 'size_ok')
+
                 # Find POCs - first try broad search, then with titles
                 print(f"\n[POC] Finding contacts for {company_name} ({domain})...")
 
-                # Try with seniority filter first (executives, VPs, directors)
-                pocs = self.apollo_service.find_contacts(
-                    domain=domain,
-                    titles=None,  # Don't filter by specific titles
-                    seniorities=['owner', 'founder', 'c_suite', 'partner', 'vp', 'director', 'head', 'manager'],
-                    per_page=15,
-                    reveal_emails=False  # Don't reveal yet, we'll use bulk_match
-                )
-
-                # If no results, try without any filters
-                if not pocs:
-                    print(f"[POC] No senior contacts, trying broad search...")
+                with telemetry_scope(session_id, 'poc_search'):
+                    # Try with seniority filter first (executives, VPs, directors)
                     pocs = self.apollo_service.find_contacts(
                         domain=domain,
-                        titles=None,
-                        seniorities=None,  # No seniority filter
+                        titles=None,  # Don't filter by specific titles
+                        seniorities=['owner', 'founder', 'c_suite', 'partner', 'vp', 'director', 'head', 'manager'],
                         per_page=15,
-                        reveal_emails=False
+                        reveal_emails=False  # Don't reveal yet, we'll use bulk_match
                     )
 
+                    # If no results, try without any filters
+                    if not pocs:
+                        print(f"[POC] No senior contacts, trying broad search...")
+                        pocs = self.apollo_service.find_contacts(
+                            domain=domain,
+                            titles=None,
+                            seniorities=None,  # No seniority filter
+                            per_page=15,
+                            reveal_emails=False
+                        )
+
                 # Fallback: people/search is blocked for this key.
                 # Step 1: Google search for VP/Senior/Director names at the company
                 # Step 2: Apollo People Enrichment (people/match) with each name → verified emails
                 if not pocs:
                     print(f"[POC] People search returned empty, searching for senior contacts...")
-                    senior_names = self._find_senior_names(company_name, domain)
+                    with telemetry_scope(session_id, 'senior_names'):
+                        senior_names = self._find_senior_names(company_name, domain)
                     print(f"[POC] Found {len(senior_names)} senior name(s) via Google for {company_name}")
 
                     enriched_pocs = []
                     for entry in senior_names[:5]:
-                        enriched = self.apollo_service.enrich_person(
-                            first_name=entry['first_name'],
-                            last_name=entry['last_name'],
-                            domain=domain,
-                            linkedin_url=entry.get('linkedin_url'),
-                            reveal_emails=True
-                        )
+                        with telemetry_scope(session_id, 'person_enrich'):
+                            enriched = self.apollo_service.enrich_person(
+                                first_name=entry['first_name'],
+                                last_name=entry['last_name'],
+                                domain=domain,
+                                linkedin_url=entry.get('linkedin_url'),
+                                reveal_emails=True
+                            )
                         if enriched and enriched.get('email'):
                             enriched_pocs.append(enriched)
                             print(f"[POC] {enriched.get('name')} → {enriched.get('email')} ({enriched.get('email_status')})")
@@ -218,7 +272,8 @@ class LeadEngineService:
                     if not any(p.get('email') for p in pocs):
                         for poc in pocs:
                             poc['domain'] = domain
-                        pocs = self.apollo_service.bulk_reveal_emails(pocs)
+                        with telemetry_scope(session_id, 'email_reveal'):
+                            pocs = self.apollo_service.bulk_reveal_emails(pocs)
 
                 # Deduplicate, filter by selected roles, rank by hiring influence, pick top 5
                 ranked_pocs = self._rank_and_deduplicate_pocs(pocs, poc_roles=poc_roles)
@@ -250,6 +305,8 @@ class LeadEngineService:
                 }
 
                 leads.append(lead)
+                if lead['pocs']:
+                    planner.record(board_name, 'with_pocs')
 
                 # Yield the lead
                 yield {
@@ -269,8 +326,11 @@ class LeadEngineService:
                 continue
 
         # PHASE 3: Complete
+        planner.finish()
+        funnel = planner.summary()
         total_pocs = sum(len(lead['pocs']) for lead in leads)
         total_emails = sum(1 for lead in leads for poc in lead['pocs'] if poc.get('email'))
+        vendor_usage = get_vendor_telemetry().summary(session_id=session_id) if session_id is not None else None
 
         yield {
             'type': 'complete',
@@ -278,6 +338,8 @@ class LeadEngineService:
             'total_leads': len(leads),
             'total_pocs': total_pocs,
             'total_emails': total_emails,
+            'search_funnel': funnel,
+            'vendor_usage': vendor_usage['stages'] if vendor_usage else None,
             'progress': 100
         }
 
@@ -289,6 +351,13 @@ class LeadEngineService:
         print(f"Skipped - No Data/Domain: {skipped_no_data}")
         print(f"Skipped - Size Filter: {skipped_size}")
         print(f"Skipped - No POCs: {skipped_no_pocs}")
+        for board_name, counts in funnel.items():
+            print(f"Funnel - {board_name}: {counts}")
+        if vendor_usage:
+            for stage, by_vendor in vendor_usage['stages'].items():
+                for vendor, stats in by_vendor.items():
+                    print(f"Vendor - {stage}/{vendor}: {stats['calls']} calls, {stats['seconds']}s, "
+                          f"{stats['credits']} {vendor_usage['credit_units'].get(vendor, 'units')}")
         print(f"{'='*60}\n")
 
     def _find_senior_names(self, company_name: str, domain: str) -> List[Dict]:
@@ -296,20 +365,9 @@ class LeadEngineService:
         Returns list of dicts with first_name, last_name, linkedin_url."""
         try:
             query = f'"{company_name}" "VP" OR "Senior VP" OR "Director" OR "Head of" OR "Senior" site:linkedin.com'
-            response = requests.get(
-                'https://www.googleapis.com/customsearch/v1',
-                params={
-                    'key': GOOGLE_API_KEY,
-                    'cx': GOOGLE_SEARCH_ENGINE_ID,
-                    'q': query,
-                    'num': 10
-                }
+            items = get_cse_client(GOOGLE_API_KEY, GOOGLE_SEARCH_ENGINE_ID).search(
+                query, num=10, ttl=TTL_PEOPLE
             )
-            if response.status_code != 200:
-                print(f"[WARN] Google search returned {response.status_code} for {company_name}")
-                return []
-
-            items = response.json().get('items', [])
             names = []
             seen = set()
             for item in items:
@@ -0,0 +1,37 @@
+"""
+Local SQLite Store
+Small on-disk databases under instance/ shared by all workers on a host
+(search cache, yield statistics, ...). Kept separate from the main app
+database so services can use them without a Flask app context.
+"""
+
+import os
+import sqlite3
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+INSTANCE_DIR = os.getenv('LOCAL_STORE_DIR', os.path.join(PROJECT_ROOT, 'instance'))
+
+
+def instance_path(filename: str) -> str:
+    """Absolute path of a file in the local store directory (created on demand)"""
+    os.makedirs(INSTANCE_DIR, exist_ok=True)
+    return os.path.join(INSTANCE_DIR, filename)
+
+
+def connect(filename: str, schema: str = None) -> sqlite3.Connection:
+    """
+    Open a connection to a local store database
+
+    Args:
+        filename: Database file name inside the instance directory
+        schema: Optional CREATE TABLE IF NOT EXISTS script to run
+
+    Returns:
+        sqlite3 connection in WAL mode (safe for concurrent gunicorn workers)
+    """
+    conn = sqlite3.connect(instance_path(filename), timeout=5, check_same_thread=False)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    if schema:
+        conn.executescript(schema)
+    return conn
@@ -4,13 +4,14 @@ Uses vector embeddings and local AI models to speed up lead discovery
 """
 
 import chromadb
-from sentence_transformers import SentenceTransformer
 from typing import List, Dict, Optional
 import numpy as np
 import json
 import asyncio
 import aiohttp
 
+from services.embedding_backend import DEFAULT_MODEL, get_embedding_backend
+
 
 class RAGLeadIntelligence:
     """
@@ -28,8 +29,8 @@ class RAGLeadIntelligence:
         print("[RAG] Initializing Lead Intelligence System...")
 
         # Initialize embedding model (lightweight, runs on CPU)
-        self.embed_model = SentenceTransformer('all-MiniLM-L6-v2')
-        print("[RAG] Loaded embedding model: all-MiniLM-L6-v2")
+        self.embed_model = get_embedding_backend(DEFAULT_MODEL)
+        print(f"[RAG] Loaded embedding model: {DEFAULT_MODEL} ({self.embed_model.name})")
 
         # Initialize ChromaDB for vector storage
         self.chroma_client = chromadb.Client()
@@ -310,7 +311,8 @@ class RAGLeadIntelligence:
         return {
             'companies_indexed': self.company_collection.count(),
             'contacts_indexed': self.contact_collection.count(),
-            'embedding_model': 'all-MiniLM-L6-v2',
+            'embedding_model': DEFAULT_MODEL,
+            'embedding_backend': self.embed_model.name,
             'vector_db': 'ChromaDB',
             'llm_enabled': self.use_ollama
         }
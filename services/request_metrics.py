@@ -0,0 +1,346 @@
+"""
+Request Metrics
+Per-request timing for the Flask app: route latency histograms, database
+time (SQLAlchemy cursor events) and outbound vendor time (every call
+recorded by vendor_telemetry). Every response gets a Server-Timing header;
+counters are snapshotted to a shared directory so /api/metrics can merge all
+gunicorn workers into one Prometheus text exposition.
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+from typing import Dict, List
+
+from services import local_store
+from services.vendor_telemetry import get_vendor_telemetry, instrument_requests
+
+METRICS_DIR = os.getenv('METRICS_DIR') or os.path.join(local_store.INSTANCE_DIR, 'metrics')
+SNAPSHOT_INTERVAL = float(os.getenv('METRICS_SNAPSHOT_INTERVAL', '5'))
+# Counters of exited workers, folded together so the merged totals never go down
+DEAD_WORKERS_FILE = 'metrics-dead.json'
+
+# Latency histogram buckets (seconds)
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+class RequestTiming:
+    """Timing collected while one request is being handled"""
+
+    __slots__ = ('start', 'db_seconds', 'db_queries', 'vendor_seconds')
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.db_seconds = 0.0
+        self.db_queries = 0
+        self.vendor_seconds: Dict[str, float] = {}
+
+
+class RequestMetrics:
+    """Process-local counters with periodic snapshots for cross-worker merging"""
+
+    def __init__(self, metrics_dir: str = METRICS_DIR):
+        self.metrics_dir = metrics_dir
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._last_snapshot = 0.0
+        # "METHOD route" -> histogram + totals
+        self.routes: Dict[str, Dict] = {}
+        # "METHOD route status" -> count
+        self.statuses: Dict[str, int] = {}
+        # vendor -> calls / errors / seconds
+        self.vendors: Dict[str, Dict] = {}
+
+    # ==================== PER-REQUEST STATE ====================
+
+    @property
+    def current(self):
+        return getattr(self._local, 'timing', None)
+
+    def begin(self):
+        self._local.timing = RequestTiming()
+
+    def end(self):
+        timing = self.current
+        self._local.timing = None
+        return timing
+
+    def record_db(self, seconds: float):
+        timing = self.current
+        if timing is not None:
+            timing.db_seconds += seconds
+            timing.db_queries += 1
+
+    def record_vendor(self, vendor: str, seconds: float, error: bool = False):
+        """Count an outbound vendor call (attributed to the current request, if any)"""
+        with self._lock:
+            stats = self.vendors.setdefault(vendor, {'calls': 0, 'errors': 0, 'seconds': 0.0})
+            stats['calls'] += 1
+            stats['errors'] += int(error)
+            stats['seconds'] += seconds
+        timing = self.current
+        if timing is not None:
+            timing.vendor_seconds[vendor] = timing.vendor_seconds.get(vendor, 0.0) + seconds
+
+    def observe(self, method: str, route: str, status: int, timing: RequestTiming) -> float:
+        """Record a finished request; returns its duration in seconds"""
+        duration = time.perf_counter() - timing.start
+        key = f"{method} {route}"
+        with self._lock:
+            stats = self.routes.get(key)
+            if stats is None:
+                stats = self.routes[key] = {'buckets': [0] * len(BUCKETS), 'count': 0, 'sum': 0.0,
+                                            'db_seconds': 0.0, 'db_queries': 0, 'vendor_seconds': 0.0}
+            for i, bound in enumerate(BUCKETS):
+                if duration <= bound:
+                    stats['buckets'][i] += 1
+            stats['count'] += 1
+            stats['sum'] += duration
+            stats['db_seconds'] += timing.db_seconds
+            stats['db_queries'] += timing.db_queries
+            stats['vendor_seconds'] += sum(timing.vendor_seconds.values())
+            status_key = f"{key} {status}"
+            self.statuses[status_key] = self.statuses.get(status_key, 0) + 1
+
+        if time.time() - self._last_snapshot >= SNAPSHOT_INTERVAL:
+            self.write_snapshot()
+        return duration
+
+    @staticmethod
+    def server_timing(duration: float, timing: RequestTiming) -> str:
+        """Server-Timing header value (milliseconds)"""
+        parts = [f"app;dur={duration * 1000:.1f}",
+                 f'db;dur={timing.db_seconds * 1000:.1f};desc="{timing.db_queries} queries"']
+        for vendor, seconds in sorted(timing.vendor_seconds.items()):
+            parts.append(f"vendor-{vendor.replace('.', '-')};dur={seconds * 1000:.1f}")
+        return ', '.join(parts)
+
+    # ==================== SNAPSHOTS ====================
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return json.loads(json.dumps({'routes': self.routes, 'statuses': self.statuses,
+                                          'vendors': self.vendors}))
+
+    def write_snapshot(self):
+        """Write this process's counters to the shared metrics directory"""
+        self._last_snapshot = time.time()
+        try:
+            os.makedirs(self.metrics_dir, exist_ok=True)
+            path = snapshot_path(os.getpid(), self.metrics_dir)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(self.snapshot(), f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"[METRICS] Could not write snapshot: {e}")
+
+    def collect(self) -> List[Dict]:
+        """Snapshots of every running worker (this process's counters are live)"""
+        self.write_snapshot()
+        snapshots = []
+        try:
+            names = [n for n in os.listdir(self.metrics_dir) if n.startswith('metrics-') and n.endswith('.json')
+                     and n != DEAD_WORKERS_FILE]
+        except OSError:
+            names = []
+        for name in names:
+            snapshot = _read_snapshot(os.path.join(self.metrics_dir, name))
+            if snapshot is not None:
+                snapshots.append(snapshot)
+        return snapshots or [self.snapshot()]
+
+    # ==================== PROMETHEUS ====================
+
+    def render_prometheus(self) -> str:
+        """All workers' counters merged, in Prometheus text exposition format"""
+        snapshots = self.collect()
+        dead = _read_snapshot(os.path.join(self.metrics_dir, DEAD_WORKERS_FILE))
+        merged = merge_snapshots(snapshots + ([dead] if dead else []))
+        routes, statuses, vendors = merged['routes'], merged['statuses'], merged['vendors']
+
+        lines = [
+            '# HELP app_workers Worker processes with a metrics snapshot',
+            '# TYPE app_workers gauge',
+            f'app_workers {len(snapshots)}',
+            '# HELP http_requests_total Requests by route and status',
+            '# TYPE http_requests_total counter',
+        ]
+        for key, count in sorted(statuses.items()):
+            method, route, status = key.split(' ', 2)
+            lines.append(f'http_requests_total{{{_labels(method=method, route=route, status=status)}}} {count}')
+
+        lines += ['# HELP http_request_duration_seconds Request latency by route',
+                  '# TYPE http_request_duration_seconds histogram']
+        for key, stats in sorted(routes.items()):
+            method, route = key.split(' ', 1)
+            labels = _labels(method=method, route=route)
+            for bound, count in zip(BUCKETS, stats['buckets']):
+                lines.append(f'http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {count}')
+            lines.append(f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {stats["count"]}')
+            lines.append(f'http_request_duration_seconds_sum{{{labels}}} {stats["sum"]:.6f}')
+            lines.append(f'http_request_duration_seconds_count{{{labels}}} {stats["count"]}')
+
+        for name, field, help_text in (
+            ('http_request_db_seconds_total', 'db_seconds', 'Time spent in database queries by route'),
+            ('http_request_db_queries_total', 'db_queries', 'Database queries by route'),
+            ('http_request_vendor_seconds_total', 'vendor_seconds', 'Time spent in outbound vendor calls by route'),
+        ):
+            lines += [f'# HELP {name} {help_text}', f'# TYPE {name} counter']
+            for key, stats in sorted(routes.items()):
+                method, route = key.split(' ', 1)
+                lines.append(f'{name}{{{_labels(method=method, route=route)}}} {stats[field]:g}')
+
+        for name, field, help_text in (
+            ('vendor_requests_total', 'calls', 'Outbound vendor HTTP calls'),
+            ('vendor_errors_total', 'errors', 'Outbound vendor HTTP calls that failed or returned >= 400'),
+            ('vendor_request_seconds_total', 'seconds', 'Time spent in outbound vendor HTTP calls'),
+        ):
+            lines += [f'# HELP {name} {help_text}', f'# TYPE {name} counter']
+            for vendor, stats in sorted(vendors.items()):
+                lines.append(f'{name}{{{_labels(vendor=vendor)}}} {stats[field]:g}')
+
+        return '\n'.join(lines) + '\n'
+
+
+def snapshot_path(pid: int, metrics_dir: str = METRICS_DIR) -> str:
+    """Snapshot file of one worker process"""
+    return os.path.join(metrics_dir, f"metrics-{pid}.json")
+
+
+def _read_snapshot(path: str):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def merge_snapshots(snapshots: List[Dict]) -> Dict:
+    """Sum worker snapshots field by field (histogram buckets element-wise)"""
+    merged = {'routes': {}, 'statuses': {}, 'vendors': {}}
+    for snap in snapshots:
+        for key, count in snap.get('statuses', {}).items():
+            merged['statuses'][key] = merged['statuses'].get(key, 0) + count
+        for section in ('routes', 'vendors'):
+            for key, stats in snap.get(section, {}).items():
+                target = merged[section].get(key)
+                if target is None:
+                    merged[section][key] = json.loads(json.dumps(stats))
+                    continue
+                for field, value in stats.items():
+                    if isinstance(value, list):
+                        target[field] = [a + b for a, b in zip(target.get(field, [0] * len(value)), value)]
+                    else:
+                        target[field] = target.get(field, 0) + value
+    return merged
+
+
+def retire_snapshot(pid: int, metrics_dir: str = METRICS_DIR):
+    """
+    Fold an exited worker's counters into the dead-workers snapshot (gunicorn child_exit)
+
+    Its counts stay in the merged totals, so Prometheus never sees a counter go down.
+    """
+    path = snapshot_path(pid, metrics_dir)
+    snapshot = _read_snapshot(path)
+    if snapshot is not None:
+        dead_path = os.path.join(metrics_dir, DEAD_WORKERS_FILE)
+        dead = _read_snapshot(dead_path)
+        try:
+            tmp_path = f"{dead_path}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(merge_snapshots([dead, snapshot] if dead else [snapshot]), f)
+            os.replace(tmp_path, dead_path)
+        except OSError as e:
+            # Keep the worker's file so its counts are still merged
+            print(f"[METRICS] Could not fold worker {pid} into {DEAD_WORKERS_FILE}: {e}")
+            return
+    for leftover in (path, f"{path}.tmp"):
+        try:
+            os.remove(leftover)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"[METRICS] Could not remove {leftover}: {e}")
+
+
+def clear_snapshots(metrics_dir: str = METRICS_DIR):
+    """Delete every snapshot, dead workers' included (gunicorn master start - counters restart)"""
+    try:
+        names = os.listdir(metrics_dir)
+    except FileNotFoundError:
+        return
+    for name in names:
+        if name.startswith('metrics-'):
+            try:
+                os.remove(os.path.join(metrics_dir, name))
+            except OSError as e:
+                print(f"[METRICS] Could not remove {name}: {e}")
+
+
+def _labels(**labels) -> str:
+    def escape(value):
+        return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+    return ','.join(f'{name}="{escape(value)}"' for name, value in labels.items())
+
+
+_metrics = None
+_metrics_lock = threading.Lock()
+
+
+def get_request_metrics() -> RequestMetrics:
+    """Get the process-wide request metrics"""
+    global _metrics
+    with _metrics_lock:
+        if _metrics is None:
+            _metrics = RequestMetrics()
+            atexit.register(_metrics.write_snapshot)
+        return _metrics
+
+
+def init_request_metrics(app, engine):
+    """
+    Instrument a Flask app
+
+    Args:
+        app: Flask app
+        engine: SQLAlchemy engine whose queries are timed
+    """
+    from flask import request
+    from sqlalchemy import event
+
+    metrics = get_request_metrics()
+
+    @event.listens_for(engine, 'before_cursor_execute')
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('query_start', []).append(time.perf_counter())
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get('query_start')
+        if starts:
+            metrics.record_db(time.perf_counter() - starts.pop())
+
+    # Vendor calls (requests hook, Ollama, Gmail) also count towards the current request
+    instrument_requests()
+    get_vendor_telemetry().add_listener(
+        lambda call: metrics.record_vendor(call.vendor, call.seconds, call.error_class != 'ok')
+    )
+
+    @app.before_request
+    def _start_timer():
+        metrics.begin()
+
+    @app.after_request
+    def _record_timing(response):
+        timing = metrics.end()
+        if timing is None:
+            return response
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        duration = metrics.observe(request.method, route, response.status_code, timing)
+        response.headers['Server-Timing'] = metrics.server_timing(duration, timing)
+        return response
+
+    return metrics
@@ -1,11 +1,115 @@
-from apscheduler.schedulers.background import BackgroundScheduler
-from apscheduler.triggers.cron import CronTrigger
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
 from datetime import datetime
+import atexit
+import os
+import socket
+import threading
+import time
+import uuid
+
+# Leader election: one process holds the lease row and runs jobs; the rest only edit the job store
+LEASE_SECONDS = int(os.getenv('SCHEDULER_LEASE_SECONDS', '30'))
+HEARTBEAT_SECONDS = int(os.getenv('SCHEDULER_HEARTBEAT_SECONDS', '10'))
+MAX_WORKERS = int(os.getenv('SCHEDULER_MAX_WORKERS', '4'))
+MISFIRE_GRACE_SECONDS = 60 * 60  # A run missed by up to an hour (restart, failover) still happens once
+
+LEADER_TABLE = 'scheduler_leader'
+
 
 class CampaignScheduler:
-    def __init__(self):
-        self.scheduler = BackgroundScheduler()
-        self.scheduler.start()
+    def __init__(self, engine):
+        """
+        Persistent campaign scheduler shared by all app processes
+
+        Args:
+            engine: SQLAlchemy engine for the app database (holds the job store and leader lease)
+        """
+        from apscheduler.schedulers.background import BackgroundScheduler
+        from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
+        from apscheduler.executors.pool import ThreadPoolExecutor
+
+        if engine is None:
+            raise ValueError("CampaignScheduler needs the app database engine")
+        self.engine = engine
+        self.node_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self.is_leader = False
+        self._stop = threading.Event()
+
+        self.scheduler = BackgroundScheduler(
+            jobstores={'default': SQLAlchemyJobStore(engine=self.engine, tablename='apscheduler_jobs')},
+            executors={'default': ThreadPoolExecutor(max_workers=MAX_WORKERS)},
+            job_defaults={
+                'coalesce': True,          # Collapse a backlog of missed runs into one
+                'max_instances': 1,        # Never run the same campaign twice at once
+                'misfire_grace_time': MISFIRE_GRACE_SECONDS
+            }
+        )
+        # Every process can add/remove jobs; only the leader resumes processing them
+        self.scheduler.start(paused=True)
+
+        self._ensure_leader_table()
+        self._heartbeat()
+        self._thread = threading.Thread(target=self._heartbeat_loop, name='scheduler-leader', daemon=True)
+        self._thread.start()
+        atexit.register(self.shutdown)
+
+    # ==================== LEADER ELECTION ====================
+
+    def _ensure_leader_table(self):
+        with self.engine.begin() as conn:
+            conn.execute(text(
+                f"CREATE TABLE IF NOT EXISTS {LEADER_TABLE} "
+                f"(id INTEGER PRIMARY KEY, holder VARCHAR(200), heartbeat_at FLOAT NOT NULL)"
+            ))
+        try:
+            with self.engine.begin() as conn:
+                conn.execute(text(f"INSERT INTO {LEADER_TABLE} (id, holder, heartbeat_at) VALUES (1, NULL, 0)"))
+        except IntegrityError:
+            pass  # Another process created the row
+
+    def _try_acquire(self) -> bool:
+        """Take or renew the lease if it is ours or has expired"""
+        now = time.time()
+        with self.engine.begin() as conn:
+            result = conn.execute(
+                text(f"UPDATE {LEADER_TABLE} SET holder = :me, heartbeat_at = :now "
+                     f"WHERE id = 1 AND (holder = :me OR holder IS NULL OR heartbeat_at < :expired)"),
+                {'me': self.node_id, 'now': now, 'expired': now - LEASE_SECONDS}
+            )
+            return result.rowcount == 1
+
+    def _heartbeat(self):
+        try:
+            leader = self._try_acquire()
+        except Exception as e:
+            print(f"[SCHEDULER] Lease check failed: {e}")
+            leader = False
+
+        if leader and not self.is_leader:
+            self.is_leader = True
+            self.scheduler.resume()
+            print(f"[SCHEDULER] {self.node_id} is now the leader - running scheduled jobs")
+        elif not leader and self.is_leader:
+            self.is_leader = False
+            self.scheduler.pause()
+            print(f"[SCHEDULER] {self.node_id} lost the lease - pausing scheduled jobs")
+        elif leader:
+            # Pick up jobs other processes added to the store since the last wakeup
+            self.scheduler.wakeup()
+
+    def _heartbeat_loop(self):
+        while not self._stop.wait(HEARTBEAT_SECONDS):
+            self._heartbeat()
+
+    def _release(self):
+        with self.engine.begin() as conn:
+            conn.execute(
+                text(f"UPDATE {LEADER_TABLE} SET holder = NULL, heartbeat_at = 0 WHERE id = 1 AND holder = :me"),
+                {'me': self.node_id}
+            )
+
+    # ==================== JOBS ====================
 
     def schedule_campaign(self, campaign_id: int, frequency: str, callback):
         """
@@ -14,12 +118,12 @@ class CampaignScheduler:
         Args:
             campaign_id: The campaign ID
             frequency: 'daily', 'weekly', or 'monthly'
-            callback: The function to call when the campaign runs
+            callback: Textual reference to the job function, e.g. 'app:run_campaign_job'
+                      (the job store keeps the reference, not the function)
         """
-        job_id = f"campaign_{campaign_id}"
+        from apscheduler.triggers.cron import CronTrigger
 
-        # Remove existing job if any
-        self.remove_campaign(campaign_id)
+        job_id = f"campaign_{campaign_id}"
 
         if frequency == 'daily':
             trigger = CronTrigger(hour=9, minute=0)  # Run daily at 9 AM
@@ -42,11 +146,13 @@ class CampaignScheduler:
 
     def remove_campaign(self, campaign_id: int):
         """Remove a scheduled campaign"""
+        from apscheduler.jobstores.base import JobLookupError
+
         job_id = f"campaign_{campaign_id}"
         try:
             self.scheduler.remove_job(job_id)
             return True
-        except:
+        except JobLookupError:
             return False
 
     def get_scheduled_jobs(self):
@@ -59,6 +165,60 @@ class CampaignScheduler:
             })
         return jobs
 
+    def get_status(self):
+        """Leader lease and job summary for this process"""
+        with self.engine.connect() as conn:
+            row = conn.execute(text(f"SELECT holder, heartbeat_at FROM {LEADER_TABLE} WHERE id = 1")).fetchone()
+        holder, heartbeat_at = row if row else (None, 0)
+        return {
+            'node_id': self.node_id,
+            'is_leader': self.is_leader,
+            'leader': holder if heartbeat_at >= time.time() - LEASE_SECONDS else None,
+            'leader_heartbeat': datetime.fromtimestamp(heartbeat_at).isoformat() if heartbeat_at else None,
+            'max_workers': MAX_WORKERS,
+            'jobs': self.get_scheduled_jobs()
+        }
+
     def shutdown(self):
-        """Shutdown the scheduler"""
-        self.scheduler.shutdown()
+        """Shutdown the scheduler and hand the lease to another process"""
+        if self._stop.is_set():
+            return
+        self._stop.set()
+        try:
+            self.scheduler.shutdown(wait=False)
+        except Exception:
+            pass
+        if self.is_leader:
+            self.is_leader = False
+            try:
+                self._release()
+            except Exception as e:
+                print(f"[SCHEDULER] Could not release lease: {e}")
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_campaign_scheduler(engine=None) -> CampaignScheduler:
+    """
+    Get the process-wide campaign scheduler (created on first use)
+
+    Args:
+        engine: SQLAlchemy engine for the app database
+
+    Raises:
+        ValueError if the scheduler does not exist yet and no engine is given
+    """
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            if engine is None:
+                raise ValueError("get_campaign_scheduler() needs the app database engine on first use")
+            _scheduler = CampaignScheduler(engine)
+        return _scheduler
+
+
+def start_campaign_scheduler(engine):
+    """Create the scheduler on a background thread so apscheduler and the lease check stay off the boot path"""
+    threading.Thread(target=get_campaign_scheduler, args=(engine,), name='scheduler-init', daemon=True).start()
@@ -0,0 +1,245 @@
+"""
+Adaptive Search Planner for the Lead Engine
+Decides which job board page to fetch next from the yield recorded in past
+sessions (search result -> valid company -> passes size -> has POCs), so a
+session stops spending CSE pages once its target is reachable.
+"""
+
+import sqlite3
+import time
+from typing import List, Dict, Optional
+
+from services import local_store
+
+STATS_FILE = 'lead_engine_yield.db'
+STATS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS board_yield (
+    board TEXT NOT NULL,
+    size_filter TEXT NOT NULL,
+    results REAL NOT NULL DEFAULT 0,
+    companies REAL NOT NULL DEFAULT 0,
+    processed REAL NOT NULL DEFAULT 0,
+    size_ok REAL NOT NULL DEFAULT 0,
+    with_pocs REAL NOT NULL DEFAULT 0,
+    sessions INTEGER NOT NULL DEFAULT 0,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (board, size_filter)
+);
+"""
+
+# Funnel stages, in order
+FUNNEL_STAGES = ('results', 'companies', 'processed', 'size_ok', 'with_pocs')
+
+ANY_FILTER = '*'
+
+
+class YieldStats:
+    """Per-board / per-size-filter funnel counts accumulated across sessions"""
+
+    # Weight of history vs a new session (older sessions fade out)
+    DECAY = 0.8
+
+    def __init__(self, filename: str = STATS_FILE):
+        self.filename = filename
+
+    def _connect(self) -> sqlite3.Connection:
+        return local_store.connect(self.filename, STATS_SCHEMA)
+
+    def load(self, size_filter: str) -> Dict[str, Dict[str, float]]:
+        """
+        Historical funnel counts per board for a size filter
+
+        Falls back to the all-filters row when this filter has no history.
+        """
+        history = {}
+        try:
+            conn = self._connect()
+            rows = conn.execute(
+                'SELECT board, size_filter, results, companies, processed, size_ok, with_pocs '
+                'FROM board_yield WHERE size_filter IN (?, ?)',
+                (size_filter, ANY_FILTER)
+            ).fetchall()
+            conn.close()
+        except sqlite3.Error as e:
+            print(f"[PLANNER] Could not load yield history: {e}")
+            return history
+
+        # Exact filter rows win over the all-filters rows
+        for row in sorted(rows, key=lambda r: r[1] == size_filter):
+            history[row[0]] = dict(zip(FUNNEL_STAGES, row[2:]))
+        return history
+
+    def _upsert_sql(self) -> str:
+        decayed = ', '.join(f'{stage} = {stage} * {self.DECAY} + excluded.{stage}' for stage in FUNNEL_STAGES)
+        return (
+            f"INSERT INTO board_yield (board, size_filter, {', '.join(FUNNEL_STAGES)}, sessions, updated_at) "
+            f"VALUES (?, ?, {', '.join('?' for _ in FUNNEL_STAGES)}, 1, ?) "
+            f"ON CONFLICT(board, size_filter) DO UPDATE SET {decayed}, "
+            f"sessions = sessions + 1, updated_at = excluded.updated_at"
+        )
+
+    def record(self, size_filter: str, session_counts: Dict[str, Dict[str, int]]):
+        """Fold one session's funnel counts into the history"""
+        try:
+            conn = self._connect()
+            now = time.time()
+            for board, counts in session_counts.items():
+                if not counts.get('results'):
+                    continue
+                for key in {size_filter, ANY_FILTER}:
+                    conn.execute(
+                        self._upsert_sql(),
+                        (board, key) + tuple(counts.get(stage, 0) for stage in FUNNEL_STAGES) + (now,)
+                    )
+            conn.commit()
+            conn.close()
+        except sqlite3.Error as e:
+            print(f"[PLANNER] Could not save yield history: {e}")
+
+
+class SearchPlanner:
+    """
+    Plans job board page fetches for one lead engine session
+
+    Usage:
+        planner = SearchPlanner(boards, target=50, company_sizes=['mid'])
+        board = planner.next_board()          # None -> stop fetching
+        planner.record_page(board, raw, companies)
+        planner.record(board, 'size_ok')
+        planner.finish()                      # persist the session's yield
+    """
+
+    RESULTS_PER_PAGE = 10
+    MAX_PAGES_PER_BOARD = 10     # CSE serves at most 100 results per query
+
+    # Assumed yield for boards without history (smoothed toward as evidence arrives)
+    PRIOR_COMPANY_RATE = 0.6     # search result -> new valid company
+    PRIOR_CONVERSION = 0.4       # processed company -> lead with POCs
+    PRIOR_WEIGHT = 20            # Pseudo-observations behind each prior
+
+    # Later pages of the same query return fewer new companies
+    PAGE_DECAY = 0.85
+
+    def __init__(self, boards: List[Dict], target: int, company_sizes: List[str] = None,
+                 stats: YieldStats = None):
+        self.boards = [b['name'] for b in boards]
+        self.target = target
+        self.size_filter = ','.join(sorted(company_sizes)) if company_sizes else ANY_FILTER
+        self.stats = stats or YieldStats()
+
+        self.history = self.stats.load(self.size_filter)
+        self.session = {board: dict.fromkeys(FUNNEL_STAGES, 0) for board in self.boards}
+        self.pages_fetched = dict.fromkeys(self.boards, 0)
+        self.exhausted = set()
+        self.page_budget = sum(self.plan().values())
+
+    # ------------------------------------------------------------------
+    # Yield estimates
+    # ------------------------------------------------------------------
+
+    def _count(self, board: str, stage: str) -> float:
+        return self.history.get(board, {}).get(stage, 0) + self.session[board][stage]
+
+    def company_rate(self, board: str) -> float:
+        """Expected new valid companies per search result"""
+        return ((self._count(board, 'companies') + self.PRIOR_WEIGHT * self.PRIOR_COMPANY_RATE) /
+                (self._count(board, 'results') + self.PRIOR_WEIGHT))
+
+    def conversion_rate(self, board: str) -> float:
+        """Expected leads with POCs per processed company"""
+        return ((self._count(board, 'with_pocs') + self.PRIOR_WEIGHT * self.PRIOR_CONVERSION) /
+                (self._count(board, 'processed') + self.PRIOR_WEIGHT))
+
+    def lead_rate(self, board: str) -> float:
+        """Expected leads per search result"""
+        return self.company_rate(board) * self.conversion_rate(board)
+
+    def _page_yield(self, board: str, page: int) -> float:
+        return self.lead_rate(board) * self.RESULTS_PER_PAGE * (self.PAGE_DECAY ** page)
+
+    # ------------------------------------------------------------------
+    # Planning
+    # ------------------------------------------------------------------
+
+    def plan(self, leads_needed: int = None) -> Dict[str, int]:
+        """
+        Pages per board expected to reach the target, allocated greedily to
+        whichever board's next page yields the most leads
+        """
+        needed = self.target if leads_needed is None else leads_needed
+        pages = dict(self.pages_fetched)
+        allocation = dict.fromkeys(self.boards, 0)
+        expected = 0.0
+
+        while expected < needed:
+            candidates = [b for b in self.boards
+                          if b not in self.exhausted and pages[b] < self.MAX_PAGES_PER_BOARD]
+            if not candidates:
+                break
+            board = max(candidates, key=lambda b: self._page_yield(b, pages[b]))
+            expected += self._page_yield(board, pages[board])
+            pages[board] += 1
+            allocation[board] += 1
+
+        return allocation
+
+    def expected_leads(self, pending: Dict[str, int]) -> float:
+        """Leads expected from companies already fetched but not processed yet"""
+        return sum(count * self.conversion_rate(board) for board, count in pending.items())
+
+    def should_fetch(self, leads: int, pending: Dict[str, int]) -> bool:
+        """
+        True when the running yield says the target won't be met without another page
+
+        Pages are fetched up to the current plan; once it is spent, the queue is
+        drained first so the next plan uses this session's observed yield.
+        """
+        if leads >= self.target:
+            return False
+        if not any(pending.values()):
+            if self.page_budget <= 0:
+                self.page_budget = max(1, sum(self.plan(self.target - leads).values()))
+            return True
+        return self.page_budget > 0 and leads + self.expected_leads(pending) < self.target
+
+    def next_board(self) -> Optional[str]:
+        """Board whose next page is expected to yield the most leads (None when all are spent)"""
+        candidates = [b for b in self.boards
+                      if b not in self.exhausted and self.pages_fetched[b] < self.MAX_PAGES_PER_BOARD]
+        if not candidates:
+            return None
+        return max(candidates, key=lambda b: self._page_yield(b, self.pages_fetched[b]))
+
+    def next_start_index(self, board: str) -> int:
+        return self.pages_fetched[board] * self.RESULTS_PER_PAGE + 1
+
+    # ------------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------------
+
+    def record_page(self, board: str, raw_results: int, companies: int):
+        """Record a fetched page (raw CSE items and new valid companies parsed from it)"""
+        self.pages_fetched[board] += 1
+        self.page_budget -= 1
+        self.session[board]['results'] += raw_results
+        self.session[board]['companies'] += companies
+        if raw_results < self.RESULTS_PER_PAGE:
+            self.exhausted.add(board)
+
+    def mark_exhausted(self, board: str):
+        self.exhausted.add(board)
+
+    def record(self, board: str, stage: str, count: int = 1):
+        """Record companies reaching a later funnel stage"""
+        self.session[board][stage] += count
+
+    def summary(self) -> Dict:
+        """Session funnel per board plus pages fetched"""
+        return {
+            board: dict(self.session[board], pages=self.pages_fetched[board])
+            for board in self.boards
+        }
+
+    def finish(self):
+        """Persist this session's yield for future plans"""
+        self.stats.record(self.size_filter, self.session)
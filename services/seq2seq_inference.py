@@ -0,0 +1,237 @@
+"""
+Local Seq2Seq Inference Service
+One flan-t5 model per process behind a dynamic-batching queue. Request
+threads submit prompts; a worker thread collects whatever arrives within
+SEQ2SEQ_MAX_WAIT_MS (up to SEQ2SEQ_MAX_BATCH prompts), runs them through
+model.generate as one padded batch under torch.inference_mode, and resolves
+each caller's future with its own text.
+
+The model is loaded on first use by the worker thread, so torch and
+transformers stay off the app import path. Batches only form when one
+process serves requests concurrently - gunicorn runs threaded (gthread)
+workers for that (gunicorn.conf.py).
+"""
+
+import concurrent.futures
+import os
+import queue
+import threading
+import time
+from typing import Dict, List, Optional
+
+from services.cpu_threads import configure_torch_threads, threads_per_worker
+
+MODEL_NAME = os.getenv('SEQ2SEQ_MODEL', 'google/flan-t5-base')
+MAX_BATCH = int(os.getenv('SEQ2SEQ_MAX_BATCH', '32'))
+MAX_WAIT_MS = float(os.getenv('SEQ2SEQ_MAX_WAIT_MS', '10'))
+MAX_INPUT_TOKENS = 512
+
+# Same decoding settings the one-at-a-time generator used
+DEFAULT_GENERATE_KWARGS = {
+    'max_length': 300,
+    'num_beams': 4,
+    'temperature': 0.7,
+    'do_sample': True,
+    'top_p': 0.9,
+}
+
+
+def default_num_threads() -> int:
+    """Intra-op threads per process: SEQ2SEQ_THREADS, else the cores split across gunicorn workers"""
+    return threads_per_worker('SEQ2SEQ_THREADS')
+
+
+class Seq2SeqBatcher:
+    """Dynamic-batching front end for a local seq2seq model"""
+
+    def __init__(self, model_name: str = MODEL_NAME, max_batch: int = MAX_BATCH,
+                 max_wait_ms: float = MAX_WAIT_MS, num_threads: int = None,
+                 generate_kwargs: Dict = None, device: str = None):
+        """
+        Initialize batcher
+
+        Args:
+            model_name: Hugging Face model id (loaded on first use)
+            max_batch: Most prompts run in one generate() call
+            max_wait_ms: How long the first queued prompt waits for others to join its batch
+            num_threads: torch intra-op threads (default: default_num_threads())
+            generate_kwargs: Decoding settings passed to model.generate
+            device: 'cpu' or 'cuda' (default: SEQ2SEQ_DEVICE, else cpu)
+        """
+        self.model_name = model_name
+        self.max_batch = max(1, max_batch)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self.num_threads = num_threads or default_num_threads()
+        self.generate_kwargs = dict(DEFAULT_GENERATE_KWARGS, **(generate_kwargs or {}))
+        self.device = device or os.getenv('SEQ2SEQ_DEVICE', 'cpu')
+        self.model = None
+        self.tokenizer = None
+        # None until a load has been attempted, then True / False
+        self.available: Optional[bool] = None
+        self._load_lock = threading.Lock()
+        self._queue: "queue.Queue" = queue.Queue()
+        self._thread = None
+        self._pid = None
+        self._start_lock = threading.Lock()
+        self.stats = {'requests': 0, 'batches': 0, 'max_batch_seen': 0, 'generate_seconds': 0.0, 'errors': 0}
+
+    def load(self) -> bool:
+        """
+        Load the tokenizer and model (once per process)
+
+        Returns:
+            True when the model is ready, False when transformers/torch or the weights are unavailable
+        """
+        with self._load_lock:
+            if self.available is not None:
+                return self.available
+            try:
+                import torch
+                from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
+
+                self.set_num_threads(self.num_threads)
+                if self.device == 'cuda' and not torch.cuda.is_available():
+                    self.device = 'cpu'
+                print(f"[SEQ2SEQ] Loading {self.model_name} on {self.device} ({self.num_threads} threads)...")
+                start = time.time()
+                self.tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+                self.model = AutoModelForSeq2SeqLM.from_pretrained(self.model_name)
+                self.model.to(self.device)
+                self.model.eval()
+                self.available = True
+                print(f"[SEQ2SEQ] Model ready in {time.time() - start:.1f}s")
+            except ImportError:
+                print("[SEQ2SEQ] Transformers not available - local generation disabled")
+                self.available = False
+            except Exception as e:
+                print(f"[SEQ2SEQ] Could not load {self.model_name}: {e}")
+                self.available = False
+            return self.available
+
+    def set_num_threads(self, num_threads: int):
+        """Set torch's intra-op thread count for this process"""
+        self.num_threads = max(1, num_threads)
+        configure_torch_threads(self.num_threads)
+
+    def generate_batch(self, prompts: List[str]) -> List[str]:
+        """
+        Run prompts through the model as one padded batch (blocks the caller)
+
+        Args:
+            prompts: Input prompts
+
+        Returns:
+            Generated text per prompt, in order
+        """
+        import torch
+
+        if not self.load():
+            raise RuntimeError(f"{self.model_name} is not available")
+        inputs = self.tokenizer(prompts, return_tensors='pt', padding=True, truncation=True,
+                                max_length=MAX_INPUT_TOKENS).to(self.device)
+        with torch.inference_mode():
+            outputs = self.model.generate(**inputs, **self.generate_kwargs)
+        return self.tokenizer.batch_decode(outputs, skip_special_tokens=True)
+
+    def _ensure_started(self):
+        with self._start_lock:
+            # Threads do not survive fork() (gunicorn preload) - restart in the child
+            if self._thread is None or self._pid != os.getpid() or not self._thread.is_alive():
+                if self._pid != os.getpid():
+                    self._queue = queue.Queue()
+                self._thread = threading.Thread(target=self._run, name='seq2seq-batcher', daemon=True)
+                self._pid = os.getpid()
+                self._thread.start()
+
+    def submit(self, prompt: str) -> concurrent.futures.Future:
+        """
+        Queue a prompt for the next batch
+
+        Args:
+            prompt: Input prompt
+
+        Returns:
+            concurrent.futures.Future resolving to the generated text
+        """
+        future = concurrent.futures.Future()
+        self._ensure_started()
+        self._queue.put((prompt, future))
+        return future
+
+    def generate(self, prompt: str, timeout: float = None) -> str:
+        """
+        Generate text for one prompt through the batching queue
+
+        Args:
+            prompt: Input prompt
+            timeout: Seconds to wait (the prompt is dropped if it has not started by then)
+
+        Returns:
+            Generated text
+        """
+        future = self.submit(prompt)
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise
+
+    def _collect(self) -> list:
+        """Block for the first prompt, then gather more until the batch is full or max_wait passes"""
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        # Drop prompts whose callers timed out and cancelled while queued
+        return [(prompt, future) for prompt, future in batch if future.set_running_or_notify_cancel()]
+
+    def _run(self):
+        # First use: load the model here so request threads only ever wait on futures
+        self.load()
+        while True:
+            batch = self._collect()
+            if not batch:
+                continue
+            if not self.available:
+                for _, future in batch:
+                    future.set_exception(RuntimeError(f"{self.model_name} is not available"))
+                continue
+
+            start = time.perf_counter()
+            try:
+                texts = self.generate_batch([prompt for prompt, _ in batch])
+            except Exception as e:
+                print(f"[SEQ2SEQ] Batch of {len(batch)} failed: {e}")
+                self.stats['errors'] += 1
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            self.stats['requests'] += len(batch)
+            self.stats['batches'] += 1
+            self.stats['max_batch_seen'] = max(self.stats['max_batch_seen'], len(batch))
+            self.stats['generate_seconds'] += time.perf_counter() - start
+            for (_, future), text in zip(batch, texts):
+                future.set_result(text)
+
+    def get_stats(self) -> Dict:
+        batches = self.stats['batches']
+        return dict(self.stats, pending=self._queue.qsize(), available=self.available,
+                    avg_batch=self.stats['requests'] / batches if batches else 0.0)
+
+
+_batcher = None
+_batcher_lock = threading.Lock()
+
+
+def get_seq2seq_batcher() -> Seq2SeqBatcher:
+    """Get the process-wide seq2seq batcher (the model loads on first use)"""
+    global _batcher
+    with _batcher_lock:
+        if _batcher is None:
+            _batcher = Seq2SeqBatcher()
+        return _batcher
@@ -1,12 +1,38 @@
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from google.auth.transport.requests import Request
-from googleapiclient.discovery import build
+import atexit
 import pickle
 import os
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime
 from typing import List, Dict
 
+# Background appender: flush a spreadsheet's rows every FLUSH_ROWS rows or FLUSH_INTERVAL seconds
+FLUSH_ROWS = int(os.getenv('SHEETS_FLUSH_ROWS', '50'))
+FLUSH_INTERVAL = float(os.getenv('SHEETS_FLUSH_INTERVAL', '10'))
+MAX_RETRIES = 5
+RETRY_STATUSES = {429, 500, 502, 503}
+
+
+def lead_row(lead_data: Dict) -> List:
+    """Job Leads sheet row for a lead"""
+    return [
+        datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        lead_data.get('campaign_name', ''),
+        lead_data.get('job_title', ''),
+        lead_data.get('company_name', ''),
+        lead_data.get('company_size', ''),
+        lead_data.get('job_url', ''),
+        lead_data.get('contact_name', ''),
+        lead_data.get('contact_title', ''),
+        lead_data.get('contact_email', ''),
+        'Yes' if lead_data.get('email_sent') else 'No',
+        lead_data.get('email_subject', ''),
+        lead_data.get('status', 'new'),
+        lead_data.get('notes', '')
+    ]
+
+
 class SheetsLogger:
     SCOPES = ['https://www.googleapis.com/auth/spreadsheets']
 
@@ -15,39 +41,50 @@ class SheetsLogger:
         self.token_file = 'token.pickle'
         self.creds = None
         self.service = None
+        # The API client's httplib2 transport is not thread-safe
+        self._lock = threading.RLock()
 
-    def authenticate(self) -> bool:
+    def authenticate(self, interactive: bool = True) -> bool:
         """
         Authenticate with Google Sheets API
+
+        Args:
+            interactive: Allow the browser consent flow when there is no saved token
         """
-        try:
-            # Check if we have saved credentials
-            if os.path.exists(self.token_file):
-                with open(self.token_file, 'rb') as token:
-                    self.creds = pickle.load(token)
-
-            # If credentials are not valid, refresh or get new ones
-            if not self.creds or not self.creds.valid:
-                if self.creds and self.creds.expired and self.creds.refresh_token:
-                    self.creds.refresh(Request())
-                else:
-                    if not os.path.exists(self.credentials_file):
-                        return False
-
-                    flow = InstalledAppFlow.from_client_secrets_file(
-                        self.credentials_file, self.SCOPES)
-                    self.creds = flow.run_local_server(port=0)
-
-                # Save credentials for next run
-                with open(self.token_file, 'wb') as token:
-                    pickle.dump(self.creds, token)
-
-            self.service = build('sheets', 'v4', credentials=self.creds)
-            return True
+        with self._lock:
+            try:
+                # The Google client libraries are only loaded once Sheets is actually used
+                from google_auth_oauthlib.flow import InstalledAppFlow
+                from google.auth.transport.requests import Request
+                from googleapiclient.discovery import build
 
-        except Exception as e:
-            print(f"Authentication error: {str(e)}")
-            return False
+                # Check if we have saved credentials
+                if os.path.exists(self.token_file):
+                    with open(self.token_file, 'rb') as token:
+                        self.creds = pickle.load(token)
+
+                # If credentials are not valid, refresh or get new ones
+                if not self.creds or not self.creds.valid:
+                    if self.creds and self.creds.expired and self.creds.refresh_token:
+                        self.creds.refresh(Request())
+                    else:
+                        if not interactive or not os.path.exists(self.credentials_file):
+                            return False
+
+                        flow = InstalledAppFlow.from_client_secrets_file(
+                            self.credentials_file, self.SCOPES)
+                        self.creds = flow.run_local_server(port=0)
+
+                    # Save credentials for next run
+                    with open(self.token_file, 'wb') as token:
+                        pickle.dump(self.creds, token)
+
+                self.service = build('sheets', 'v4', credentials=self.creds)
+                return True
+
+            except Exception as e:
+                print(f"Authentication error: {str(e)}")
+                return False
 
     def list_spreadsheets(self) -> List[Dict]:
         """
@@ -119,6 +156,17 @@ class SheetsLogger:
             body={'values': headers}
         ).execute()
 
+    def append_rows(self, spreadsheet_id: str, rows: List[List]):
+        """Append rows to the Job Leads sheet in one API call (raises on API errors)"""
+        with self._lock:
+            self.service.spreadsheets().values().append(
+                spreadsheetId=spreadsheet_id,
+                range='Job Leads!A:M',
+                valueInputOption='RAW',
+                insertDataOption='INSERT_ROWS',
+                body={'values': rows}
+            ).execute()
+
     def log_job_lead(self, spreadsheet_id: str, lead_data: Dict):
         """
         Log a job lead to Google Sheets
@@ -128,29 +176,7 @@ class SheetsLogger:
                 raise Exception("Authentication failed")
 
         try:
-            values = [[
-                datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                lead_data.get('campaign_name', ''),
-                lead_data.get('job_title', ''),
-                lead_data.get('company_name', ''),
-                lead_data.get('company_size', ''),
-                lead_data.get('job_url', ''),
-                lead_data.get('contact_name', ''),
-                lead_data.get('contact_title', ''),
-                lead_data.get('contact_email', ''),
-                'Yes' if lead_data.get('email_sent') else 'No',
-                lead_data.get('email_subject', ''),
-                lead_data.get('status', 'new'),
-                lead_data.get('notes', '')
-            ]]
-
-            self.service.spreadsheets().values().append(
-                spreadsheetId=spreadsheet_id,
-                range='Job Leads!A:M',
-                valueInputOption='RAW',
-                insertDataOption='INSERT_ROWS',
-                body={'values': values}
-            ).execute()
+            self.append_rows(spreadsheet_id, [lead_row(lead_data)])
 
             return True
 
@@ -167,34 +193,156 @@ class SheetsLogger:
                 raise Exception("Authentication failed")
 
         try:
-            values = []
-            for lead in leads:
-                values.append([
-                    datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                    lead.get('campaign_name', ''),
-                    lead.get('job_title', ''),
-                    lead.get('company_name', ''),
-                    lead.get('company_size', ''),
-                    lead.get('job_url', ''),
-                    lead.get('contact_name', ''),
-                    lead.get('contact_title', ''),
-                    lead.get('contact_email', ''),
-                    'Yes' if lead.get('email_sent') else 'No',
-                    lead.get('email_subject', ''),
-                    lead.get('status', 'new'),
-                    lead.get('notes', '')
-                ])
-
-            self.service.spreadsheets().values().append(
-                spreadsheetId=spreadsheet_id,
-                range='Job Leads!A:M',
-                valueInputOption='RAW',
-                insertDataOption='INSERT_ROWS',
-                body={'values': values}
-            ).execute()
+            self.append_rows(spreadsheet_id, [lead_row(lead) for lead in leads])
 
             return True
 
         except Exception as e:
             print(f"Error batch logging to sheets: {str(e)}")
             return False
+
+
+class SheetsAppender:
+    """Background queue that coalesces lead rows per spreadsheet into single appends"""
+
+    def __init__(self, logger: SheetsLogger = None, flush_rows: int = FLUSH_ROWS,
+                 flush_interval: float = FLUSH_INTERVAL):
+        """
+        Initialize appender
+
+        Args:
+            logger: SheetsLogger used for the API calls (optional, uses the shared logger)
+            flush_rows: Rows per spreadsheet that trigger an immediate flush
+            flush_interval: Seconds a queued row may wait before it is flushed
+        """
+        self.logger = logger or get_sheets_logger()
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval
+        # spreadsheet_id -> (time of oldest queued row, rows)
+        self._pending: "OrderedDict[str, tuple]" = OrderedDict()
+        self._cond = threading.Condition()
+        self._thread = None
+        self._pid = None
+        self._stopping = False
+        self.stats = {'queued': 0, 'appended': 0, 'api_calls': 0, 'retries': 0, 'dropped': 0}
+
+    def _ensure_started(self):
+        # Threads do not survive fork() (gunicorn preload) - restart in the child
+        if self._thread is None or self._pid != os.getpid() or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name='sheets-appender', daemon=True)
+            self._pid = os.getpid()
+            self._thread.start()
+
+    def enqueue(self, spreadsheet_id: str, lead_data: Dict):
+        """Queue a lead row (never blocks on Google Sheets)"""
+        if not spreadsheet_id:
+            return
+        with self._cond:
+            self._ensure_started()
+            since, rows = self._pending.get(spreadsheet_id, (time.time(), []))
+            rows.append(lead_row(lead_data))
+            self._pending[spreadsheet_id] = (since, rows)
+            self.stats['queued'] += 1
+            if len(rows) >= self.flush_rows:
+                self._cond.notify()
+
+    def _take_due(self, force: bool = False):
+        """Pop the spreadsheets that are due for a flush (caller holds the lock)"""
+        now = time.time()
+        due = [sid for sid, (since, rows) in self._pending.items()
+               if force or len(rows) >= self.flush_rows or now - since >= self.flush_interval]
+        return [(sid, self._pending.pop(sid)[1]) for sid in due]
+
+    def _next_wait(self) -> float:
+        if not self._pending:
+            return self.flush_interval
+        oldest = min(since for since, _ in self._pending.values())
+        return max(0.05, oldest + self.flush_interval - time.time())
+
+    def _run(self):
+        while True:
+            with self._cond:
+                batches = self._take_due(force=self._stopping)
+                if not batches:
+                    if self._stopping:
+                        return
+                    self._cond.wait(self._next_wait())
+                    continue
+            for spreadsheet_id, rows in batches:
+                self._flush(spreadsheet_id, rows)
+
+    def _flush(self, spreadsheet_id: str, rows: List[List]):
+        """Append rows in one call, retrying quota and server errors with backoff"""
+        from googleapiclient.errors import HttpError
+
+        if not self.logger.service and not self.logger.authenticate(interactive=False):
+            print(f"[SHEETS] Not authenticated - dropping {len(rows)} rows")
+            self.stats['dropped'] += len(rows)
+            return
+
+        for attempt in range(MAX_RETRIES + 1):
+            try:
+                self.stats['api_calls'] += 1
+                self.logger.append_rows(spreadsheet_id, rows)
+                self.stats['appended'] += len(rows)
+                print(f"[SHEETS] Appended {len(rows)} rows to {spreadsheet_id}")
+                return
+            except HttpError as e:
+                if e.resp.status not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                    print(f"[SHEETS] Append failed ({e.resp.status}) - dropping {len(rows)} rows: {e}")
+                    break
+                backoff = min(60, 2 ** (attempt + 1))
+                self.stats['retries'] += 1
+                print(f"[SHEETS] Append throttled ({e.resp.status}) - retrying in {backoff}s")
+                time.sleep(backoff)
+            except Exception as e:
+                print(f"[SHEETS] Append failed - dropping {len(rows)} rows: {e}")
+                break
+        self.stats['dropped'] += len(rows)
+
+    def flush(self):
+        """Flush everything queued now (blocks the caller)"""
+        with self._cond:
+            batches = self._take_due(force=True)
+        for spreadsheet_id, rows in batches:
+            self._flush(spreadsheet_id, rows)
+
+    def shutdown(self, timeout: float = 30):
+        """Drain queued rows and stop the background thread"""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+        if self._thread is not None and self._pid == os.getpid():
+            self._thread.join(timeout)
+            if self._thread.is_alive():
+                print("[SHEETS] Shutdown timed out with rows still queued")
+
+    def get_stats(self) -> Dict:
+        with self._cond:
+            pending = sum(len(rows) for _, rows in self._pending.values())
+        return dict(self.stats, pending=pending)
+
+
+_logger = None
+_appender = None
+_singleton_lock = threading.Lock()
+
+
+def get_sheets_logger() -> SheetsLogger:
+    """Get the process-wide SheetsLogger (token read and service built once)"""
+    global _logger
+    with _singleton_lock:
+        if _logger is None:
+            _logger = SheetsLogger()
+        return _logger
+
+
+def get_sheets_appender() -> SheetsAppender:
+    """Get the process-wide background appender (drained at interpreter exit)"""
+    global _appender
+    logger = get_sheets_logger()
+    with _singleton_lock:
+        if _appender is None:
+            _appender = SheetsAppender(logger)
+            atexit.register(_appender.shutdown)
+        return _appender
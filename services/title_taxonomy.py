@@ -0,0 +1,197 @@
+"""
+Job Title Taxonomy
+Shared title keyword tables (POC ranking, Apollo role categories) and a
+compiled rule cascade that settles clear-cut contact filter verdicts
+without asking the LLM.
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, Optional
+
+# Title priority for ranking POCs by hiring influence (lower = higher priority)
+TITLE_PRIORITY = [
+    ['talent acquisition', 'head of talent'],
+    ['hr manager', 'hr business partner'],
+    ['engineering manager', 'hiring manager'],
+    ['vp engineering', 'vp it', 'vp of engineering', 'vp of it'],
+    ['cto', 'technical director', 'chief technology officer'],
+    ['senior recruiter'],
+]
+
+# Apollo role categories, first match wins (substring match on the lowercased title)
+ROLE_CATEGORIES = [
+    ('Executive', ['ceo', 'chief executive', 'president', 'owner', 'founder', 'managing director']),
+    ('Tech Leadership', ['cto', 'chief technology', 'vp engineering', 'head of engineering', 'director of engineering']),
+    ('Finance', ['cfo', 'chief financial', 'vp finance', 'finance director']),
+    ('Operations', ['coo', 'chief operating', 'operations director', 'vp operations']),
+    ('Marketing', ['cmo', 'chief marketing', 'vp marketing', 'marketing director', 'head of marketing']),
+    ('HR/Recruiting', ['hr', 'human resources', 'people', 'talent', 'chro', 'recruiting']),
+    ('Sales', ['sales', 'revenue', 'business development', 'account executive']),
+    ('Partner', ['partner', 'principal']),
+]
+
+
+def categorize_role(title: str) -> str:
+    """Categorize a job title into a role type for easier filtering"""
+    title_lower = (title or '').lower()
+    for category, keywords in ROLE_CATEGORIES:
+        if any(x in title_lower for x in keywords):
+            return category
+    return 'Other'
+
+
+# ============================================================
+# Contact filter cascade
+# ============================================================
+
+# Title classes, checked in order on the normalized title (word boundaries).
+# 'ambiguous' and anything unmatched go to the LLM.
+_LEVEL = r'(?:s|e)?vp (?:of )?(?:global )?'
+_HR = r'(?:hr|human resources|people|talent|talent acquisition|recruiting|recruitment)'
+# Nouns that make a title a role of its own ("Internship Program Recruiter" is not an intern)
+_ROLE_NOUN = (r'recruiter|recruiting|recruitment|sourcer|manager|director|coordinator|lead|head|'
+              r'specialist|partner|officer|supervisor|vp|chief')
+# Functions whose "operations" is not the plant floor ("HR Operations Director", "Sales Operations Director")
+_NON_OPS_FUNCTION = _HR + r'|sales|marketing|revenue|business development'
+
+TITLE_CLASSES = [
+    ('junior', r'intern|internship|trainee|student|apprentice|co op'),
+    ('former', r'former|retired'),
+    ('ambiguous', r'assistant|secretary|ea to|pa to'),
+    ('ops_executive', r'coo|chief operating officer|chief operations officer'),
+    ('ops_leader', _LEVEL + r'(?:operations|manufacturing|production|supply chain)'
+                   r'|head of (?:operations|manufacturing|production)'
+                   r'|(?:operations|manufacturing|production|plant) director'
+                   r'|director (?:of )?(?:operations|manufacturing|production)'
+                   r'|plant manager'),
+    ('hr_executive', r'chro|chief (?:people|human resources|hr|talent) officer'
+                     r'|' + _LEVEL + _HR +
+                     r'|head of ' + _HR +
+                     r'|' + _HR + r' director|director (?:of )?' + _HR),
+    ('recruiter', r'(?:senior |lead )?recruiter|sourcer|recruitment consultant'
+                  r'|talent acquisition (?:specialist|coordinator|partner|associate)'
+                  r'|hr (?:generalist|coordinator|specialist|executive)'),
+    ('hr_manager', '|'.join(re.escape(k) for k in TITLE_PRIORITY[0] + TITLE_PRIORITY[1]) +
+                   r'|hrbp|people partner|recruiting manager|recruitment manager'),
+    # Any other HR mention is worth a closer look
+    ('ambiguous', _HR),
+]
+
+# A class does not apply when its exclusion also matches the title: the title then
+# goes to the LLM ('ambiguous') or on to the next classes (None)
+CLASS_EXCLUSIONS = {
+    'junior': (_ROLE_NOUN, 'ambiguous'),
+    'ops_leader': (_NON_OPS_FUNCTION, None),
+}
+
+_COMPILED_CLASSES = [(name, re.compile(rf'\b(?:{pattern})\b')) for name, pattern in TITLE_CLASSES]
+_COMPILED_EXCLUSIONS = {name: (re.compile(rf'\b(?:{pattern})\b'), fallback)
+                        for name, (pattern, fallback) in CLASS_EXCLUSIONS.items()}
+
+# Apollo categories no tier ever targets (only consulted when no class above matched).
+# Matched on word boundaries - categorize_role's substring test sees 'cto' in 'director'.
+UNRELATED_ROLE_CATEGORIES = {'Finance', 'Marketing', 'Sales'}
+_UNRELATED = re.compile(r'\b(?:{})\b'.format('|'.join(
+    re.escape(keyword) for category, keywords in ROLE_CATEGORIES
+    if category in UNRELATED_ROLE_CATEGORIES for keyword in keywords
+)))
+
+# Target tier -> title class -> (relevant, confidence)
+TIER_RULES = {
+    'T1': {
+        'ops_executive': (True, 0.95), 'ops_leader': (True, 0.85),
+        'hr_executive': (False, 0.8), 'hr_manager': (False, 0.8), 'recruiter': (False, 0.85),
+    },
+    'T2': {
+        'hr_executive': (True, 0.9), 'hr_manager': (True, 0.85),
+        'ops_executive': (False, 0.8), 'ops_leader': (False, 0.8),
+    },
+    'T3': {
+        'recruiter': (True, 0.9), 'hr_manager': (True, 0.8),
+        'ops_executive': (False, 0.8), 'ops_leader': (False, 0.8),
+    },
+}
+ALWAYS_IRRELEVANT = {'junior': 0.95, 'former': 0.9, 'unrelated': 0.85, 'no_title': 0.9}
+
+VERDICT_CATEGORY = {
+    'ops_executive': 'decision_maker',
+    'ops_leader': 'decision_maker',
+    'hr_executive': 'hr_leader',
+    'hr_manager': 'hr_leader',
+    'recruiter': 'hr_practitioner',
+}
+
+_PUNCTUATION = re.compile(r'[^a-z0-9]+')
+# "Ex-COO" / "Ex COO" lead the title; all-caps "EX" is employee experience ("EX Program Manager")
+_FORMER_PREFIX = re.compile(r'^\s*[Ee]x(?:-|\s+)(?=[A-Za-z])')
+_REPLACEMENTS = [
+    (re.compile(r'\bvice president\b'), 'vp'),
+    (re.compile(r'\bv p\b'), 'vp'),
+    (re.compile(r'\bsr\b'), 'senior'),
+    (re.compile(r'\bdir\b'), 'director'),
+    (re.compile(r'\bmgr\b'), 'manager'),
+    (re.compile(r'\bhead of the\b'), 'head of'),
+]
+
+
+def normalize_title(title: str) -> str:
+    """Lowercase, strip punctuation and expand common abbreviations"""
+    title = _FORMER_PREFIX.sub('former ', title or '')
+    text = ' '.join(_PUNCTUATION.sub(' ', title.lower()).split())
+    for pattern, replacement in _REPLACEMENTS:
+        text = pattern.sub(replacement, text)
+    return text
+
+
+@lru_cache(maxsize=4096)
+def classify_title(title: str) -> str:
+    """
+    Title class used by the contact filter cascade
+
+    Returns:
+        One of the TITLE_CLASSES names, 'unrelated', 'no_title' or 'other'
+    """
+    normalized = normalize_title(title)
+    if not normalized:
+        return 'no_title'
+    for name, pattern in _COMPILED_CLASSES:
+        if pattern.search(normalized):
+            exclusion, fallback = _COMPILED_EXCLUSIONS.get(name, (None, None))
+            if exclusion is not None and exclusion.search(normalized):
+                if fallback:
+                    return fallback
+                continue
+            return name
+    if _UNRELATED.search(normalized):
+        return 'unrelated'
+    return 'other'
+
+
+def decide_contact(contact: Dict, tier: str = "T1") -> Optional[Dict]:
+    """
+    Settle a contact filter verdict from the title alone
+
+    Args:
+        contact: Contact data from Apollo
+        tier: Target tier (T1, T2, T3)
+
+    Returns:
+        Verdict shaped like ContactFilterAgent's, or None when the LLM should decide
+    """
+    title_class = classify_title(contact.get('title') or '')
+
+    if title_class in ALWAYS_IRRELEVANT:
+        relevant, confidence = False, ALWAYS_IRRELEVANT[title_class]
+    elif title_class in TIER_RULES.get(tier, {}):
+        relevant, confidence = TIER_RULES[tier][title_class]
+    else:
+        return None
+
+    return {
+        'relevant': relevant,
+        'confidence': confidence,
+        'reason': f"Title rule: {title_class.replace('_', ' ')} ({'target' if relevant else 'not target'} for {tier})",
+        'category': VERDICT_CATEGORY.get(title_class, 'irrelevant') if relevant else 'irrelevant',
+        'title_class': title_class,
+    }
@@ -1,15 +1,16 @@
 """
 Advanced Vector Search Service with Semantic Understanding and Result Validation
-Uses sentence-transformers for embeddings and FAISS for efficient similarity search
+Uses sentence embeddings (services/embedding_backend.py) and FAISS for efficient similarity search
 """
 
 import re
 from typing import List, Dict, Optional, Tuple
-from sentence_transformers import SentenceTransformer
 import faiss
 import numpy as np
 from sklearn.metrics.pairwise import cosine_similarity
 
+from services.embedding_backend import get_embedding_backend
+
 
 class VectorSearchService:
     """
@@ -31,7 +32,8 @@ class VectorSearchService:
                        'paraphrase-multilingual-MiniLM-L12-v2' - Multilingual
         """
         print(f"[TECH] Initializing Vector Search Service with model: {model_name}")
-        self.model = SentenceTransformer(model_name)
+        # Shared per process; torch or int8 ONNX depending on EMBEDDING_BACKEND
+        self.model = get_embedding_backend(model_name)
         self.embedding_dimension = self.model.get_sentence_embedding_dimension()
 
         # FAISS index for fast similarity search
@@ -0,0 +1,563 @@
+"""
+Vendor Call Telemetry
+Every outbound call to a paid or rate-limited vendor (Apollo, Google CSE,
+Gemini, Ollama, Microsoft Graph, Gmail) is recorded with its endpoint,
+duration, status, error class, retries, bytes and estimated credit / quota
+spend. Recent calls stay in an in-process ring buffer; aggregates are flushed
+periodically to a local store table so all workers share one view, globally
+and per lead session / pipeline stage.
+"""
+
+import atexit
+import contextvars
+import json
+import os
+import re
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlparse
+
+from services import local_store
+
+BUFFER_SIZE = int(os.getenv('TELEMETRY_BUFFER_SIZE', '5000'))
+FLUSH_INTERVAL = float(os.getenv('TELEMETRY_FLUSH_INTERVAL', '60'))
+RETENTION_DAYS = int(os.getenv('TELEMETRY_RETENTION_DAYS', '30'))
+
+# Outbound host suffix -> vendor label
+VENDOR_HOSTS = {
+    'apollo.io': 'apollo',
+    'generativelanguage.googleapis.com': 'gemini',
+    'customsearch.googleapis.com': 'google_cse',
+    'oauth2.googleapis.com': 'google_oauth',
+    'sheets.googleapis.com': 'google_sheets',
+    'gmail.googleapis.com': 'gmail',
+    'googleapis.com': 'google',
+    'serpapi.com': 'serpapi',
+    'graph.microsoft.com': 'microsoft_graph',
+    'login.microsoftonline.com': 'microsoft_login',
+}
+
+# Shared hosts serving several vendors: (host suffix, path prefix) -> vendor label, checked first.
+# The CSE callers use www.googleapis.com/customsearch/v1, which the host alone files under 'google'.
+VENDOR_PATHS = {
+    ('googleapis.com', '/customsearch/'): 'google_cse',
+}
+
+# What each vendor bills or rate-limits in
+CREDIT_UNITS = {
+    'apollo': 'credits',          # Enrichment / email reveal; searches are free
+    'google_cse': 'queries',      # 100 free queries/day, then billed per 1000
+    'gemini': 'requests',         # Requests-per-day quota per key
+    'gmail': 'quota_units',       # messages.send = 100 units (250 units/s per user)
+    'microsoft_graph': 'requests',
+}
+
+# Apollo endpoints that consume credits (per person / organization returned)
+APOLLO_CREDIT_ENDPOINTS = ('/people/match', '/contacts/match', '/organizations/enrich')
+APOLLO_BULK_ENDPOINTS = ('/people/bulk_match', '/contacts/bulk_match', '/organizations/bulk_enrich')
+GMAIL_SEND_UNITS = 100
+
+ERROR_CLASSES = ('ok', 'http_4xx', 'rate_limited', 'http_5xx', 'timeout', 'connection', 'error')
+
+# Lead session / pipeline stage the current thread (or task) is working for
+_session_id = contextvars.ContextVar('telemetry_session_id', default=None)
+_stage = contextvars.ContextVar('telemetry_stage', default=None)
+
+_ID_SEGMENT = re.compile(r'^(\d+|[0-9a-f]{16,}|[0-9a-f-]{32,36})$|@', re.IGNORECASE)
+
+STATS_FIELDS = ('calls', 'errors', 'seconds', 'max_seconds', 'retries', 'bytes_in', 'bytes_out', 'credits')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS vendor_call_stats (
+    hour INTEGER NOT NULL,
+    vendor TEXT NOT NULL,
+    endpoint TEXT NOT NULL,
+    session_id TEXT NOT NULL DEFAULT '',
+    stage TEXT NOT NULL DEFAULT '',
+    calls INTEGER NOT NULL DEFAULT 0,
+    errors INTEGER NOT NULL DEFAULT 0,
+    error_classes TEXT NOT NULL DEFAULT '{}',
+    seconds REAL NOT NULL DEFAULT 0,
+    max_seconds REAL NOT NULL DEFAULT 0,
+    retries INTEGER NOT NULL DEFAULT 0,
+    bytes_in INTEGER NOT NULL DEFAULT 0,
+    bytes_out INTEGER NOT NULL DEFAULT 0,
+    credits REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (hour, vendor, endpoint, session_id, stage)
+);
+CREATE INDEX IF NOT EXISTS idx_vendor_call_stats_session ON vendor_call_stats(session_id);
+"""
+
+
+def vendor_for_url(url: str) -> str:
+    """Vendor label for an outbound URL (host name when unknown)"""
+    parsed = urlparse(url)
+    host = (parsed.hostname or 'unknown').lower()
+    for (suffix, prefix), vendor in VENDOR_PATHS.items():
+        if (host == suffix or host.endswith('.' + suffix)) and parsed.path.startswith(prefix):
+            return vendor
+    for suffix, vendor in VENDOR_HOSTS.items():
+        if host == suffix or host.endswith('.' + suffix):
+            return vendor
+    return host
+
+
+def endpoint_for_url(url: str) -> str:
+    """URL path with ids, emails and hashes collapsed so calls group per endpoint"""
+    path = urlparse(url).path or '/'
+    return '/'.join(':id' if _ID_SEGMENT.search(part) else part for part in path.split('/'))
+
+
+def estimate_credits(vendor: str, endpoint: str, body: bytes = None, count: int = 1) -> float:
+    """
+    Estimated credits / quota units one call spends
+
+    Args:
+        vendor: Vendor label
+        endpoint: Normalized endpoint path
+        body: Request body (used to count bulk Apollo lookups)
+        count: Operations carried by the call (Gmail batch parts)
+
+    Returns:
+        Units in CREDIT_UNITS[vendor] (0 for free endpoints and unknown vendors)
+    """
+    if vendor == 'apollo':
+        if endpoint.endswith(APOLLO_CREDIT_ENDPOINTS):
+            return 1.0
+        if endpoint.endswith(APOLLO_BULK_ENDPOINTS):
+            try:
+                payload = json.loads(body or b'{}')
+                return float(len(payload.get('details') or payload.get('domains') or []))
+            except (ValueError, TypeError, AttributeError):
+                return 0.0
+        return 0.0
+    if vendor == 'gmail':
+        return float(GMAIL_SEND_UNITS * count) if endpoint.endswith(('/send', '/batch/gmail/v1')) else 0.0
+    if vendor == 'google_cse':
+        # One billed query per search; anything else on the host is not a query
+        return 1.0 if endpoint.startswith('/customsearch/') else 0.0
+    if vendor in ('gemini', 'microsoft_graph'):
+        return 1.0
+    return 0.0
+
+
+def error_class_for_status(status: Optional[int]) -> str:
+    if status is None:
+        return 'error'
+    if status == 429:
+        return 'rate_limited'
+    if status >= 500:
+        return 'http_5xx'
+    if status >= 400:
+        return 'http_4xx'
+    return 'ok'
+
+
+def error_class_for_exception(error: BaseException) -> str:
+    name = type(error).__name__.lower()
+    if 'timeout' in name:
+        return 'timeout'
+    if 'connect' in name:
+        return 'connection'
+    return 'error'
+
+
+@contextmanager
+def telemetry_scope(session_id=None, stage: str = None):
+    """
+    Attribute vendor calls made inside the block to a lead session and/or stage
+
+    Args:
+        session_id: Lead session id (kept from the enclosing scope when None)
+        stage: Pipeline stage name (kept from the enclosing scope when None)
+    """
+    tokens = []
+    if session_id is not None:
+        tokens.append((_session_id, _session_id.set(str(session_id))))
+    if stage is not None:
+        tokens.append((_stage, _stage.set(stage)))
+    try:
+        yield
+    finally:
+        for var, token in reversed(tokens):
+            var.reset(token)
+
+
+class VendorCall:
+    """One outbound vendor call"""
+
+    __slots__ = ('ts', 'vendor', 'endpoint', 'method', 'status', 'error_class', 'seconds',
+                 'retries', 'bytes_in', 'bytes_out', 'credits', 'session_id', 'stage')
+
+    def __init__(self, vendor: str, endpoint: str, method: str, status: Optional[int], error_class: str,
+                 seconds: float, retries: int = 0, bytes_in: int = 0, bytes_out: int = 0, credits: float = 0.0):
+        self.ts = time.time()
+        self.vendor = vendor
+        self.endpoint = endpoint
+        self.method = method
+        self.status = status
+        self.error_class = error_class
+        self.seconds = seconds
+        self.retries = retries
+        self.bytes_in = bytes_in
+        self.bytes_out = bytes_out
+        self.credits = credits
+        self.session_id = _session_id.get()
+        self.stage = _stage.get()
+
+    def to_dict(self) -> Dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+def _new_stats() -> Dict:
+    stats = dict.fromkeys(STATS_FIELDS, 0)
+    stats['error_classes'] = {}
+    return stats
+
+
+def _add_stats(stats: Dict, other: Dict):
+    for field in STATS_FIELDS:
+        if field == 'max_seconds':
+            stats[field] = max(stats[field], other[field])
+        else:
+            stats[field] += other[field]
+    for name, count in other['error_classes'].items():
+        stats['error_classes'][name] = stats['error_classes'].get(name, 0) + count
+
+
+def _rounded(stats: Dict) -> Dict:
+    result = dict(stats)
+    for field in ('seconds', 'max_seconds', 'credits'):
+        result[field] = round(result[field], 3)
+    result['avg_seconds'] = round(stats['seconds'] / stats['calls'], 3) if stats['calls'] else 0.0
+    return result
+
+
+class VendorTelemetry:
+    """Ring buffer of recent vendor calls plus aggregates flushed to the local store"""
+
+    def __init__(self, db_file: str = 'vendor_telemetry.db', buffer_size: int = BUFFER_SIZE):
+        self.db_file = db_file
+        self.recent = deque(maxlen=buffer_size)
+        self._lock = threading.Lock()
+        # One connection shared by the flusher and request threads: every use of it holds
+        # this lock, and a flush holds it from taking the pending stats until they are committed
+        self._db_lock = threading.RLock()
+        self._conn = None
+        self._listeners: List[Callable[[VendorCall], None]] = []
+        # (hour, vendor, endpoint, session_id, stage) -> stats not yet flushed
+        self._pending: Dict[tuple, Dict] = {}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _db(self):
+        if self._conn is None:
+            self._conn = local_store.connect(self.db_file, SCHEMA)
+        return self._conn
+
+    def add_listener(self, listener: Callable[[VendorCall], None]):
+        """Call listener(call) for every recorded call (on the calling thread)"""
+        self._listeners.append(listener)
+
+    # ==================== RECORDING ====================
+
+    def record(self, vendor: str, endpoint: str, method: str = 'POST', status: Optional[int] = None,
+               error_class: str = None, seconds: float = 0.0, retries: int = 0,
+               bytes_in: int = 0, bytes_out: int = 0, credits: float = None,
+               request_body: bytes = None, count: int = 1) -> VendorCall:
+        """
+        Record one outbound call
+
+        Args:
+            vendor: Vendor label
+            endpoint: Normalized endpoint path
+            method: HTTP method
+            status: HTTP status (None when no response was received)
+            error_class: One of ERROR_CLASSES (derived from status when None)
+            seconds: Wall time of the call
+            retries: Transport-level retries made before the final response
+            bytes_in: Response body size
+            bytes_out: Request body size
+            credits: Credits / quota units spent (estimated when None)
+            request_body: Request body for credit estimation
+            count: Operations carried by the call (batch requests)
+
+        Returns:
+            The recorded VendorCall
+        """
+        if error_class is None:
+            error_class = error_class_for_status(status)
+        if credits is None:
+            # Failed calls are not billed
+            credits = estimate_credits(vendor, endpoint, request_body, count) if error_class == 'ok' else 0.0
+        call = VendorCall(vendor, endpoint, method, status, error_class, seconds,
+                          retries, bytes_in, bytes_out, credits)
+
+        key = (int(call.ts // 3600) * 3600, vendor, endpoint, call.session_id or '', call.stage or '')
+        with self._lock:
+            self.recent.append(call)
+            stats = self._pending.get(key)
+            if stats is None:
+                stats = self._pending[key] = _new_stats()
+            stats['calls'] += 1
+            stats['errors'] += int(error_class != 'ok')
+            stats['error_classes'][error_class] = stats['error_classes'].get(error_class, 0) + 1
+            stats['seconds'] += seconds
+            stats['max_seconds'] = max(stats['max_seconds'], seconds)
+            stats['retries'] += retries
+            stats['bytes_in'] += bytes_in
+            stats['bytes_out'] += bytes_out
+            stats['credits'] += credits
+        self._ensure_flusher()
+
+        for listener in self._listeners:
+            try:
+                listener(call)
+            except Exception as e:
+                print(f"[TELEMETRY] Listener failed: {e}")
+        return call
+
+    @contextmanager
+    def track(self, vendor: str, endpoint: str, method: str = 'POST', count: int = 1):
+        """
+        Time a call made with a client the requests hook can't see (aiohttp, httplib2)
+
+        The block may set 'status', 'bytes_in', 'bytes_out', 'retries' or
+        'credits' on the yielded dict; exceptions are recorded by class and re-raised.
+        """
+        info = {'status': None, 'error_class': None}
+        start = time.perf_counter()
+        try:
+            yield info
+        except BaseException as e:
+            # googleapiclient HttpError carries the httplib2 response
+            status = getattr(getattr(e, 'resp', None), 'status', None)
+            if isinstance(status, int):
+                info['status'] = status
+            # A response already seen by the block decides the class (e.g. a quota error raised on 429)
+            if info['status'] is None:
+                info['error_class'] = error_class_for_exception(e)
+            raise
+        finally:
+            self.record(vendor, endpoint, method, seconds=time.perf_counter() - start, count=count, **info)
+
+    # ==================== FLUSHING ====================
+
+    def _ensure_flusher(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._flush_loop, name='vendor-telemetry', daemon=True)
+                self._thread.start()
+
+    def _flush_loop(self):
+        while not self._stop.wait(FLUSH_INTERVAL):
+            self.flush()
+
+    def flush(self) -> int:
+        """
+        Add pending aggregates to the local store
+
+        Returns:
+            Number of aggregate rows written
+        """
+        with self._db_lock:
+            return self._flush_locked()
+
+    def _flush_locked(self) -> int:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+        try:
+            conn = self._db()
+            with conn:
+                for (hour, vendor, endpoint, session_id, stage), stats in pending.items():
+                    row = conn.execute(
+                        "SELECT error_classes FROM vendor_call_stats WHERE hour = ? AND vendor = ? "
+                        "AND endpoint = ? AND session_id = ? AND stage = ?",
+                        (hour, vendor, endpoint, session_id, stage)
+                    ).fetchone()
+                    classes = dict(stats['error_classes'])
+                    if row:
+                        for name, count in json.loads(row[0]).items():
+                            classes[name] = classes.get(name, 0) + count
+                    conn.execute(
+                        "INSERT INTO vendor_call_stats (hour, vendor, endpoint, session_id, stage, calls, errors, "
+                        "error_classes, seconds, max_seconds, retries, bytes_in, bytes_out, credits) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                        "ON CONFLICT (hour, vendor, endpoint, session_id, stage) DO UPDATE SET "
+                        "calls = calls + excluded.calls, errors = errors + excluded.errors, "
+                        "error_classes = excluded.error_classes, seconds = seconds + excluded.seconds, "
+                        "max_seconds = MAX(max_seconds, excluded.max_seconds), retries = retries + excluded.retries, "
+                        "bytes_in = bytes_in + excluded.bytes_in, bytes_out = bytes_out + excluded.bytes_out, "
+                        "credits = credits + excluded.credits",
+                        (hour, vendor, endpoint, session_id, stage, stats['calls'], stats['errors'],
+                         json.dumps(classes), stats['seconds'], stats['max_seconds'], stats['retries'],
+                         stats['bytes_in'], stats['bytes_out'], stats['credits'])
+                    )
+                conn.execute("DELETE FROM vendor_call_stats WHERE hour < ?",
+                             (time.time() - RETENTION_DAYS * 86400,))
+            return len(pending)
+        except Exception as e:
+            print(f"[TELEMETRY] Flush failed, keeping {len(pending)} aggregates in memory: {e}")
+            with self._lock:
+                for key, stats in pending.items():
+                    current = self._pending.get(key)
+                    if current is None:
+                        self._pending[key] = stats
+                    else:
+                        _add_stats(current, stats)
+            return 0
+
+    def shutdown(self):
+        """Stop the flush thread and write what is left"""
+        self._stop.set()
+        self.flush()
+
+    # ==================== REPORTING ====================
+
+    def _rows(self, since: float, session_id=None):
+        """Aggregate rows from all workers (flushed) plus this process's pending ones"""
+        query = ("SELECT hour, vendor, endpoint, session_id, stage, calls, errors, error_classes, seconds, "
+                 "max_seconds, retries, bytes_in, bytes_out, credits FROM vendor_call_stats WHERE hour >= ?")
+        params = [int(since // 3600) * 3600]
+        if session_id is not None:
+            query += " AND session_id = ?"
+            params.append(str(session_id))
+        with self._db_lock:
+            self._flush_locked()
+            try:
+                rows = self._db().execute(query, params).fetchall()
+            except Exception as e:
+                print(f"[TELEMETRY] Could not read aggregates: {e}")
+                rows = []
+            # Whatever a failed flush put back (taken with the rows so nothing is counted twice)
+            with self._lock:
+                pending = [(key, json.loads(json.dumps(stats))) for key, stats in self._pending.items()]
+        for row in rows:
+            stats = dict(zip(('calls', 'errors'), row[5:7]))
+            stats['error_classes'] = json.loads(row[7])
+            stats.update(zip(('seconds', 'max_seconds', 'retries', 'bytes_in', 'bytes_out', 'credits'), row[8:]))
+            yield row[:5], stats
+        for key, stats in pending:
+            if key[0] >= params[0] and (session_id is None or key[3] == str(session_id)):
+                yield key, stats
+
+    def summary(self, hours: float = 24, session_id=None) -> Dict:
+        """
+        Aggregated vendor spend
+
+        Args:
+            hours: Look-back window (ignored for a session - all of it is returned)
+            session_id: Restrict to one lead session
+
+        Returns:
+            Totals per vendor, per endpoint and per stage (stage x vendor for sessions)
+        """
+        since = 0 if session_id is not None else time.time() - hours * 3600
+        vendors: Dict[str, Dict] = {}
+        endpoints: Dict[str, Dict] = {}
+        stages: Dict[str, Dict] = {}
+        total = _new_stats()
+        for (hour, vendor, endpoint, row_session, stage), stats in self._rows(since, session_id):
+            _add_stats(vendors.setdefault(vendor, _new_stats()), stats)
+            _add_stats(endpoints.setdefault(f"{vendor} {endpoint}", _new_stats()), stats)
+            stage_stats = stages.setdefault(stage or 'unattributed', {})
+            _add_stats(stage_stats.setdefault(vendor, _new_stats()), stats)
+            _add_stats(total, stats)
+
+        return {
+            'session_id': session_id,
+            'window_hours': None if session_id is not None else hours,
+            'credit_units': CREDIT_UNITS,
+            'total': _rounded(total),
+            'vendors': {name: _rounded(stats) for name, stats in sorted(vendors.items())},
+            'endpoints': {name: _rounded(stats) for name, stats in
+                          sorted(endpoints.items(), key=lambda item: -item[1]['seconds'])},
+            'stages': {stage: {vendor: _rounded(stats) for vendor, stats in by_vendor.items()}
+                       for stage, by_vendor in stages.items()}
+        }
+
+    def recent_calls(self, limit: int = 100, vendor: str = None, session_id=None) -> List[Dict]:
+        """Most recent calls seen by this process (newest first)"""
+        if limit <= 0:
+            return []
+        with self._lock:
+            calls = list(self.recent)
+        result = []
+        for call in reversed(calls):
+            if vendor and call.vendor != vendor:
+                continue
+            if session_id is not None and call.session_id != str(session_id):
+                continue
+            result.append(call.to_dict())
+            if len(result) >= limit:
+                break
+        return result
+
+
+_telemetry = None
+_telemetry_lock = threading.Lock()
+
+
+def get_vendor_telemetry() -> VendorTelemetry:
+    """Get the process-wide vendor telemetry"""
+    global _telemetry
+    with _telemetry_lock:
+        if _telemetry is None:
+            _telemetry = VendorTelemetry()
+            atexit.register(_telemetry.shutdown)
+        return _telemetry
+
+
+def _response_retries(response) -> int:
+    """Retries urllib3 made before this response (when the adapter has a Retry policy)"""
+    retries = getattr(getattr(response, 'raw', None), 'retries', None)
+    return len(getattr(retries, 'history', ()) or ())
+
+
+def instrument_requests():
+    """Record every outbound call made with the requests library"""
+    import requests
+
+    if getattr(requests.Session.send, '_telemetry', False):
+        return
+    original_send = requests.Session.send
+    telemetry = get_vendor_telemetry()
+
+    def recorded_send(session, request, **kwargs):
+        start = time.perf_counter()
+        response = None
+        error_class = None
+        try:
+            response = original_send(session, request, **kwargs)
+            return response
+        except Exception as e:
+            error_class = error_class_for_exception(e)
+            raise
+        finally:
+            body = request.body.encode() if isinstance(request.body, str) else request.body
+            bytes_in = 0
+            if response is not None:
+                # Non-streamed bodies have already been read by send()
+                if not kwargs.get('stream'):
+                    bytes_in = len(response.content or b'')
+                else:
+                    bytes_in = int(response.headers.get('Content-Length') or 0)
+            telemetry.record(
+                vendor_for_url(request.url), endpoint_for_url(request.url), request.method,
+                status=response.status_code if response is not None else None, error_class=error_class,
+                seconds=time.perf_counter() - start,
+                retries=_response_retries(response) if response is not None else 0,
+                bytes_in=bytes_in, bytes_out=len(body) if isinstance(body, (bytes, bytearray)) else 0,
+                request_body=body if isinstance(body, (bytes, bytearray)) else None
+            )
+
+    recorded_send._telemetry = True
+    requests.Session.send = recorded_send
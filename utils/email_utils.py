@@ -1,7 +1,23 @@
 """
 Email utility functions for formatting and processing emails
 """
+import hashlib
 import html as html_module
+import re
+import threading
+from collections import OrderedDict
+
+# Shared HTML shell (built once, not per message)
+HTML_EMAIL_HEAD = '\n'.join([
+    '<html>',
+    '<head>',
+    '<meta charset="utf-8">',
+    '<meta name="viewport" content="width=device-width, initial-scale=1.0">',
+    '</head>',
+    '<body style="font-family: -apple-system, BlinkMacSystemFont, \'Segoe UI\', Roboto, \'Helvetica Neue\', Arial, sans-serif; font-size: 15px; line-height: 1.6; color: #333; max-width: 600px; margin: 0 auto; padding: 20px;">'
+])
+HTML_EMAIL_TAIL = '</body>\n</html>'
+HTML_PARAGRAPH_OPEN = '<p style="margin: 0 0 16px 0;">'
 
 
 def text_to_html_email(text):
@@ -27,22 +43,15 @@ def text_to_html_email(text):
     paragraphs = text.split('\n\n')
 
     # Build HTML with professional styling
-    html_parts = [
-        '<html>',
-        '<head>',
-        '<meta charset="utf-8">',
-        '<meta name="viewport" content="width=device-width, initial-scale=1.0">',
-        '</head>',
-        '<body style="font-family: -apple-system, BlinkMacSystemFont, \'Segoe UI\', Roboto, \'Helvetica Neue\', Arial, sans-serif; font-size: 15px; line-height: 1.6; color: #333; max-width: 600px; margin: 0 auto; padding: 20px;">'
-    ]
+    html_parts = [HTML_EMAIL_HEAD]
 
     for para in paragraphs:
         if para.strip():
             # Replace single newlines with <br> for line breaks within paragraphs
             para_html = para.replace('\n', '<br>')
-            html_parts.append(f'<p style="margin: 0 0 16px 0;">{para_html}</p>')
+            html_parts.append(f'{HTML_PARAGRAPH_OPEN}{para_html}</p>')
 
-    html_parts.extend(['</body>', '</html>'])
+    html_parts.append(HTML_EMAIL_TAIL)
 
     return '\n'.join(html_parts)
 
@@ -64,3 +73,198 @@ def replace_email_variables(text, variables):
         text = text.replace(f'{{{key}}}', str(value))
 
     return text
+
+
+# ============================================================
+# Compiled templates (bulk rendering)
+# ============================================================
+
+# {{Var}} or {Var}; anything else stays literal text
+PLACEHOLDER_PATTERN = re.compile(r'\{\{(\w+)\}\}|\{(\w+)\}')
+
+# Characters html.escape rewrites (most values have none, so the escape call is skipped)
+HTML_SPECIAL_PATTERN = re.compile(r'[&<>"\']')
+
+COMPILED_CACHE_SIZE = 256
+
+
+class _CompiledText:
+    """Literal parts with placeholder slots, filled by index and joined once"""
+
+    __slots__ = ('parts', 'slots')
+
+    def __init__(self):
+        self.parts = []
+        self.slots = []  # (index in parts, field)
+
+    def add_literal(self, text):
+        if not text:
+            return
+        if self.parts and (not self.slots or self.slots[-1][0] != len(self.parts) - 1):
+            self.parts[-1] += text
+        else:
+            self.parts.append(text)
+
+    def add_field(self, field):
+        self.slots.append((len(self.parts), field))
+        self.parts.append('')
+
+    def render(self, values):
+        parts = self.parts[:]
+        for index, field in self.slots:
+            parts[index] = values[field]
+        return ''.join(parts)
+
+
+class CompiledEmailTemplate:
+    """Subject + body template parsed once, rendered per lead in one pass"""
+
+    def __init__(self, subject, body):
+        """
+        Compile an email template
+
+        Args:
+            subject (str): Subject template
+            body (str): Body template (plain text, paragraphs split by blank lines)
+        """
+        subject = subject or ''
+        body = body or ''
+        # field -> (variable name, placeholder text); {X} and {{X}} are separate
+        # fields so an unknown variable is left exactly as written
+        self.fields = {}
+        self.subject = self._compile(subject)
+        self.body = self._compile(body)
+        self.variables = {name for name, raw in self.fields.values()}
+
+        # HTML body: paragraphs come from the template's own blank lines, so literal
+        # text is escaped and <br>-joined once here. Whether a paragraph is blank can
+        # only depend on the lead when it has no literal text of its own.
+        self.html_paragraphs = []
+        for paragraph in body.split('\n\n'):
+            literal = PLACEHOLDER_PATTERN.sub('', paragraph)
+            if literal == paragraph and not literal.strip():
+                continue
+            self.html_paragraphs.append((
+                self._compile(paragraph, html=True),
+                self._compile(paragraph) if not literal.strip() else None
+            ))
+
+        self.html = None
+        if all(check is None for _, check in self.html_paragraphs):
+            self.html = _CompiledText()
+            self.html.add_literal(HTML_EMAIL_HEAD)
+            for paragraph, _ in self.html_paragraphs:
+                self.html.add_literal(f'\n{HTML_PARAGRAPH_OPEN}')
+                slot_fields = dict(paragraph.slots)
+                for index, part in enumerate(paragraph.parts):
+                    if index in slot_fields:
+                        self.html.add_field(slot_fields[index])
+                    else:
+                        self.html.add_literal(part)
+                self.html.add_literal('</p>')
+            self.html.add_literal(f'\n{HTML_EMAIL_TAIL}')
+
+    def _compile(self, text, html=False):
+        compiled = _CompiledText()
+        position = 0
+        for match in PLACEHOLDER_PATTERN.finditer(text):
+            compiled.add_literal(self._literal(text[position:match.start()], html))
+            name = match.group(1) or match.group(2)
+            field = name if match.group(1) else f'{{{name}}}'
+            self.fields[field] = (name, match.group(0))
+            compiled.add_field(field)
+            position = match.end()
+        compiled.add_literal(self._literal(text[position:], html))
+        return compiled
+
+    @staticmethod
+    def _literal(text, html):
+        return html_module.escape(text).replace('\n', '<br>') if html else text
+
+    def unknown_variables(self, variables):
+        """Placeholders in the template that variables does not provide"""
+        return sorted(name for name in self.variables if variables.get(name) is None)
+
+    def render(self, variables, html=True):
+        """
+        Render subject, body and HTML body for one lead
+
+        Args:
+            variables (dict): Variable names (without braces) to values
+            html (bool): Also build the HTML body
+
+        Returns:
+            dict: subject, body, html (or None) and unknown_variables
+        """
+        values = {}
+        unknown = set()
+        reflow = False
+        for field, (name, raw) in self.fields.items():
+            value = variables.get(name)
+            if value is None:
+                # Unknown variables are left in place, like replace_email_variables
+                values[field] = raw
+                unknown.add(name)
+            else:
+                value = str(value)
+                values[field] = value
+                # Empty or multi-line values can merge or add paragraphs
+                reflow = reflow or not value or '\n' in value
+
+        rendered = {
+            'subject': self.subject.render(values),
+            'body': self.body.render(values),
+            'html': None,
+            'unknown_variables': sorted(unknown),
+        }
+        if html:
+            if reflow:
+                rendered['html'] = text_to_html_email(rendered['body'])
+            else:
+                escaped = {
+                    field: html_module.escape(value) if HTML_SPECIAL_PATTERN.search(value) else value
+                    for field, value in values.items()
+                }
+                rendered['html'] = self.html.render(escaped) if self.html else self._render_html(values, escaped)
+        return rendered
+
+    def _render_html(self, values, escaped):
+        html_parts = [HTML_EMAIL_HEAD]
+        for html_paragraph, check in self.html_paragraphs:
+            if check is None or check.render(values).strip():
+                html_parts.append(f'{HTML_PARAGRAPH_OPEN}{html_paragraph.render(escaped)}</p>')
+        html_parts.append(HTML_EMAIL_TAIL)
+        return '\n'.join(html_parts)
+
+
+_compiled_templates = OrderedDict()
+_compiled_lock = threading.Lock()
+
+
+def get_compiled_template(subject, body, template_id=None):
+    """
+    Get a compiled template from the process-wide cache
+
+    Args:
+        subject (str): Subject template
+        body (str): Body template
+        template_id (int): EmailTemplate id (optional, for stored templates)
+
+    Returns:
+        CompiledEmailTemplate
+    """
+    # The content hash acts as the template version, so edits recompile
+    version = hashlib.sha1(f'{subject}\x00{body}'.encode('utf-8')).hexdigest()
+    key = (template_id, version)
+    with _compiled_lock:
+        compiled = _compiled_templates.get(key)
+        if compiled is not None:
+            _compiled_templates.move_to_end(key)
+            return compiled
+
+    compiled = CompiledEmailTemplate(subject, body)
+    with _compiled_lock:
+        _compiled_templates[key] = compiled
+        while len(_compiled_templates) > COMPILED_CACHE_SIZE:
+            _compiled_templates.popitem(last=False)
+    return compiled